@@ -0,0 +1,810 @@
+"""
+ローカルで動作するW3C WebDriverの代替サーバー。
+ブラウザやネットワークなしでページ操作のラウンドトリップ数と所要時間を計測するために使用します
+（ベンチマークとテスト専用のため、src には含めない）。
+
+使用例:
+    server = FakeWebDriverServer(latency=0.002)
+    page = server.add_page("http://app.test/login", title="Login")
+    page.add_element((By.ID, "username"), FakeElement("input"))
+    with server:
+        driver = webdriver.Remote(command_executor=server.url, options=webdriver.ChromeOptions())
+"""
+
+import base64
+import itertools
+import json
+import re
+import threading
+import time
+import uuid
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from src import browser_scripts, conditions
+from src.driver_pool import CLEAR_STORAGE_SCRIPT
+
+# W3C WebDriverの要素参照のキー
+ELEMENT_KEY = "element-6066-11e4-a52e-4f735466cecf"
+
+# 1x1ピクセルの透明なPNG
+BLANK_PNG = base64.b64decode(
+    "iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAYAAAAfFcSJAAAADUlEQVR42mNkYPhfDwAChwGA60e6kgAAAABJRU5ErkJggg=="
+)
+
+
+class WebDriverError(Exception):
+    """W3C WebDriverのエラーレスポンスとして返す例外"""
+    
+    def __init__(self, error: str, message: str = "", status: int = 404):
+        """
+        WebDriverErrorクラスの初期化
+        
+        Args:
+            error: W3Cのエラーコード（例: "no such element"）
+            message: エラーメッセージ
+            status: HTTPステータスコード
+        """
+        super().__init__(message or error)
+        self.error = error
+        self.message = message or error
+        self.status = status
+
+
+def normalize_locator(by: str, value: str) -> Tuple[str, str]:
+    """
+    ロケーターをSeleniumがW3Cコマンドで送る形式に変換する
+    
+    SeleniumはID・NAME・CLASS_NAME・TAG_NAMEをCSSセレクターに変換して送るため、
+    ページに登録したロケーターとリクエストのロケーターを同じ形式で比較できるようにする。
+    
+    Args:
+        by: 検索方法
+        value: 検索値
+    
+    Returns:
+        Tuple[str, str]: (検索方法, 検索値)
+    """
+    if by == "id":
+        return "css selector", f'[id="{value}"]'
+    if by == "name":
+        return "css selector", f'[name="{value}"]'
+    if by == "class name":
+        return "css selector", f".{value}"
+    if by == "tag name":
+        return "css selector", value
+    return by, value
+
+
+class FakeElement:
+    """代替サーバーのページ上の要素"""
+    
+    def __init__(self, tag: str = "div", text: str = "", attributes: Optional[Dict[str, str]] = None,
+                 displayed: bool = True, enabled: bool = True, navigates_to: Optional[str] = None,
+                 on_click: Optional[Callable[["FakeSession"], None]] = None):
+        """
+        FakeElementクラスの初期化
+        
+        Args:
+            tag: タグ名
+            text: 表示テキスト
+            attributes: HTML属性
+            displayed: 表示されているかどうか
+            enabled: 有効かどうか
+            navigates_to: クリック時に移動するURL
+            on_click: クリック時に呼び出す関数
+        """
+        self.tag = tag
+        self.text = text
+        self.attributes = dict(attributes or {})
+        self.properties: Dict[str, Any] = {"value": self.attributes.get("value", "")}
+        self.displayed = displayed
+        self.enabled = enabled
+        self.selected = False
+        self.navigates_to = navigates_to
+        self.on_click = on_click
+        self.rect = {"x": 0, "y": 0, "width": 100, "height": 20}
+        self.clicks = 0
+    
+    @property
+    def value(self) -> str:
+        """入力値"""
+        return self.properties.get("value", "")
+    
+    @value.setter
+    def value(self, value: str) -> None:
+        self.properties["value"] = value
+
+
+class FakePage:
+    """代替サーバーのページ"""
+    
+    def __init__(self, url: str, title: str = ""):
+        """
+        FakePageクラスの初期化
+        
+        Args:
+            url: ページのURL
+            title: ページのタイトル
+        """
+        self.url = url
+        self.title = title
+        self.elements: Dict[Tuple[str, str], List[FakeElement]] = {}
+        self.source = "<html><head></head><body></body></html>"
+    
+    def add_element(self, locator: Tuple[str, str], element: FakeElement) -> FakeElement:
+        """
+        ロケーターで見つかる要素を追加する
+        
+        Args:
+            locator: (検索方法, 検索値)のタプル
+            element: 追加する要素
+        
+        Returns:
+            FakeElement: 追加した要素
+        """
+        self.elements.setdefault(normalize_locator(*locator), []).append(element)
+        return element
+    
+    def add_elements(self, locator: Tuple[str, str], elements: List[FakeElement]) -> List[FakeElement]:
+        """
+        ロケーターで見つかる要素をまとめて追加する
+        
+        Args:
+            locator: (検索方法, 検索値)のタプル
+            elements: 追加する要素のリスト
+        
+        Returns:
+            List[FakeElement]: 追加した要素のリスト
+        """
+        for element in elements:
+            self.add_element(locator, element)
+        return elements
+    
+    def find(self, by: str, value: str) -> List[FakeElement]:
+        """
+        ロケーターに一致する要素を返す
+        
+        Args:
+            by: 検索方法
+            value: 検索値
+        
+        Returns:
+            List[FakeElement]: 一致する要素のリスト
+        """
+        return list(self.elements.get(normalize_locator(by, value), []))
+    
+    def contains(self, element: FakeElement) -> bool:
+        """
+        要素がこのページに属しているかどうかを返す
+        
+        Args:
+            element: 確認する要素
+        
+        Returns:
+            bool: 属している場合はTrue
+        """
+        return any(element is candidate for elements in self.elements.values() for candidate in elements)
+
+
+class FakeSession:
+    """代替サーバーのブラウザセッション"""
+    
+    def __init__(self, server: "FakeWebDriverServer", session_id: str, capabilities: dict):
+        """
+        FakeSessionクラスの初期化
+        
+        Args:
+            server: セッションを保持するサーバー
+            session_id: セッションID
+            capabilities: セッションのケイパビリティ
+        """
+        self.server = server
+        self.session_id = session_id
+        self.capabilities = capabilities
+        self.page = FakePage("about:blank")
+        self.history: List[str] = ["about:blank"]
+        self.history_index = 0
+        self.cookies: List[dict] = []
+        self.local_storage: Dict[str, str] = {}
+        self.session_storage: Dict[str, str] = {}
+        self.timeouts = {"implicit": 0, "pageLoad": 300000, "script": 30000}
+        self.window_handles = ["main"]
+        self.current_window = "main"
+        self.window_rect = {"x": 0, "y": 0, "width": 1920, "height": 1080}
+        self._element_ids: Dict[int, str] = {}
+        self._elements: Dict[str, FakeElement] = {}
+    
+    def navigate(self, url: str, record_history: bool = True) -> None:
+        """
+        URLのページに移動する
+        
+        Args:
+            url: 移動先のURL
+            record_history: 履歴に記録するかどうか
+        """
+        self.page = self.server.get_page(url)
+        if record_history:
+            del self.history[self.history_index + 1:]
+            self.history.append(url)
+            self.history_index = len(self.history) - 1
+    
+    def element_ref(self, element: FakeElement) -> dict:
+        """
+        要素をW3Cの要素参照に変換する
+        
+        Args:
+            element: 要素
+        
+        Returns:
+            dict: 要素参照
+        """
+        element_id = self._element_ids.get(id(element))
+        if element_id is None:
+            element_id = str(uuid.uuid4())
+            self._element_ids[id(element)] = element_id
+            self._elements[element_id] = element
+        return {ELEMENT_KEY: element_id}
+    
+    def element(self, element_id: str) -> FakeElement:
+        """
+        要素IDから要素を返す
+        
+        Args:
+            element_id: 要素ID
+        
+        Returns:
+            FakeElement: 要素
+        
+        Raises:
+            WebDriverError: 要素が存在しない、または現在のページにない場合
+        """
+        element = self._elements.get(element_id)
+        if element is None:
+            raise WebDriverError("no such element", f"Unknown element id: {element_id}")
+        if not self.page.contains(element):
+            raise WebDriverError("stale element reference", "The element is no longer attached to the DOM")
+        return element
+    
+    def to_wire(self, value: Any) -> Any:
+        """スクリプトの戻り値をJSONに変換する（要素は要素参照にする）"""
+        if isinstance(value, FakeElement):
+            return self.element_ref(value)
+        if isinstance(value, (list, tuple)):
+            return [self.to_wire(item) for item in value]
+        if isinstance(value, dict):
+            return {key: self.to_wire(item) for key, item in value.items()}
+        return value
+    
+    def from_wire(self, value: Any) -> Any:
+        """スクリプトの引数をPythonの値に変換する（要素参照は要素にする）"""
+        if isinstance(value, dict):
+            if ELEMENT_KEY in value:
+                return self.element(value[ELEMENT_KEY])
+            return {key: self.from_wire(item) for key, item in value.items()}
+        if isinstance(value, list):
+            return [self.from_wire(item) for item in value]
+        return value
+
+
+# スクリプトハンドラー: (セッション, 引数のリスト) -> 戻り値
+ScriptHandler = Callable[[FakeSession, list], Any]
+
+
+class FakeWebDriverServer:
+    """W3C WebDriverの代替となるローカルHTTPサーバー"""
+    
+    def __init__(self, latency: float = 0.0, host: str = "127.0.0.1", port: int = 0):
+        """
+        FakeWebDriverServerクラスの初期化
+        
+        Args:
+            latency: 1コマンドあたりに追加する遅延（秒）
+            host: 待ち受けるホスト
+            port: 待ち受けるポート。0の場合は空いているポートを使用する
+        """
+        self.latency = latency
+        self.pages: Dict[str, FakePage] = {}
+        self.sessions: Dict[str, FakeSession] = {}
+        self.commands: List[str] = []
+        self.script_handlers: Dict[str, ScriptHandler] = {}
+        self.atom_handlers: Dict[str, ScriptHandler] = {}
+        self._lock = threading.Lock()
+        self._httpd = ThreadingHTTPServer((host, port), _make_handler(self))
+        self._httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+        self._register_builtin_scripts()
+    
+    @property
+    def url(self) -> str:
+        """サーバーのURL"""
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+    
+    @property
+    def round_trips(self) -> int:
+        """受け付けたコマンドの数"""
+        return len(self.commands)
+    
+    def command_counts(self) -> Counter:
+        """
+        コマンドごとの受付回数を返す
+        
+        Returns:
+            Counter: {コマンド名: 回数}
+        """
+        return Counter(self.commands)
+    
+    def reset_counts(self) -> None:
+        """コマンドの記録を消去する"""
+        with self._lock:
+            self.commands.clear()
+    
+    def start(self) -> "FakeWebDriverServer":
+        """サーバーをバックグラウンドスレッドで起動する"""
+        self._thread = threading.Thread(
+            target=self._httpd.serve_forever, kwargs={"poll_interval": 0.05},
+            name="fake-webdriver", daemon=True,
+        )
+        self._thread.start()
+        return self
+    
+    def stop(self) -> None:
+        """サーバーを停止する"""
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+    
+    def __enter__(self) -> "FakeWebDriverServer":
+        return self.start()
+    
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.stop()
+    
+    def add_page(self, url: str, title: str = "") -> FakePage:
+        """
+        ページを追加する
+        
+        Args:
+            url: ページのURL
+            title: ページのタイトル
+        
+        Returns:
+            FakePage: 追加したページ
+        """
+        page = FakePage(url, title)
+        self.pages[url] = page
+        return page
+    
+    def get_page(self, url: str) -> FakePage:
+        """
+        URLのページを返す。登録されていない場合は空のページを返す
+        
+        Args:
+            url: ページのURL
+        
+        Returns:
+            FakePage: ページ
+        """
+        return self.pages.get(url) or FakePage(url)
+    
+    def add_script_handler(self, script: str, handler: ScriptHandler) -> None:
+        """
+        execute_scriptで実行されるスクリプトの代替処理を登録する
+        
+        スクリプトは完全一致で照合する。browser_scripts などの定数をそのまま渡し、書き写した文字列は使わない
+        （定数を変更した場合に一致しなくなるため）。登録されていないスクリプトは "javascript error" として扱われる。
+        
+        Args:
+            script: スクリプト（送信されるスクリプトの定数）
+            handler: 代替処理
+        """
+        self.script_handlers[script] = handler
+    
+    def add_predicate_handler(self, predicate: str, handler: Callable[["FakeElement", list], bool]) -> None:
+        """
+        browser_scripts.find_matching_script の判定式の代替処理を登録する
+        
+        Args:
+            predicate: 判定式
+            handler: (要素, 判定式の引数) を受け取り、条件を満たす場合に真を返す関数
+        """
+        def find_matching(session, args):
+            params = args[2] if len(args) > 2 else None
+            for element in session.page.find(args[0], args[1]):
+                if handler(element, params):
+                    return element
+            return None
+        
+        self.add_script_handler(browser_scripts.find_matching_script(predicate), find_matching)
+    
+    def run_script(self, session: FakeSession, script: str, args: list) -> Any:
+        """
+        スクリプトの代替処理を実行する
+        
+        Args:
+            session: セッション
+            script: スクリプト
+            args: スクリプトの引数
+        
+        Returns:
+            Any: スクリプトの戻り値
+        """
+        handler = self.script_handlers.get(script)
+        if handler is None:
+            # Seleniumのアトム（is_displayed, get_attributeなど）は先頭のコメントで識別する
+            match = re.match(r"/\* (\w+) \*/", script)
+            handler = self.atom_handlers.get(match.group(1)) if match else None
+        if handler is None:
+            first_line = next((line.strip() for line in script.splitlines() if line.strip()), "")
+            raise WebDriverError(
+                "javascript error", f"Unsupported script in fake WebDriver: {first_line[:80]}", status=500
+            )
+        return handler(session, session.from_wire(args))
+    
+    def _register_builtin_scripts(self) -> None:
+        """このリポジトリが使用するスクリプトの代替処理を登録する"""
+        
+        def extract(session, args, read):
+            names = args[2] if len(args) > 2 else None
+            return [read(element, names) for element in session.page.find(args[0], args[1])]
+        
+        def read_attributes(element, names):
+            return {name: element.attributes.get(name) for name in names}
+        
+        def read_properties(element, names):
+            return {name: element.properties.get(name) for name in names}
+        
+        def clear_storage(session, args):
+            session.local_storage.clear()
+            session.session_storage.clear()
+        
+        def find_form_fields(session, args):
+            rows = []
+            for by, value in args[0]:
+                found = session.page.find(by, value)
+                if not found:
+                    return None
+                element = found[0]
+                rows.append([element, element.tag, element.attributes.get("type", "").lower(), element.selected])
+            return rows
+        
+        def fill_form(session, args):
+            elements = []
+            for by, value, _ in args[0]:
+                found = session.page.find(by, value)
+                if not found:
+                    return None
+                elements.append(found[0])
+            for element, (_, _, value) in zip(elements, args[0]):
+                if element.attributes.get("type") in ("checkbox", "radio"):
+                    element.selected = bool(value)
+                    element.properties["checked"] = element.selected
+                else:
+                    element.value = value if isinstance(value, list) else str(value)
+            return True
+        
+        def capture_storage(session, args):
+            match = re.match(r"[a-z]+://[^/]+", session.page.url)
+            origin = match.group(0) if match else "null"
+            return [origin, dict(session.local_storage), dict(session.session_storage)]
+        
+        def restore_storage(session, args):
+            session.local_storage.update(args[0])
+            session.session_storage.update(args[1])
+        
+        def check_locators(session, args):
+            rows = []
+            for by, value in args[0]:
+                found = session.page.find(by, value)
+                rows.append([len(found), sum(1 for element in found if element.displayed), None])
+            return rows
+        
+        def page_timing(session, args):
+            # 代替サーバーには実際の通信がないため、ナビゲーションの種類とURLだけを返す
+            navigation = {"url": session.page.url, "type": "navigate", "transfer_size": 0}
+            return {"navigation": navigation, "paint": {}, "resource_count": 0, "resource_bytes": 0, "resources": []}
+        
+        # スクリプトを書き写さず、ライブラリが送信する定数そのものをキーにする
+        handlers: Dict[str, ScriptHandler] = {
+            browser_scripts.READY_STATE: lambda session, args: "complete",
+            browser_scripts.NETWORK_STATE: lambda session, args: ["complete", 0],
+            CLEAR_STORAGE_SCRIPT: clear_storage,
+            browser_scripts.GET_TEXTS: lambda session, args: extract(
+                session, args, lambda element, names: _rendered_text(element)
+            ),
+            browser_scripts.GET_ATTRIBUTES: lambda session, args: extract(session, args, read_attributes),
+            browser_scripts.GET_PROPERTIES: lambda session, args: extract(session, args, read_properties),
+            browser_scripts.ALL_PRESENT: lambda session, args: all(
+                session.page.find(by, value) for by, value in args[0]
+            ),
+            browser_scripts.PAGE_TIMING: page_timing,
+            browser_scripts.CAPTURE_STORAGE: capture_storage,
+            browser_scripts.RESTORE_STORAGE: restore_storage,
+            browser_scripts.CHECK_LOCATORS: check_locators,
+            browser_scripts.FIND_FORM_FIELDS: find_form_fields,
+            browser_scripts.FILL_FORM: fill_form,
+        }
+        for script, handler in handlers.items():
+            self.add_script_handler(script, handler)
+        for predicate, handler in (
+            (browser_scripts.CONDITION_PREDICATES["presence"], lambda element, params: True),
+            (browser_scripts.CONDITION_PREDICATES["visibility"], lambda element, params: element.displayed),
+            (browser_scripts.CONDITION_PREDICATES["clickable"],
+             lambda element, params: element.displayed and element.enabled),
+            (conditions.visible.compile()[0], lambda element, params: element.displayed),
+            (conditions.enabled.compile()[0], lambda element, params: element.enabled),
+            (conditions.clickable.compile()[0], lambda element, params: element.displayed and element.enabled),
+        ):
+            self.add_predicate_handler(predicate, handler)
+        self.atom_handlers["isDisplayed"] = lambda session, args: args[0].displayed
+        self.atom_handlers["getAttribute"] = (
+            lambda session, args: args[0].attributes.get(args[1], args[0].properties.get(args[1]))
+        )
+    
+    def dispatch(self, method: str, path: str, body: dict) -> Any:
+        """
+        リクエストを処理してレスポンスの値を返す
+        
+        Args:
+            method: HTTPメソッド
+            path: リクエストのパス
+            body: リクエストのJSON
+        
+        Returns:
+            Any: レスポンスの "value"
+        """
+        for route_method, pattern, name, handler in _ROUTES:
+            if route_method != method:
+                continue
+            match = pattern.fullmatch(path)
+            if match is None:
+                continue
+            with self._lock:
+                self.commands.append(name)
+            if self.latency:
+                time.sleep(self.latency)
+            params = match.groupdict()
+            if "session_id" in params:
+                session = self.sessions.get(params.pop("session_id"))
+                if session is None:
+                    raise WebDriverError("invalid session id", "Session not found")
+                return handler(self, session, body, **params)
+            return handler(self, body, **params)
+        raise WebDriverError("unknown command", f"{method} {path}", status=404)
+
+
+# --- コマンドの処理 ---------------------------------------------------------
+
+_session_counter = itertools.count(1)
+
+
+def _new_session(server, body):
+    session_id = f"fake-{next(_session_counter)}-{uuid.uuid4().hex[:8]}"
+    requested = body.get("capabilities", {}).get("alwaysMatch", {})
+    capabilities = {
+        "browserName": requested.get("browserName", "fake"),
+        "browserVersion": "1.0",
+        "platformName": "any",
+        "pageLoadStrategy": requested.get("pageLoadStrategy", "normal"),
+    }
+    server.sessions[session_id] = FakeSession(server, session_id, capabilities)
+    return {"sessionId": session_id, "capabilities": capabilities}
+
+
+def _delete_session(server, session, body):
+    server.sessions.pop(session.session_id, None)
+
+
+def _navigate(server, session, body):
+    session.navigate(body["url"])
+
+
+def _back(server, session, body):
+    if session.history_index > 0:
+        session.history_index -= 1
+        session.navigate(session.history[session.history_index], record_history=False)
+
+
+def _forward(server, session, body):
+    if session.history_index < len(session.history) - 1:
+        session.history_index += 1
+        session.navigate(session.history[session.history_index], record_history=False)
+
+
+def _refresh(server, session, body):
+    session.navigate(session.page.url, record_history=False)
+
+
+def _find_element(server, session, body, element_id=None):
+    elements = session.page.find(body["using"], body["value"])
+    if not elements:
+        raise WebDriverError("no such element", f"Unable to locate element: {body['value']}")
+    return session.element_ref(elements[0])
+
+
+def _find_elements(server, session, body, element_id=None):
+    return [session.element_ref(element) for element in session.page.find(body["using"], body["value"])]
+
+
+def _rendered_text(element: FakeElement) -> str:
+    # Get Element Text と同じく、表示されていない要素は空文字列を返す
+    return element.text if element.displayed else ""
+
+
+def _click(server, session, body, element_id):
+    element = session.element(element_id)
+    if not element.displayed or not element.enabled:
+        raise WebDriverError("element not interactable", "Element is not interactable", status=400)
+    element.clicks += 1
+    if element.tag == "input" and element.attributes.get("type") in ("checkbox", "radio"):
+        element.selected = not element.selected
+        element.properties["checked"] = element.selected
+    if element.on_click is not None:
+        element.on_click(session)
+    if element.navigates_to:
+        session.navigate(element.navigates_to)
+
+
+def _clear(server, session, body, element_id):
+    session.element(element_id).value = ""
+
+
+def _send_keys(server, session, body, element_id):
+    element = session.element(element_id)
+    element.value = element.value + body.get("text", "")
+
+
+def _execute_sync(server, session, body):
+    return session.to_wire(server.run_script(session, body["script"], body.get("args", [])))
+
+
+def _execute_async(server, session, body):
+    raise WebDriverError("javascript error", "Asynchronous scripts are not supported by the fake WebDriver",
+                         status=500)
+
+
+def _set_timeouts(server, session, body):
+    session.timeouts.update({key: value for key, value in body.items() if value is not None})
+
+
+def _switch_to_window(server, session, body):
+    if body.get("handle") not in session.window_handles:
+        raise WebDriverError("no such window", "Window not found")
+    session.current_window = body["handle"]
+
+
+def _close_window(server, session, body):
+    session.window_handles.remove(session.current_window)
+    return list(session.window_handles)
+
+
+def _set_window_rect(server, session, body):
+    session.window_rect.update({key: value for key, value in body.items() if value is not None})
+    return session.window_rect
+
+
+def _add_cookie(server, session, body):
+    cookie = body["cookie"]
+    session.cookies = [c for c in session.cookies if c["name"] != cookie["name"]] + [cookie]
+
+
+def _get_named_cookie(server, session, body, name):
+    for cookie in session.cookies:
+        if cookie["name"] == name:
+            return cookie
+    raise WebDriverError("no such cookie", f"Cookie not found: {name}")
+
+
+def _delete_cookie(server, session, body, name):
+    session.cookies = [c for c in session.cookies if c["name"] != name]
+
+
+def _delete_all_cookies(server, session, body):
+    session.cookies = []
+
+
+_SESSION = r"/session/(?P<session_id>[^/]+)"
+_ELEMENT = _SESSION + r"/element/(?P<element_id>[^/]+)"
+
+_ROUTES = [(method, re.compile(pattern), name, handler) for method, pattern, name, handler in [
+    ("POST", r"/session", "newSession", _new_session),
+    ("DELETE", _SESSION, "quit", _delete_session),
+    ("POST", _SESSION + r"/url", "get", _navigate),
+    ("GET", _SESSION + r"/url", "getCurrentUrl", lambda server, session, body: session.page.url),
+    ("GET", _SESSION + r"/title", "getTitle", lambda server, session, body: session.page.title),
+    ("GET", _SESSION + r"/source", "getPageSource", lambda server, session, body: session.page.source),
+    ("POST", _SESSION + r"/back", "goBack", _back),
+    ("POST", _SESSION + r"/forward", "goForward", _forward),
+    ("POST", _SESSION + r"/refresh", "refresh", _refresh),
+    ("POST", _SESSION + r"/element", "findElement", _find_element),
+    ("POST", _SESSION + r"/elements", "findElements", _find_elements),
+    ("POST", _ELEMENT + r"/element", "findChildElement", _find_element),
+    ("POST", _ELEMENT + r"/elements", "findChildElements", _find_elements),
+    ("POST", _ELEMENT + r"/click", "clickElement", _click),
+    ("POST", _ELEMENT + r"/clear", "clearElement", _clear),
+    ("POST", _ELEMENT + r"/value", "sendKeysToElement", _send_keys),
+    ("GET", _ELEMENT + r"/text", "getElementText",
+     lambda server, session, body, element_id: _rendered_text(session.element(element_id))),
+    ("GET", _ELEMENT + r"/name", "getElementTagName",
+     lambda server, session, body, element_id: session.element(element_id).tag),
+    ("GET", _ELEMENT + r"/enabled", "isElementEnabled",
+     lambda server, session, body, element_id: session.element(element_id).enabled),
+    ("GET", _ELEMENT + r"/selected", "isElementSelected",
+     lambda server, session, body, element_id: session.element(element_id).selected),
+    ("GET", _ELEMENT + r"/rect", "getElementRect",
+     lambda server, session, body, element_id: session.element(element_id).rect),
+    ("GET", _ELEMENT + r"/attribute/(?P<name>[^/]+)", "getElementAttribute",
+     lambda server, session, body, element_id, name: session.element(element_id).attributes.get(name)),
+    ("GET", _ELEMENT + r"/property/(?P<name>[^/]+)", "getElementProperty",
+     lambda server, session, body, element_id, name: session.element(element_id).properties.get(name)),
+    ("GET", _ELEMENT + r"/screenshot", "elementScreenshot",
+     lambda server, session, body, element_id: base64.b64encode(BLANK_PNG).decode("ascii")),
+    ("POST", _SESSION + r"/execute/sync", "executeScript", _execute_sync),
+    ("POST", _SESSION + r"/execute/async", "executeAsyncScript", _execute_async),
+    ("GET", _SESSION + r"/timeouts", "getTimeouts", lambda server, session, body: dict(session.timeouts)),
+    ("POST", _SESSION + r"/timeouts", "setTimeouts", _set_timeouts),
+    ("GET", _SESSION + r"/window", "getCurrentWindowHandle",
+     lambda server, session, body: session.current_window),
+    ("GET", _SESSION + r"/window/handles", "getWindowHandles",
+     lambda server, session, body: list(session.window_handles)),
+    ("POST", _SESSION + r"/window", "switchToWindow", _switch_to_window),
+    ("DELETE", _SESSION + r"/window", "close", _close_window),
+    ("GET", _SESSION + r"/window/rect", "getWindowRect", lambda server, session, body: session.window_rect),
+    ("POST", _SESSION + r"/window/rect", "setWindowRect", _set_window_rect),
+    ("GET", _SESSION + r"/screenshot", "screenshot",
+     lambda server, session, body: base64.b64encode(BLANK_PNG).decode("ascii")),
+    ("GET", _SESSION + r"/cookie", "getCookies", lambda server, session, body: list(session.cookies)),
+    ("POST", _SESSION + r"/cookie", "addCookie", _add_cookie),
+    ("GET", _SESSION + r"/cookie/(?P<name>[^/]+)", "getCookie", _get_named_cookie),
+    ("DELETE", _SESSION + r"/cookie", "deleteAllCookies", _delete_all_cookies),
+    ("DELETE", _SESSION + r"/cookie/(?P<name>[^/]+)", "deleteCookie", _delete_cookie),
+    ("POST", _SESSION + r"/frame", "switchToFrame", lambda server, session, body: None),
+    ("POST", _SESSION + r"/frame/parent", "switchToParentFrame", lambda server, session, body: None),
+]]
+
+
+def _make_handler(server: FakeWebDriverServer):
+    """サーバーに紐付いたHTTPリクエストハンドラーのクラスを作成する"""
+    
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        # ヘッダーと本文を別々に送るため、Nagleアルゴリズムによる遅延を避ける
+        disable_nagle_algorithm = True
+        
+        def _handle(self, method: str) -> None:
+            length = int(self.headers.get("Content-Length") or 0)
+            raw = self.rfile.read(length) if length else b""
+            try:
+                body = json.loads(raw) if raw else {}
+                status, payload = 200, {"value": server.dispatch(method, self.path.rstrip("/"), body)}
+            except WebDriverError as e:
+                status = e.status
+                payload = {"value": {"error": e.error, "message": e.message, "stacktrace": ""}}
+            except Exception as e:
+                status = 500
+                payload = {"value": {"error": "unknown error", "message": repr(e), "stacktrace": ""}}
+            data = json.dumps(payload).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+        
+        def do_GET(self) -> None:
+            self._handle("GET")
+        
+        def do_POST(self) -> None:
+            self._handle("POST")
+        
+        def do_DELETE(self) -> None:
+            self._handle("DELETE")
+        
+        def log_message(self, format, *args) -> None:
+            # リクエストごとのログは出力しない
+            pass
+    
+    return Handler
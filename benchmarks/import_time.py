@@ -0,0 +1,119 @@
+"""
+インポート時間のベンチマークを実行する。
+`python -X importtime` でモジュールを読み込み、読み込まれたモジュールと所要時間を計測します。
+テストの収集時に不要なモジュール（ブラウザのドライバ、webdriver_manager など）が
+読み込まれていないことを確認します。
+
+実行方法:
+    # 計測結果を表示する
+    python benchmarks/import_time.py
+    
+    # 不要なモジュールが読み込まれた場合は終了コード1
+    python benchmarks/import_time.py --check
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+from typing import Dict, List
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# 計測対象のモジュールと、読み込み時に読み込まれてはならないモジュール
+# selenium.webdriver はパッケージの __init__ で全ブラウザを読み込むため、conftest では遅延させる
+IMPORT_TARGETS = {
+    "conftest": ["webdriver_manager", "requests", "selenium.webdriver"],
+    "src.page_actions": ["webdriver_manager", "selenium.webdriver.support.expected_conditions"],
+    # 非同期のクライアントはSeleniumの同期クライアントやHTTPライブラリを使わない
+    "src.async_page": ["selenium.webdriver", "requests", "urllib3"],
+}
+
+
+def parse_importtime(output: str) -> Dict[str, int]:
+    """
+    `-X importtime` の出力を解析する
+    
+    Args:
+        output: 標準エラー出力
+    
+    Returns:
+        Dict[str, int]: モジュール名と累積の読み込み時間（マイクロ秒）
+    """
+    modules = {}
+    for line in output.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        fields = line[len("import time:"):].split("|")
+        if len(fields) != 3 or not fields[1].strip().isdigit():
+            continue
+        modules[fields[2].strip()] = int(fields[1])
+    return modules
+
+
+def measure_imports(module: str) -> Dict[str, int]:
+    """
+    新しいプロセスでモジュールを読み込み、読み込まれたモジュールを返す
+    
+    Args:
+        module: モジュール名
+    
+    Returns:
+        Dict[str, int]: モジュール名と累積の読み込み時間（マイクロ秒）
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=REPO_ROOT, capture_output=True, text=True, check=True,
+    )
+    return parse_importtime(result.stderr)
+
+
+def find_forbidden(modules: Dict[str, int], forbidden: List[str]) -> List[str]:
+    """
+    読み込まれてはならないモジュールを探す
+    
+    Args:
+        modules: 読み込まれたモジュール
+        forbidden: 読み込まれてはならないモジュール名（サブモジュールも含む）
+    
+    Returns:
+        List[str]: 読み込まれていた禁止モジュール
+    """
+    return sorted(
+        name for name in modules
+        if any(name == prefix or name.startswith(prefix + ".") for prefix in forbidden)
+    )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="インポート時間のベンチマーク")
+    parser.add_argument("--runs", type=int, default=5, help="モジュールごとの計測回数")
+    parser.add_argument("--top", type=int, default=10, help="表示する時間のかかったモジュールの数")
+    parser.add_argument("--check", action="store_true", help="不要なモジュールが読み込まれた場合に失敗する")
+    args = parser.parse_args()
+    
+    failures = []
+    for target, forbidden in IMPORT_TARGETS.items():
+        runs = [measure_imports(target) for _ in range(args.runs)]
+        total = statistics.median(run.get(target, 0) for run in runs) / 1000
+        print(f"{target}: {total:.1f}ms（{args.runs}回の中央値）")
+        
+        slowest = sorted(runs[-1].items(), key=lambda item: item[1], reverse=True)
+        for name, microseconds in slowest[1:args.top + 1]:
+            print(f"  {microseconds / 1000:>8.1f}ms  {name}")
+        
+        loaded = find_forbidden(runs[-1], forbidden)
+        if loaded:
+            failures.append((target, loaded))
+    
+    if failures:
+        print("読み込み時に不要なモジュールが読み込まれています:")
+        for target, loaded in failures:
+            print(f"  {target}: {', '.join(loaded)}")
+        return 1 if args.check else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,58 @@
+"""
+ページ操作のベンチマークを実行する。
+ブラウザやネットワークは不要です。
+
+実行方法:
+    # 計測して基準と比較する（ラウンドトリップ数が増えた場合は終了コード1）
+    python benchmarks/run_benchmarks.py --latency-ms 2 --check
+    
+    # 現在の結果を基準として保存する
+    python benchmarks/run_benchmarks.py --update-baseline
+"""
+
+import argparse
+import json
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from benchmarks.suite import find_regressions, format_results, load_baseline, run_suite, save_baseline
+
+RESULTS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results", "latest.json")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="ページ操作のベンチマーク")
+    parser.add_argument("--latency-ms", type=float, default=2.0, help="1コマンドあたりの遅延（ミリ秒）")
+    parser.add_argument("--iterations", type=int, default=3, help="操作ごとの繰り返し回数")
+    parser.add_argument("--links", type=int, default=50, help="ナビゲーションリンク数")
+    parser.add_argument("--output", default=RESULTS_PATH, help="計測結果の出力先")
+    parser.add_argument("--check", action="store_true", help="ラウンドトリップ数が基準より増えた場合に失敗する")
+    parser.add_argument("--update-baseline", action="store_true", help="現在の結果を基準として保存する")
+    args = parser.parse_args()
+    
+    results = run_suite(args.latency_ms / 1000, args.iterations, args.links)
+    baseline = load_baseline()
+    for line in format_results(results, baseline):
+        print(line)
+    
+    os.makedirs(os.path.dirname(args.output), exist_ok=True)
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(results, f, ensure_ascii=False, indent=2)
+    
+    if args.update_baseline:
+        save_baseline(results)
+        print("基準を更新しました")
+        return 0
+    
+    regressions = find_regressions(results, baseline)
+    if regressions:
+        print("ラウンドトリップ数が基準より増えています:")
+        for regression in regressions:
+            print(f"  {regression}")
+        return 1 if args.check else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
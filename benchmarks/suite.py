@@ -0,0 +1,261 @@
+"""
+ページ操作のベンチマーク。
+代替WebDriverサーバー上でPageActions・BasePage・サンプルのページオブジェクトを実行し、
+操作ごとのラウンドトリップ数と所要時間を計測します。
+"""
+
+import json
+import os
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+from selenium import webdriver
+from selenium.webdriver.common.by import By
+
+from config import settings
+from examples.pages.home_page import HomePage
+from examples.pages.login_page import LoginPage
+from benchmarks.fake_webdriver import FakeElement, FakeWebDriverServer
+from src.base_page import BasePage
+from src.conditions import visible, enabled
+from src.page_actions import PageActions
+from src.session_cache import SessionCache
+
+BASE_URL = "http://app.test"
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+
+# (操作名, 準備処理, 計測する処理)。いずれもドライバを受け取る
+Operation = Tuple[str, Optional[Callable], Callable]
+
+# 登録フォームのフィールド（30個のテキスト入力、セレクトボックス、チェックボックス）
+REGISTRATION_FIELDS = {(By.ID, f"field-{i}"): f"value {i}" for i in range(30)}
+REGISTRATION_FIELDS[(By.ID, "country")] = "jp"
+REGISTRATION_FIELDS[(By.ID, "terms")] = True
+
+
+def build_site(server: FakeWebDriverServer, navigation_links: int = 50) -> None:
+    """
+    サンプルのページオブジェクトに対応するページを代替サーバーに登録する
+    
+    Args:
+        server: 代替WebDriverサーバー
+        navigation_links: ホームページのナビゲーションリンク数
+    """
+    home = server.add_page(f"{BASE_URL}/", "Home")
+    home.add_element(HomePage.WELCOME_MESSAGE, FakeElement("p", "Welcome"))
+    home.add_element(HomePage.LOGIN_LINK, FakeElement("a", "Login", navigates_to=f"{BASE_URL}/login"))
+    home.add_element(HomePage.SEARCH_BOX, FakeElement("input"))
+    home.add_element(HomePage.SEARCH_BUTTON, FakeElement("button", "Search"))
+    home.add_element(HomePage.NAVIGATION_MENU, FakeElement("nav"))
+    home.add_elements(HomePage.NAVIGATION_LINKS, [
+        FakeElement("a", f"Link {i}", attributes={"href": f"/page/{i}"}) for i in range(navigation_links)
+    ])
+    
+    login = server.add_page(f"{BASE_URL}/login", "Login")
+    login.add_element(LoginPage.USERNAME_FIELD, FakeElement("input"))
+    login.add_element(LoginPage.PASSWORD_FIELD, FakeElement("input", attributes={"type": "password"}))
+    login.add_element(LoginPage.LOGIN_BUTTON,
+                      FakeElement("button", "Login", navigates_to=f"{BASE_URL}/dashboard"))
+    
+    server.add_page(f"{BASE_URL}/dashboard", "Dashboard")
+    
+    register = server.add_page(f"{BASE_URL}/register", "Register")
+    for i in range(30):
+        register.add_element((By.ID, f"field-{i}"), FakeElement("input", attributes={"type": "text"}))
+    register.add_element((By.ID, "country"), FakeElement("select"))
+    # Selectはselect要素を起点に option[value ="..."] で検索する（代替サーバーはページ全体から探す）
+    register.add_element((By.CSS_SELECTOR, 'option[value ="jp"]'), FakeElement("option", "Japan"))
+    register.add_element((By.ID, "terms"), FakeElement("input", attributes={"type": "checkbox"}))
+
+
+def operations() -> List[Operation]:
+    """
+    計測する操作の一覧を返す
+    
+    Returns:
+        List[Operation]: 操作のリスト
+    """
+    def open_home(driver):
+        HomePage(driver, BASE_URL).open_home_page()
+    
+    def open_login(driver):
+        LoginPage(driver, BASE_URL).open_login_page()
+    
+    def open_register(driver):
+        BasePage(driver, BASE_URL).open("register")
+    
+    def fill_per_field(driver):
+        actions = PageActions(driver)
+        for locator, value in REGISTRATION_FIELDS.items():
+            if isinstance(value, bool):
+                actions.click(locator)
+            elif locator == (By.ID, "country"):
+                actions.select_dropdown_option_by_value(locator, value)
+            else:
+                actions.type_text(locator, value)
+    
+    session_cache = SessionCache(enabled=True)
+    
+    def log_out(driver):
+        driver.delete_all_cookies()
+        driver.get("about:blank")
+    
+    def prepare_cached_login(driver):
+        if session_cache.get(f"{BASE_URL}|user") is None:
+            LoginPage(driver, BASE_URL).open_login_page().login("user", "secret")
+            # 代替サーバーのログインはクッキーを発行しないため、セッションのクッキーを設定してから保存する
+            driver.add_cookie({"name": "sessionid", "value": "benchmark"})
+            session_cache.capture(driver, f"{BASE_URL}|user")
+        log_out(driver)
+    
+    def search_three_times(driver):
+        page = HomePage(driver, BASE_URL)
+        for query in ("first", "second", "third"):
+            page.search(query)
+    
+    def text_loop(driver):
+        links = PageActions(driver).find_all(HomePage.NAVIGATION_LINKS)
+        return [link.text for link in links]
+    
+    return [
+        ("PageActions.find", open_home, lambda d: PageActions(d).find(HomePage.SEARCH_BOX)),
+        ("PageActions.click", open_home, lambda d: PageActions(d).click(HomePage.SEARCH_BUTTON)),
+        ("PageActions.click(clickable)", open_home,
+         lambda d: PageActions(d).click(HomePage.SEARCH_BUTTON, condition="clickable")),
+        ("PageActions.click(visible & enabled)", open_home,
+         lambda d: PageActions(d).click(HomePage.SEARCH_BUTTON, condition=visible & enabled)),
+        ("PageActions.type_text", open_home, lambda d: PageActions(d).type_text(HomePage.SEARCH_BOX, "query")),
+        ("PageActions.get_text", open_home, lambda d: PageActions(d).get_text(HomePage.WELCOME_MESSAGE)),
+        ("PageActions.wait_for_page_load", open_home, lambda d: PageActions(d).wait_for_page_load()),
+        ("PageActions.is_element_present(absent)", open_home,
+         lambda d: PageActions(d).is_element_present(LoginPage.ERROR_MESSAGE)),
+        ("BasePage.open", None, lambda d: BasePage(d, BASE_URL).open("/")),
+        ("HomePage.open_home_page (READY_LOCATORS)", None, lambda d: HomePage(d, BASE_URL).open_home_page()),
+        ("LoginPage.login", open_login, lambda d: LoginPage(d, BASE_URL).login("user", "secret")),
+        ("LoginPage open + login (UI)", log_out,
+         lambda d: LoginPage(d, BASE_URL).open_login_page().login("user", "secret")),
+        ("LoginPage session cache (restored)", prepare_cached_login,
+         lambda d: LoginPage(d, BASE_URL).login_with_session_cache(session_cache, "user", "secret")),
+        ("LoginPage.is_error_message_displayed", open_login,
+         lambda d: LoginPage(d, BASE_URL).is_error_message_displayed()),
+        ("HomePage.search", open_home, lambda d: HomePage(d, BASE_URL).search("query")),
+        ("HomePage.search x3 (Element cache)", open_home, search_three_times),
+        ("HomePage.check_locators", open_home, lambda d: HomePage(d, BASE_URL).check_locators()),
+        ("HomePage.get_navigation_link_texts", open_home,
+         lambda d: HomePage(d, BASE_URL).get_navigation_link_texts()),
+        ("find_all + .text loop", open_home, text_loop),
+        ("type_text per field (32 fields)", open_register, fill_per_field),
+        ("PageActions.fill_form(fidelity, 32 fields)", open_register,
+         lambda d: PageActions(d).fill_form(REGISTRATION_FIELDS, mode="fidelity")),
+        ("PageActions.fill_form(fast, 32 fields)", open_register,
+         lambda d: PageActions(d).fill_form(REGISTRATION_FIELDS, mode="fast")),
+    ]
+
+
+def run_suite(latency: float = 0.0, iterations: int = 3, navigation_links: int = 50) -> Dict:
+    """
+    全ての操作を計測する
+    
+    Args:
+        latency: 1コマンドあたりの遅延（秒）
+        iterations: 操作ごとの繰り返し回数
+        navigation_links: ホームページのナビゲーションリンク数
+        
+    Returns:
+        Dict: {"latency_ms": ..., "operations": {操作名: {"round_trips": ..., "wall_ms": ...}}}
+    """
+    server = FakeWebDriverServer(latency=latency)
+    build_site(server, navigation_links)
+    results = {}
+    
+    with server:
+        driver = webdriver.Remote(command_executor=server.url, options=webdriver.ChromeOptions())
+        # conftest.pyのdriverフィクスチャと同じ設定にする
+        driver.implicitly_wait(settings.IMPLICIT_WAIT)
+        try:
+            for name, prepare, operation in operations():
+                round_trips = 0
+                elapsed = 0.0
+                for _ in range(iterations):
+                    if prepare is not None:
+                        prepare(driver)
+                    server.reset_counts()
+                    start = time.perf_counter()
+                    operation(driver)
+                    elapsed += time.perf_counter() - start
+                    round_trips += server.round_trips
+                results[name] = {
+                    "round_trips": round_trips // iterations,
+                    "wall_ms": round(elapsed / iterations * 1000, 3),
+                }
+        finally:
+            driver.quit()
+    
+    return {"latency_ms": latency * 1000, "operations": results}
+
+
+def load_baseline(path: str = BASELINE_PATH) -> Dict[str, int]:
+    """
+    基準となるラウンドトリップ数を読み込む
+    
+    Args:
+        path: 基準ファイルのパス
+        
+    Returns:
+        Dict[str, int]: {操作名: ラウンドトリップ数}
+    """
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_baseline(results: Dict, path: str = BASELINE_PATH) -> None:
+    """
+    計測結果のラウンドトリップ数を基準として保存する
+    
+    Args:
+        results: run_suiteの結果
+        path: 基準ファイルのパス
+    """
+    baseline = {name: row["round_trips"] for name, row in results["operations"].items()}
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(baseline, f, ensure_ascii=False, indent=2, sort_keys=True)
+        f.write("\n")
+
+
+def find_regressions(results: Dict, baseline: Dict[str, int]) -> List[str]:
+    """
+    基準よりラウンドトリップ数が増えた操作を返す
+    
+    Args:
+        results: run_suiteの結果
+        baseline: 基準となるラウンドトリップ数
+        
+    Returns:
+        List[str]: 増えた操作の説明のリスト
+    """
+    regressions = []
+    for name, row in results["operations"].items():
+        expected = baseline.get(name)
+        if expected is not None and row["round_trips"] > expected:
+            regressions.append(f"{name}: {expected} → {row['round_trips']} 往復")
+    return regressions
+
+
+def format_results(results: Dict, baseline: Dict[str, int]) -> List[str]:
+    """
+    計測結果を表形式の文字列にする
+    
+    Args:
+        results: run_suiteの結果
+        baseline: 基準となるラウンドトリップ数
+        
+    Returns:
+        List[str]: 表の各行
+    """
+    lines = [f"{'操作':<42} {'往復':>6} {'基準':>6} {'時間(ms)':>10}"]
+    for name, row in results["operations"].items():
+        expected = baseline.get(name, "-")
+        lines.append(f"{name:<42} {row['round_trips']:>6} {expected:>6} {row['wall_ms']:>10.2f}")
+    return lines
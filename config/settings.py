@@ -9,15 +9,158 @@ BASE_URL = "https://example.com"
 # ブラウザ設定 (chrome, firefox, edge, safari)
 BROWSER = "chrome"
 
+# マトリクス実行設定（--browsers chrome,firefox）
+# 指定した全てのブラウザを並行して起動し、matrix フィクスチャのシナリオを同時に実行する
+MATRIX_BROWSERS = None  # ブラウザ名のリスト（Noneの場合は --browser の1つだけ）
+MATRIX_SLOWDOWN_RATIO = 1.5  # 最も速いブラウザのこの倍率以上かかった場合にサマリーで強調する
+
 # ブラウザのオプション
 HEADLESS = False  # ヘッドレスモード（画面表示なし）
 WINDOW_WIDTH = 1920
 WINDOW_HEIGHT = 1080
+# ページ読み込み戦略 (normal, eager, none)
+#   normal: loadイベント（画像などのサブリソースを含む読み込み完了）まで待つ
+#   eager: DOMContentLoaded（DOMの構築完了）まで待つ
+#   none: 待たずに戻る。ページの準備完了は BasePage.READY_LOCATORS などで判定する
+PAGE_LOAD_STRATEGY = "normal"
+
+# ドライバのバイナリの解決結果をブラウザのバージョンごとに保存するマニフェスト
+DRIVER_MANIFEST_PATH = ".driver_cache/manifest.json"
+
+# ドライバプール設定
+# Trueの場合、起動済みのブラウザをテストクラス間で再利用する（--driver-pool / --no-driver-pool）
+# 返却時のWeb Storageの消去は返却時に開いているページのオリジンのみ（クッキーは全ドメイン）
+DRIVER_POOL_ENABLED = False
+DRIVER_POOL_MAX_REUSE = 50  # 1つのブラウザを再利用する最大回数
+DRIVER_POOL_MAX_IDLE = 2  # ブラウザごとに保持する未使用ドライバの最大数
+
+# 並列実行設定（pytest-xdist の -n auto）
+WORKER_MEMORY_MB = 600  # 1ワーカー（ブラウザを含む）が使用するメモリ量の見積もり
+MAX_WORKERS = None  # ワーカー数の上限（Noneの場合はCPU数とメモリ量から決める）
 
 # 待機時間設定（秒）
 IMPLICIT_WAIT = 10
 EXPLICIT_WAIT = 20
+# Trueの場合、暗黙的な待機と明示的な待機の併用を検出して警告する
+DEBUG_MIXED_WAITS = False
+# 要素の待機方法 (poll, adaptive, observer)
+#   poll: WebDriverWaitによる0.5秒間隔のポーリング
+#   adaptive: ADAPTIVE_POLL_MIN秒から始めてADAPTIVE_POLL_MAX秒まで間隔を広げるポーリング
+#   observer: ブラウザ内のMutationObserverで条件の成立を検知する
+WAIT_MODE = "poll"
+ADAPTIVE_POLL_MIN = 0.05
+ADAPTIVE_POLL_MAX = 0.5
+OBSERVER_WAIT_CHUNK = 10  # 1回の非同期スクリプトで待機する最大時間（秒）
+NETWORK_IDLE_TIME = 0.5  # リソースの読み込みがこの時間（秒）途絶えたらネットワークがアイドルとみなす
+
+# 非同期WebDriverクライアント設定（src/async_webdriver.py）
+ASYNC_COMMAND_TIMEOUT = 120  # 1つのコマンドのレスポンスを待つ最大時間（秒）
 
 # スクリーンショット設定
+# ファイルは {SCREENSHOT_DIR}/{実行ID}/{ワーカーID}/ に保存される
 SCREENSHOT_DIR = "screenshots"
-TAKE_SCREENSHOT_ON_FAILURE = True
\ No newline at end of file
+TAKE_SCREENSHOT_ON_FAILURE = True
+# Trueの場合、スクリーンショットのデコードと書き込みをバックグラウンドで行う
+# 返されるパスのファイルは実行終了時までに書き込まれるため、テスト中に読む場合は有効にしない
+ASYNC_ARTIFACTS = False
+ARTIFACT_QUEUE_SIZE = 100  # 書き込み待ちの最大件数
+SCREENSHOT_MAX_WIDTH = None  # 指定した幅より大きい画像を縮小して保存する（Pillowが必要）
+# 内容のハッシュで重複を除く保存先（{SCREENSHOT_DIR}/objects/）
+# 同じ内容の画像は1つだけ保存し、テストごとの参照は {SCREENSHOT_DIR}/{実行ID}/{ワーカーID}/manifest.jsonl に記録する
+SCREENSHOT_STORE = False
+SCREENSHOT_STORE_MAX_MB = 500  # 保存する画像の合計サイズの上限（MB）。並列実行時は全ワーカーの合計。超えた場合は使われていない期間が長いものから削除する。Noneの場合は無制限
+SCREENSHOT_PERCEPTUAL_DEDUPE = False  # Trueの場合、見た目がほぼ同じ画像は保存せず、最初の画像を参照する（Pillowが必要）
+SCREENSHOT_DHASH_THRESHOLD = 4  # ほぼ同じとみなす差分ハッシュ（64ビット）の異なるビット数の上限
+
+# ビジュアル比較設定（NumPyとPillowが必要）
+# ベースライン画像は {VISUAL_BASELINE_DIR}/{ブラウザ名}/{名前}.png に保存する
+VISUAL_BASELINE_DIR = "visual_baselines"
+VISUAL_UPDATE_BASELINES = False  # Trueの場合、差分のある画像でベースラインを更新する（--update-baselines）
+VISUAL_TOLERANCE = 0.001  # 不一致の画素の割合がこの値以下であれば一致とみなす
+VISUAL_PIXEL_THRESHOLD = 16  # 色の差（0〜255）がこの値以下の画素は一致とみなす（アンチエイリアスの揺れを無視する）
+VISUAL_PRECHECK_STEP = 4  # 事前チェックで縦横この間隔ごとの画素だけを比較する。0の場合は事前チェックを行わない
+VISUAL_SAVE_DIFF = True  # Trueの場合、不一致の画像の差分を {SCREENSHOT_DIR}/{実行ID}/{ワーカーID}/ に保存する
+
+# DOMスナップショット設定
+# テスト失敗時に失敗したロケーターの周辺のDOMを1回のスクリプト実行で取得し、
+# 圧縮して {SCREENSHOT_DIR}/{実行ID}/{ワーカーID}/dom_snapshots.zip に保存する
+DOM_SNAPSHOT_ON_FAILURE = False  # --dom-snapshots で有効にできる
+DOM_SNAPSHOT_SAMPLE_RATE = 0.0  # 成功したテストのうちスナップショットを取得する割合（0〜1、--dom-sample-rate）
+DOM_SNAPSHOT_ANCESTOR_LEVELS = 3  # 失敗したロケーターの要素から何階層上の要素までを保存するか
+DOM_SNAPSHOT_MAX_CHARS = 2000000  # 保存するHTMLの最大文字数
+
+# リソースのフィルタリング設定
+# 機能テストに不要なリソースの読み込みをブロックする（--block-resources でプロファイルを指定）
+# Chromium系ブラウザではCDPを、その他のブラウザではローカルのフィルタリングプロキシを使用する
+# resource_types はリソースの実際の種類ではなく、URLの拡張子で判定する（拡張子のないURLはブロックされない）
+RESOURCE_FILTER_PROFILE = None  # 使用するプロファイル名。Noneの場合はブロックしない
+RESOURCE_FILTER_PROFILES = {
+    # 画像・動画・フォントと主な解析用スクリプトをブロックする
+    "functional": {
+        "resource_types": ["image", "media", "font"],
+        "url_patterns": [
+            "*google-analytics.com*",
+            "*googletagmanager.com*",
+            "*doubleclick.net*",
+            "*connect.facebook.net*",
+            "*hotjar.com*",
+        ],
+    },
+    # 画像と動画のみをブロックする
+    "no-media": {
+        "resource_types": ["image", "media"],
+        "url_patterns": [],
+    },
+}
+BLOCKED_URL_PATTERNS = []  # プロファイルに加えてブロックするURLパターン（* をワイルドカードとして使用できる）
+RESOURCE_FILTER_MEASURE_BYTES = True  # ブロックしたURLのサイズをHEADリクエストで見積もり、テストごとに記録する。Falseの場合はバイト数を0とする
+
+# 再実行の設定
+# 一時的な失敗で失敗したテストを、ブラウザを起動し直さずに同じドライバで再実行する
+RETRY_ATTEMPTS = 0  # 再実行の最大回数（--retries）。0の場合は再実行しない
+RETRY_EXCEPTIONS = ("TimeoutException", "StaleElementReferenceException")  # 再実行の対象とする例外のクラス名
+RETRY_RESET_STATE = True  # 再実行の前にウィンドウ・Web Storage・クッキーを消去して about:blank に移動する
+
+# テストの実行順序の設定
+# Trueの場合、requires マーカーの要件（ブラウザ、ウィンドウサイズ、オリジン、ログイン状態）ごとに
+# テストクラスをまとめ、ブラウザの切り替えや状態のリセットが少なくなる順序で実行する（--schedule-tests）
+SCHEDULE_TESTS = False
+
+# セッション状態のキャッシュ設定
+# ログイン後のクッキーとWeb Storageを保存し、以降のテストではUIでのログインを行わずに復元する
+SESSION_CACHE_ENABLED = False  # --session-cache で有効に、--no-session-cache で無効にできる
+SESSION_CACHE_TTL = 1800  # 保存した状態の有効期間（秒）
+SESSION_CACHE_DIR = None  # 状態をファイルにも保存するディレクトリ（例: ".session_cache"）。Noneの場合はメモリにのみ保存する
+SESSION_CACHE_RESTORE_PATH = "favicon.ico"  # 復元時にオリジンを開くためのパス（同一オリジンの軽量なURL）
+
+# ロケーターの一括確認の設定（--locator-smoke）
+# 各ページオブジェクトの URL_PATH のページを開き、宣言された全てのロケーターを1回のスクリプト実行で確認する
+LOCATOR_SMOKE_PACKAGES = ["examples.pages"]  # ページオブジェクトを探すパッケージ
+LOCATOR_SMOKE_TIMEOUT = 5  # 問題がなくなるまで確認を繰り返す最大時間（秒）
+# ログインが必要なページ（LOCATOR_SMOKE_ROLE を宣言したページ）で使用するログインページのクラス
+# login_with_session_cache(cache, username, password) を持つこと
+LOCATOR_SMOKE_LOGIN_PAGE = "examples.pages.login_page.LoginPage"
+# 役割 → (ユーザー名, パスワード)。アカウントのない役割のページは確認せずにスキップする
+# 例: {"user": ("smoke-user", os.environ["SMOKE_PASSWORD"])}（パスワードはリポジトリにコミットしないこと）
+LOCATOR_SMOKE_ACCOUNTS = {}
+
+# JavaScript設定
+# Falseの場合、一括取得メソッドは要素ごとのWebDriverコマンドで値を取得する
+USE_JAVASCRIPT = True
+# PageActions.fill_form の入力方法 (fast, fidelity)
+#   fast: 1回のスクリプト実行で値を設定し、input/changeイベントを発生させる
+#   fidelity: 要素の検索をまとめ、実際のキー入力とクリックで入力する
+FORM_FILL_MODE = "fidelity"
+
+# 計測設定
+# Trueの場合、全てのWebDriverコマンドの所要時間と呼び出し元を記録する
+COMMAND_INSTRUMENTATION = False
+REPORT_DIR = "reports"  # 計測結果（JSONL）の出力先
+
+# ページ性能の計測設定（--page-timing）
+# Trueの場合、BasePage のページ遷移（open, refresh, navigate_back, navigate_forward）ごとに
+# Navigation Timing・Paint Timing・Resource Timing を取得し、{REPORT_DIR}/{実行ID}/{ワーカーID}/ にJSONLで保存する
+# PERFORMANCE_BUDGETS を宣言したページオブジェクトは、この設定に関わらず計測して予算を確認する
+PAGE_TIMING_ENABLED = False
+PAGE_TIMING_MAX_RESOURCES = 50  # 記録するリソースの最大数（所要時間の長い順）
+PERFORMANCE_BUDGET_ACTION = "fail"  # 予算を超えた場合の動作 (fail: テストを失敗させる, warn: 警告だけを出す)
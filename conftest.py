@@ -4,31 +4,141 @@ WebDriverの初期化とテスト実行の構成を定義します。
 """
 
 import os
+from typing import Optional
 import pytest
-from datetime import datetime
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service as ChromeService
-from selenium.webdriver.firefox.service import Service as FirefoxService
-from selenium.webdriver.edge.service import Service as EdgeService
-from selenium.webdriver.safari.service import Service as SafariService
-from webdriver_manager.chrome import ChromeDriverManager
-from webdriver_manager.firefox import GeckoDriverManager
-from webdriver_manager.microsoft import EdgeChromiumDriverManager
 
 # 設定ファイルをインポート
 import sys
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 from config import settings
+from src.artifact_writer import save_screenshot, shutdown_artifact_writer
+from src.artifacts import get_capture_stats, get_run_id, get_worker_id, set_current_test, unique_artifact_path
+from src.dom_snapshot import capture_dom_snapshot, close_dom_archive, should_sample
+from src.driver_pool import DriverPool, reset_driver_state
+from src.driver_resolver import StartupProfile, StartupStats, get_driver_resolver, start_driver
+from src.instrumentation import CommandRecorder
+from src.locator_health import discover_page_objects, format_health_report, prepare_smoke_session
+from src.matrix import BrowserMatrix, get_matrix_stats, parse_browsers
+from src.page_timing import get_page_timing_recorder
+from src.parallel import WorkerStats, format_utilization, recommended_worker_count
+from src.resource_filter import (
+    CHROMIUM_BROWSERS, BlockedResourceStats, FilteringProxy, ResourceFilter,
+    collect_blocked_requests, install_cdp_filter, uses_cdp_filter,
+)
+from src.retry import FlakinessStats, get_retry_count, is_retryable, rerun
+from src.scheduling import (
+    check_requirements, format_schedule_summary, get_requirements, parse_window_size, schedule_items,
+)
+from src.screenshot_store import get_screenshot_store, store_screenshot
+from src.session_cache import SessionCache
+from src.visual import get_visual_comparer
+
+DRIVER_POOL_KEY = pytest.StashKey()
+WORKER_STATS_KEY = pytest.StashKey()
+COLLECTED_WORKER_STATS_KEY = pytest.StashKey()
+ARTIFACT_WRITER_KEY = pytest.StashKey()
+COMMAND_RECORDER_KEY = pytest.StashKey()
+RESOURCE_FILTER_KEY = pytest.StashKey()
+RESOURCE_STATS_KEY = pytest.StashKey()
+RESOURCE_PROXY_KEY = pytest.StashKey()
+STARTUP_STATS_KEY = pytest.StashKey()
+SESSION_CACHE_KEY = pytest.StashKey()
+SCHEDULE_KEY = pytest.StashKey()
+FLAKINESS_STATS_KEY = pytest.StashKey()
+SCREENSHOT_STORE_KEY = pytest.StashKey()
+VISUAL_COMPARER_KEY = pytest.StashKey()
+CAPTURE_STATS_KEY = pytest.StashKey()
+ELEMENT_CACHE_KEY = pytest.StashKey()
+MATRIX_STATS_KEY = pytest.StashKey()
+PAGE_TIMING_KEY = pytest.StashKey()
+LOCATOR_SMOKE_DRIVER_KEY = pytest.StashKey()
+LOCATOR_HEALTH_KEY = pytest.StashKey()
+RETRY_RUNS_KEY = pytest.StashKey()
 
 
 def pytest_addoption(parser):
     """コマンドラインオプションを追加する"""
     parser.addoption("--browser", action="store", default=settings.BROWSER,
                      help="Select browser: chrome, firefox, edge, safari")
+    parser.addoption("--browsers", action="store", default=None, metavar="LIST",
+                     help="matrix フィクスチャのシナリオを同時に実行するブラウザ（カンマ区切り、例: chrome,firefox）")
     parser.addoption("--headless", action="store_true", default=settings.HEADLESS,
                      help="Run browser in headless mode")
+    parser.addoption("--page-load-strategy", action="store", default=settings.PAGE_LOAD_STRATEGY,
+                     choices=("normal", "eager", "none"),
+                     help="Page load strategy: normal waits for load, eager for DOMContentLoaded, none returns at once")
     parser.addoption("--base-url", action="store", default=settings.BASE_URL,
                      help="Base URL for the tests")
+    parser.addoption("--driver-pool", action="store_true", dest="driver_pool",
+                     default=settings.DRIVER_POOL_ENABLED,
+                     help="Reuse pooled browsers across test classes instead of starting one for every class")
+    parser.addoption("--no-driver-pool", action="store_false", dest="driver_pool",
+                     default=settings.DRIVER_POOL_ENABLED,
+                     help="Start a dedicated browser for every test class instead of reusing pooled ones")
+    parser.addoption("--session-cache", action="store_true", dest="session_cache",
+                     default=settings.SESSION_CACHE_ENABLED,
+                     help="Restore cached sessions instead of logging in through the UI in every test")
+    parser.addoption("--no-session-cache", action="store_false", dest="session_cache",
+                     default=settings.SESSION_CACHE_ENABLED,
+                     help="Log in through the UI in every test instead of restoring cached sessions")
+    parser.addoption("--retries", action="store", type=int, default=settings.RETRY_ATTEMPTS, metavar="N",
+                     help="Re-run tests failing with a transient error up to N times in the same browser")
+    parser.addoption("--schedule-tests", action="store_true", default=settings.SCHEDULE_TESTS,
+                     help="Group test classes by their requires marker to reduce browser restarts and state resets")
+    parser.addoption("--update-baselines", action="store_true", default=settings.VISUAL_UPDATE_BASELINES,
+                     help="ビジュアル比較で差分のある画像をベースラインとして保存する")
+    parser.addoption("--dom-snapshots", action="store_true", default=settings.DOM_SNAPSHOT_ON_FAILURE,
+                     help="テスト失敗時にDOMスナップショットを保存する")
+    parser.addoption("--dom-sample-rate", action="store", type=float, default=settings.DOM_SNAPSHOT_SAMPLE_RATE,
+                     metavar="RATE", help="成功したテストのうちDOMスナップショットを保存する割合（0〜1）")
+    parser.addoption("--locator-smoke", action="store_true", default=False,
+                     help="テストの代わりに、全てのページオブジェクトのロケーターを一括確認する")
+    parser.addoption("--page-timing", action="store_true", default=settings.PAGE_TIMING_ENABLED,
+                     help="BasePage のページ遷移ごとにNavigation・Paint・Resource Timingを記録する")
+    parser.addoption("--instrument-commands", action="store_true",
+                     default=settings.COMMAND_INSTRUMENTATION,
+                     help="Record every WebDriver command and print a hot-spot report")
+    parser.addoption("--debug-waits", action="store_true", default=settings.DEBUG_MIXED_WAITS,
+                     help="Warn when implicit and explicit waits are mixed")
+    parser.addoption("--block-resources", action="store", default=settings.RESOURCE_FILTER_PROFILE,
+                     metavar="PROFILE",
+                     help="Block resources using a profile from RESOURCE_FILTER_PROFILES (e.g. functional)")
+
+
+def pytest_configure(config):
+    """コマンドラインオプションを設定に反映する"""
+    settings.DEBUG_MIXED_WAITS = config.getoption("--debug-waits")
+    settings.PAGE_LOAD_STRATEGY = config.getoption("--page-load-strategy")
+    settings.VISUAL_UPDATE_BASELINES = config.getoption("--update-baselines")
+    settings.DOM_SNAPSHOT_ON_FAILURE = config.getoption("--dom-snapshots")
+    settings.DOM_SNAPSHOT_SAMPLE_RATE = config.getoption("--dom-sample-rate")
+    settings.PAGE_TIMING_ENABLED = config.getoption("--page-timing")
+    if config.getoption("--browsers"):
+        settings.MATRIX_BROWSERS = parse_browsers(config.getoption("--browsers"))
+    config.addinivalue_line(
+        "markers", "fresh_browser: プールを使わず、このクラス専用のブラウザを起動する"
+    )
+    config.addinivalue_line(
+        "markers", "retry(n=1): 一時的な失敗で失敗した場合に、このテストの本体を最大n回再実行する（本体の中でページを開くこと）"
+    )
+    config.addinivalue_line(
+        "markers",
+        "requires(browser, window_size, origin, role): テストの実行に必要なブラウザ・ウィンドウサイズ・オリジン・ログイン状態",
+    )
+    
+    # 実行IDはワーカーの起動前に決めて、全ワーカーで同じ成果物ディレクトリを使う
+    get_run_id()
+    config.stash[WORKER_STATS_KEY] = WorkerStats(get_worker_id())
+    config.stash[COLLECTED_WORKER_STATS_KEY] = []
+    config.stash[STARTUP_STATS_KEY] = StartupStats()
+    config.stash[FLAKINESS_STATS_KEY] = FlakinessStats()
+    config.stash[SESSION_CACHE_KEY] = SessionCache(enabled=config.getoption("session_cache"))
+    if config.getoption("--instrument-commands"):
+        config.stash[COMMAND_RECORDER_KEY] = CommandRecorder()
+    resource_filter = ResourceFilter.from_settings(config.getoption("--block-resources"))
+    if resource_filter is not None:
+        config.stash[RESOURCE_FILTER_KEY] = resource_filter
+        config.stash[RESOURCE_STATS_KEY] = BlockedResourceStats(settings.RESOURCE_FILTER_MEASURE_BYTES)
 
 
 @pytest.fixture(scope="session")
@@ -37,59 +147,365 @@ def base_url(request):
     return request.config.getoption("--base-url")
 
 
-@pytest.fixture(scope="class")
-def driver(request):
-    """WebDriverのセットアップとティアダウンを行う"""
-    browser_name = request.config.getoption("--browser").lower()
-    headless = request.config.getoption("--headless")
+def default_requirements(config) -> dict:
+    """
+    requires マーカーで指定されていない項目の値を返す
+    
+    Args:
+        config: pytestのConfig
+    
+    Returns:
+        dict: ブラウザはコマンドラインオプション、オリジンはベースURL、その他はNone
+    """
+    return {
+        "browser": config.getoption("--browser").lower(),
+        "window_size": None,
+        "origin": config.getoption("--base-url"),
+        "role": None,
+    }
+
+
+class LocatorHealthError(Exception):
+    """ページオブジェクトのロケーターに問題がある"""
+
+
+class LocatorSmokeItem(pytest.Item):
+    """ページオブジェクトのロケーターを一括確認するテストアイテム（--locator-smoke）"""
+    
+    def __init__(self, *, page_class, **kwargs):
+        """
+        LocatorSmokeItemクラスの初期化
+        
+        Args:
+            page_class: 確認するページオブジェクトのクラス
+        """
+        super().__init__(**kwargs)
+        self.page_class = page_class
+    
+    def runtest(self):
+        """ページが宣言したログイン状態で URL_PATH のページを開き、宣言された全てのロケーターを確認する"""
+        driver = get_smoke_driver(self.config)
+        base_url = self.config.getoption("--base-url")
+        if not prepare_smoke_session(driver, self.page_class, base_url, self.config.stash[SESSION_CACHE_KEY]):
+            pytest.skip(f"LOCATOR_SMOKE_ACCOUNTS に役割 {self.page_class.LOCATOR_SMOKE_ROLE} のアカウントがありません")
+        page = self.page_class(driver, base_url)
+        # 準備完了の待機（READY_LOCATORS）は壊れたロケーターでタイムアウトするため行わない
+        driver.get(f"{page.base_url.rstrip('/')}/{self.page_class.URL_PATH.lstrip('/')}")
+        results = page.check_locators(timeout=settings.LOCATOR_SMOKE_TIMEOUT)
+        self.config.stash[LOCATOR_HEALTH_KEY].extend(results)
+        if not all(result.ok for result in results):
+            raise LocatorHealthError("\n".join(format_health_report(results, only_problems=True)))
+    
+    def repr_failure(self, excinfo):
+        """問題のあるロケーターの一覧を失敗の内容として表示する"""
+        if isinstance(excinfo.value, LocatorHealthError):
+            return f"{self.page_class.__name__} のロケーターに問題があります:\n{excinfo.value}"
+        return super().repr_failure(excinfo)
+    
+    def reportinfo(self):
+        """テストの場所としてページオブジェクトのクラスを表示する"""
+        return self.path, None, f"{self.page_class.__module__}.{self.page_class.__name__}"
+
+
+def get_smoke_driver(config):
+    """
+    ロケーターの一括確認に使用するドライバを返す（全てのページで1つのブラウザを使い回す）
+    
+    Args:
+        config: pytestのConfig
+    
+    Returns:
+        WebDriver: 起動済みのドライバ
+    """
+    driver = config.stash.get(LOCATOR_SMOKE_DRIVER_KEY, None)
+    if driver is None:
+        driver = launch_driver(config, config.getoption("--browser").lower())
+        config.stash[LOCATOR_SMOKE_DRIVER_KEY] = driver
+    return driver
+
+
+def pytest_collection_modifyitems(session, config, items):
+    """
+    --locator-smoke の場合に、テストをページオブジェクトごとのロケーターの確認に置き換える。
+    テストクラスのメソッドの requires マーカーを確認し、
+    --schedule-tests の場合に、要件ごとにテストクラスをまとめて並べ替える
+    """
+    if config.getoption("--locator-smoke"):
+        # conftest の読み込み時には selenium.common だけを読み込み、selenium.webdriver は読み込まない
+        # （benchmarks/import_time.py で確認している）。BasePage は selenium.webdriver を読み込むため、ここで読み込む
+        from src.base_page import BasePage
+        
+        config.hook.pytest_deselected(items=list(items))
+        items[:] = [
+            LocatorSmokeItem.from_parent(session, name=f"locators[{cls.__name__}]", page_class=cls)
+            for cls in discover_page_objects(settings.LOCATOR_SMOKE_PACKAGES, BasePage)
+        ]
+        config.stash[LOCATOR_HEALTH_KEY] = []
+        return
+    for item in items:
+        try:
+            check_requirements(item)
+        except ValueError as e:
+            raise pytest.UsageError(str(e)) from e
+    if config.getoption("--schedule-tests"):
+        config.stash[SCHEDULE_KEY] = schedule_items(items, default_requirements(config))
+
+
+@pytest.fixture(scope="function")
+def requirements(request):
+    """テストの requires マーカーの要件（browser, window_size, origin, role）を返す"""
+    return get_requirements(request.node, default_requirements(request.config))
+
+
+def create_driver(browser_name: str, headless: bool, proxy: Optional[str] = None, network_log: bool = False,
+                  startup: Optional[StartupProfile] = None):
+    """
+    指定されたブラウザのWebDriverを起動する
+    
+    Args:
+        browser_name: ブラウザ名 (chrome, firefox, edge, safari)
+        headless: ヘッドレスモードで起動するかどうか
+        proxy: 使用するHTTPプロキシ（host:port）。firefoxのみ対応
+        network_log: Trueの場合、ネットワークイベントをパフォーマンスログに記録する（chrome, edgeのみ）
+        startup: 起動時間の内訳（resolve, spawn, session, window_size）を記録する StartupProfile
+    
+    Returns:
+        WebDriver: 起動したドライバ
+    """
+    # ドライバのパスはブラウザのバージョンごとにマニフェストから再利用する
+    resolver = get_driver_resolver()
+    startup = startup if startup is not None else StartupProfile()
     
     # ブラウザ設定
+    # Seleniumのモジュールは使用するブラウザの分だけ、起動時に読み込む
+    # （テストの収集やブラウザを使わないテストで読み込みの時間がかからないようにする）
+    from selenium import webdriver
+    
     if browser_name == "chrome":
+        from selenium.webdriver.chrome.service import Service as ChromeService
+        
         options = webdriver.ChromeOptions()
+        options.page_load_strategy = settings.PAGE_LOAD_STRATEGY
         if headless:
             options.add_argument("--headless=new")
         options.add_argument(f"--window-size={settings.WINDOW_WIDTH},{settings.WINDOW_HEIGHT}")
         options.add_argument("--no-sandbox")
         options.add_argument("--disable-dev-shm-usage")
+        if network_log:
+            enable_network_log(options)
         try:
-            driver = webdriver.Chrome(options=options)
+            driver = resolver.launch("chrome", webdriver.Chrome, ChromeService, options, startup)
         except Exception as e:
             print(f"Chrome WebDriverの初期化に失敗しました: {e}")
             # 代替方法
-            driver = webdriver.Chrome(service=ChromeService(ChromeDriverManager().install()), options=options)
+            driver = resolver.launch("chrome", webdriver.Chrome, ChromeService, options, startup,
+                                     install=lambda: install_driver("chrome"))
     
     elif browser_name == "firefox":
+        from selenium.webdriver.firefox.service import Service as FirefoxService
+        
         options = webdriver.FirefoxOptions()
+        options.page_load_strategy = settings.PAGE_LOAD_STRATEGY
         if headless:
             options.add_argument("--headless")
-        driver = webdriver.Firefox(service=FirefoxService(GeckoDriverManager().install()), options=options)
+        if proxy:
+            host, port = proxy.rsplit(":", 1)
+            options.set_preference("network.proxy.type", 1)
+            for scheme in ("http", "ssl"):
+                options.set_preference(f"network.proxy.{scheme}", host)
+                options.set_preference(f"network.proxy.{scheme}_port", int(port))
+        driver = resolver.launch("firefox", webdriver.Firefox, FirefoxService, options, startup,
+                                 install=lambda: install_driver("firefox"))
     
     elif browser_name == "edge":
+        from selenium.webdriver.edge.service import Service as EdgeService
+        
         options = webdriver.EdgeOptions()
+        options.page_load_strategy = settings.PAGE_LOAD_STRATEGY
         if headless:
             options.add_argument("--headless")
-        driver = webdriver.Edge(service=EdgeService(EdgeChromiumDriverManager().install()), options=options)
+        if network_log:
+            enable_network_log(options)
+        driver = resolver.launch("edge", webdriver.Edge, EdgeService, options, startup,
+                                 install=lambda: install_driver("edge"))
     
     elif browser_name == "safari":
-        driver = webdriver.Safari(service=SafariService())
+        from selenium.webdriver.safari.service import Service as SafariService
+        
+        if proxy:
+            print("Safariはプロキシの設定に対応していないため、リソースのフィルタリングは行われません")
+        options = webdriver.SafariOptions()
+        options.page_load_strategy = settings.PAGE_LOAD_STRATEGY
+        driver = start_driver(webdriver.Safari, SafariService(), options, startup)
     
     else:
         raise ValueError(f"サポートされていないブラウザ: {browser_name}")
     
     # ウィンドウサイズ設定
     if browser_name != "chrome":  # Chromeの場合は既にオプションで設定済み
-        driver.set_window_size(settings.WINDOW_WIDTH, settings.WINDOW_HEIGHT)
+        with startup.phase("window_size"):
+            driver.set_window_size(settings.WINDOW_WIDTH, settings.WINDOW_HEIGHT)
     
     # 暗黙的な待機時間を設定
     driver.implicitly_wait(settings.IMPLICIT_WAIT)
     
+    return driver
+
+
+def install_driver(browser_name: str) -> str:
+    """
+    webdriver_managerでドライバをダウンロードし、パスを返す
+    
+    マニフェストにドライバのパスがない場合にだけ呼ばれるため、webdriver_managerもここで読み込む。
+    
+    Args:
+        browser_name: ブラウザ名 (chrome, firefox, edge)
+    
+    Returns:
+        str: ドライバのパス
+    """
+    if browser_name == "chrome":
+        from webdriver_manager.chrome import ChromeDriverManager
+        return ChromeDriverManager().install()
+    if browser_name == "firefox":
+        from webdriver_manager.firefox import GeckoDriverManager
+        return GeckoDriverManager().install()
+    if browser_name == "edge":
+        from webdriver_manager.microsoft import EdgeChromiumDriverManager
+        return EdgeChromiumDriverManager().install()
+    raise ValueError(f"webdriver_managerが対応していないブラウザ: {browser_name}")
+
+
+def enable_network_log(options) -> None:
+    """
+    Chromium系ブラウザのネットワークイベントをパフォーマンスログに記録する設定を行う
+    
+    Args:
+        options: ChromeOptions または EdgeOptions
+    """
+    options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+    options.add_experimental_option("perfLoggingPrefs", {"enableNetwork": True, "enablePage": False})
+
+
+def get_filtering_proxy(config) -> FilteringProxy:
+    """
+    リソースのフィルタリングプロキシを返す。初回の呼び出しで起動する
+    
+    Args:
+        config: pytestのConfig
+    
+    Returns:
+        FilteringProxy: 起動済みのプロキシ
+    """
+    proxy = config.stash.get(RESOURCE_PROXY_KEY, None)
+    if proxy is None:
+        proxy = FilteringProxy(config.stash[RESOURCE_FILTER_KEY], config.stash[RESOURCE_STATS_KEY]).start()
+        config.stash[RESOURCE_PROXY_KEY] = proxy
+    return proxy
+
+
+def launch_driver(config, browser_name: str):
+    """
+    コマンドラインオプションに従ってWebDriverを起動する
+    
+    Args:
+        config: pytestのConfig
+        browser_name: ブラウザ名
+    
+    Returns:
+        WebDriver: 起動したドライバ
+    """
+    resource_filter = config.stash.get(RESOURCE_FILTER_KEY, None)
+    use_cdp = resource_filter is not None and browser_name in CHROMIUM_BROWSERS
+    proxy = None
+    if resource_filter is not None and not use_cdp:
+        proxy = get_filtering_proxy(config).address
+    
+    startup = StartupProfile()
+    driver = create_driver(browser_name, config.getoption("--headless"), proxy=proxy, network_log=use_cdp,
+                           startup=startup)
+    config.stash[STARTUP_STATS_KEY].add(browser_name, startup)
+    if use_cdp:
+        install_cdp_filter(driver, resource_filter)
+    recorder = config.stash.get(COMMAND_RECORDER_KEY, None)
+    if recorder is not None:
+        recorder.install(driver)
+    return driver
+
+
+@pytest.fixture(scope="session")
+def driver_pool(request):
+    """テストクラス間で再利用するWebDriverのプールを返す"""
+    pool = DriverPool(lambda browser_name: launch_driver(request.config, browser_name))
+    request.config.stash[DRIVER_POOL_KEY] = pool
+    
+    yield pool
+    
+    pool.close()
+
+
+@pytest.fixture(scope="class")
+def driver(request, driver_pool):
+    """WebDriverのセットアップとティアダウンを行う"""
+    requirements = get_requirements(request.node, default_requirements(request.config))
+    browser_name = requirements["browser"]
+    window_size = parse_window_size(requirements["window_size"])
+    use_pool = (request.config.getoption("driver_pool")
+                and request.node.get_closest_marker("fresh_browser") is None)
+    
+    if use_pool:
+        driver = driver_pool.acquire(browser_name)
+    else:
+        driver = launch_driver(request.config, browser_name)
+    
+    if window_size is not None:
+        driver.set_window_size(*window_size)
+    
     # テストに使用するためにdriverをrequest.nodeに保存
-    request.cls.driver = driver
+    if request.cls is not None:
+        request.cls.driver = driver
     
-    # テスト実行後にdriverを閉じる
     yield driver
     
-    driver.quit()
+    # プールに返却するとブラウザの状態がリセットされる
+    if use_pool:
+        # ウィンドウサイズを変更した場合は既定のサイズに戻す（戻せない場合は再利用しない）
+        discard = False
+        if window_size is not None:
+            try:
+                driver.set_window_size(settings.WINDOW_WIDTH, settings.WINDOW_HEIGHT)
+            except Exception:
+                discard = True
+        driver_pool.release(driver, discard=discard)
+    else:
+        driver.quit()
+
+
+@pytest.fixture(scope="class")
+def matrix(request, driver_pool):
+    """--browsers の全てのブラウザを並行して起動し、シナリオを同時に実行するBrowserMatrixを返す"""
+    browsers = settings.MATRIX_BROWSERS
+    if not browsers:
+        browsers = [get_requirements(request.node, default_requirements(request.config))["browser"]]
+    if request.config.getoption("driver_pool"):
+        browser_matrix = BrowserMatrix(browsers, driver_pool.acquire, driver_pool.release)
+    else:
+        browser_matrix = BrowserMatrix(browsers, lambda browser_name: launch_driver(request.config, browser_name))
+    
+    with browser_matrix:
+        yield browser_matrix
+
+
+@pytest.fixture(scope="session")
+def session_cache(request):
+    """ログイン済みのセッション状態のキャッシュを返す"""
+    return request.config.stash[SESSION_CACHE_KEY]
+
+
+@pytest.fixture(scope="session")
+def visual():
+    """スクリーンショットをベースライン画像と比較するVisualComparerを返す"""
+    return get_visual_comparer()
 
 
 @pytest.fixture(scope="function")
@@ -108,21 +524,363 @@ def navigate(driver, base_url):
     return _navigate
 
 
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_protocol(item, nextitem):
+    """実行中のテストのnodeidを記録し（成果物や計測結果の紐付けに使用）、ブラウザを使うテストの要素のキャッシュの利用を集計する"""
+    fixturenames = getattr(item, "fixturenames", ())
+    browser_test = "driver" in fixturenames or "matrix" in fixturenames
+    before = get_element_cache_counts() if browser_test else None
+    set_current_test(item.nodeid)
+    yield
+    set_current_test(None)
+    if browser_test:
+        after = get_element_cache_counts()
+        record_element_cache_usage(item.config, {kind: count - before.get(kind, 0) for kind, count in after.items()})
+
+
+def get_element_cache_counts() -> dict:
+    """
+    プロセス共通の要素のキャッシュの集計を返す
+    
+    src.elements は selenium.webdriver を読み込むため、既に読み込まれている場合だけ参照する。
+    
+    Returns:
+        dict: 集計結果。src.elements が読み込まれていない場合は空の辞書
+    """
+    elements = sys.modules.get("src.elements")
+    return elements.get_element_cache_stats().to_dict() if elements is not None else {}
+
+
+def record_element_cache_usage(config, counts: dict) -> None:
+    """
+    ブラウザを使うテスト（またはワーカー）の要素のキャッシュの利用を実行全体の集計に加える
+    
+    ユニットテストやベンチマークでの利用をサマリーに含めないよう、プロセス共通の集計とは別に集計する。
+    
+    Args:
+        config: pytestの設定
+        counts: 加える集計結果（ElementCacheStats.to_dict の形式）
+    """
+    if not any(counts.values()):
+        return
+    if ELEMENT_CACHE_KEY not in config.stash:
+        from src.elements import ElementCacheStats
+        config.stash[ELEMENT_CACHE_KEY] = ElementCacheStats()
+    config.stash[ELEMENT_CACHE_KEY].merge(counts)
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_call(item):
+    """
+    一時的な失敗で失敗したテストを、同じブラウザで状態をリセットして再実行する
+    
+    再実行するのはテストの本体（item.runtest）だけで、関数スコープのフィクスチャと setup_method は
+    実行し直さない。状態のリセットでブラウザは about:blank に移動するため、再実行するテストは
+    本体の中で対象のページを開く必要がある。
+    """
+    # マーカーの誤りはフックの後処理ではなく、テストのエラーとして報告する
+    retries = get_retry_count(item.get_closest_marker("retry"), item.config.getoption("--retries"))
+    outcome = yield
+    if retries <= 0 or outcome.excinfo is None:
+        return
+    error = outcome.excinfo[1]
+    if not is_retryable(error, settings.RETRY_EXCEPTIONS):
+        return
+    
+    driver = get_item_driver(item)
+    
+    def reset():
+        if driver is not None and settings.RETRY_RESET_STATE:
+            reset_driver_state(driver)
+    
+    try:
+        passed, errors = rerun(item.runtest, retries, reset, settings.RETRY_EXCEPTIONS)
+    except (pytest.skip.Exception, pytest.xfail.Exception) as e:
+        # 再実行でスキップ・xfail になった場合は、最初の失敗ではなくそれをテストの結果にする
+        outcome.force_exception(e)
+        return
+    errors.insert(0, error)
+    item.config.stash[FLAKINESS_STATS_KEY].record(item.nodeid, errors, passed)
+    item.stash[RETRY_RUNS_KEY] = len(errors) + (1 if passed else 0)
+    if passed:
+        # 再実行で成功した場合は最初の失敗を取り消す（全て失敗した場合は最初の失敗を報告する）
+        outcome.force_result(None)
+
+
+def get_item_driver(item):
+    """
+    テストが使用しているWebDriverを返す
+    
+    Args:
+        item: pytestのテストアイテム
+    
+    Returns:
+        WebDriver: テストクラスまたはフィクスチャのドライバ。見つからない場合はNone
+    """
+    driver = getattr(item.instance, "driver", None)
+    if driver is None:
+        driver = getattr(item, "funcargs", {}).get("driver")
+    return driver
+
+
 @pytest.hookimpl(tryfirst=True, hookwrapper=True)
 def pytest_runtest_makereport(item, call):
-    """テスト失敗時にスクリーンショットを撮影するためのフック"""
+    """テスト失敗時にスクリーンショットとDOMスナップショットを取得するためのフック"""
     outcome = yield
     report = outcome.get_result()
+    item.config.stash[WORKER_STATS_KEY].add_report(report)
+    
+    resource_stats = item.config.stash.get(RESOURCE_STATS_KEY, None)
+    if resource_stats is not None and report.when == "call":
+        record_blocked_resources(item, report, resource_stats)
+    if report.when == "call" and RETRY_RUNS_KEY in item.stash:
+        report.user_properties.append(("runs", item.stash[RETRY_RUNS_KEY]))
     
     if report.when == "call" and report.failed and settings.TAKE_SCREENSHOT_ON_FAILURE:
         try:
-            driver = item.instance.driver
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            driver = get_item_driver(item)
             test_name = item.nodeid.replace("::", "_").replace(".py", "").replace("/", "_")
-            screenshot_dir = settings.SCREENSHOT_DIR
-            os.makedirs(screenshot_dir, exist_ok=True)
-            screenshot_path = os.path.join(screenshot_dir, f"{test_name}_{timestamp}.png")
-            driver.save_screenshot(screenshot_path)
+            if settings.SCREENSHOT_STORE:
+                screenshot_path = store_screenshot(driver, test_name)
+            else:
+                screenshot_path = unique_artifact_path(settings.SCREENSHOT_DIR, test_name, "png")
+                save_screenshot(driver, screenshot_path)
             print(f"スクリーンショットを保存しました: {screenshot_path}")
         except Exception as e:
-            print(f"スクリーンショットの撮影に失敗しました: {e}")
\ No newline at end of file
+            print(f"スクリーンショットの撮影に失敗しました: {e}")
+    
+    if report.when == "call" and (
+        (report.failed and settings.DOM_SNAPSHOT_ON_FAILURE)
+        or (report.passed and should_sample(item.nodeid, settings.DOM_SNAPSHOT_SAMPLE_RATE))
+    ):
+        # 待機がタイムアウトした場合は、待機していたロケーターの周辺だけを保存する
+        locator = getattr(call.excinfo.value, "locator", None) if call.excinfo is not None else None
+        driver = get_item_driver(item)
+        if driver is not None:
+            try:
+                test_name = item.nodeid.replace("::", "_").replace(".py", "").replace("/", "_")
+                archive_path = capture_dom_snapshot(driver, test_name, locator)
+                if report.failed:
+                    print(f"DOMスナップショットを保存しました: {archive_path}")
+            except Exception as e:
+                print(f"DOMスナップショットの取得に失敗しました: {e}")
+
+
+def record_blocked_resources(item, report, stats: BlockedResourceStats) -> None:
+    """
+    テスト中にブロックしたリクエスト数とバイト数をレポートのuser_propertiesに記録する
+    
+    Args:
+        item: pytestのテストアイテム
+        report: テストのレポート
+        stats: ブロックしたリクエストの集計
+    """
+    driver = get_item_driver(item)
+    if driver is not None and uses_cdp_filter(driver):
+        try:
+            for url in collect_blocked_requests(driver):
+                stats.record(url)
+        except Exception as e:
+            print(f"ブロックしたリクエストの取得に失敗しました: {e}")
+    requests, blocked_bytes = stats.take()
+    report.user_properties.append(("blocked_requests", requests))
+    report.user_properties.append(("blocked_bytes", blocked_bytes))
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_xdist_auto_num_workers(config):
+    """-n auto の場合に、CPU数と利用可能なメモリ量からワーカー数を決める"""
+    return recommended_worker_count()
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_testnodedown(node, error):
+    """ワーカーの終了時に、ワーカーの稼働状況を受け取る"""
+    stats = getattr(node, "workeroutput", {}).get("swt_worker_stats")
+    if stats:
+        node.config.stash[COLLECTED_WORKER_STATS_KEY].append(stats)
+    resource_stats = getattr(node, "workeroutput", {}).get("swt_resource_filter")
+    if resource_stats and RESOURCE_STATS_KEY in node.config.stash:
+        node.config.stash[RESOURCE_STATS_KEY].merge(resource_stats)
+    flakiness = getattr(node, "workeroutput", {}).get("swt_flakiness")
+    if flakiness:
+        node.config.stash[FLAKINESS_STATS_KEY].merge(flakiness)
+    schedule = getattr(node, "workeroutput", {}).get("swt_schedule")
+    if schedule and SCHEDULE_KEY not in node.config.stash:
+        # 全ワーカーが同じ順序で収集するため、最初のワーカーの結果を使う
+        node.config.stash[SCHEDULE_KEY] = schedule
+    session_cache = getattr(node, "workeroutput", {}).get("swt_session_cache")
+    if session_cache:
+        node.config.stash[SESSION_CACHE_KEY].merge(session_cache)
+    captures = getattr(node, "workeroutput", {}).get("swt_captures")
+    if captures:
+        get_capture_stats().merge(captures)
+    visual_stats = getattr(node, "workeroutput", {}).get("swt_visual")
+    if visual_stats:
+        get_visual_comparer().merge(visual_stats)
+    element_stats = getattr(node, "workeroutput", {}).get("swt_elements")
+    if element_stats:
+        record_element_cache_usage(node.config, element_stats)
+    matrix_stats = getattr(node, "workeroutput", {}).get("swt_matrix")
+    if matrix_stats:
+        get_matrix_stats().merge(matrix_stats)
+    commands = getattr(node, "workeroutput", {}).get("swt_commands")
+    if commands and COMMAND_RECORDER_KEY in node.config.stash:
+        node.config.stash[COMMAND_RECORDER_KEY].merge(commands)
+    page_timing = getattr(node, "workeroutput", {}).get("swt_page_timing")
+    if page_timing:
+        get_page_timing_recorder().merge(page_timing)
+
+
+def pytest_sessionfinish(session, exitstatus):
+    """成果物と計測結果の書き込みを完了させ、ワーカーの稼働状況をコントローラーに渡す"""
+    session.config.stash[ARTIFACT_WRITER_KEY] = shutdown_artifact_writer()
+    close_dom_archive()
+    session.config.stash[CAPTURE_STATS_KEY] = get_capture_stats()
+    session.config.stash[SCREENSHOT_STORE_KEY] = get_screenshot_store()
+    session.config.stash[VISUAL_COMPARER_KEY] = get_visual_comparer()
+    session.config.stash[MATRIX_STATS_KEY] = get_matrix_stats()
+    page_timing = get_page_timing_recorder()
+    page_timing.close()
+    session.config.stash[PAGE_TIMING_KEY] = page_timing
+    if page_timing.path is not None:
+        print(f"ページ性能の計測結果を保存しました: {page_timing.path}")
+    recorder = session.config.stash.get(COMMAND_RECORDER_KEY, None)
+    if recorder is not None and recorder.records:
+        path = unique_artifact_path(settings.REPORT_DIR, "commands", "jsonl")
+        recorder.export_jsonl(path)
+        print(f"WebDriverコマンドの記録を保存しました: {path}")
+    
+    smoke_driver = session.config.stash.get(LOCATOR_SMOKE_DRIVER_KEY, None)
+    if smoke_driver is not None:
+        smoke_driver.quit()
+    
+    proxy = session.config.stash.get(RESOURCE_PROXY_KEY, None)
+    if proxy is not None:
+        proxy.stop()
+    resource_stats = session.config.stash.get(RESOURCE_STATS_KEY, None)
+    if resource_stats is not None:
+        resource_stats.close()
+    
+    stats = session.config.stash[WORKER_STATS_KEY]
+    stats.finish()
+    if hasattr(session.config, "workeroutput"):
+        session.config.workeroutput["swt_worker_stats"] = stats.to_dict()
+        if resource_stats is not None:
+            session.config.workeroutput["swt_resource_filter"] = resource_stats.to_dict()
+        session.config.workeroutput["swt_session_cache"] = session.config.stash[SESSION_CACHE_KEY].to_dict()
+        session.config.workeroutput["swt_flakiness"] = session.config.stash[FLAKINESS_STATS_KEY].to_dict()
+        session.config.workeroutput["swt_captures"] = session.config.stash[CAPTURE_STATS_KEY].to_dict()
+        session.config.workeroutput["swt_visual"] = session.config.stash[VISUAL_COMPARER_KEY].to_dict()
+        session.config.workeroutput["swt_matrix"] = session.config.stash[MATRIX_STATS_KEY].to_dict()
+        session.config.workeroutput["swt_page_timing"] = page_timing.to_dict()
+        if recorder is not None and recorder.records:
+            session.config.workeroutput["swt_commands"] = recorder.to_dict()
+        if ELEMENT_CACHE_KEY in session.config.stash:
+            session.config.workeroutput["swt_elements"] = session.config.stash[ELEMENT_CACHE_KEY].to_dict()
+        if SCHEDULE_KEY in session.config.stash:
+            session.config.workeroutput["swt_schedule"] = session.config.stash[SCHEDULE_KEY]
+
+
+def pytest_terminal_summary(terminalreporter, exitstatus, config):
+    """テスト実行後にドライバプール・起動時間・実行順序・セッションキャッシュ・再実行・コマンド計測・リソースのブロック・成果物・ロケーターの確認・要素のキャッシュ・ビジュアル比較・ブラウザのマトリクス実行・ページ性能・ワーカーの利用状況を表示する"""
+    pool = config.stash.get(DRIVER_POOL_KEY, None)
+    summary = pool.summary() if pool is not None else None
+    if summary:
+        terminalreporter.write_sep("-", "driver pool")
+        terminalreporter.write_line(summary)
+    
+    startup_lines = config.stash[STARTUP_STATS_KEY].summary_lines()
+    if startup_lines:
+        terminalreporter.write_sep("-", "browser startup")
+        for line in startup_lines:
+            terminalreporter.write_line(line)
+    
+    schedule = config.stash.get(SCHEDULE_KEY, None)
+    if schedule is not None:
+        terminalreporter.write_sep("-", "test scheduling")
+        terminalreporter.write_line(format_schedule_summary(schedule))
+    
+    summary = config.stash[SESSION_CACHE_KEY].summary()
+    if summary:
+        terminalreporter.write_sep("-", "session cache")
+        terminalreporter.write_line(summary)
+    
+    flakiness_lines = config.stash[FLAKINESS_STATS_KEY].summary_lines()
+    if flakiness_lines:
+        terminalreporter.write_sep("-", "flaky tests")
+        for line in flakiness_lines:
+            terminalreporter.write_line(line)
+    
+    recorder = config.stash.get(COMMAND_RECORDER_KEY, None)
+    lines = recorder.hot_spot_report() if recorder is not None else []
+    if lines:
+        terminalreporter.write_sep("-", "webdriver command hot spots")
+        for line in lines:
+            terminalreporter.write_line(line)
+    
+    resource_stats = config.stash.get(RESOURCE_STATS_KEY, None)
+    summary = resource_stats.summary() if resource_stats is not None else None
+    if summary:
+        terminalreporter.write_sep("-", "resource filter")
+        terminalreporter.write_line(summary)
+    
+    writer = config.stash.get(ARTIFACT_WRITER_KEY, None)
+    summary = writer.summary() if writer is not None else None
+    if summary:
+        # 書き込みのエラーはテスト結果に影響させず、ここで報告だけを行う
+        terminalreporter.write_sep("-", "artifacts")
+        terminalreporter.write_line(summary)
+        for path, error in writer.errors:
+            terminalreporter.write_line(f"  {path}: {error}")
+    store = config.stash.get(SCREENSHOT_STORE_KEY, None)
+    summary = store.summary() if store is not None else None
+    if summary:
+        terminalreporter.write_sep("-", "screenshot store")
+        terminalreporter.write_line(summary)
+    health = config.stash.get(LOCATOR_HEALTH_KEY, None)
+    if health:
+        counts = {}
+        for result in health:
+            if not result.ok:
+                counts[result.status] = counts.get(result.status, 0) + 1
+        problems = ", ".join(f"{status}: {count}件" for status, count in sorted(counts.items())) or "なし"
+        terminalreporter.write_sep("-", "locator health")
+        terminalreporter.write_line(f"確認したロケーター: {len(health)}件, 問題: {problems}")
+    element_stats = config.stash.get(ELEMENT_CACHE_KEY, None)
+    summary = element_stats.summary() if element_stats is not None else None
+    if summary:
+        terminalreporter.write_sep("-", "element cache")
+        terminalreporter.write_line(summary)
+    capture_stats = config.stash.get(CAPTURE_STATS_KEY, None)
+    lines = capture_stats.summary_lines() if capture_stats is not None else []
+    if lines:
+        terminalreporter.write_sep("-", "artifact capture")
+        for line in lines:
+            terminalreporter.write_line(line)
+    comparer = config.stash.get(VISUAL_COMPARER_KEY, None)
+    summary = comparer.summary() if comparer is not None else None
+    if summary:
+        terminalreporter.write_sep("-", "visual comparison")
+        terminalreporter.write_line(summary)
+    matrix_stats = config.stash.get(MATRIX_STATS_KEY, None)
+    lines = matrix_stats.summary_lines() if matrix_stats is not None else []
+    if lines:
+        terminalreporter.write_sep("-", "browser matrix")
+        for line in lines:
+            terminalreporter.write_line(line)
+    page_timing = config.stash.get(PAGE_TIMING_KEY, None)
+    lines = page_timing.summary_lines() if page_timing is not None else []
+    if lines:
+        terminalreporter.write_sep("-", "page timing")
+        for line in lines:
+            terminalreporter.write_line(line)
+    
+    worker_stats = list(config.stash[COLLECTED_WORKER_STATS_KEY])
+    own_stats = config.stash[WORKER_STATS_KEY].to_dict()
+    if not worker_stats and own_stats["tests"] > 0:
+        worker_stats = [own_stats]
+    if worker_stats:
+        terminalreporter.write_sep("-", "worker utilization")
+        for line in format_utilization(worker_stats):
+            terminalreporter.write_line(line)
@@ -6,6 +6,7 @@ from selenium.webdriver.common.by import By
 from selenium.webdriver.remote.webdriver import WebDriver
 
 from src.base_page import BasePage
+from src.elements import Element, Elements
 
 
 class HomePage(BasePage):
@@ -22,6 +23,23 @@ class HomePage(BasePage):
     NAVIGATION_MENU = (By.CSS_SELECTOR, "nav.main-nav")
     NAVIGATION_LINKS = (By.CSS_SELECTOR, "nav.main-nav a")
     
+    # 要素（最初のアクセスで検索し、ページ遷移までキャッシュする）
+    welcome_message = Element(WELCOME_MESSAGE)
+    login_link = Element(LOGIN_LINK, invalidates=True)
+    search_box = Element(SEARCH_BOX)
+    search_button = Element(SEARCH_BUTTON)
+    navigation_links = Elements(NAVIGATION_LINKS)
+    
+    # これらの要素が揃えばページを操作できる（画像などの読み込み完了は待たない）
+    READY_LOCATORS = (SEARCH_BOX, NAVIGATION_MENU)
+    
+    # ウェルカムメッセージはログイン後にのみ表示される
+    OPTIONAL_LOCATORS = ("WELCOME_MESSAGE",)
+    MULTIPLE_LOCATORS = ("NAVIGATION_LINKS",)
+    
+    # ログインしていない場合はログインページへ移動するため、ログインしてから確認する
+    LOCATOR_SMOKE_ROLE = "user"
+    
     def __init__(self, driver: WebDriver, base_url: str):
         """
         HomePageクラスの初期化
@@ -43,11 +61,11 @@ class HomePage(BasePage):
         Returns:
             str: ウェルカムメッセージ
         """
-        return self.actions.get_text(self.WELCOME_MESSAGE)
+        return self.welcome_message.text
     
     def click_login_link(self):
         """ログインリンクをクリックする"""
-        self.actions.click(self.LOGIN_LINK)
+        self.login_link.click()
         from examples.pages.login_page import LoginPage
         return LoginPage(self.driver, self.base_url)
     
@@ -58,8 +76,10 @@ class HomePage(BasePage):
         Args:
             query: 検索クエリ
         """
-        self.actions.type_text(self.SEARCH_BOX, query)
-        self.actions.click(self.SEARCH_BUTTON)
+        # 同じページで繰り返し検索する場合は、キャッシュした要素をそのまま使う
+        self.search_box.clear()
+        self.search_box.send_keys(query)
+        self.search_button.click()
         return self
     
     def get_navigation_links(self) -> list:
@@ -69,7 +89,7 @@ class HomePage(BasePage):
         Returns:
             list: ナビゲーションリンクのリスト
         """
-        return self.actions.find_all(self.NAVIGATION_LINKS)
+        return list(self.navigation_links)
     
     def get_navigation_link_texts(self) -> list:
         """
@@ -78,8 +98,7 @@ class HomePage(BasePage):
         Returns:
             list: ナビゲーションリンクのテキストのリスト
         """
-        links = self.get_navigation_links()
-        return [link.text for link in links]
+        return self.actions.get_texts(self.NAVIGATION_LINKS)
     
     def click_navigation_link(self, link_text: str):
         """
@@ -3,10 +3,14 @@
 実際のプロジェクトでは、このようなページオブジェクトを作成します。
 """
 
+from selenium.common.exceptions import TimeoutException
 from selenium.webdriver.common.by import By
 from selenium.webdriver.remote.webdriver import WebDriver
 
 from src.base_page import BasePage
+from src.conditions import clickable
+from src.elements import Element
+from src.session_cache import SessionCache
 
 
 class LoginPage(BasePage):
@@ -21,6 +25,18 @@ class LoginPage(BasePage):
     LOGIN_BUTTON = (By.CSS_SELECTOR, "button[type='submit']")
     ERROR_MESSAGE = (By.CSS_SELECTOR, ".error-message")
     
+    # 要素（最初のアクセスで検索し、ページ遷移までキャッシュする）
+    error_message = Element(ERROR_MESSAGE)
+    
+    # これらの要素が揃えばページを操作できる（画像などの読み込み完了は待たない）
+    READY_LOCATORS = (USERNAME_FIELD, PASSWORD_FIELD, LOGIN_BUTTON)
+    
+    # エラーメッセージはログインに失敗した場合にのみ表示される
+    OPTIONAL_LOCATORS = ("ERROR_MESSAGE",)
+    
+    # ログイン済みかどうかの確認に開くページのパス（未ログインの場合はログインページへ移動する）
+    SESSION_CHECK_PATH = ""
+    
     def __init__(self, driver: WebDriver, base_url: str):
         """
         LoginPageクラスの初期化
@@ -43,11 +59,68 @@ class LoginPage(BasePage):
             username: ユーザー名
             password: パスワード
         """
-        self.actions.type_text(self.USERNAME_FIELD, username)
-        self.actions.type_text(self.PASSWORD_FIELD, password)
-        self.actions.click(self.LOGIN_BUTTON)
+        self.actions.fill_form({
+            self.USERNAME_FIELD: username,
+            self.PASSWORD_FIELD: password,
+        }, mode="fidelity")
+        # 表示・有効の確認とクリック対象の取得を1回のスクリプト実行で行う
+        self.actions.click(self.LOGIN_BUTTON, condition=clickable)
+        # 送信でページが遷移するか、エラーメッセージが表示される
+        self.invalidate_elements()
         return self
     
+    def login_with_session_cache(self, cache: SessionCache, username: str, password: str) -> bool:
+        """
+        保存したセッション状態を復元してログインする。保存されていない場合はUIでログインして保存する
+        
+        Args:
+            cache: セッション状態のキャッシュ（session_cacheフィクスチャ）
+            username: ユーザー名
+            password: パスワード
+            
+        Returns:
+            bool: 保存した状態を復元した場合はTrue、UIでログインした場合はFalse
+        """
+        return cache.ensure_session(
+            self.driver, f"{self.base_url}|{username}",
+            login=lambda: self.open_login_page().login(username, password).wait_for_login_result(),
+            verify=self.is_logged_in,
+        )
+    
+    def wait_for_login_result(self, timeout: int = None) -> bool:
+        """
+        送信後にログインページから移動するか、エラーメッセージが表示されるまで待つ
+        
+        Args:
+            timeout: 待機時間（秒）
+            
+        Returns:
+            bool: ログインページから移動した場合はTrue、そうでない場合はFalse
+        """
+        try:
+            self.actions.wait_until(
+                lambda driver: not self._on_login_page() or driver.find_elements(*self.ERROR_MESSAGE), timeout
+            )
+        except TimeoutException:
+            return False
+        return not self._on_login_page()
+    
+    def is_logged_in(self) -> bool:
+        """
+        SESSION_CHECK_PATH のページを開き、ログイン済みかどうかを確認する
+        
+        Returns:
+            bool: ログインページへ移動しなかった場合はTrue、そうでない場合はFalse
+        """
+        self.invalidate_elements()
+        self.driver.get(f"{self.base_url.rstrip('/')}/{self.SESSION_CHECK_PATH.lstrip('/')}")
+        return not self._on_login_page()
+    
+    def _on_login_page(self) -> bool:
+        """現在のURLがログインページかどうかを返す"""
+        path = self.driver.current_url.split("?")[0].rstrip("/")
+        return path.endswith("/" + self.URL_PATH)
+    
     def get_error_message(self) -> str:
         """
         エラーメッセージを取得する
@@ -55,7 +128,7 @@ class LoginPage(BasePage):
         Returns:
             str: エラーメッセージ
         """
-        return self.actions.get_text(self.ERROR_MESSAGE)
+        return self.error_message.text
     
     def is_username_field_displayed(self) -> bool:
         """
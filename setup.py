@@ -33,5 +33,13 @@ setup(
         "selenium>=4.0.0",
         "webdriver-manager>=4.0.0",
         "pytest-html>=3.0.0",
+        "pytest-xdist>=3.0.0",
     ],
+    extras_require={
+        # スクリーンショットの縮小・ほぼ同じ画像の判定・ビジュアル比較
+        "visual": [
+            "Pillow>=9.0.0",
+            "numpy>=1.21.0",
+        ],
+    },
 )
\ No newline at end of file
@@ -0,0 +1,243 @@
+"""
+成果物（スクリーンショットなど）をバックグラウンドで書き込むライター。
+PNGのデコードやディスクへの書き込みをテストのスレッドから切り離します。
+"""
+
+import base64
+import io
+import os
+import queue
+import threading
+import time
+from typing import Callable, List, Optional, Tuple, Union
+
+from config import settings
+from src.artifacts import get_capture_stats
+
+# (保存先のパス, データまたは書き込み処理, 変換関数)
+_Job = Tuple[str, Union[bytes, str, Callable[[], Optional[int]]], Optional[Callable[[bytes], bytes]]]
+
+_STOP = object()
+
+
+def make_png_resizer(max_width: int) -> Callable[[bytes], bytes]:
+    """
+    PNGを指定した幅以下に縮小する変換関数を返す
+    
+    縮小にはPillowが必要。Pillowがない場合は変換時にImportErrorとなり、
+    ライターのエラーとして記録される（元の画像はそのまま保存される）。
+    
+    Args:
+        max_width: 最大幅（ピクセル）
+    
+    Returns:
+        Callable[[bytes], bytes]: 変換関数
+    """
+    def resize(data: bytes) -> bytes:
+        from PIL import Image
+        
+        image = Image.open(io.BytesIO(data))
+        if image.width <= max_width:
+            return data
+        height = round(image.height * max_width / image.width)
+        output = io.BytesIO()
+        image.resize((max_width, height)).save(output, format="PNG", optimize=True)
+        return output.getvalue()
+    
+    return resize
+
+
+class ArtifactWriter:
+    """キューとワーカースレッドで成果物を書き込むライター"""
+    
+    def __init__(self, max_queue: int = settings.ARTIFACT_QUEUE_SIZE):
+        """
+        ArtifactWriterクラスの初期化
+        
+        Args:
+            max_queue: キューに保持する最大件数。満杯の場合はsubmitが空きを待つ
+        """
+        self._queue: "queue.Queue" = queue.Queue(maxsize=max_queue)
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        
+        # 統計情報
+        self.written = 0
+        self.bytes_written = 0
+        self.errors: List[Tuple[str, str]] = []
+    
+    def submit(self, path: str, data: Union[bytes, str],
+               transform: Optional[Callable[[bytes], bytes]] = None) -> str:
+        """
+        成果物の書き込みを予約する
+        
+        Args:
+            path: 保存先のパス
+            data: 書き込むデータ。文字列の場合はBase64として書き込み時にデコードする
+            transform: 書き込み前にデータを変換する関数
+        
+        Returns:
+            str: 保存先のパス
+        """
+        self._ensure_started()
+        self._queue.put((path, data, transform))
+        return path
+    
+    def submit_task(self, path: str, task: Callable[[], Optional[int]]) -> str:
+        """
+        書き込み処理を予約する（書き込む内容や方法を書き込み時に決める場合に使用）
+        
+        Args:
+            path: 保存先のパス（エラーの記録に使用）
+            task: 書き込みを行い、書き込んだバイト数を返す関数。書き込まなかった場合はNoneを返す
+        
+        Returns:
+            str: 保存先のパス
+        """
+        self._ensure_started()
+        self._queue.put((path, task, None))
+        return path
+    
+    def flush(self) -> None:
+        """予約済みの書き込みが全て終わるまで待機する"""
+        if self._thread is not None:
+            self._queue.join()
+    
+    def close(self) -> None:
+        """予約済みの書き込みを終えてからワーカースレッドを停止する"""
+        with self._lock:
+            thread = self._thread
+            self._thread = None
+        if thread is None:
+            return
+        self._queue.put(_STOP)
+        thread.join()
+    
+    def summary(self) -> Optional[str]:
+        """
+        書き込み状況を表す文字列を返す
+        
+        Returns:
+            Optional[str]: 一度も書き込みを行っていない場合はNone
+        """
+        if self.written == 0 and not self.errors:
+            return None
+        return (
+            f"書き込み: {self.written}件 ({self.bytes_written / 1024:.0f} KB), "
+            f"エラー: {len(self.errors)}件"
+        )
+    
+    def _ensure_started(self) -> None:
+        """ワーカースレッドを起動する"""
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="artifact-writer", daemon=True
+                )
+                self._thread.start()
+    
+    def _run(self) -> None:
+        """キューから取り出した成果物を書き込む"""
+        while True:
+            job = self._queue.get()
+            try:
+                if job is _STOP:
+                    return
+                self._write(*job)
+            finally:
+                self._queue.task_done()
+    
+    def _write(self, path: str, data: Union[bytes, str, Callable[[], Optional[int]]],
+               transform: Optional[Callable[[bytes], bytes]]) -> None:
+        """
+        成果物を1件書き込む。エラーは記録するだけで例外は送出しない
+        
+        Args:
+            path: 保存先のパス
+            data: 書き込むデータ、または submit_task で予約した書き込み処理
+            transform: 書き込み前にデータを変換する関数
+        """
+        try:
+            if callable(data):
+                size = data()
+                if size is not None:
+                    self.written += 1
+                    self.bytes_written += size
+                return
+            if isinstance(data, str):
+                data = base64.b64decode(data)
+            if transform is not None:
+                try:
+                    data = transform(data)
+                except Exception as e:
+                    # 変換に失敗した場合は元のデータを保存する
+                    self.errors.append((path, f"変換に失敗しました: {e}"))
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            with open(path, "wb") as f:
+                f.write(data)
+            self.written += 1
+            self.bytes_written += len(data)
+        except Exception as e:
+            self.errors.append((path, str(e)))
+
+
+_default_writer: Optional[ArtifactWriter] = None
+_default_writer_lock = threading.Lock()
+
+
+def get_artifact_writer() -> ArtifactWriter:
+    """
+    プロセス共通のArtifactWriterを返す
+    
+    Returns:
+        ArtifactWriter: 共通のライター
+    """
+    global _default_writer
+    with _default_writer_lock:
+        if _default_writer is None:
+            _default_writer = ArtifactWriter()
+        return _default_writer
+
+
+def shutdown_artifact_writer() -> Optional[ArtifactWriter]:
+    """
+    プロセス共通のArtifactWriterの書き込みを終えて停止する
+    
+    Returns:
+        Optional[ArtifactWriter]: 停止したライター。使用されていない場合はNone
+    """
+    global _default_writer
+    with _default_writer_lock:
+        writer, _default_writer = _default_writer, None
+    if writer is not None:
+        writer.close()
+    return writer
+
+
+def save_screenshot(driver, path: str) -> str:
+    """
+    スクリーンショットを保存する
+    
+    ASYNC_ARTIFACTSが有効な場合は、Base64のまま共通のライターに渡し、
+    デコード・縮小・書き込みをバックグラウンドで行う。
+    
+    Args:
+        driver: Seleniumのwebdriverインスタンス
+        path: 保存先のパス
+    
+    Returns:
+        str: 保存先のパス
+    """
+    start = time.perf_counter()
+    if not settings.ASYNC_ARTIFACTS:
+        driver.save_screenshot(path)
+        size = os.path.getsize(path) if os.path.exists(path) else 0
+        get_capture_stats().record("screenshot", time.perf_counter() - start, size)
+        return path
+    
+    transform = None
+    if settings.SCREENSHOT_MAX_WIDTH:
+        transform = make_png_resizer(settings.SCREENSHOT_MAX_WIDTH)
+    data = driver.get_screenshot_as_base64()
+    get_capture_stats().record("screenshot", time.perf_counter() - start, len(data) * 3 // 4)
+    return get_artifact_writer().submit(path, data, transform)
@@ -0,0 +1,191 @@
+"""
+テスト成果物（スクリーンショットなど）の保存先を管理するユーティリティ。
+並列実行時もワーカーごとに衝突しないパスを生成します。
+"""
+
+import itertools
+import os
+import threading
+from datetime import datetime
+from typing import Dict, List, Optional
+
+# 実行ID・ワーカーIDを受け渡す環境変数
+RUN_ID_ENV = "SWT_RUN_ID"
+WORKER_ID_ENV = "PYTEST_XDIST_WORKER"
+
+_sequence = itertools.count(1)
+_current_test: Optional[str] = None
+
+
+def get_run_id() -> str:
+    """
+    テスト実行全体で共通の実行IDを返す
+    
+    最初の呼び出しで生成して環境変数に保存するため、その後に起動された
+    ワーカープロセスにも同じIDが引き継がれる。
+    
+    Returns:
+        str: 実行ID
+    """
+    run_id = os.environ.get(RUN_ID_ENV)
+    if not run_id:
+        run_id = datetime.now().strftime("%Y%m%d_%H%M%S")
+        os.environ[RUN_ID_ENV] = run_id
+    return run_id
+
+
+def get_worker_id() -> str:
+    """
+    現在のプロセスのワーカーIDを返す
+    
+    Returns:
+        str: pytest-xdistのワーカーID (gw0, gw1, ...)。並列実行でない場合は "main"
+    """
+    return os.environ.get(WORKER_ID_ENV, "main")
+
+
+def artifact_dir(base_dir: str) -> str:
+    """
+    現在の実行・ワーカー専用の成果物ディレクトリを作成して返す
+    
+    Args:
+        base_dir: 成果物のルートディレクトリ
+    
+    Returns:
+        str: {base_dir}/{実行ID}/{ワーカーID} のパス
+    """
+    path = os.path.join(base_dir, get_run_id(), get_worker_id())
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def unique_artifact_path(base_dir: str, name: str, extension: str) -> str:
+    """
+    衝突しない成果物ファイルのパスを返す
+    
+    ファイル名にはマイクロ秒までのタイムスタンプとプロセス内の連番を付ける。
+    
+    Args:
+        base_dir: 成果物のルートディレクトリ
+        name: ファイル名の接頭辞
+        extension: 拡張子（ドットなし）
+    
+    Returns:
+        str: 成果物ファイルのパス
+    """
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+    filename = f"{name}_{timestamp}_{next(_sequence):04d}.{extension}"
+    return os.path.join(artifact_dir(base_dir), filename)
+
+
+def set_current_test(nodeid: Optional[str]) -> None:
+    """
+    実行中のテストのnodeidを記録する
+    
+    Args:
+        nodeid: pytestのnodeid。テストの外ではNone
+    """
+    global _current_test
+    _current_test = nodeid
+
+
+def get_current_test() -> Optional[str]:
+    """
+    実行中のテストのnodeidを返す
+    
+    Returns:
+        Optional[str]: pytestのnodeid。テストの外ではNone
+    """
+    return _current_test
+
+
+class CaptureStats:
+    """成果物の種類ごとの取得時間とサイズの集計"""
+    
+    def __init__(self):
+        """CaptureStatsクラスの初期化"""
+        # 種類 → {"count", "seconds", "bytes", "stored"}
+        self.kinds: Dict[str, Dict[str, float]] = {}
+        self._lock = threading.Lock()
+    
+    def record(self, kind: str, seconds: float, size: int) -> None:
+        """
+        成果物の取得を記録する
+        
+        Args:
+            kind: 成果物の種類（"screenshot", "dom snapshot" など）
+            seconds: テストのスレッドでの取得にかかった時間（秒）
+            size: ブラウザから転送したデータのバイト数
+        """
+        with self._lock:
+            entry = self.kinds.setdefault(kind, {"count": 0, "seconds": 0.0, "bytes": 0, "stored": 0})
+            entry["count"] += 1
+            entry["seconds"] += seconds
+            entry["bytes"] += size
+    
+    def record_stored(self, kind: str, size: int) -> None:
+        """
+        圧縮などの後に保存したバイト数を記録する
+        
+        Args:
+            kind: 成果物の種類
+            size: 保存したバイト数
+        """
+        with self._lock:
+            entry = self.kinds.setdefault(kind, {"count": 0, "seconds": 0.0, "bytes": 0, "stored": 0})
+            entry["stored"] += size
+    
+    def to_dict(self) -> Dict:
+        """
+        集計結果を辞書で返す（並列実行時にコントローラーへ渡すために使用）
+        
+        Returns:
+            Dict: 種類ごとの集計結果
+        """
+        with self._lock:
+            return {kind: dict(entry) for kind, entry in self.kinds.items()}
+    
+    def merge(self, data: Dict) -> None:
+        """
+        他のワーカーの集計結果を加える
+        
+        Args:
+            data: to_dict の結果
+        """
+        with self._lock:
+            for kind, counts in data.items():
+                entry = self.kinds.setdefault(kind, {"count": 0, "seconds": 0.0, "bytes": 0, "stored": 0})
+                for key, value in counts.items():
+                    entry[key] += value
+    
+    def summary_lines(self) -> List[str]:
+        """
+        種類ごとの1件あたりの取得時間とサイズを表す行を返す
+        
+        Returns:
+            List[str]: 表示する行。一度も取得していない場合は空のリスト
+        """
+        if not self.kinds:
+            return []
+        lines = [f"{'kind':<14}{'count':>7}{'avg(ms)':>10}{'avg(KB)':>10}{'stored(KB)':>12}"]
+        for kind, entry in sorted(self.kinds.items()):
+            count = entry["count"] or 1
+            stored = f"{entry['stored'] / count / 1024:.1f}" if entry["stored"] else "-"
+            lines.append(
+                f"{kind:<14}{entry['count']:>7}{entry['seconds'] / count * 1000:>10.1f}"
+                f"{entry['bytes'] / count / 1024:>10.1f}{stored:>12}"
+            )
+        return lines
+
+
+_capture_stats = CaptureStats()
+
+
+def get_capture_stats() -> CaptureStats:
+    """
+    プロセス共通のCaptureStatsを返す
+    
+    Returns:
+        CaptureStats: 共通の集計
+    """
+    return _capture_stats
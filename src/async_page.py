@@ -0,0 +1,325 @@
+"""
+asyncioで動作するページ操作。
+PageActions・BasePage と同じ名前のメソッドを AsyncWebDriver の上でコルーチンとして提供します。
+待機はイベントループをブロックしないポーリング（asyncio.sleep）で行うため、
+1つのイベントループで多数のブラウザセッションを同時に操作できます（監視や負荷のシナリオ向け）。
+
+使用例:
+    async def check(url):
+        async with await AsyncWebDriver.start(DRIVER_URL, {"browserName": "chrome"}) as driver:
+            page = await AsyncBasePage(driver, url).open()
+            return await page.get_title()
+    
+    async def main():
+        return await asyncio.gather(*(check(url) for url in urls))
+    
+    titles = asyncio.run(main())
+"""
+
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, List, Optional, Tuple, Union
+
+from selenium.common.exceptions import NoSuchElementException, TimeoutException
+
+from config import settings
+from src import browser_scripts
+from src.async_webdriver import AsyncWebDriver, AsyncWebElement
+from src.conditions import Condition
+
+# WebDriverWaitの既定のポーリング間隔（WAIT_MODE が poll の場合に使用）
+POLL_FREQUENCY = 0.5
+
+
+class AsyncPageActions:
+    """asyncioで動作するページ操作のためのユーティリティクラス"""
+    
+    def __init__(self, driver: AsyncWebDriver):
+        """
+        AsyncPageActionsクラスの初期化
+        
+        Args:
+            driver: AsyncWebDriverのインスタンス
+        """
+        self.driver = driver
+    
+    async def wait_until(self, condition: Callable[[AsyncWebDriver], Awaitable[Any]],
+                         timeout: Optional[float] = None, message: str = "",
+                         mode: Optional[str] = None) -> Any:
+        """
+        条件が真になるまで待機する
+        
+        Args:
+            condition: ドライバを受け取り、成立時に真となる値を返すコルーチン関数
+            timeout: 待機時間（秒）
+            message: タイムアウト時のメッセージ
+            mode: 待機方法。poll は一定間隔、adaptive（observer を含む）は
+                ADAPTIVE_POLL_MIN 秒から ADAPTIVE_POLL_MAX 秒まで間隔を広げてポーリングする
+        
+        Returns:
+            Any: conditionが返した値
+        
+        Raises:
+            TimeoutException: 時間内に条件が成立しなかった場合
+        """
+        if timeout is None:
+            timeout = settings.EXPLICIT_WAIT
+        if mode is None:
+            mode = settings.WAIT_MODE
+        adaptive = mode != "poll"
+        interval = settings.ADAPTIVE_POLL_MIN if adaptive else POLL_FREQUENCY
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                value = await condition(self.driver)
+                if value:
+                    return value
+            except NoSuchElementException:
+                pass
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise TimeoutException(message)
+            await asyncio.sleep(min(interval, remaining))
+            if adaptive:
+                interval = min(interval * 2, settings.ADAPTIVE_POLL_MAX)
+    
+    async def wait_for_element(self, locator: Tuple[str, str], timeout: Optional[float] = None,
+                               condition: Union[str, Condition] = "presence",
+                               mode: Optional[str] = None) -> AsyncWebElement:
+        """
+        要素が特定の状態になるまで待機する
+        
+        条件はブラウザ内で評価し、1回のポーリングを1往復で行う。
+        
+        Args:
+            locator: (検索方法, 検索値)のタプル
+            timeout: 待機時間（秒）
+            condition: 待機条件（presence, visibility, clickable）または src.conditions の Condition
+            mode: 待機方法（poll, adaptive）。Noneの場合は settings.WAIT_MODE を使用
+        
+        Returns:
+            AsyncWebElement: 条件を満たした要素
+        """
+        if timeout is None:
+            timeout = settings.EXPLICIT_WAIT
+        if isinstance(condition, str):
+            if condition not in browser_scripts.CONDITION_PREDICATES:
+                raise ValueError(f"サポートされていない待機条件: {condition}")
+            predicate, params, description = browser_scripts.CONDITION_PREDICATES[condition], None, condition
+        else:
+            predicate, params = condition.compile()
+            description = condition.description
+        by, value = locator
+        script = browser_scripts.find_matching_script(predicate)
+        message = f"{locator} が {description} の状態になりませんでした（{timeout}秒）"
+        try:
+            return await self.wait_until(lambda d: d.execute_script(script, by, value, params),
+                                         timeout, message, mode)
+        except TimeoutException as e:
+            # 再実行の統計でロケーターごとに集計するため、同期版と同じく locator 属性に記録する
+            e.locator = locator
+            raise
+    
+    async def find(self, locator: Tuple[str, str], timeout: Optional[float] = None) -> AsyncWebElement:
+        """
+        要素を見つける
+        
+        Args:
+            locator: (検索方法, 検索値)のタプル
+            timeout: 待機時間（秒）、Noneの場合はデフォルト値を使用
+        
+        Returns:
+            AsyncWebElement: 見つかった要素
+        
+        Raises:
+            TimeoutException: 要素が見つからない場合
+        """
+        return await self.wait_for_element(locator, timeout)
+    
+    async def find_all(self, locator: Tuple[str, str], timeout: Optional[float] = None) -> List[AsyncWebElement]:
+        """
+        全ての一致する要素を見つける（1つ以上見つかるまで待機する）
+        
+        Args:
+            locator: (検索方法, 検索値)のタプル
+            timeout: 待機時間（秒）
+        
+        Returns:
+            List[AsyncWebElement]: 見つかった要素のリスト
+        """
+        if timeout is None:
+            timeout = settings.EXPLICIT_WAIT
+        message = f"{locator} の要素が見つかりませんでした（{timeout}秒）"
+        return await self.wait_until(lambda d: d.find_elements(*locator), timeout, message)
+    
+    async def click(self, locator: Tuple[str, str], timeout: Optional[float] = None,
+                    condition: Optional[Union[str, Condition]] = None) -> None:
+        """
+        要素をクリックする
+        
+        Args:
+            locator: (検索方法, 検索値)のタプル
+            timeout: 待機時間（秒）
+            condition: クリック前に待機する条件。Noneの場合は存在だけを待つ
+        """
+        element = await self.wait_for_element(locator, timeout, condition or "presence")
+        await element.click()
+    
+    async def type_text(self, locator: Tuple[str, str], text: str, timeout: Optional[float] = None,
+                        clear_first: bool = True) -> None:
+        """
+        テキストを入力する
+        
+        Args:
+            locator: (検索方法, 検索値)のタプル
+            text: 入力するテキスト
+            timeout: 待機時間（秒）
+            clear_first: 入力前にフィールドをクリアするかどうか
+        """
+        element = await self.find(locator, timeout)
+        if clear_first:
+            await element.clear()
+        await element.send_keys(text)
+    
+    async def get_text(self, locator: Tuple[str, str], timeout: Optional[float] = None) -> str:
+        """
+        要素のテキストを取得する
+        
+        Args:
+            locator: (検索方法, 検索値)のタプル
+            timeout: 待機時間（秒）
+        
+        Returns:
+            str: 要素のテキスト
+        """
+        element = await self.find(locator, timeout)
+        return await element.get_text()
+    
+    async def wait_for_page_load(self, timeout: Optional[float] = None, state: str = "complete") -> None:
+        """
+        ページの読み込みが指定した状態になるまで待機する
+        
+        Args:
+            timeout: 待機時間（秒）
+            state: 待機する document.readyState（interactive, complete）
+        """
+        if state not in ("interactive", "complete"):
+            raise ValueError(f"サポートされていない読み込み状態: {state}")
+        accepted = ("interactive", "complete") if state == "interactive" else ("complete",)
+        
+        async def loaded(driver):
+            return await driver.execute_script(browser_scripts.READY_STATE) in accepted
+        
+        await self.wait_until(loaded, timeout, f"ページの読み込みが {state} になりませんでした")
+    
+    async def wait_for_all_present(self, locators: List[Tuple[str, str]], timeout: Optional[float] = None) -> None:
+        """
+        全てのロケーターに一致する要素が存在するまで待機する（1ポーリングにつき1回のスクリプト実行）
+        
+        Args:
+            locators: ロケーターのリスト
+            timeout: 待機時間（秒）
+        """
+        if timeout is None:
+            timeout = settings.EXPLICIT_WAIT
+        if not locators:
+            return
+        payload = [list(locator) for locator in locators]
+        message = f"{list(locators)} の要素が揃いませんでした（{timeout}秒）"
+        await self.wait_until(lambda d: d.execute_script(browser_scripts.ALL_PRESENT, payload), timeout, message)
+
+
+class AsyncBasePage:
+    """asyncioで動作するページオブジェクトの基底クラス"""
+    
+    # ページの準備完了を判定する要素のロケーター（BasePage.READY_LOCATORS と同じ）
+    READY_LOCATORS: Tuple[Tuple[str, str], ...] = ()
+    
+    def __init__(self, driver: AsyncWebDriver, base_url: str = settings.BASE_URL):
+        """
+        AsyncBasePageクラスの初期化
+        
+        Args:
+            driver: AsyncWebDriverのインスタンス
+            base_url: ベースURL
+        """
+        self.driver = driver
+        self.base_url = base_url
+        self.actions = AsyncPageActions(driver)
+    
+    async def open(self, path: str = ""):
+        """
+        指定されたパスのページを開く
+        
+        Args:
+            path: ページのパス
+        """
+        url = f"{self.base_url.rstrip('/')}/{path.lstrip('/')}"
+        await self.driver.get(url)
+        await self.wait_until_ready()
+        return self
+    
+    async def wait_until_ready(self, timeout: Optional[float] = None):
+        """
+        ページを操作できる状態になるまで待機する
+        
+        READY_LOCATORS の要素が全て存在するまで待つ。宣言されていない場合は、
+        ページ読み込み戦略が none の場合にだけ読み込みの完了を待つ。
+        
+        Args:
+            timeout: 待機時間（秒）
+        """
+        if self.READY_LOCATORS:
+            await self.actions.wait_for_all_present(list(self.READY_LOCATORS), timeout)
+        elif self.driver.capabilities.get("pageLoadStrategy", settings.PAGE_LOAD_STRATEGY) == "none":
+            await self.actions.wait_for_page_load(timeout)
+        return self
+    
+    async def get_title(self) -> str:
+        """
+        ページのタイトルを取得する
+        
+        Returns:
+            str: ページのタイトル
+        """
+        return await self.driver.get_title()
+    
+    async def get_current_url(self) -> str:
+        """
+        現在のURLを取得する
+        
+        Returns:
+            str: 現在のURL
+        """
+        return await self.driver.get_current_url()
+    
+    async def navigate_back(self):
+        """ブラウザの戻るボタンを押す"""
+        await self.driver.back()
+        await self.wait_until_ready()
+        return self
+    
+    async def navigate_forward(self):
+        """ブラウザの進むボタンを押す"""
+        await self.driver.forward()
+        await self.wait_until_ready()
+        return self
+    
+    async def refresh(self):
+        """ページを更新する"""
+        await self.driver.refresh()
+        await self.wait_until_ready()
+        return self
+    
+    async def execute_script(self, script: str, *args):
+        """
+        JavaScriptを実行する
+        
+        Args:
+            script: 実行するJavaScript
+            *args: スクリプトに渡す引数
+        
+        Returns:
+            実行結果
+        """
+        return await self.driver.execute_script(script, *args)
@@ -0,0 +1,476 @@
+"""
+asyncioで動作するW3C WebDriverクライアント。
+標準ライブラリのasyncioのストリームでドライバとHTTP/1.1（keep-alive）で通信し、
+1つのイベントループから多数のブラウザセッションを同時に操作できるようにします。
+Seleniumのクライアントと異なり、セッションごとにスレッドを必要としません。
+
+使用例:
+    async with await AsyncWebDriver.start("http://localhost:4444", {"browserName": "chrome"}) as driver:
+        await driver.get("https://example.com")
+        print(await driver.get_title())
+"""
+
+import asyncio
+import json
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+from selenium.common.exceptions import (
+    ElementClickInterceptedException, ElementNotInteractableException, InvalidArgumentException,
+    InvalidSelectorException, InvalidSessionIdException, JavascriptException, NoSuchElementException,
+    NoSuchFrameException, NoSuchWindowException, StaleElementReferenceException, TimeoutException,
+    WebDriverException,
+)
+
+from config import settings
+
+# W3C WebDriverの要素参照のキー
+ELEMENT_KEY = "element-6066-11e4-a52e-4f735466cecf"
+
+# W3C WebDriverのエラーコードに対応する例外（同期のクライアントと同じ例外を送出する）
+_ERRORS = {
+    "no such element": NoSuchElementException,
+    "stale element reference": StaleElementReferenceException,
+    "element click intercepted": ElementClickInterceptedException,
+    "element not interactable": ElementNotInteractableException,
+    "invalid argument": InvalidArgumentException,
+    "invalid selector": InvalidSelectorException,
+    "invalid session id": InvalidSessionIdException,
+    "javascript error": JavascriptException,
+    "no such frame": NoSuchFrameException,
+    "no such window": NoSuchWindowException,
+    "script timeout": TimeoutException,
+    "timeout": TimeoutException,
+}
+
+
+def to_w3c_locator(by: str, value: str) -> Tuple[str, str]:
+    """
+    ロケーターをW3C WebDriverの検索方法に変換する（Seleniumのクライアントと同じ変換）
+    
+    Args:
+        by: 検索方法
+        value: 検索値
+    
+    Returns:
+        Tuple[str, str]: (検索方法, 検索値)
+    """
+    if by == "id":
+        return "css selector", f'[id="{value}"]'
+    if by == "name":
+        return "css selector", f'[name="{value}"]'
+    if by == "class name":
+        return "css selector", f".{value}"
+    if by == "tag name":
+        return "css selector", value
+    return by, value
+
+
+class AsyncWebElement:
+    """AsyncWebDriverで取得した要素"""
+    
+    def __init__(self, driver: "AsyncWebDriver", element_id: str):
+        """
+        AsyncWebElementクラスの初期化
+        
+        Args:
+            driver: 要素を取得したドライバ
+            element_id: 要素ID
+        """
+        self.driver = driver
+        self.id = element_id
+    
+    def __eq__(self, other) -> bool:
+        return isinstance(other, AsyncWebElement) and other.id == self.id
+    
+    def __hash__(self) -> int:
+        return hash(self.id)
+    
+    def __repr__(self) -> str:
+        return f"<AsyncWebElement id={self.id!r}>"
+    
+    async def _command(self, method: str, command: str, body: Optional[dict] = None) -> Any:
+        """要素のコマンドを実行する"""
+        return await self.driver.command(method, f"/element/{self.id}/{command}", body)
+    
+    async def click(self) -> None:
+        """要素をクリックする"""
+        await self._command("POST", "click", {})
+    
+    async def clear(self) -> None:
+        """入力要素の値を消去する"""
+        await self._command("POST", "clear", {})
+    
+    async def send_keys(self, *values: str) -> None:
+        """
+        キー入力を送る
+        
+        Args:
+            *values: 入力するテキスト
+        """
+        text = "".join(str(value) for value in values)
+        await self._command("POST", "value", {"text": text, "value": list(text)})
+    
+    async def get_text(self) -> str:
+        """
+        要素の表示されているテキストを返す
+        
+        Returns:
+            str: テキスト
+        """
+        return await self._command("GET", "text")
+    
+    async def get_tag_name(self) -> str:
+        """
+        要素のタグ名を返す
+        
+        Returns:
+            str: タグ名
+        """
+        return await self._command("GET", "name")
+    
+    async def get_attribute(self, name: str) -> Optional[str]:
+        """
+        要素の属性の値を返す
+        
+        Args:
+            name: 属性名
+        
+        Returns:
+            Optional[str]: 属性の値。属性がない場合はNone
+        """
+        return await self._command("GET", f"attribute/{name}")
+    
+    async def get_property(self, name: str) -> Any:
+        """
+        要素のプロパティの値を返す
+        
+        Args:
+            name: プロパティ名
+        
+        Returns:
+            Any: プロパティの値
+        """
+        return await self._command("GET", f"property/{name}")
+    
+    async def is_enabled(self) -> bool:
+        """
+        要素が有効かどうかを返す
+        
+        Returns:
+            bool: 有効な場合はTrue
+        """
+        return await self._command("GET", "enabled")
+    
+    async def is_selected(self) -> bool:
+        """
+        要素が選択されているかどうかを返す
+        
+        Returns:
+            bool: 選択されている場合はTrue
+        """
+        return await self._command("GET", "selected")
+
+
+class AsyncWebDriver:
+    """asyncioで動作するW3C WebDriverのセッション"""
+    
+    def __init__(self, command_executor: str, session_id: Optional[str] = None,
+                 capabilities: Optional[Dict] = None, timeout: float = settings.ASYNC_COMMAND_TIMEOUT):
+        """
+        AsyncWebDriverクラスの初期化（新しいセッションを開始する場合は start を使用する）
+        
+        Args:
+            command_executor: ドライバ（またはSelenium Grid）のURL。例: "http://localhost:9515"
+            session_id: 既存のセッションID
+            capabilities: セッションのケイパビリティ
+            timeout: 1つのコマンドのレスポンスを待つ最大時間（秒）
+        """
+        parts = urlsplit(command_executor)
+        if parts.scheme != "http":
+            raise ValueError(f"サポートされていないURL: {command_executor}")
+        self.host = parts.hostname or "localhost"
+        self.port = parts.port or 80
+        self.base_path = parts.path.rstrip("/")
+        self.session_id = session_id
+        self.capabilities = capabilities or {}
+        self.timeout = timeout
+        self.round_trips = 0
+        self._reader: Optional[asyncio.StreamReader] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+        # Python 3.9以前ではLockが作成時のイベントループに紐付くため、最初のコマンドで作成する
+        self._lock: Optional[asyncio.Lock] = None
+    
+    @classmethod
+    async def start(cls, command_executor: str, capabilities: Optional[Dict] = None,
+                    timeout: float = settings.ASYNC_COMMAND_TIMEOUT) -> "AsyncWebDriver":
+        """
+        新しいセッションを開始する
+        
+        Args:
+            command_executor: ドライバ（またはSelenium Grid）のURL
+            capabilities: 要求するケイパビリティ（alwaysMatch）。例: {"browserName": "chrome"}
+            timeout: 1つのコマンドのレスポンスを待つ最大時間（秒）
+        
+        Returns:
+            AsyncWebDriver: セッションを開始したドライバ
+        """
+        driver = cls(command_executor, timeout=timeout)
+        body = {"capabilities": {"alwaysMatch": capabilities or {}, "firstMatch": [{}]}}
+        value = await driver.request("POST", "/session", body)
+        driver.session_id = value["sessionId"]
+        driver.capabilities = value.get("capabilities", {})
+        return driver
+    
+    async def __aenter__(self) -> "AsyncWebDriver":
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.quit()
+    
+    async def quit(self) -> None:
+        """セッションを終了して接続を閉じる"""
+        try:
+            if self.session_id is not None:
+                await self.request("DELETE", f"/session/{self.session_id}")
+        finally:
+            self.session_id = None
+            await self._close()
+    
+    async def _close(self) -> None:
+        """ドライバとの接続を閉じる"""
+        writer, self._reader, self._writer = self._writer, None, None
+        if writer is not None:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except (ConnectionError, OSError):
+                pass
+    
+    async def command(self, method: str, path: str, body: Optional[dict] = None) -> Any:
+        """
+        セッションのコマンドを実行する
+        
+        Args:
+            method: HTTPメソッド
+            path: セッションからの相対パス。例: "/url"
+            body: リクエストのJSON
+        
+        Returns:
+            Any: レスポンスの "value"（要素参照は AsyncWebElement に変換する）
+        """
+        if self.session_id is None:
+            raise InvalidSessionIdException("セッションが開始されていません")
+        value = await self.request(method, f"/session/{self.session_id}{path}", body)
+        return self._unwrap(value)
+    
+    async def request(self, method: str, path: str, body: Optional[dict] = None) -> Any:
+        """
+        ドライバにリクエストを送り、レスポンスの "value" を返す
+        
+        Args:
+            method: HTTPメソッド
+            path: パス
+            body: リクエストのJSON
+        
+        Returns:
+            Any: レスポンスの "value"
+        
+        Raises:
+            WebDriverException: ドライバがエラーを返した場合（エラーコードに対応するサブクラス）
+            TimeoutException: timeout 秒以内にレスポンスを受け取れなかった場合
+        """
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        payload = json.dumps(body).encode("utf-8") if body is not None else b""
+        async with self._lock:
+            try:
+                status, data = await asyncio.wait_for(self._send(method, path, payload), self.timeout)
+            except (asyncio.TimeoutError, asyncio.CancelledError) as e:
+                # レスポンスを読み残した接続を再利用すると、次のコマンドがこのレスポンスを読んでしまうため閉じる
+                await self._close()
+                if isinstance(e, asyncio.TimeoutError):
+                    raise TimeoutException(f"{method} {path} のレスポンスが{self.timeout}秒以内に返りませんでした") from e
+                raise
+        self.round_trips += 1
+        
+        try:
+            response = json.loads(data) if data else {}
+        except ValueError:
+            raise WebDriverException(f"ドライバのレスポンスを解析できません（HTTP {status}）: {data[:200]!r}")
+        value = response.get("value") if isinstance(response, dict) else None
+        if status >= 400 or (isinstance(value, dict) and "error" in value):
+            error = value.get("error", "") if isinstance(value, dict) else ""
+            message = value.get("message", "") if isinstance(value, dict) else ""
+            raise _ERRORS.get(error, WebDriverException)(message or f"HTTP {status} {error}".strip())
+        return value
+    
+    async def _send(self, method: str, path: str, payload: bytes) -> Tuple[int, bytes]:
+        """
+        HTTP/1.1でリクエストを送り、ステータスコードと本文を返す
+        
+        keep-aliveの接続を再利用し、再利用した接続がドライバ側で閉じられていた場合は
+        1回だけ接続し直して送り直す。
+        """
+        head = (
+            f"{method} {self.base_path}{path} HTTP/1.1\r\n"
+            f"Host: {self.host}:{self.port}\r\n"
+            "Accept: application/json\r\n"
+            "Content-Type: application/json;charset=UTF-8\r\n"
+            f"Content-Length: {len(payload)}\r\n"
+            "Connection: keep-alive\r\n\r\n"
+        ).encode("ascii")
+        reused = self._writer is not None
+        try:
+            return await self._exchange(head + payload)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            await self._close()
+            if not reused:
+                raise
+        return await self._exchange(head + payload)
+    
+    async def _exchange(self, request: bytes) -> Tuple[int, bytes]:
+        """接続がなければ接続し、リクエストを書き込んでレスポンスを読む"""
+        if self._writer is None:
+            self._reader, self._writer = await asyncio.open_connection(self.host, self.port)
+        self._writer.write(request)
+        await self._writer.drain()
+        return await self._read_response()
+    
+    async def _read_response(self) -> Tuple[int, bytes]:
+        """レスポンスを読み、ステータスコードと本文を返す（Content-Length と chunked に対応）"""
+        reader = self._reader
+        status_line = await reader.readline()
+        if not status_line:
+            raise ConnectionResetError("ドライバが接続を閉じました")
+        version, status = status_line.decode("latin-1").split(None, 2)[:2]
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+        
+        if headers.get("transfer-encoding", "").lower() == "chunked":
+            chunks = []
+            while True:
+                size = int((await reader.readline()).split(b";")[0], 16)
+                if size == 0:
+                    await reader.readline()
+                    break
+                chunks.append(await reader.readexactly(size))
+                await reader.readline()
+            data = b"".join(chunks)
+        elif "content-length" in headers:
+            data = await reader.readexactly(int(headers["content-length"]))
+        else:
+            data = await reader.read()
+            headers["connection"] = "close"
+        
+        if headers.get("connection", "").lower() == "close" or version == "HTTP/1.0":
+            await self._close()
+        return int(status), data
+    
+    def _wrap(self, value: Any) -> Any:
+        """スクリプトの引数をJSONに変換する（要素は要素参照にする）"""
+        if isinstance(value, AsyncWebElement):
+            return {ELEMENT_KEY: value.id}
+        if isinstance(value, (list, tuple)):
+            return [self._wrap(item) for item in value]
+        if isinstance(value, dict):
+            return {key: self._wrap(item) for key, item in value.items()}
+        return value
+    
+    def _unwrap(self, value: Any) -> Any:
+        """レスポンスの値をPythonの値に変換する（要素参照は AsyncWebElement にする）"""
+        if isinstance(value, dict):
+            if ELEMENT_KEY in value:
+                return AsyncWebElement(self, value[ELEMENT_KEY])
+            return {key: self._unwrap(item) for key, item in value.items()}
+        if isinstance(value, list):
+            return [self._unwrap(item) for item in value]
+        return value
+    
+    async def get(self, url: str) -> None:
+        """
+        URLを開く
+        
+        Args:
+            url: 開くURL
+        """
+        await self.command("POST", "/url", {"url": url})
+    
+    async def get_current_url(self) -> str:
+        """
+        現在のURLを返す
+        
+        Returns:
+            str: 現在のURL
+        """
+        return await self.command("GET", "/url")
+    
+    async def get_title(self) -> str:
+        """
+        ページのタイトルを返す
+        
+        Returns:
+            str: タイトル
+        """
+        return await self.command("GET", "/title")
+    
+    async def back(self) -> None:
+        """ブラウザの履歴を1つ戻る"""
+        await self.command("POST", "/back", {})
+    
+    async def forward(self) -> None:
+        """ブラウザの履歴を1つ進む"""
+        await self.command("POST", "/forward", {})
+    
+    async def refresh(self) -> None:
+        """ページを更新する"""
+        await self.command("POST", "/refresh", {})
+    
+    async def find_element(self, by: str, value: str) -> AsyncWebElement:
+        """
+        要素を1つ検索する
+        
+        Args:
+            by: 検索方法
+            value: 検索値
+        
+        Returns:
+            AsyncWebElement: 見つかった要素
+        
+        Raises:
+            NoSuchElementException: 要素が見つからない場合
+        """
+        using, value = to_w3c_locator(by, value)
+        return await self.command("POST", "/element", {"using": using, "value": value})
+    
+    async def find_elements(self, by: str, value: str) -> List[AsyncWebElement]:
+        """
+        一致する全ての要素を検索する
+        
+        Args:
+            by: 検索方法
+            value: 検索値
+        
+        Returns:
+            List[AsyncWebElement]: 見つかった要素のリスト
+        """
+        using, value = to_w3c_locator(by, value)
+        return await self.command("POST", "/elements", {"using": using, "value": value})
+    
+    async def execute_script(self, script: str, *args) -> Any:
+        """
+        JavaScriptを実行する
+        
+        Args:
+            script: 実行するJavaScript
+            *args: スクリプトに渡す引数（AsyncWebElementは要素参照として渡す）
+        
+        Returns:
+            Any: スクリプトの戻り値
+        """
+        return await self.command("POST", "/execute/sync", {"script": script, "args": self._wrap(list(args))})
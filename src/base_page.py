@@ -3,16 +3,42 @@
 すべてのページオブジェクトの基底クラスとして機能します。
 """
 
+from typing import Dict, Optional, Sequence, Tuple
+
 from selenium.webdriver.remote.webdriver import WebDriver
 from selenium.webdriver.common.by import By
 
+from src.locator_health import check_locators, find_declared_locators
 from src.page_actions import PageActions
+from src.page_timing import PageTiming, measure_page
 from config import settings
 
 
 class BasePage:
     """ページオブジェクトの基底クラス"""
     
+    # ページの準備完了を判定する条件。サブクラスで上書きする
+    # READY_LOCATORS: 全て存在すれば操作を始められるとみなす要素のロケーター
+    # READY_NETWORK_IDLE: Trueの場合、ネットワークがアイドル状態になるまで待つ
+    READY_LOCATORS: Tuple[Tuple[By, str], ...] = ()
+    READY_NETWORK_IDLE = False
+    
+    # ロケーターの一括確認（check_locators）で使用する宣言。サブクラスで上書きする
+    # OPTIONAL_LOCATORS: ページの状態によっては存在しない要素（エラーメッセージなど）の属性名
+    # MULTIPLE_LOCATORS: 複数の要素に一致することが前提の属性名
+    OPTIONAL_LOCATORS: Tuple[str, ...] = ()
+    MULTIPLE_LOCATORS: Tuple[str, ...] = ()
+    # LOCATOR_SMOKE_ROLE: --locator-smoke でページを開く前にログインする役割（settings.LOCATOR_SMOKE_ACCOUNTS のキー）
+    #   Noneの場合はログインしていない状態で開く
+    LOCATOR_SMOKE_ROLE: Optional[str] = None
+    
+    # ページ性能の予算（指標 → 上限）。サブクラスで上書きする
+    # 宣言したページはページ遷移ごとに性能を計測し、予算を超えた場合はテストを失敗させるか警告する
+    # 例: {"ttfb": 300, "dom_content_loaded": 1500}（ミリ秒。指標は src.page_timing.BUDGET_METRICS）
+    # PERFORMANCE_BUDGET_ACTION: fail または warn。Noneの場合は settings.PERFORMANCE_BUDGET_ACTION
+    PERFORMANCE_BUDGETS: Dict[str, float] = {}
+    PERFORMANCE_BUDGET_ACTION: Optional[str] = None
+    
     def __init__(self, driver: WebDriver, base_url: str = settings.BASE_URL):
         """
         BasePage クラスの初期化
@@ -24,6 +50,10 @@ class BasePage:
         self.driver = driver
         self.base_url = base_url
         self.actions = PageActions(driver)
+        # Element・Elements で宣言した要素のキャッシュ（属性名 → 要素）。ページ遷移で破棄する
+        self._element_cache: Dict[str, object] = {}
+        # 最後に計測したページ性能（measure_timing の結果）
+        self.last_timing: Optional[PageTiming] = None
     
     def open(self, path: str = ""):
         """
@@ -33,10 +63,99 @@ class BasePage:
             path: ページのパス
         """
         url = f"{self.base_url.rstrip('/')}/{path.lstrip('/')}"
+        self.invalidate_elements()
         self.driver.get(url)
-        self.actions.wait_for_page_load()
+        self.wait_until_ready()
+        self._measure_navigation("open")
+        return self
+    
+    def wait_until_ready(self, timeout: int = None):
+        """
+        ページを操作できる状態になるまで待機する
+        
+        READY_LOCATORS の要素が全て存在し、READY_NETWORK_IDLE の場合はネットワークが
+        アイドル状態になるまで待つ。条件が宣言されていない場合はページ読み込み戦略に従い、
+        normal と eager ではページ遷移のコマンドが既に待機しているため追加の確認を行わず、
+        none では読み込みの完了まで待つ。
+        
+        Args:
+            timeout: 待機時間（秒）
+        """
+        if self.READY_LOCATORS:
+            self.actions.wait_for_all_present(list(self.READY_LOCATORS), timeout)
+        elif not self.READY_NETWORK_IDLE and self.get_page_load_strategy() == "none":
+            self.actions.wait_for_page_load(timeout)
+        if self.READY_NETWORK_IDLE:
+            self.actions.wait_for_network_idle(timeout=timeout)
+        return self
+    
+    def measure_timing(self, action: str = "measure") -> PageTiming:
+        """
+        現在のページの Navigation Timing・Paint Timing・Resource Timing を1回のスクリプト実行で取得して記録し、
+        PERFORMANCE_BUDGETS と比較する
+        
+        Args:
+            action: 記録するページ遷移の種類（open, refresh, back, forward）
+        
+        Returns:
+            PageTiming: 計測結果
+        
+        Raises:
+            PerformanceBudgetExceeded: 予算を超え、予算超過時の動作が fail の場合
+        """
+        self.last_timing = measure_page(self.driver, type(self).__name__, action,
+                                        self.PERFORMANCE_BUDGETS, self.PERFORMANCE_BUDGET_ACTION)
+        return self.last_timing
+    
+    def _measure_navigation(self, action: str) -> None:
+        """ページ性能の計測が有効か、予算が宣言されている場合にページ遷移後の性能を計測する"""
+        if settings.PAGE_TIMING_ENABLED or self.PERFORMANCE_BUDGETS:
+            self.measure_timing(action)
+    
+    def invalidate_elements(self):
+        """
+        Element・Elements で宣言した要素のキャッシュを破棄する
+        
+        ページ遷移を伴うメソッドは自動で呼び出す。ページ遷移やDOMの書き換えを
+        driver を直接操作して行った場合に呼び出す（呼び出さなくても、同じURLのページでDOMから
+        外れた要素は操作時に探し直されるが、別のURLに遷移した場合は StaleElementReferenceException になる）。
+        """
+        self._element_cache.clear()
         return self
     
+    @classmethod
+    def declared_locators(cls) -> Dict[str, Tuple[By, str]]:
+        """
+        クラス属性として宣言されたロケーターを返す
+        
+        Returns:
+            Dict[str, Tuple[By, str]]: 属性名 → ロケーター
+        """
+        return find_declared_locators(cls)
+    
+    def check_locators(self, timeout: float = 0):
+        """
+        宣言された全てのロケーターを現在のページで1回のスクリプト実行で確認する
+        
+        Args:
+            timeout: 問題がなくなるまで確認を繰り返す最大時間（秒）
+        
+        Returns:
+            List[LocatorHealth]: ロケーターごとの一致した数・表示されている数・確認結果
+        """
+        return check_locators(self.driver, self.declared_locators(), self.OPTIONAL_LOCATORS,
+                              self.MULTIPLE_LOCATORS, timeout)
+    
+    def get_page_load_strategy(self) -> str:
+        """
+        セッションのページ読み込み戦略を返す
+        
+        Returns:
+            str: normal, eager, none のいずれか
+        """
+        strategy = getattr(self.driver, "caps", {}).get("pageLoadStrategy")
+        return strategy if strategy in ("normal", "eager", "none") else settings.PAGE_LOAD_STRATEGY
+    
     def get_title(self) -> str:
         """
         ページのタイトルを取得する
@@ -57,20 +176,26 @@ class BasePage:
     
     def navigate_back(self):
         """ブラウザの戻るボタンを押す"""
+        self.invalidate_elements()
         self.driver.back()
-        self.actions.wait_for_page_load()
+        self.wait_until_ready()
+        self._measure_navigation("back")
         return self
     
     def navigate_forward(self):
         """ブラウザの進むボタンを押す"""
+        self.invalidate_elements()
         self.driver.forward()
-        self.actions.wait_for_page_load()
+        self.wait_until_ready()
+        self._measure_navigation("forward")
         return self
     
     def refresh(self):
         """ページを更新する"""
+        self.invalidate_elements()
         self.driver.refresh()
-        self.actions.wait_for_page_load()
+        self.wait_until_ready()
+        self._measure_navigation("refresh")
         return self
     
     def execute_script(self, script: str, *args):
@@ -80,7 +205,7 @@ class BasePage:
         Args:
             script: 実行するJavaScript
             *args: スクリプトに渡す引数
-            
+        
         Returns:
             実行結果
         """
@@ -95,14 +220,8 @@ class BasePage:
             timeout: 待機時間（秒）
         """
         from selenium.webdriver.support import expected_conditions as EC
-        from selenium.webdriver.support.ui import WebDriverWait
         
-        if timeout is None:
-            timeout = settings.EXPLICIT_WAIT
-        
-        WebDriverWait(self.driver, timeout).until(
-            EC.url_contains(text)
-        )
+        self.actions.wait_until(EC.url_contains(text), timeout)
         return self
     
     def wait_for_title_contains(self, text: str, timeout: int = None):
@@ -114,14 +233,8 @@ class BasePage:
             timeout: 待機時間（秒）
         """
         from selenium.webdriver.support import expected_conditions as EC
-        from selenium.webdriver.support.ui import WebDriverWait
-        
-        if timeout is None:
-            timeout = settings.EXPLICIT_WAIT
         
-        WebDriverWait(self.driver, timeout).until(
-            EC.title_contains(text)
-        )
+        self.actions.wait_until(EC.title_contains(text), timeout)
         return self
     
     def take_screenshot(self, filename: str) -> str:
@@ -130,8 +243,27 @@ class BasePage:
         
         Args:
             filename: ファイル名
-            
+        
         Returns:
             str: スクリーンショットのパス
         """
-        return self.actions.take_screenshot(filename)
\ No newline at end of file
+        return self.actions.take_screenshot(filename)
+    
+    def compare_screenshot(self, name: str, locator: Optional[Tuple[By, str]] = None,
+                           mask_locators: Sequence[Tuple[By, str]] = (), comparer=None):
+        """
+        スクリーンショットをベースライン画像と比較する
+        
+        Args:
+            name: ベースラインの名前
+            locator: 撮影する要素のロケーター。Noneの場合は表示領域全体
+            mask_locators: 比較しない要素のロケーター（日時や広告など）
+            comparer: 使用するVisualComparer。Noneの場合はプロセス共通のもの
+        
+        Returns:
+            VisualDiff: 比較の結果
+        """
+        from src.visual import get_visual_comparer
+        
+        comparer = comparer or get_visual_comparer()
+        return comparer.check(self.driver, name, locator, mask_locators)
\ No newline at end of file
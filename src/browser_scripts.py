@@ -0,0 +1,456 @@
+"""
+ブラウザ内で実行するJavaScriptスニペット。
+複数の要素に対する処理を1回の execute_script にまとめるために使用します。
+"""
+
+# Seleniumのロケーター (By.*, 値) をブラウザ内で解決する関数。
+# 各スクリプトの先頭に連結して使用する。
+LOCATE_FUNCTION = """
+function __swtLocate(by, value, root) {
+    root = root || document;
+    var toArray = function (list) { return Array.prototype.slice.call(list); };
+    switch (by) {
+        case 'css selector':
+            return toArray(root.querySelectorAll(value));
+        case 'id':
+            return toArray(root.querySelectorAll('#' + CSS.escape(value)));
+        case 'name':
+            return toArray(root.querySelectorAll('[name="' + CSS.escape(value) + '"]'));
+        case 'class name':
+            return toArray(root.querySelectorAll('.' + CSS.escape(value)));
+        case 'tag name':
+            return toArray(root.getElementsByTagName(value));
+        case 'xpath':
+            var snapshot = document.evaluate(
+                value, root, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+            var nodes = [];
+            for (var i = 0; i < snapshot.snapshotLength; i++) {
+                nodes.push(snapshot.snapshotItem(i));
+            }
+            return nodes;
+        case 'link text':
+            return toArray(root.querySelectorAll('a')).filter(function (a) {
+                return (a.innerText || '').trim() === value;
+            });
+        case 'partial link text':
+            return toArray(root.querySelectorAll('a')).filter(function (a) {
+                return (a.innerText || '').indexOf(value) !== -1;
+            });
+        default:
+            throw new Error('Unsupported locator strategy: ' + by);
+    }
+}
+"""
+
+# 要素が表示されているかどうかを判定する式（elは判定対象の要素）
+IS_VISIBLE = (
+    "!!(el.offsetWidth || el.offsetHeight || el.getClientRects().length)"
+    " && window.getComputedStyle(el).visibility !== 'hidden'"
+)
+
+# 一致する全要素の表示テキストを取得する
+# WebElement.text と同じく、表示されていない要素（display: none など）は空文字列を返す
+# （innerText は display: none の要素では textContent を返すため、そのままでは一致しない）
+# arguments: [by, value]
+GET_TEXTS = LOCATE_FUNCTION + """
+var elements = __swtLocate(arguments[0], arguments[1]);
+return elements.map(function (el) {
+    return (""" + IS_VISIBLE + """) ? (el.innerText || '').trim() : '';
+});
+"""
+
+# 一致する全要素の属性値を取得する
+# arguments: [by, value, names]
+GET_ATTRIBUTES = LOCATE_FUNCTION + """
+var names = arguments[2];
+var elements = __swtLocate(arguments[0], arguments[1]);
+return elements.map(function (el) {
+    var values = {};
+    names.forEach(function (name) { values[name] = el.getAttribute(name); });
+    return values;
+});
+"""
+
+# 一致する全要素のDOMプロパティ値を取得する
+# arguments: [by, value, names]
+GET_PROPERTIES = LOCATE_FUNCTION + """
+var names = arguments[2];
+var elements = __swtLocate(arguments[0], arguments[1]);
+return elements.map(function (el) {
+    var values = {};
+    names.forEach(function (name) {
+        var value = el[name];
+        if (value !== null && typeof value === 'object' && !Array.isArray(value)) {
+            value = String(value);
+        }
+        values[name] = value === undefined ? null : value;
+    });
+    return values;
+});
+"""
+
+# wait_for_elementの待機条件に対応する判定式
+CONDITION_PREDICATES = {
+    "presence": "true",
+    "visibility": IS_VISIBLE,
+    "clickable": "(" + IS_VISIBLE + ") && !el.disabled",
+}
+
+# 条件を満たす最初の要素を返す関数。__PREDICATE__ は判定式に置き換える。
+# 判定式からは el（要素）と params（判定式の引数）を参照できる。
+_MATCH_FUNCTION = """
+function __swtMatch(by, value, params) {
+    var elements = __swtLocate(by, value);
+    for (var i = 0; i < elements.length; i++) {
+        var el = elements[i];
+        if (__PREDICATE__) {
+            return el;
+        }
+    }
+    return null;
+}
+"""
+
+# 条件を満たす要素を1回だけ探す
+# arguments: [by, value, params]
+_FIND_MATCHING = LOCATE_FUNCTION + _MATCH_FUNCTION + """
+return __swtMatch(arguments[0], arguments[1], arguments[2]);
+"""
+
+# 条件を満たす要素が現れるまでMutationObserverで待機する（execute_async_script用）
+# arguments: [by, value, params, 待機時間(ms), callback]
+# 時間内に見つからない場合はnullを返す。
+_OBSERVE_MATCHING = LOCATE_FUNCTION + _MATCH_FUNCTION + """
+var by = arguments[0], value = arguments[1], params = arguments[2], budget = arguments[3];
+var done = arguments[arguments.length - 1];
+var found = __swtMatch(by, value, params);
+if (found) {
+    done(found);
+    return;
+}
+var finished = false, observer = null, interval = null, timer = null;
+var finish = function (result) {
+    if (finished) {
+        return;
+    }
+    finished = true;
+    if (observer) { observer.disconnect(); }
+    clearInterval(interval);
+    clearTimeout(timer);
+    done(result);
+};
+var check = function () {
+    var el = __swtMatch(by, value, params);
+    if (el) {
+        finish(el);
+    }
+};
+observer = new MutationObserver(check);
+observer.observe(document.documentElement || document, {
+    childList: true, subtree: true, attributes: true, characterData: true
+});
+// スタイルシートやレイアウトの変化はMutationとして通知されないため、低頻度の確認も併用する
+interval = setInterval(check, 100);
+timer = setTimeout(function () { finish(null); }, budget);
+"""
+
+
+def find_matching_script(predicate: str) -> str:
+    """
+    条件を満たす最初の要素を返すスクリプトを作成する
+    
+    Args:
+        predicate: 判定式（el と params を参照できるJavaScriptの式）
+    
+    Returns:
+        str: execute_script用のスクリプト
+    """
+    return _FIND_MATCHING.replace("__PREDICATE__", predicate)
+
+
+def observe_matching_script(predicate: str) -> str:
+    """
+    条件を満たす要素が現れるまで待機するスクリプトを作成する
+    
+    Args:
+        predicate: 判定式（el と params を参照できるJavaScriptの式）
+    
+    Returns:
+        str: execute_async_script用のスクリプト
+    """
+    return _OBSERVE_MATCHING.replace("__PREDICATE__", predicate)
+
+# フォームの全フィールドを一度に探し、要素と種類を返す
+# arguments: [[[by, value], ...]]
+# 見つからないフィールドがある場合はnullを返す。
+FIND_FORM_FIELDS = LOCATE_FUNCTION + """
+var result = [];
+var locators = arguments[0];
+for (var i = 0; i < locators.length; i++) {
+    var el = __swtLocate(locators[i][0], locators[i][1])[0];
+    if (!el) {
+        return null;
+    }
+    result.push([el, el.tagName.toLowerCase(), (el.type || '').toLowerCase(), !!el.checked]);
+}
+return result;
+"""
+
+# セレクトボックスに値が一致するオプションがない場合に FILL_FORM が送出するエラーのメッセージ
+FILL_FORM_OPTION_ERROR = "Cannot locate option with value"
+
+# フォームの全フィールドに値を設定し、input/changeイベントを発生させる
+# arguments: [[[by, value, 値], ...]]
+# 見つからないフィールドがある場合は何も変更せずにnullを返す。
+# セレクトボックスに一致するオプションがない場合は、何も変更せずに FILL_FORM_OPTION_ERROR のエラーを送出する。
+FILL_FORM = LOCATE_FUNCTION + """
+var fields = arguments[0];
+var elements = [];
+var selectValues = function (value) {
+    return Array.isArray(value) ? value.map(String) : [String(value)];
+};
+for (var i = 0; i < fields.length; i++) {
+    var found = __swtLocate(fields[i][0], fields[i][1])[0];
+    if (!found) {
+        return null;
+    }
+    elements.push(found);
+}
+for (var j = 0; j < elements.length; j++) {
+    if (elements[j].tagName.toLowerCase() !== 'select') {
+        continue;
+    }
+    var optionValues = Array.prototype.map.call(elements[j].options, function (option) {
+        return option.value;
+    });
+    var missing = selectValues(fields[j][2]).filter(function (value) {
+        return optionValues.indexOf(value) === -1;
+    });
+    if (missing.length) {
+        throw new Error('""" + FILL_FORM_OPTION_ERROR + """: ' + missing.join(', '));
+    }
+}
+var setNativeValue = function (el, value) {
+    // Reactなどのフレームワークが値の変更を検知できるよう、ネイティブのsetterを使用する
+    var proto = Object.getPrototypeOf(el);
+    var descriptor = Object.getOwnPropertyDescriptor(proto, 'value');
+    if (descriptor && descriptor.set) {
+        descriptor.set.call(el, value);
+    } else {
+        el.value = value;
+    }
+};
+elements.forEach(function (el, i) {
+    var value = fields[i][2];
+    var tag = el.tagName.toLowerCase();
+    var type = (el.type || '').toLowerCase();
+    if (tag === 'select') {
+        var values = selectValues(value);
+        Array.prototype.forEach.call(el.options, function (option) {
+            var selected = values.indexOf(option.value) !== -1;
+            if (selected || el.multiple) {
+                option.selected = selected;
+            }
+        });
+    } else if (type === 'checkbox' || type === 'radio') {
+        el.checked = !!value;
+    } else {
+        el.focus();
+        setNativeValue(el, String(value));
+    }
+    el.dispatchEvent(new Event('input', {bubbles: true}));
+    el.dispatchEvent(new Event('change', {bubbles: true}));
+});
+return true;
+"""
+
+# 全てのロケーターに一致する要素が存在するかどうかを返す
+# arguments: [[[by, value], ...]]
+ALL_PRESENT = LOCATE_FUNCTION + """
+var locators = arguments[0];
+for (var i = 0; i < locators.length; i++) {
+    if (__swtLocate(locators[i][0], locators[i][1]).length === 0) {
+        return false;
+    }
+}
+return true;
+"""
+
+# 読み込み状態を返す
+READY_STATE = "return document.readyState"
+
+# 読み込み状態と読み込みが完了したリソースの数を返す（ネットワークのアイドル判定に使用）
+NETWORK_STATE = "return [document.readyState, performance.getEntriesByType('resource').length];"
+
+# 現在のオリジンとlocalStorage・sessionStorageの内容を返す（セッション状態の保存に使用）
+CAPTURE_STORAGE = """
+var dump = function (storage) {
+    var values = {};
+    for (var i = 0; i < storage.length; i++) {
+        var key = storage.key(i);
+        values[key] = storage.getItem(key);
+    }
+    return values;
+};
+return [window.location.origin, dump(window.localStorage), dump(window.sessionStorage)];
+"""
+
+# localStorage・sessionStorageに値を設定する（セッション状態の復元に使用）
+# arguments: [localStorageの値, sessionStorageの値]
+RESTORE_STORAGE = """
+var load = function (storage, values) {
+    Object.keys(values).forEach(function (key) { storage.setItem(key, values[key]); });
+};
+load(window.localStorage, arguments[0]);
+load(window.sessionStorage, arguments[1]);
+"""
+
+# 一致する全要素の範囲と devicePixelRatio を返す（ビジュアル比較で無視する領域に使用）
+# 基準の要素を指定した場合は、その要素の左上からの位置を返す
+# arguments: [[[by, value], ...], 基準の要素のロケーター [by, value] または null]
+ELEMENT_RECTS = LOCATE_FUNCTION + """
+var origin = {left: 0, top: 0};
+if (arguments[1]) {
+    var base = __swtLocate(arguments[1][0], arguments[1][1])[0];
+    if (base) {
+        origin = base.getBoundingClientRect();
+    }
+}
+var rects = [];
+arguments[0].forEach(function (locator) {
+    __swtLocate(locator[0], locator[1]).forEach(function (el) {
+        var rect = el.getBoundingClientRect();
+        rects.push([rect.left - origin.left, rect.top - origin.top, rect.width, rect.height]);
+    });
+});
+return [window.devicePixelRatio || 1, rects];
+"""
+
+# 失敗したロケーターの周辺のDOMを返す（DOMスナップショットに使用）
+# 一致する要素がない場合は、CSSセレクターとXPathの末尾を削りながら存在する最も近い祖先を探す
+# 入力中の値は value 属性に写し（パスワードを除く）、script・style・noscript は除く
+# arguments: [by または null, value, 祖先の階層数, 最大文字数]
+DOM_SNAPSHOT = LOCATE_FUNCTION + """
+var by = arguments[0], value = arguments[1], levels = arguments[2], maxChars = arguments[3];
+var node = null, matched = 0, used = null, current = value;
+while (by && current) {
+    var found = [];
+    try {
+        found = __swtLocate(by, current);
+    } catch (e) {
+        found = [];
+    }
+    if (found.length > 0) {
+        node = found[0];
+        used = current;
+        matched = current === value ? found.length : 0;
+        break;
+    }
+    var next = '';
+    if (by === 'css selector') {
+        next = current.replace(/\\s*[>+~]?\\s*[^\\s>+~]+\\s*$/, '');
+    } else if (by === 'xpath') {
+        next = current.replace(/\\/+[^\\/]*$/, '');
+    }
+    if (next === current) {
+        break;
+    }
+    current = next;
+}
+var root = node || document.body || document.documentElement;
+for (var i = 0; node && i < levels && root.parentElement; i++) {
+    root = root.parentElement;
+}
+var clone = root.cloneNode(true);
+var fields = 'input, textarea, select';
+var live = root.querySelectorAll(fields), copies = clone.querySelectorAll(fields);
+for (var j = 0; j < live.length; j++) {
+    if (live[j].type !== 'password') {
+        copies[j].setAttribute('value', live[j].value);
+    }
+}
+Array.prototype.forEach.call(clone.querySelectorAll('script, style, noscript'), function (el) {
+    el.parentNode.removeChild(el);
+});
+var html = clone.outerHTML;
+var describe = function (el) {
+    return el.tagName.toLowerCase() + (el.id ? '#' + el.id : '') +
+        (typeof el.className === 'string' && el.className.trim()
+            ? '.' + el.className.trim().split(/\\s+/).join('.') : '');
+};
+return {
+    url: window.location.href,
+    title: document.title,
+    root: describe(root),
+    used: used,
+    matched: matched,
+    truncated: html.length > maxChars,
+    html: html.slice(0, maxChars)
+};
+"""
+
+# ロケーターごとに一致する要素の数と表示されている要素の数を返す（ロケーターの一括確認に使用）
+# 評価できないロケーター（セレクターの構文エラーなど）はエラーメッセージを返す
+# arguments: [[[by, value], ...]]
+# 戻り値: [[一致した数, 表示されている数, エラーまたはnull], ...]
+CHECK_LOCATORS = LOCATE_FUNCTION + """
+return arguments[0].map(function (locator) {
+    var elements;
+    try {
+        elements = __swtLocate(locator[0], locator[1]);
+    } catch (e) {
+        return [0, 0, String(e.message || e)];
+    }
+    var visible = elements.filter(function (el) { return """ + IS_VISIBLE + """; }).length;
+    return [elements.length, visible, null];
+});
+"""
+
+# Navigation Timing・Paint Timing・Resource Timing を1回で取得する（ページ性能の計測に使用）
+# 時刻はナビゲーションの開始からのミリ秒。まだ発生していないイベント（loadなど）は null を返す
+# arguments: [返すリソースの最大数（所要時間の長い順）]
+# restored: このドキュメントを既に計測したか、バックフォワードキャッシュから復元された場合は true
+# （復元されたページのエントリは最初の読み込みのままで、戻る・進むの計測にはならない）
+PAGE_TIMING = """
+var restored = window.__swtTimingMeasured === true
+    || performance.getEntriesByType('back-forward-cache-restoration').length > 0;
+window.__swtTimingMeasured = true;
+var round = function (value) { return Math.round(value * 10) / 10; };
+var since = function (value) { return value > 0 ? round(value) : null; };
+var nav = performance.getEntriesByType('navigation')[0];
+var navigation = nav ? {
+    url: nav.name,
+    type: nav.type,
+    dns: round(nav.domainLookupEnd - nav.domainLookupStart),
+    connect: round(nav.connectEnd - nav.connectStart),
+    ttfb: since(nav.responseStart),
+    response_end: since(nav.responseEnd),
+    dom_interactive: since(nav.domInteractive),
+    dom_content_loaded: since(nav.domContentLoadedEventEnd),
+    load: since(nav.loadEventEnd),
+    transfer_size: nav.transferSize || 0
+} : null;
+var paint = {};
+performance.getEntriesByType('paint').forEach(function (entry) { paint[entry.name] = round(entry.startTime); });
+var entries = performance.getEntriesByType('resource');
+var bytes = 0;
+entries.forEach(function (entry) { bytes += entry.transferSize || 0; });
+var resources = entries.slice().sort(function (a, b) { return b.duration - a.duration; })
+    .slice(0, arguments[0]).map(function (entry) {
+        return {
+            name: entry.name,
+            type: entry.initiatorType,
+            start: round(entry.startTime),
+            duration: round(entry.duration),
+            transfer_size: entry.transferSize || 0
+        };
+    });
+return {
+    navigation: navigation,
+    restored: restored,
+    paint: paint,
+    resource_count: entries.length,
+    resource_bytes: bytes,
+    resources: resources
+};
+"""
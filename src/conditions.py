@@ -0,0 +1,183 @@
+"""
+複合待機条件。
+visible & enabled & text_contains("OK") のように組み合わせた条件を1つのJavaScriptの判定式に変換し、
+ブラウザ内で1回のスクリプト実行で評価します。
+
+使用例:
+    from src.conditions import visible, enabled, not_covered, text_contains
+    
+    button = actions.wait_for_element(LOGIN_BUTTON, condition=visible & enabled & not_covered)
+    button.click()
+"""
+
+import re
+from typing import Any, List, Tuple
+
+from src import browser_scripts
+
+
+class Condition:
+    """ブラウザ内で評価する要素の条件"""
+    
+    def __init__(self, expression: str, params: Tuple[Any, ...] = (), description: str = ""):
+        """
+        Conditionクラスの初期化
+        
+        Args:
+            expression: 判定式。el で要素を、$0, $1, ... で params を参照できる
+            params: 判定式の引数（JSONに変換できる値）
+            description: 条件の説明（エラーメッセージ用）
+        """
+        self.expression = expression
+        self.params = tuple(params)
+        self.description = description or expression
+    
+    def __and__(self, other: "Condition") -> "Condition":
+        return _Composite("&&", self, other)
+    
+    def __or__(self, other: "Condition") -> "Condition":
+        return _Composite("||", self, other)
+    
+    def __invert__(self) -> "Condition":
+        return _Not(self)
+    
+    def __repr__(self) -> str:
+        return f"Condition({self.description})"
+    
+    def compile(self) -> Tuple[str, List[Any]]:
+        """
+        条件をJavaScriptの判定式と引数のリストに変換する
+        
+        Returns:
+            Tuple[str, List[Any]]: (el と params を参照する判定式, params)
+        """
+        params: List[Any] = []
+        return self._render(params), params
+    
+    def _render(self, params: List[Any]) -> str:
+        """引数を params に追加し、$n を params[i] に置き換えた判定式を返す"""
+        offset = len(params)
+        params.extend(self.params)
+        return "(" + re.sub(r"\$(\d+)", lambda m: f"params[{offset + int(m.group(1))}]", self.expression) + ")"
+
+
+class _Composite(Condition):
+    """2つの条件を && または || で組み合わせた条件"""
+    
+    def __init__(self, operator: str, left: Condition, right: Condition):
+        word = "&" if operator == "&&" else "|"
+        super().__init__("", (), f"{left.description} {word} {right.description}")
+        self.operator = operator
+        self.left = left
+        self.right = right
+    
+    def _render(self, params: List[Any]) -> str:
+        return f"({self.left._render(params)} {self.operator} {self.right._render(params)})"
+
+
+class _Not(Condition):
+    """条件を否定した条件"""
+    
+    def __init__(self, inner: Condition):
+        super().__init__("", (), f"not {inner.description}")
+        self.inner = inner
+    
+    def _render(self, params: List[Any]) -> str:
+        return f"!{self.inner._render(params)}"
+
+
+# 要素が存在する
+present = Condition("true", description="present")
+
+# 要素が表示されている
+visible = Condition(browser_scripts.IS_VISIBLE, description="visible")
+
+# 要素が有効（disabledでない）
+enabled = Condition("!el.disabled", description="enabled")
+
+# チェックボックスやオプションが選択されている
+selected = Condition("!!(el.checked || el.selected)", description="selected")
+
+# 要素の中心が他の要素に覆われていない（画面外の場合はクリック時にスクロールされるため真とする）
+not_covered = Condition(
+    "(function () {"
+    " var r = el.getBoundingClientRect();"
+    " if (!r.width || !r.height) { return false; }"
+    " var x = r.left + r.width / 2, y = r.top + r.height / 2;"
+    " if (x < 0 || y < 0 || x > window.innerWidth || y > window.innerHeight) { return true; }"
+    " var top = document.elementFromPoint(x, y);"
+    " return !!top && (top === el || el.contains(top));"
+    " })()",
+    description="not_covered",
+)
+
+# クリックできる（表示されていて有効）
+clickable = visible & enabled
+
+
+def text_contains(text: str) -> Condition:
+    """
+    要素のテキストに指定した文字列が含まれる
+    
+    Args:
+        text: 含まれるべき文字列
+    
+    Returns:
+        Condition: 条件
+    """
+    return Condition("(el.innerText || el.textContent || '').indexOf($0) !== -1", (text,),
+                     f"text_contains({text!r})")
+
+
+def text_equals(text: str) -> Condition:
+    """
+    要素の前後の空白を除いたテキストが指定した文字列と一致する
+    
+    Args:
+        text: 一致するべき文字列
+    
+    Returns:
+        Condition: 条件
+    """
+    return Condition("(el.innerText || el.textContent || '').trim() === $0", (text,),
+                     f"text_equals({text!r})")
+
+
+def attribute_equals(name: str, value: str) -> Condition:
+    """
+    要素の属性値が指定した値と一致する
+    
+    Args:
+        name: 属性名
+        value: 一致するべき値
+    
+    Returns:
+        Condition: 条件
+    """
+    return Condition("el.getAttribute($0) === $1", (name, value), f"attribute_equals({name!r}, {value!r})")
+
+
+def value_equals(value: str) -> Condition:
+    """
+    入力要素の値が指定した値と一致する
+    
+    Args:
+        value: 一致するべき値
+    
+    Returns:
+        Condition: 条件
+    """
+    return Condition("el.value === $0", (value,), f"value_equals({value!r})")
+
+
+def has_class(name: str) -> Condition:
+    """
+    要素が指定したクラスを持つ
+    
+    Args:
+        name: クラス名
+    
+    Returns:
+        Condition: 条件
+    """
+    return Condition("el.classList.contains($0)", (name,), f"has_class({name!r})")
@@ -0,0 +1,188 @@
+"""
+DOMスナップショット。
+テストの失敗時に、失敗したロケーターの周辺のDOMを1回のスクリプト実行で取得し、
+実行・ワーカーごとのZIPアーカイブに圧縮して保存します。スクリーンショットより小さく速いため、
+成功したテストの一部も低いコストで記録できます。
+
+保存先:
+    {SCREENSHOT_DIR}/{実行ID}/{ワーカーID}/dom_snapshots.zip
+"""
+
+import itertools
+import os
+import threading
+import time
+import zipfile
+import zlib
+from typing import Dict, Optional, Tuple
+
+from config import settings
+from src import browser_scripts
+from src.artifact_writer import get_artifact_writer
+from src.artifacts import artifact_dir, get_capture_stats
+
+ARCHIVE_NAME = "dom_snapshots.zip"
+
+# 取得の集計に使用する成果物の種類
+CAPTURE_KIND = "dom snapshot"
+
+
+def should_sample(nodeid: str, rate: float) -> bool:
+    """
+    成功したテストのスナップショットを取得するかどうかを返す
+    
+    nodeidのハッシュで決めるため、同じテストは実行のたびに同じ結果になる。
+    
+    Args:
+        nodeid: テストのnodeid
+        rate: 取得する割合（0〜1）
+    
+    Returns:
+        bool: 取得する場合はTrue
+    """
+    if rate <= 0:
+        return False
+    return zlib.crc32(nodeid.encode("utf-8")) / 0xFFFFFFFF < rate
+
+
+def format_snapshot(snapshot: Dict, locator: Optional[Tuple[str, str]] = None) -> str:
+    """
+    スクリプトの結果を、取得時の状況をコメントに記したHTMLに変換する
+    
+    Args:
+        snapshot: DOM_SNAPSHOT の結果
+        locator: 失敗したロケーター
+    
+    Returns:
+        str: 保存するHTML
+    """
+    lines = [
+        f"url: {snapshot['url']}",
+        f"title: {snapshot['title']}",
+    ]
+    if locator is not None:
+        lines.append(f"locator: {locator[0]}={locator[1]} (一致: {snapshot['matched']}件)")
+        if snapshot["matched"] == 0 and snapshot["used"]:
+            lines.append(f"存在する最も近い祖先: {snapshot['used']}")
+    lines.append(f"root: {snapshot['root']}" + (" (途中まで)" if snapshot["truncated"] else ""))
+    # HTMLコメントを閉じる文字列が含まれないようにする
+    header = "\n".join(lines).replace("--", "- -")
+    return f"<!--\n{header}\n-->\n{snapshot['html']}\n"
+
+
+class DomSnapshotArchive:
+    """DOMスナップショットを圧縮して追記するZIPアーカイブ"""
+    
+    def __init__(self, path: str, compresslevel: int = 6):
+        """
+        DomSnapshotArchiveクラスの初期化
+        
+        Args:
+            path: アーカイブのパス（最初の追加時に作成する）
+            compresslevel: Deflateの圧縮レベル（1〜9）
+        """
+        self.path = path
+        self.compresslevel = compresslevel
+        self._zip: Optional[zipfile.ZipFile] = None
+        self._sequence = itertools.count(1)
+        self._lock = threading.Lock()
+    
+    def add(self, name: str, content: str) -> int:
+        """
+        スナップショットを圧縮してアーカイブに追加する
+        
+        Args:
+            name: エントリーの名前（拡張子なし）。連番を付けて重複を避ける
+            content: 保存するHTML
+        
+        Returns:
+            int: 圧縮後のバイト数
+        """
+        with self._lock:
+            if self._zip is None:
+                os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+                # compresslevel は Python 3.7 以降で指定できる
+                self._zip = zipfile.ZipFile(self.path, "a", zipfile.ZIP_DEFLATED, compresslevel=self.compresslevel)
+            entry = f"{name}_{next(self._sequence):04d}.html"
+            self._zip.writestr(entry, content.encode("utf-8"))
+            return self._zip.getinfo(entry).compress_size
+    
+    def close(self) -> None:
+        """アーカイブを閉じる（中央ディレクトリを書き込む）"""
+        with self._lock:
+            if self._zip is not None:
+                self._zip.close()
+                self._zip = None
+
+
+_default_archive: Optional[DomSnapshotArchive] = None
+_default_archive_lock = threading.Lock()
+
+
+def get_dom_archive() -> DomSnapshotArchive:
+    """
+    現在の実行・ワーカーのアーカイブを返す
+    
+    Returns:
+        DomSnapshotArchive: 共通のアーカイブ
+    """
+    global _default_archive
+    with _default_archive_lock:
+        if _default_archive is None:
+            _default_archive = DomSnapshotArchive(os.path.join(artifact_dir(settings.SCREENSHOT_DIR), ARCHIVE_NAME))
+        return _default_archive
+
+
+def close_dom_archive() -> Optional[DomSnapshotArchive]:
+    """
+    現在の実行・ワーカーのアーカイブを閉じる（成果物のライターを停止した後に呼び出す）
+    
+    Returns:
+        Optional[DomSnapshotArchive]: 閉じたアーカイブ。使用されていない場合はNone
+    """
+    global _default_archive
+    with _default_archive_lock:
+        archive, _default_archive = _default_archive, None
+    if archive is not None:
+        archive.close()
+    return archive
+
+
+def capture_dom_snapshot(driver, name: str, locator: Optional[Tuple[str, str]] = None,
+                         ancestor_levels: int = settings.DOM_SNAPSHOT_ANCESTOR_LEVELS,
+                         max_chars: int = settings.DOM_SNAPSHOT_MAX_CHARS) -> str:
+    """
+    DOMスナップショットを取得してアーカイブに保存する
+    
+    locator を指定した場合は、一致した要素（一致しない場合は存在する最も近い祖先）から
+    ancestor_levels 階層上の要素の部分木だけを取得する。ASYNC_ARTIFACTSが有効な場合、
+    圧縮と書き込みはバックグラウンドのライターで行う。
+    
+    Args:
+        driver: Seleniumのwebdriverインスタンス
+        name: エントリーの名前
+        locator: 失敗したロケーター。Noneの場合は body 全体
+        ancestor_levels: 要素から何階層上の要素までを取得するか
+        max_chars: 取得するHTMLの最大文字数
+    
+    Returns:
+        str: アーカイブのパス
+    """
+    start = time.perf_counter()
+    by, value = locator if locator is not None else (None, None)
+    snapshot = driver.execute_script(browser_scripts.DOM_SNAPSHOT, by, value, ancestor_levels, max_chars)
+    content = format_snapshot(snapshot, locator)
+    stats = get_capture_stats()
+    stats.record(CAPTURE_KIND, time.perf_counter() - start, len(content.encode("utf-8")))
+    archive = get_dom_archive()
+    
+    def task():
+        size = archive.add(name, content)
+        stats.record_stored(CAPTURE_KIND, size)
+        return size
+    
+    if settings.ASYNC_ARTIFACTS:
+        get_artifact_writer().submit_task(archive.path, task)
+    else:
+        task()
+    return archive.path
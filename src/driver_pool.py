@@ -0,0 +1,250 @@
+"""
+WebDriverのプール。
+起動済みのブラウザをテストクラス間で再利用し、起動と終了のコストを削減します。
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional
+
+from config import settings
+
+if TYPE_CHECKING:
+    from selenium.webdriver.remote.webdriver import WebDriver
+
+# 現在のオリジンのWeb Storageを消去するスクリプト（他のオリジンのWeb Storageは消去されない）
+CLEAR_STORAGE_SCRIPT = """
+try { window.localStorage.clear(); } catch (e) {}
+try { window.sessionStorage.clear(); } catch (e) {}
+"""
+
+
+def reset_driver_state(driver: WebDriver) -> None:
+    """
+    ブラウザの状態を再利用できる状態に戻す
+    
+    余分なウィンドウを閉じ、Web Storageとクッキーを消去して about:blank に移動する。
+    クッキーは全ドメインを消去するが、Web Storageはスクリプトで消去するため
+    返却時に開いているページのオリジンの分だけが消去される。テスト中に訪れた
+    他のオリジンのlocalStorageは次のテストに残るため、オリジンをまたいで
+    localStorageに依存するテストではプールを無効にすること。
+    
+    Args:
+        driver: Seleniumのwebdriverインスタンス
+    """
+    handles = driver.window_handles
+    if len(handles) > 1:
+        for handle in handles[1:]:
+            driver.switch_to.window(handle)
+            driver.close()
+    driver.switch_to.window(handles[0])
+    
+    driver.execute_script(CLEAR_STORAGE_SCRIPT)
+    if hasattr(driver, "execute_cdp_cmd"):
+        # Chromium系ではCDPで全ドメインのクッキーを消去できる
+        driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+    else:
+        driver.delete_all_cookies()
+    driver.get("about:blank")
+
+
+def is_driver_healthy(driver: WebDriver) -> bool:
+    """
+    ドライバのセッションが応答するかどうかを確認する
+    
+    Args:
+        driver: Seleniumのwebdriverインスタンス
+    
+    Returns:
+        bool: 応答する場合はTrue、そうでない場合はFalse
+    """
+    try:
+        driver.current_window_handle
+        return True
+    except Exception:
+        return False
+
+
+class PooledDriver:
+    """プールで管理されるドライバの情報"""
+    
+    def __init__(self, driver: WebDriver, key: str, startup_seconds: float):
+        """
+        PooledDriverクラスの初期化
+        
+        Args:
+            driver: Seleniumのwebdriverインスタンス
+            key: ドライバの種類を表すキー（ブラウザ名など）
+            startup_seconds: ドライバの起動にかかった時間（秒）
+        """
+        self.driver = driver
+        self.key = key
+        self.startup_seconds = startup_seconds
+        self.uses = 0
+
+
+class DriverPool:
+    """起動済みのWebDriverを再利用するプール"""
+    
+    def __init__(self, factory: Callable[[str], WebDriver],
+                 max_reuse: int = settings.DRIVER_POOL_MAX_REUSE,
+                 max_idle: int = settings.DRIVER_POOL_MAX_IDLE):
+        """
+        DriverPoolクラスの初期化
+        
+        Args:
+            factory: キーを受け取り新しいドライバを起動する関数
+            max_reuse: 1つのドライバを再利用する最大回数。超えた場合は終了して起動し直す
+            max_idle: キーごとに保持する未使用ドライバの最大数
+        """
+        self.factory = factory
+        self.max_reuse = max_reuse
+        self.max_idle = max_idle
+        self._idle: Dict[str, List[PooledDriver]] = {}
+        self._in_use: Dict[int, PooledDriver] = {}
+        self._lock = threading.Lock()
+        
+        # 統計情報
+        self.launches = 0
+        self.reuses = 0
+        self.recycled = 0
+        self.discarded = 0
+        self.startup_seconds = 0.0
+    
+    def acquire(self, key: str = "default") -> WebDriver:
+        """
+        ドライバを取得する。未使用のドライバがあれば再利用し、なければ起動する
+        
+        Args:
+            key: ドライバの種類を表すキー（ブラウザ名など）
+        
+        Returns:
+            WebDriver: 使用可能なドライバ
+        """
+        while True:
+            with self._lock:
+                idle = self._idle.get(key)
+                entry = idle.pop() if idle else None
+            if entry is None:
+                break
+            if is_driver_healthy(entry.driver):
+                entry.uses += 1
+                with self._lock:
+                    self._in_use[id(entry.driver)] = entry
+                    self.reuses += 1
+                return entry.driver
+            self._retire(entry, "discarded")
+        
+        start = time.perf_counter()
+        driver = self.factory(key)
+        entry = PooledDriver(driver, key, time.perf_counter() - start)
+        entry.uses = 1
+        with self._lock:
+            self._in_use[id(driver)] = entry
+            self.launches += 1
+            self.startup_seconds += entry.startup_seconds
+        return driver
+    
+    def release(self, driver: WebDriver, discard: bool = False) -> None:
+        """
+        ドライバをプールに返却する
+        
+        返却時に状態をリセットする。リセットに失敗した場合や再利用回数の上限に
+        達した場合はドライバを終了する。
+        
+        Args:
+            driver: 返却するドライバ
+            discard: Trueの場合は再利用せずに終了する
+        """
+        with self._lock:
+            entry = self._in_use.pop(id(driver), None)
+        if entry is None:
+            driver.quit()
+            return
+        
+        if discard:
+            self._retire(entry, "discarded")
+            return
+        if entry.uses >= self.max_reuse:
+            self._retire(entry, "recycled")
+            return
+        
+        try:
+            reset_driver_state(driver)
+        except Exception:
+            self._retire(entry, "discarded")
+            return
+        
+        with self._lock:
+            idle = self._idle.setdefault(entry.key, [])
+            if len(idle) < self.max_idle:
+                idle.append(entry)
+                return
+        self._quit(entry)
+    
+    def close(self) -> None:
+        """プールが保持する全てのドライバを終了する"""
+        with self._lock:
+            entries = [entry for idle in self._idle.values() for entry in idle]
+            entries.extend(self._in_use.values())
+            self._idle.clear()
+            self._in_use.clear()
+        for entry in entries:
+            self._quit(entry)
+    
+    def average_startup_seconds(self) -> float:
+        """
+        ドライバの平均起動時間を返す
+        
+        Returns:
+            float: 平均起動時間（秒）
+        """
+        if self.launches == 0:
+            return 0.0
+        return self.startup_seconds / self.launches
+    
+    def estimated_seconds_saved(self) -> float:
+        """
+        再利用によって節約できた起動時間の推定値を返す
+        
+        Returns:
+            float: 節約できた時間（秒）
+        """
+        return self.reuses * self.average_startup_seconds()
+    
+    def summary(self) -> Optional[str]:
+        """
+        プールの利用状況を表す文字列を返す
+        
+        Returns:
+            Optional[str]: 一度もドライバを起動していない場合はNone
+        """
+        if self.launches == 0:
+            return None
+        return (
+            f"起動: {self.launches}回 (平均 {self.average_startup_seconds():.2f}秒), "
+            f"再利用: {self.reuses}回, リサイクル: {self.recycled}回, 破棄: {self.discarded}回, "
+            f"節約した起動時間: 約{self.estimated_seconds_saved():.1f}秒"
+        )
+    
+    def _retire(self, entry: PooledDriver, counter: str) -> None:
+        """
+        ドライバを終了し、統計情報のカウンターをロック内で加算する
+        
+        Args:
+            entry: 終了するドライバの情報
+            counter: 加算するカウンターの属性名（"recycled" または "discarded"）
+        """
+        self._quit(entry)
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+    
+    @staticmethod
+    def _quit(entry: PooledDriver) -> None:
+        """ドライバを終了する。終了時のエラーは無視する"""
+        try:
+            entry.driver.quit()
+        except Exception:
+            pass
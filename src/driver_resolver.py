@@ -0,0 +1,378 @@
+"""
+ドライバのバイナリの解決とブラウザ起動時間の計測。
+解決したドライバのパスをブラウザのバージョンごとにマニフェストへ保存し、
+2回目以降の起動ではバージョン確認やダウンロードを行わずに再利用します。
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import re
+import shutil
+import subprocess
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Callable, Dict, Iterator, List, Optional
+
+from selenium.common.exceptions import WebDriverException
+
+from config import settings
+
+if TYPE_CHECKING:
+    from selenium.webdriver.remote.webdriver import WebDriver
+
+# ブラウザのバイナリの候補（PATH上のコマンド名、またはフルパス）
+BROWSER_BINARIES = {
+    "chrome": [
+        "google-chrome", "google-chrome-stable", "chromium", "chromium-browser",
+        "/Applications/Google Chrome.app/Contents/MacOS/Google Chrome",
+    ],
+    "firefox": [
+        "firefox",
+        "/Applications/Firefox.app/Contents/MacOS/firefox",
+    ],
+    "edge": [
+        "microsoft-edge", "microsoft-edge-stable", "msedge",
+        "/Applications/Microsoft Edge.app/Contents/MacOS/Microsoft Edge",
+    ],
+}
+
+# 起動時間の内訳の項目
+STARTUP_PHASES = ("resolve", "spawn", "session", "window_size")
+
+
+def find_browser_binary(browser_name: str) -> Optional[str]:
+    """
+    ブラウザのバイナリのパスを探す
+    
+    Args:
+        browser_name: ブラウザ名
+    
+    Returns:
+        Optional[str]: バイナリのパス。見つからない場合はNone
+    """
+    for candidate in BROWSER_BINARIES.get(browser_name, []):
+        path = candidate if os.path.isabs(candidate) else shutil.which(candidate)
+        if path and os.path.isfile(path):
+            return path
+    return None
+
+
+def parse_major_version(output: str) -> Optional[str]:
+    """
+    `--version` の出力からメジャーバージョンを取り出す
+    
+    Args:
+        output: 例: "Google Chrome 120.0.6099.109"
+    
+    Returns:
+        Optional[str]: メジャーバージョン。例: "120"
+    """
+    match = re.search(r"(\d+)\.\d+", output)
+    return match.group(1) if match else None
+
+
+class StartupProfile:
+    """1回のブラウザ起動にかかった時間の内訳"""
+    
+    def __init__(self):
+        """StartupProfileクラスの初期化"""
+        self.phases: Dict[str, float] = {}
+    
+    def add(self, phase: str, seconds: float) -> None:
+        """
+        所要時間を加える
+        
+        Args:
+            phase: 項目名（resolve, spawn, session, window_size）
+            seconds: 所要時間（秒）
+        """
+        self.phases[phase] = self.phases.get(phase, 0.0) + max(seconds, 0.0)
+    
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """
+        with文の中の処理の所要時間を加える
+        
+        Args:
+            name: 項目名
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - start)
+    
+    @property
+    def total(self) -> float:
+        """合計時間（秒）"""
+        return sum(self.phases.values())
+
+
+class StartupStats:
+    """ブラウザごとの起動時間の集計"""
+    
+    def __init__(self):
+        """StartupStatsクラスの初期化"""
+        self.profiles: Dict[str, List[StartupProfile]] = {}
+        self._lock = threading.Lock()
+    
+    def add(self, browser_name: str, profile: StartupProfile) -> None:
+        """
+        起動時間の内訳を記録する
+        
+        Args:
+            browser_name: ブラウザ名
+            profile: 起動時間の内訳
+        """
+        with self._lock:
+            self.profiles.setdefault(browser_name, []).append(profile)
+    
+    def summary_lines(self) -> List[str]:
+        """
+        ブラウザごとの平均の内訳を表す行を返す
+        
+        Returns:
+            List[str]: 表の行。起動していない場合は空のリスト
+        """
+        if not self.profiles:
+            return []
+        lines = [f"{'browser':<10}{'launches':>9}" + "".join(f"{phase:>13}" for phase in STARTUP_PHASES)
+                 + f"{'total':>9}"]
+        for browser_name, profiles in sorted(self.profiles.items()):
+            count = len(profiles)
+            averages = [sum(p.phases.get(phase, 0.0) for p in profiles) / count for phase in STARTUP_PHASES]
+            total = sum(p.total for p in profiles) / count
+            lines.append(f"{browser_name:<10}{count:>9}" + "".join(f"{value:>12.2f}s" for value in averages)
+                         + f"{total:>8.2f}s")
+        return lines
+
+
+def start_driver(driver_class: Callable[..., WebDriver], service, options,
+                 profile: Optional[StartupProfile] = None) -> WebDriver:
+    """
+    ドライバを起動し、プロセスの起動とセッションの作成の時間を計測する
+    
+    service.start の呼び出しを計測し、それより前（Selenium Managerによる解決など）を resolve、
+    service.start を spawn、それより後を session として記録する。
+    
+    Args:
+        driver_class: webdriver.Chrome などのドライバのクラス
+        service: ドライバのService
+        options: ブラウザのオプション
+        profile: 所要時間を記録する StartupProfile
+    
+    Returns:
+        WebDriver: 起動したドライバ
+    """
+    profile = profile if profile is not None else StartupProfile()
+    original_start = service.start
+    spawn: Dict[str, float] = {}
+    
+    def timed_start(*args, **kwargs):
+        spawn["start"] = time.perf_counter()
+        try:
+            return original_start(*args, **kwargs)
+        finally:
+            spawn["end"] = time.perf_counter()
+    
+    service.start = timed_start
+    began = time.perf_counter()
+    try:
+        driver = driver_class(service=service, options=options)
+    finally:
+        service.start = original_start
+    finished = time.perf_counter()
+    
+    if spawn:
+        profile.add("resolve", spawn["start"] - began)
+        profile.add("spawn", spawn["end"] - spawn["start"])
+        profile.add("session", finished - spawn["end"])
+    else:
+        profile.add("session", finished - began)
+    return driver
+
+
+class DriverResolver:
+    """ブラウザのバージョンごとにドライバのパスを保存するマニフェスト"""
+    
+    def __init__(self, manifest_path: str = settings.DRIVER_MANIFEST_PATH):
+        """
+        DriverResolverクラスの初期化
+        
+        Args:
+            manifest_path: マニフェスト（JSON）のパス
+        """
+        self.manifest_path = manifest_path
+        self._lock = threading.Lock()
+        self._manifest = self._load()
+    
+    def browser_version(self, browser_name: str) -> Optional[str]:
+        """
+        インストールされているブラウザのメジャーバージョンを返す
+        
+        バイナリの更新日時が変わらない限り、`--version` の実行結果をマニフェストから再利用する。
+        
+        Args:
+            browser_name: ブラウザ名
+        
+        Returns:
+            Optional[str]: メジャーバージョン。分からない場合はNone
+        """
+        binary = find_browser_binary(browser_name)
+        if binary is None:
+            return None
+        mtime = os.stat(binary).st_mtime
+        with self._lock:
+            cached = self._manifest["browsers"].get(binary)
+        if cached and cached["mtime"] == mtime:
+            return cached["version"]
+        
+        try:
+            result = subprocess.run([binary, "--version"], capture_output=True, text=True, timeout=10)
+            version = parse_major_version(result.stdout)
+        except (OSError, subprocess.SubprocessError):
+            version = None
+        with self._lock:
+            self._manifest["browsers"][binary] = {"mtime": mtime, "version": version}
+            self._save()
+        return version
+    
+    def driver_key(self, browser_name: str) -> str:
+        """
+        マニフェストのキー（ブラウザ名とメジャーバージョン）を返す
+        
+        Args:
+            browser_name: ブラウザ名
+        
+        Returns:
+            str: 例: "chrome-120"。バージョンが分からない場合は "chrome-unknown"
+        """
+        return f"{browser_name}-{self.browser_version(browser_name) or 'unknown'}"
+    
+    def resolve(self, browser_name: str) -> Optional[str]:
+        """
+        保存済みのドライバのパスを返す
+        
+        Args:
+            browser_name: ブラウザ名
+        
+        Returns:
+            Optional[str]: ドライバのパス。保存されていないか、ファイルが存在しない場合はNone
+        """
+        key = self.driver_key(browser_name)
+        with self._lock:
+            path = self._manifest["drivers"].get(key)
+        if path and os.path.isfile(path) and os.access(path, os.X_OK):
+            return path
+        return None
+    
+    def record(self, browser_name: str, path: Optional[str]) -> None:
+        """
+        ドライバのパスを保存する
+        
+        Args:
+            browser_name: ブラウザ名
+            path: ドライバのパス
+        """
+        if not path or not os.path.isfile(path):
+            return
+        key = self.driver_key(browser_name)
+        with self._lock:
+            if self._manifest["drivers"].get(key) == path:
+                return
+            self._manifest["drivers"][key] = path
+            self._save()
+    
+    def invalidate(self, browser_name: str) -> None:
+        """
+        保存済みのドライバのパスを削除する
+        
+        Args:
+            browser_name: ブラウザ名
+        """
+        key = self.driver_key(browser_name)
+        with self._lock:
+            if self._manifest["drivers"].pop(key, None) is not None:
+                self._save()
+    
+    def launch(self, browser_name: str, driver_class: Callable[..., WebDriver], service_class, options,
+               profile: Optional[StartupProfile] = None,
+               install: Optional[Callable[[], str]] = None) -> WebDriver:
+        """
+        保存済みのドライバでブラウザを起動する。保存されていない場合は解決して保存する
+        
+        保存済みのドライバで起動できない場合（ブラウザの更新でバージョンが合わないなど）は
+        保存内容を削除して解決し直す。
+        
+        Args:
+            browser_name: ブラウザ名
+            driver_class: webdriver.Chrome などのドライバのクラス
+            service_class: ドライバのServiceのクラス
+            options: ブラウザのオプション
+            profile: 所要時間を記録する StartupProfile
+            install: ドライバをダウンロードしてパスを返す関数（webdriver_manager など）。
+                Noneの場合はSelenium Managerに解決を任せる
+        
+        Returns:
+            WebDriver: 起動したドライバ
+        """
+        profile = profile if profile is not None else StartupProfile()
+        with profile.phase("resolve"):
+            cached = self.resolve(browser_name)
+        if cached is not None:
+            try:
+                return start_driver(driver_class, service_class(cached), options, profile)
+            except WebDriverException:
+                self.invalidate(browser_name)
+        
+        path = None
+        if install is not None:
+            with profile.phase("resolve"):
+                path = install()
+        service = service_class(path) if path else service_class()
+        driver = start_driver(driver_class, service, options, profile)
+        self.record(browser_name, getattr(driver.service, "path", None))
+        return driver
+    
+    def _load(self) -> Dict:
+        """マニフェストを読み込む"""
+        try:
+            with open(self.manifest_path, encoding="utf-8") as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            manifest = {}
+        manifest.setdefault("browsers", {})
+        manifest.setdefault("drivers", {})
+        return manifest
+    
+    def _save(self) -> None:
+        """マニフェストを書き込む（ロックを取得して呼び出す）"""
+        directory = os.path.dirname(self.manifest_path) or "."
+        os.makedirs(directory, exist_ok=True)
+        # 並列実行の他のワーカーが途中まで書かれたファイルを読まないよう、置き換えで保存する
+        fd, temp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(self._manifest, f, indent=2, sort_keys=True)
+        os.replace(temp_path, self.manifest_path)
+
+
+_default_resolver: Optional[DriverResolver] = None
+_default_resolver_lock = threading.Lock()
+
+
+def get_driver_resolver() -> DriverResolver:
+    """
+    プロセス共通のDriverResolverを返す
+    
+    Returns:
+        DriverResolver: 共通のリゾルバー
+    """
+    global _default_resolver
+    with _default_resolver_lock:
+        if _default_resolver is None:
+            _default_resolver = DriverResolver()
+        return _default_resolver
@@ -0,0 +1,303 @@
+"""
+宣言的な要素の定義。
+ページオブジェクトのクラス属性として要素を1回だけ宣言し、最初にアクセスした時に検索して、
+次のページ遷移までページオブジェクトごとにキャッシュします。同じ要素への繰り返しの操作で
+検索のラウンドトリップを省き、要素がDOMから外れた場合（StaleElementReferenceException）は
+同じURLのページにいる間だけ自動で探し直します。
+"""
+
+import threading
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Tuple
+
+from selenium.common.exceptions import StaleElementReferenceException
+from selenium.webdriver.remote.command import Command
+from selenium.webdriver.remote.webelement import WebElement
+
+if TYPE_CHECKING:
+    from selenium.webdriver.common.by import By
+
+# 実行後にページ遷移やDOMの書き換えが起こりうるコマンド（invalidates=True の要素で使用）
+_INVALIDATING_COMMANDS = (Command.CLICK_ELEMENT,)
+# ページのキャッシュに要素を検索した時のURLを保存するキー（属性名と重ならない名前）
+_URL_KEY = "#url"
+
+
+class ElementCacheStats:
+    """要素のキャッシュの利用状況の集計"""
+    
+    def __init__(self):
+        """ElementCacheStatsクラスの初期化"""
+        self.hits = 0
+        self.misses = 0
+        self.stale = 0
+        self._lock = threading.Lock()
+    
+    def record(self, kind: str) -> None:
+        """
+        キャッシュの利用を記録する
+        
+        Args:
+            kind: "hits"（キャッシュを使用）, "misses"（検索）, "stale"（DOMから外れたため再検索）のいずれか
+        """
+        with self._lock:
+            setattr(self, kind, getattr(self, kind) + 1)
+    
+    def to_dict(self) -> Dict[str, int]:
+        """
+        集計結果を辞書で返す（並列実行時にコントローラーへ渡すために使用）
+        
+        Returns:
+            Dict[str, int]: 集計結果
+        """
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "stale": self.stale}
+    
+    def merge(self, data: Dict[str, int]) -> None:
+        """
+        他のワーカーの集計結果を加える
+        
+        Args:
+            data: to_dict の結果
+        """
+        with self._lock:
+            self.hits += data.get("hits", 0)
+            self.misses += data.get("misses", 0)
+            self.stale += data.get("stale", 0)
+    
+    def summary(self) -> Optional[str]:
+        """
+        集計結果の概要を返す
+        
+        Returns:
+            Optional[str]: 概要。一度も要素を取得していない場合はNone
+        """
+        total = self.hits + self.misses
+        if total == 0:
+            return None
+        return (
+            f"要素の取得: {total}回 (キャッシュ: {self.hits}回, 検索: {self.misses}回, "
+            f"ヒット率: {self.hits / total:.0%}), DOMから外れた要素の再検索: {self.stale}回"
+        )
+
+
+_element_cache_stats = ElementCacheStats()
+
+
+def get_element_cache_stats() -> ElementCacheStats:
+    """
+    プロセス共通のElementCacheStatsを返す
+    
+    Returns:
+        ElementCacheStats: 共通の集計
+    """
+    return _element_cache_stats
+
+
+class CachedElement(WebElement):
+    """DOMから外れた場合に探し直して操作をやり直すWebElement"""
+    
+    def __init__(self, element: WebElement, relocate: Callable[[], WebElement],
+                 cache: Optional[Dict] = None):
+        """
+        CachedElementクラスの初期化
+        
+        Args:
+            element: 見つかった要素
+            relocate: 要素を探し直す関数
+            cache: invalidates=True の要素の場合、クリック後に空にするページのキャッシュ
+        """
+        super().__init__(element.parent, element.id)
+        self._relocate = relocate
+        self._invalidated_cache = cache
+    
+    def _execute(self, command, params=None):
+        """
+        要素のコマンドを実行する。要素がDOMから外れていた場合は1回だけ探し直して実行し直す
+        
+        Args:
+            command: コマンド名
+            params: コマンドのパラメータ
+        
+        Returns:
+            コマンドの結果
+        """
+        result = self._retry_stale(lambda: super(CachedElement, self)._execute(command, params))
+        if self._invalidated_cache is not None and command in _INVALIDATING_COMMANDS:
+            self._invalidated_cache.clear()
+        return result
+    
+    def get_attribute(self, name: str):
+        """
+        要素の属性を取得する（Seleniumはスクリプトの実行で取得するため、_execute を経由しない）
+        
+        Args:
+            name: 属性名
+        
+        Returns:
+            属性の値
+        """
+        return self._retry_stale(lambda: super(CachedElement, self).get_attribute(name))
+    
+    def is_displayed(self) -> bool:
+        """
+        要素が表示されているかどうかを返す（Seleniumはスクリプトの実行で判定するため、_execute を経由しない）
+        
+        Returns:
+            bool: 表示されている場合はTrue
+        """
+        return self._retry_stale(lambda: super(CachedElement, self).is_displayed())
+    
+    def _retry_stale(self, call: Callable[[], Any]) -> Any:
+        """
+        要素への操作を実行し、要素がDOMから外れていた場合は1回だけ探し直して実行し直す
+        
+        検索した時とURLが変わっている場合は、別のページの要素に置き換えないよう
+        探し直さずに StaleElementReferenceException を送出する。
+        """
+        try:
+            return call()
+        except StaleElementReferenceException:
+            get_element_cache_stats().record("stale")
+            self._id = self._relocate().id
+            return call()
+
+
+class Element:
+    """
+    ページオブジェクトの要素の宣言
+    
+    例:
+        class HomePage(BasePage):
+            SEARCH_BOX = (By.ID, "search")
+            search_box = Element(SEARCH_BOX)
+        
+        page.search_box.send_keys("query")  # 最初のアクセスで検索し、以降はキャッシュを使用する
+    """
+    
+    def __init__(self, locator: Tuple["By", str], invalidates: bool = False,
+                 timeout: Optional[int] = None):
+        """
+        Elementクラスの初期化
+        
+        Args:
+            locator: (検索方法, 検索値)のタプル
+            invalidates: クリックでページ遷移やDOMの書き換えが起こる要素かどうか。
+                Trueの場合、クリック後にページオブジェクトの全ての要素のキャッシュを破棄する
+            timeout: 要素が見つかるまでの待機時間（秒）。Noneの場合はデフォルト値を使用
+        """
+        self.locator = locator
+        self.invalidates = invalidates
+        self.timeout = timeout
+        self.name = None
+    
+    def __set_name__(self, owner, name: str):
+        """クラス属性の名前をキャッシュのキーとして記録する"""
+        self.name = name
+    
+    @staticmethod
+    def _page_url(page) -> str:
+        """
+        ページのキャッシュの要素を検索した時のURLを返す
+        
+        キャッシュが空の時（ページ遷移の後）に1回だけ取得し、キャッシュと一緒に破棄する。
+        
+        Args:
+            page: ページオブジェクト
+        
+        Returns:
+            str: URL
+        """
+        cache = page._element_cache
+        if _URL_KEY not in cache:
+            cache[_URL_KEY] = page.driver.current_url
+        return cache[_URL_KEY]
+    
+    def _relocator(self, page, find: Callable[[], Any]) -> Callable[[], Any]:
+        """
+        DOMから外れた要素を探し直す関数を返す
+        
+        探し直す前に現在のURLを確認し、検索した時のURLから変わっている場合は、
+        ページ遷移の後に別のページの要素に置き換えないよう StaleElementReferenceException を送出する。
+        
+        Args:
+            page: ページオブジェクト
+            find: 要素を検索する関数
+        
+        Returns:
+            Callable[[], Any]: 探し直す関数
+        """
+        url = self._page_url(page)
+        
+        def relocate():
+            current_url = page.driver.current_url
+            if current_url != url:
+                raise StaleElementReferenceException(
+                    f"{url} から {current_url} に遷移したため、{self.name} を探し直せません"
+                    "（ページ遷移の後は invalidate_elements() を呼び出してください）"
+                )
+            return find()
+        return relocate
+    
+    def __get__(self, page, owner=None):
+        """ページオブジェクトのキャッシュから要素を返す。キャッシュにない場合は検索する"""
+        if page is None:
+            return self
+        cache = page._element_cache
+        stats = get_element_cache_stats()
+        if self.name in cache:
+            stats.record("hits")
+            return cache[self.name]
+        stats.record("misses")
+        cache[self.name] = value = self.resolve(page)
+        return value
+    
+    def resolve(self, page) -> CachedElement:
+        """
+        キャッシュを使わずに要素を検索する
+        
+        Args:
+            page: ページオブジェクト
+        
+        Returns:
+            CachedElement: 見つかった要素
+        """
+        def find():
+            return page.actions.find(self.locator, self.timeout)
+        
+        cache = page._element_cache if self.invalidates else None
+        relocate = self._relocator(page, find)
+        return CachedElement(find(), relocate, cache)
+
+
+class Elements(Element):
+    """
+    ページオブジェクトの、複数の要素に一致するロケーターの宣言
+    
+    アクセスすると一致した全ての要素のリストを返す。DOMから外れた要素は、
+    一致する要素を探し直して同じ位置の要素に置き換える。
+    """
+    
+    def resolve(self, page) -> List[CachedElement]:
+        """
+        キャッシュを使わずに全ての一致する要素を検索する
+        
+        Args:
+            page: ページオブジェクト
+        
+        Returns:
+            List[CachedElement]: 見つかった要素のリスト
+        """
+        cache = page._element_cache if self.invalidates else None
+        
+        def relocate_at(index):
+            def find():
+                elements = page.actions.find_all(self.locator, self.timeout)
+                if index >= len(elements):
+                    raise StaleElementReferenceException(
+                        f"一致する要素が{len(elements)}件に減ったため、{index + 1}件目の要素を探し直せません"
+                    )
+                return elements[index]
+            return self._relocator(page, find)
+        
+        elements = page.actions.find_all(self.locator, self.timeout)
+        return [CachedElement(element, relocate_at(index), cache) for index, element in enumerate(elements)]
@@ -0,0 +1,223 @@
+"""
+WebDriverコマンドの計測。
+ドライバのコマンド実行をラップし、コマンドごとの所要時間と呼び出し元を記録します。
+"""
+
+from __future__ import annotations
+
+import json
+import sys
+import threading
+import time
+from collections import defaultdict
+from typing import TYPE_CHECKING, Dict, List, Optional
+
+from src.artifacts import get_current_test
+
+if TYPE_CHECKING:
+    from selenium.webdriver.remote.webdriver import WebDriver
+
+# 呼び出し元として記録するクラス（サブクラスを含む）
+_CALLER_BASE_CLASSES = ("PageActions", "BasePage")
+
+
+def find_calling_method() -> Optional[str]:
+    """
+    コールスタックから、コマンドを発行したページ操作のメソッドを探す
+    
+    PageActionsまたはBasePage（のサブクラス）のメソッドのうち、最もテストに近いものを返す。
+    例えば LoginPage.login → PageActions.type_text → PageActions.find の場合は LoginPage.login。
+    
+    Returns:
+        Optional[str]: "クラス名.メソッド名"。見つからない場合はNone
+    """
+    caller = None
+    frame = sys._getframe(1)
+    while frame is not None:
+        instance = frame.f_locals.get("self")
+        if instance is not None:
+            names = {cls.__name__ for cls in type(instance).__mro__}
+            if names.intersection(_CALLER_BASE_CLASSES):
+                caller = f"{type(instance).__name__}.{frame.f_code.co_name}"
+        frame = frame.f_back
+    return caller
+
+
+class CommandRecord:
+    """1回のWebDriverコマンドの記録"""
+    
+    __slots__ = ("command", "duration", "caller", "nodeid", "error")
+    
+    def __init__(self, command: str, duration: float, caller: Optional[str],
+                 nodeid: Optional[str], error: Optional[str] = None):
+        """
+        CommandRecordクラスの初期化
+        
+        Args:
+            command: コマンド名（例: findElement）
+            duration: 所要時間（秒）
+            caller: 呼び出し元のメソッド
+            nodeid: 実行中のテストのnodeid
+            error: コマンドが例外になった場合の例外クラス名
+        """
+        self.command = command
+        self.duration = duration
+        self.caller = caller
+        self.nodeid = nodeid
+        self.error = error
+    
+    def to_dict(self) -> dict:
+        """
+        記録を辞書にする
+        
+        Returns:
+            dict: 記録の内容
+        """
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+class CommandRecorder:
+    """WebDriverコマンドの記録と集計を行うクラス"""
+    
+    def __init__(self):
+        """CommandRecorderクラスの初期化"""
+        self.records: List[CommandRecord] = []
+        # 他のワーカーから受け取った集計（種類 → キー → [回数, 合計時間]）
+        self.merged: Dict[str, Dict[str, List[float]]] = {"commands": {}, "callers": {}, "tests": {}}
+        self._lock = threading.Lock()
+    
+    def install(self, driver: WebDriver) -> WebDriver:
+        """
+        ドライバのコマンド実行をラップして記録を開始する
+        
+        Args:
+            driver: Seleniumのwebdriverインスタンス
+        
+        Returns:
+            WebDriver: 同じドライバ
+        """
+        executor = driver.command_executor
+        original_execute = executor.execute
+        
+        def execute(command, params):
+            caller = find_calling_method()
+            nodeid = get_current_test()
+            error = None
+            start = time.perf_counter()
+            try:
+                return original_execute(command, params)
+            except Exception as e:
+                error = type(e).__name__
+                raise
+            finally:
+                self.add(CommandRecord(command, time.perf_counter() - start, caller, nodeid, error))
+        
+        executor.execute = execute
+        return driver
+    
+    def add(self, record: CommandRecord) -> None:
+        """
+        記録を追加する
+        
+        Args:
+            record: コマンドの記録
+        """
+        with self._lock:
+            self.records.append(record)
+    
+    def export_jsonl(self, path: str) -> None:
+        """
+        記録をJSONL形式で書き出す
+        
+        Args:
+            path: 出力先のパス
+        """
+        with open(path, "w", encoding="utf-8") as f:
+            for record in self.records:
+                f.write(json.dumps(record.to_dict(), ensure_ascii=False) + "\n")
+    
+    def hot_spot_report(self, top: int = 10) -> List[str]:
+        """
+        所要時間の多いコマンド・呼び出し元と、テストごとの往復回数を表にする
+        
+        Args:
+            top: 各表に表示する件数
+        
+        Returns:
+            List[str]: 表の各行
+        """
+        groups = self._groups()
+        if not groups["commands"]:
+            return []
+        
+        count = sum(group[0] for group in groups["commands"].values())
+        total = sum(group[1] for group in groups["commands"].values())
+        lines = [f"WebDriverコマンド: {count}回, 合計 {total:.2f}秒"]
+        lines.extend(self._table("コマンド", groups["commands"], top))
+        lines.extend(self._table("呼び出し元", groups["callers"], top))
+        
+        per_test = groups["tests"]
+        lines.append("")
+        lines.append(f"{'往復回数':>8} {'合計(s)':>9}  テスト")
+        for nodeid, (count, total) in sorted(per_test.items(), key=lambda kv: -kv[1][0])[:top]:
+            lines.append(f"{count:>8} {total:>9.2f}  {nodeid}")
+        return lines
+    
+    def to_dict(self) -> Dict:
+        """
+        コマンド・呼び出し元・テストごとの集計を辞書で返す（並列実行時にコントローラーへ渡すために使用）
+        
+        個々の記録は含まず、ワーカーごとのJSONLに書き出す。
+        
+        Returns:
+            Dict: 種類（commands, callers, tests） → キー → [回数, 合計時間]
+        """
+        return {kind: {name: list(group) for name, group in groups.items()}
+                for kind, groups in self._groups().items()}
+    
+    def merge(self, data: Dict) -> None:
+        """
+        他のワーカーの集計結果を加える
+        
+        Args:
+            data: to_dict の結果
+        """
+        with self._lock:
+            for kind, groups in data.items():
+                target = self.merged.setdefault(kind, {})
+                for name, (count, total) in groups.items():
+                    group = target.setdefault(name, [0, 0.0])
+                    group[0] += count
+                    group[1] += total
+    
+    def _groups(self) -> Dict[str, Dict[str, List[float]]]:
+        """自身の記録と他のワーカーの集計を合わせて、種類ごとに集計する"""
+        groups = {
+            "commands": self._group(lambda r: r.command),
+            "callers": self._group(lambda r: r.caller or "(直接呼び出し)"),
+            "tests": self._group(lambda r: r.nodeid or "(テスト外)"),
+        }
+        with self._lock:
+            for kind, merged in self.merged.items():
+                for name, (count, total) in merged.items():
+                    group = groups[kind][name]
+                    group[0] += count
+                    group[1] += total
+        return groups
+    
+    def _group(self, key) -> Dict[str, List[float]]:
+        """記録をキーごとに集計し、{キー: [回数, 合計時間]} を返す"""
+        groups: Dict[str, List[float]] = defaultdict(lambda: [0, 0.0])
+        for record in self.records:
+            group = groups[key(record)]
+            group[0] += 1
+            group[1] += record.duration
+        return groups
+    
+    @staticmethod
+    def _table(title: str, groups: Dict[str, List[float]], top: int) -> List[str]:
+        """集計結果を合計時間の多い順に表にする"""
+        lines = ["", f"{'回数':>8} {'合計(s)':>9} {'平均(ms)':>9}  {title}"]
+        for name, (count, total) in sorted(groups.items(), key=lambda kv: -kv[1][1])[:top]:
+            lines.append(f"{count:>8} {total:>9.2f} {total / count * 1000:>9.1f}  {name}")
+        return lines
@@ -0,0 +1,241 @@
+"""
+ページオブジェクトのロケーターの一括確認。
+クラス属性として宣言されたロケーターを集め、現在のページで一致する要素の数・表示状態を
+1回のスクリプト実行で確認します。アプリケーションの変更で壊れたロケーターを、
+待機のタイムアウトを1つずつ待たずに見つけるために使用します。
+"""
+
+import importlib
+import pkgutil
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from config import settings
+from src import browser_scripts
+
+# Seleniumの検索方法（By.* の値）
+LOCATOR_STRATEGIES = (
+    "id", "name", "xpath", "css selector", "class name", "tag name", "link text", "partial link text",
+)
+
+
+def is_locator(value) -> bool:
+    """
+    値が (検索方法, 検索値) のロケーターかどうかを返す
+    
+    Args:
+        value: クラス属性の値
+    
+    Returns:
+        bool: ロケーターの場合はTrue
+    """
+    return (
+        isinstance(value, tuple) and len(value) == 2
+        and value[0] in LOCATOR_STRATEGIES and isinstance(value[1], str)
+    )
+
+
+def find_declared_locators(cls) -> Dict[str, Tuple[str, str]]:
+    """
+    クラスと基底クラスで宣言されたロケーターを返す
+    
+    大文字の名前のクラス属性のうち、ロケーターの形をしたものを集める。
+    
+    Args:
+        cls: ページオブジェクトのクラス
+    
+    Returns:
+        Dict[str, Tuple[str, str]]: 属性名 → ロケーター（基底クラスのものから宣言順）
+    """
+    locators: Dict[str, Tuple[str, str]] = {}
+    for klass in reversed(cls.__mro__):
+        for name, value in vars(klass).items():
+            if name.isupper() and is_locator(value):
+                locators[name] = value
+    return locators
+
+
+def discover_page_objects(packages: Iterable[str], base_class) -> List[type]:
+    """
+    パッケージ内のモジュールを読み込み、URL_PATH を宣言したページオブジェクトのクラスを返す
+    
+    Args:
+        packages: ページオブジェクトを探すパッケージ名
+        base_class: ページオブジェクトの基底クラス（BasePage）
+    
+    Returns:
+        List[type]: ページオブジェクトのクラス（モジュール名・クラス名の順）
+    """
+    packages = list(packages)
+    for package_name in packages:
+        package = importlib.import_module(package_name)
+        for module in pkgutil.walk_packages(getattr(package, "__path__", []), package_name + "."):
+            importlib.import_module(module.name)
+    
+    # 指定したパッケージで定義されたクラスだけを対象にする（テストで定義したページなどを除く）
+    prefixes = tuple(name + "." for name in packages)
+    found = set()
+    pending = list(base_class.__subclasses__())
+    while pending:
+        cls = pending.pop()
+        pending.extend(cls.__subclasses__())
+        if isinstance(getattr(cls, "URL_PATH", None), str) and cls.__module__.startswith(prefixes):
+            found.add(cls)
+    return sorted(found, key=lambda cls: (cls.__module__, cls.__name__))
+
+
+def import_object(path: str):
+    """
+    "パッケージ.モジュール.名前" の形式で指定されたオブジェクトを読み込む
+    
+    Args:
+        path: オブジェクトのパス
+    
+    Returns:
+        Any: 読み込んだオブジェクト
+    """
+    module_name, _, name = path.rpartition(".")
+    return getattr(importlib.import_module(module_name), name)
+
+
+def prepare_smoke_session(driver, page_class, base_url: str, cache) -> bool:
+    """
+    ロケーターの一括確認でページを開く前に、ページが宣言したログイン状態にする
+    
+    LOCATOR_SMOKE_ROLE がないページはクッキーを削除してログインしていない状態にする。
+    ある場合は LOCATOR_SMOKE_ACCOUNTS のアカウントで LOCATOR_SMOKE_LOGIN_PAGE からログインする
+    （2回目以降はセッション状態のキャッシュから復元する）。
+    
+    Args:
+        driver: Seleniumのwebdriverインスタンス
+        page_class: 確認するページオブジェクトのクラス
+        base_url: ベースURL
+        cache: セッション状態のキャッシュ（SessionCache）
+    
+    Returns:
+        bool: 準備できた場合はTrue。役割のアカウントが設定されていない場合はFalse
+    """
+    role = getattr(page_class, "LOCATOR_SMOKE_ROLE", None)
+    if role is None:
+        # 前のページのためにログインした状態を残さない（ページを開く前はクッキーを削除できない）
+        if driver.current_url.startswith("http"):
+            driver.delete_all_cookies()
+        return True
+    account = settings.LOCATOR_SMOKE_ACCOUNTS.get(role)
+    if account is None:
+        return False
+    login_page = import_object(settings.LOCATOR_SMOKE_LOGIN_PAGE)(driver, base_url)
+    login_page.login_with_session_cache(cache, *account)
+    return True
+
+
+class LocatorHealth:
+    """1つのロケーターの確認結果"""
+    
+    # 確認結果の種類
+    OK = "ok"
+    MISSING = "missing"  # 一致する要素がない
+    HIDDEN = "hidden"  # 一致する要素が全て非表示
+    AMBIGUOUS = "ambiguous"  # 1つの要素を指すはずのロケーターが複数の要素に一致する
+    INVALID = "invalid"  # セレクターの構文エラーなど
+    
+    def __init__(self, name: str, locator: Tuple[str, str], count: int = 0, visible: int = 0,
+                 error: Optional[str] = None, optional: bool = False, multiple: bool = False):
+        """
+        LocatorHealthクラスの初期化
+        
+        Args:
+            name: ロケーターの属性名
+            locator: (検索方法, 検索値)のタプル
+            count: 一致した要素の数
+            visible: 一致した要素のうち表示されているものの数
+            error: ロケーターの評価で発生したエラー
+            optional: ページの状態によっては存在しない要素かどうか（OPTIONAL_LOCATORS）
+            multiple: 複数の要素に一致することが前提かどうか（MULTIPLE_LOCATORS）
+        """
+        self.name = name
+        self.locator = locator
+        self.count = count
+        self.visible = visible
+        self.error = error
+        self.optional = optional
+        self.multiple = multiple
+    
+    @property
+    def status(self) -> str:
+        """確認結果の種類"""
+        if self.error is not None:
+            return self.INVALID
+        if self.count == 0:
+            return self.MISSING
+        if self.visible == 0:
+            return self.HIDDEN
+        if self.count > 1 and not self.multiple:
+            return self.AMBIGUOUS
+        return self.OK
+    
+    @property
+    def ok(self) -> bool:
+        """問題がないかどうか（存在しない任意の要素は問題としない）"""
+        status = self.status
+        return status == self.OK or (self.optional and status in (self.MISSING, self.HIDDEN))
+
+
+def check_locators(driver, locators: Dict[str, Tuple[str, str]], optional: Iterable[str] = (),
+                   multiple: Iterable[str] = (), timeout: float = 0,
+                   poll_interval: float = 0.25) -> List[LocatorHealth]:
+    """
+    ロケーターを現在のページで1回のスクリプト実行でまとめて確認する
+    
+    timeout を指定した場合は、全ての結果に問題がなくなるかタイムアウトするまで確認を繰り返す
+    （描画に時間のかかるページで使用する）。
+    
+    Args:
+        driver: Seleniumのwebdriverインスタンス
+        locators: 属性名 → ロケーター
+        optional: ページの状態によっては存在しない要素の属性名
+        multiple: 複数の要素に一致することが前提の属性名
+        timeout: 確認を繰り返す最大時間（秒）
+        poll_interval: 確認の間隔（秒）
+    
+    Returns:
+        List[LocatorHealth]: ロケーターごとの確認結果（locators の順）
+    """
+    optional, multiple = set(optional), set(multiple)
+    names = list(locators)
+    payload = [list(locators[name]) for name in names]
+    deadline = time.monotonic() + timeout
+    while True:
+        rows = driver.execute_script(browser_scripts.CHECK_LOCATORS, payload)
+        results = [
+            LocatorHealth(name, locators[name], count, visible, error, name in optional, name in multiple)
+            for name, (count, visible, error) in zip(names, rows)
+        ]
+        if all(result.ok for result in results) or time.monotonic() >= deadline:
+            return results
+        time.sleep(poll_interval)
+
+
+def format_health_report(results: List[LocatorHealth], only_problems: bool = False) -> List[str]:
+    """
+    確認結果を表す行を返す
+    
+    Args:
+        results: check_locators の結果
+        only_problems: Trueの場合は問題のあるロケーターだけを表示する
+    
+    Returns:
+        List[str]: 表示する行
+    """
+    lines = []
+    for result in results:
+        if only_problems and result.ok:
+            continue
+        note = " (任意)" if result.optional else ""
+        if result.error is not None:
+            note += f" {result.error}"
+        lines.append(
+            f"  {result.status:<10}{result.count:>4}件 (表示: {result.visible}件)  "
+            f"{result.name} = {result.locator[0]}={result.locator[1]}{note}"
+        )
+    return lines
@@ -0,0 +1,335 @@
+"""
+クロスブラウザのマトリクス実行。
+選択した複数のブラウザを並行して起動し、1つのシナリオ（ページオブジェクトの操作）を
+スレッドプールで全てのブラウザに同時に実行します。結果はブラウザごとに集計し、
+所要時間を横に並べて比較することで、特定のブラウザでだけ遅い操作を見つけやすくします。
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from config import settings
+
+
+def parse_browsers(value: Optional[str]) -> List[str]:
+    """
+    カンマ区切りのブラウザ名を重複を除いたリストに変換する
+    
+    Args:
+        value: 例: "chrome,firefox"
+    
+    Returns:
+        List[str]: ブラウザ名のリスト（指定順）
+    """
+    browsers = []
+    for name in (value or "").split(","):
+        name = name.strip().lower()
+        if name and name not in browsers:
+            browsers.append(name)
+    return browsers
+
+
+class MatrixFailure(AssertionError):
+    """マトリクス実行で一部のブラウザが失敗したことを示す例外"""
+    
+    def __init__(self, result: "MatrixResult"):
+        """
+        MatrixFailureクラスの初期化
+        
+        Args:
+            result: マトリクス実行の結果
+        """
+        self.result = result
+        lines = [f"{result.name}: {len(result.failed)}/{len(result.runs)}個のブラウザで失敗しました"]
+        for run in result.failed:
+            lines.append(f"  {run.browser}: {type(run.error).__name__}: {run.error}")
+        super().__init__("\n".join(lines))
+
+
+class BrowserRun:
+    """1つのブラウザでのシナリオの実行結果"""
+    
+    def __init__(self, browser: str, seconds: float, value: Any = None, error: Optional[BaseException] = None,
+                 launched: bool = True):
+        """
+        BrowserRunクラスの初期化
+        
+        Args:
+            browser: ブラウザ名
+            seconds: シナリオの所要時間（秒）
+            value: シナリオの戻り値
+            error: シナリオで発生した例外（起動に失敗した場合は起動時の例外）
+            launched: ブラウザを起動できたかどうか
+        """
+        self.browser = browser
+        self.seconds = seconds
+        self.value = value
+        self.error = error
+        self.launched = launched
+    
+    @property
+    def passed(self) -> bool:
+        """例外が発生しなかったかどうか"""
+        return self.error is None
+
+
+class MatrixResult:
+    """全てのブラウザでのシナリオの実行結果"""
+    
+    def __init__(self, name: str, runs: List[BrowserRun]):
+        """
+        MatrixResultクラスの初期化
+        
+        Args:
+            name: シナリオの名前
+            runs: ブラウザごとの実行結果（ブラウザの指定順）
+        """
+        self.name = name
+        self.runs = runs
+    
+    def __getitem__(self, browser: str) -> BrowserRun:
+        """ブラウザの実行結果を返す"""
+        for run in self.runs:
+            if run.browser == browser:
+                return run
+        raise KeyError(browser)
+    
+    @property
+    def failed(self) -> List[BrowserRun]:
+        """失敗したブラウザの実行結果"""
+        return [run for run in self.runs if not run.passed]
+    
+    @property
+    def values(self) -> Dict[str, Any]:
+        """ブラウザ名 → シナリオの戻り値"""
+        return {run.browser: run.value for run in self.runs}
+    
+    def raise_for_failures(self) -> "MatrixResult":
+        """
+        失敗したブラウザがある場合は MatrixFailure を送出する
+        
+        Returns:
+            MatrixResult: 失敗がない場合は自身
+        """
+        if self.failed:
+            raise MatrixFailure(self)
+        return self
+
+
+class MatrixStats:
+    """シナリオ・ブラウザごとの所要時間と結果の集計"""
+    
+    def __init__(self):
+        """MatrixStatsクラスの初期化"""
+        # シナリオ名 → ブラウザ名 → {"runs", "failed", "seconds"}
+        self.scenarios: Dict[str, Dict[str, Dict[str, float]]] = {}
+        self._lock = threading.Lock()
+    
+    def record(self, result: MatrixResult) -> None:
+        """
+        マトリクス実行の結果を記録する（起動に失敗したブラウザは所要時間がないため記録しない）
+        
+        Args:
+            result: マトリクス実行の結果
+        """
+        with self._lock:
+            browsers = self.scenarios.setdefault(result.name, {})
+            for run in result.runs:
+                if not run.launched:
+                    continue
+                entry = browsers.setdefault(run.browser, {"runs": 0, "failed": 0, "seconds": 0.0})
+                entry["runs"] += 1
+                entry["failed"] += 0 if run.passed else 1
+                entry["seconds"] += run.seconds
+    
+    def to_dict(self) -> Dict:
+        """
+        集計結果を辞書で返す（並列実行時にコントローラーへ渡すために使用）
+        
+        Returns:
+            Dict: シナリオ・ブラウザごとの集計結果
+        """
+        with self._lock:
+            return {
+                name: {browser: dict(entry) for browser, entry in browsers.items()}
+                for name, browsers in self.scenarios.items()
+            }
+    
+    def merge(self, data: Dict) -> None:
+        """
+        他のワーカーの集計結果を加える
+        
+        Args:
+            data: to_dict の結果
+        """
+        with self._lock:
+            for name, browsers in data.items():
+                target = self.scenarios.setdefault(name, {})
+                for browser, counts in browsers.items():
+                    entry = target.setdefault(browser, {"runs": 0, "failed": 0, "seconds": 0.0})
+                    for key, value in counts.items():
+                        entry[key] += value
+    
+    def summary_lines(self, slowdown_ratio: float = settings.MATRIX_SLOWDOWN_RATIO) -> List[str]:
+        """
+        シナリオごとの平均所要時間をブラウザごとに横に並べた行を返す
+        
+        最も速いブラウザの slowdown_ratio 倍以上かかったブラウザには "!" を付け、
+        失敗を含むブラウザには失敗回数を付ける。
+        
+        Args:
+            slowdown_ratio: 遅いとみなす最速のブラウザとの比
+        
+        Returns:
+            List[str]: 表示する行。一度も実行していない場合は空のリスト
+        """
+        with self._lock:
+            scenarios = {name: dict(browsers) for name, browsers in self.scenarios.items()}
+        if not scenarios:
+            return []
+        browsers = sorted({browser for entries in scenarios.values() for browser in entries})
+        width = max(40, max(len(name) for name in scenarios) + 2)
+        lines = [f"{'scenario':<{width}}" + "".join(f"{browser:>14}" for browser in browsers) + f"{'slowest':>10}"]
+        totals = {browser: [0, 0, 0.0] for browser in browsers}
+        for name in sorted(scenarios):
+            entries = scenarios[name]
+            averages = {browser: entry["seconds"] / entry["runs"] for browser, entry in entries.items() if entry["runs"]}
+            fastest = min(averages.values()) if averages else 0.0
+            cells = []
+            for browser in browsers:
+                entry = entries.get(browser)
+                if entry is None or not entry["runs"]:
+                    cells.append(f"{'-':>14}")
+                    continue
+                totals[browser][0] += entry["runs"]
+                totals[browser][1] += entry["failed"]
+                totals[browser][2] += entry["seconds"]
+                mark = "!" if fastest > 0 and averages[browser] >= fastest * slowdown_ratio else " "
+                failed = f" ({int(entry['failed'])}失敗)" if entry["failed"] else ""
+                cells.append(f"{averages[browser] * 1000:.0f}ms{failed}{mark}".rjust(14))
+            ratio = f"{max(averages.values()) / fastest:.1f}x" if fastest > 0 and len(averages) > 1 else "-"
+            lines.append(f"{name:<{width}}" + "".join(cells) + f"{ratio:>10}")
+        lines.append(
+            f"{'合計（成功/実行）':<{width - 8}}"
+            + "".join(
+                f"{f'{runs - failed}/{runs} {seconds:.1f}s':>14}" for runs, failed, seconds in totals.values()
+            )
+        )
+        return lines
+
+
+_matrix_stats = MatrixStats()
+
+
+def get_matrix_stats() -> MatrixStats:
+    """
+    プロセス共通のMatrixStatsを返す
+    
+    Returns:
+        MatrixStats: 共通の集計
+    """
+    return _matrix_stats
+
+
+class BrowserMatrix:
+    """複数のブラウザで同じシナリオを同時に実行するマトリクス"""
+    
+    def __init__(self, browsers: Iterable[str], acquire: Callable[[str], Any],
+                 release: Optional[Callable[[Any], None]] = None, stats: Optional[MatrixStats] = None):
+        """
+        BrowserMatrixクラスの初期化
+        
+        Args:
+            browsers: ブラウザ名のリスト
+            acquire: ブラウザ名を受け取りドライバを返す関数（DriverPool.acquire など）
+            release: ドライバを返却する関数。Noneの場合は driver.quit() で終了する
+            stats: 実行結果を記録する集計。Noneの場合はプロセス共通のもの
+        """
+        self.browsers = list(browsers)
+        if not self.browsers:
+            raise ValueError("ブラウザが指定されていません")
+        self.acquire = acquire
+        self.release = release or (lambda driver: driver.quit())
+        self.stats = stats if stats is not None else get_matrix_stats()
+        self.drivers: Dict[str, Any] = {}
+        self.launch_errors: Dict[str, BaseException] = {}
+        # ブラウザごとに1スレッドを使い、起動・シナリオ・終了を全てのブラウザで同時に行う
+        self._executor = ThreadPoolExecutor(max_workers=len(self.browsers), thread_name_prefix="matrix")
+    
+    def __enter__(self) -> "BrowserMatrix":
+        return self.start()
+    
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+    
+    def _map(self, function: Callable[[str], Any], browsers: List[str]) -> Dict[str, Any]:
+        """ブラウザごとに関数をスレッドプールで同時に実行し、ブラウザ名 → 結果（または例外）を返す"""
+        futures = {browser: self._executor.submit(function, browser) for browser in browsers}
+        results = {}
+        for browser, future in futures.items():
+            try:
+                results[browser] = future.result()
+            except Exception as e:
+                results[browser] = e
+        return results
+    
+    def start(self) -> "BrowserMatrix":
+        """
+        全てのブラウザを並行して起動する。起動に失敗したブラウザは launch_errors に記録する
+        
+        Returns:
+            BrowserMatrix: 自身
+        """
+        pending = [browser for browser in self.browsers if browser not in self.drivers]
+        for browser, result in self._map(self.acquire, pending).items():
+            if isinstance(result, Exception):
+                self.launch_errors[browser] = result
+            else:
+                self.drivers[browser] = result
+        return self
+    
+    def run(self, scenario: Callable[[Any], Any], name: Optional[str] = None, check: bool = True) -> MatrixResult:
+        """
+        シナリオを全てのブラウザで同時に実行する
+        
+        Args:
+            scenario: ドライバを受け取る関数（ページオブジェクトの操作）
+            name: 集計に使用するシナリオの名前。Noneの場合は関数名
+            check: Trueの場合、失敗したブラウザがあれば MatrixFailure を送出する
+        
+        Returns:
+            MatrixResult: ブラウザごとの実行結果
+        """
+        if not self.drivers and not self.launch_errors:
+            self.start()
+        name = name or getattr(scenario, "__name__", "scenario")
+        
+        def execute(browser):
+            driver = self.drivers[browser]
+            start = time.perf_counter()
+            try:
+                value = scenario(driver)
+            except Exception as e:
+                return BrowserRun(browser, time.perf_counter() - start, error=e)
+            return BrowserRun(browser, time.perf_counter() - start, value)
+        
+        runs = self._map(execute, list(self.drivers))
+        ordered = []
+        for browser in self.browsers:
+            if browser in runs:
+                ordered.append(runs[browser])
+            elif browser in self.launch_errors:
+                ordered.append(BrowserRun(browser, 0.0, error=self.launch_errors[browser], launched=False))
+        result = MatrixResult(name, ordered)
+        self.stats.record(result)
+        if check:
+            result.raise_for_failures()
+        return result
+    
+    def close(self) -> None:
+        """全てのドライバを並行して返却し、スレッドプールを停止する"""
+        drivers, self.drivers = self.drivers, {}
+        self._map(lambda browser: self.release(drivers[browser]), list(drivers))
+        self._executor.shutdown(wait=True)
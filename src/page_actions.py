@@ -3,22 +3,59 @@
 Seleniumの一般的な操作をラップし、より使いやすくします。
 """
 
-from typing import Optional, Union, Tuple
+from __future__ import annotations
+
+import time
+import warnings
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Optional, Union, Tuple, List, Any, Callable, Iterator, Dict
 
-from selenium.webdriver.remote.webdriver import WebDriver
-from selenium.webdriver.remote.webelement import WebElement
-from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.common.action_chains import ActionChains
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
+from selenium.common.exceptions import TimeoutException, NoSuchElementException, JavascriptException
 
 from config import settings
+from src import browser_scripts
+from src.conditions import Condition
+
+if TYPE_CHECKING:
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.remote.webdriver import WebDriver
+    from selenium.webdriver.remote.webelement import WebElement
+
+
+# wait_for_elementの待機条件に対応するSeleniumの条件（expected_conditionsの関数名）
+# expected_conditionsとActionChainsは使用するメソッドの中で読み込む
+_EXPECTED_CONDITIONS = {
+    "presence": "presence_of_element_located",
+    "visibility": "visibility_of_element_located",
+    "clickable": "element_to_be_clickable",
+}
+
+
+class MixedWaitsWarning(UserWarning):
+    """暗黙的な待機が有効なまま明示的な待機が行われたことを示す警告"""
+
+
+@contextmanager
+def _timeout_locator(locator: Tuple[By, str]) -> Iterator[None]:
+    """
+    タイムアウトした場合に、待機していたロケーターを例外の locator 属性に記録する
+    （再実行の統計でロケーターごとに集計するために使用）
+    
+    Args:
+        locator: (検索方法, 検索値)のタプル
+    """
+    try:
+        yield
+    except TimeoutException as e:
+        if getattr(e, "locator", None) is None:
+            e.locator = locator
+        raise
 
 
 class PageActions:
     """ページ操作のためのユーティリティクラス"""
-
+    
     def __init__(self, driver: WebDriver):
         """
         PageActionsクラスの初期化
@@ -28,6 +65,8 @@ class PageActions:
         """
         self.driver = driver
         self.wait = WebDriverWait(driver, settings.EXPLICIT_WAIT)
+        self.use_javascript = settings.USE_JAVASCRIPT
+        self._implicit_wait: Optional[float] = None
     
     def find(self, locator: Tuple[By, str], timeout: Optional[int] = None) -> WebElement:
         """
@@ -36,19 +75,14 @@ class PageActions:
         Args:
             locator: (検索方法, 検索値)のタプル。例: (By.ID, "my-id")
             timeout: 待機時間（秒）、Noneの場合はデフォルト値を使用
-            
+        
         Returns:
             WebElement: 見つかった要素
-            
+        
         Raises:
             TimeoutException: 要素が見つからない場合
         """
-        if timeout is None:
-            timeout = settings.EXPLICIT_WAIT
-        
-        return WebDriverWait(self.driver, timeout).until(
-            EC.presence_of_element_located(locator)
-        )
+        return self.wait_for_element(locator, timeout)
     
     def find_all(self, locator: Tuple[By, str], timeout: Optional[int] = None) -> list:
         """
@@ -57,27 +91,37 @@ class PageActions:
         Args:
             locator: (検索方法, 検索値)のタプル
             timeout: 待機時間（秒）
-            
+        
         Returns:
             list: 見つかった要素のリスト
         """
         if timeout is None:
             timeout = settings.EXPLICIT_WAIT
         
-        WebDriverWait(self.driver, timeout).until(
-            EC.presence_of_element_located(locator)
-        )
+        from selenium.webdriver.support import expected_conditions as EC
+        
+        self._check_mixed_waits("find_all")
+        with _timeout_locator(locator):
+            WebDriverWait(self.driver, timeout).until(
+                EC.presence_of_element_located(locator)
+            )
         return self.driver.find_elements(*locator)
     
-    def click(self, locator: Tuple[By, str], timeout: Optional[int] = None) -> None:
+    def click(self, locator: Tuple[By, str], timeout: Optional[int] = None,
+              condition: Optional[Union[str, Condition]] = None) -> None:
         """
         要素をクリックする
         
         Args:
             locator: (検索方法, 検索値)のタプル
             timeout: 待機時間（秒）
+            condition: クリック前に待機する条件。例: visible & enabled & not_covered
+                待機で見つかった要素をそのままクリックするため、要素を探し直さない
         """
-        element = self.find(locator, timeout)
+        if condition is None:
+            element = self.find(locator, timeout)
+        else:
+            element = self.wait_for_element(locator, timeout, condition)
         element.click()
     
     def type_text(self, locator: Tuple[By, str], text: str, timeout: Optional[int] = None, clear_first: bool = True) -> None:
@@ -99,50 +143,303 @@ class PageActions:
         """
         要素が存在するかどうかを確認する
         
+        確認中は暗黙的な待機を無効にするため、要素が存在しない場合も
+        IMPLICIT_WAITの時間ブロックされることはない。
+        
         Args:
             locator: (検索方法, 検索値)のタプル
             timeout: 待機時間（秒）
-            
+        
         Returns:
             bool: 要素が存在する場合はTrue、そうでない場合はFalse
         """
-        try:
-            if timeout > 0:
+        from selenium.webdriver.support import expected_conditions as EC
+        
+        with self.implicit_wait_disabled():
+            try:
+                if timeout > 0:
+                    WebDriverWait(self.driver, timeout).until(
+                        EC.presence_of_element_located(locator)
+                    )
+                else:
+                    self.driver.find_element(*locator)
+                return True
+            except (NoSuchElementException, TimeoutException):
+                return False
+    
+    def is_element_absent(self, locator: Tuple[By, str], timeout: int = 0) -> bool:
+        """
+        要素が存在しないかどうかを確認する
+        
+        確認中は暗黙的な待機を無効にする。timeoutを指定した場合は、
+        要素がなくなるまで最大timeout秒待機する。
+        
+        Args:
+            locator: (検索方法, 検索値)のタプル
+            timeout: 待機時間（秒）
+        
+        Returns:
+            bool: 要素が存在しない場合はTrue、そうでない場合はFalse
+        """
+        with self.implicit_wait_disabled():
+            if timeout <= 0:
+                return len(self.driver.find_elements(*locator)) == 0
+            try:
                 WebDriverWait(self.driver, timeout).until(
-                    EC.presence_of_element_located(locator)
+                    lambda d: len(d.find_elements(*locator)) == 0
                 )
-            else:
-                self.driver.find_element(*locator)
-            return True
-        except (NoSuchElementException, TimeoutException):
-            return False
+                return True
+            except TimeoutException:
+                return False
+    
+    def get_implicit_wait(self) -> float:
+        """
+        現在の暗黙的な待機時間を取得する
+        
+        最初の呼び出しでドライバから読み取り、以降はキャッシュした値を返す。
+        
+        Returns:
+            float: 暗黙的な待機時間（秒）
+        """
+        if self._implicit_wait is None:
+            try:
+                self._implicit_wait = float(self.driver.timeouts.implicit_wait)
+            except Exception:
+                # タイムアウトを取得できないドライバの場合は設定値を使用する
+                self._implicit_wait = float(settings.IMPLICIT_WAIT)
+        return self._implicit_wait
+    
+    def set_implicit_wait(self, seconds: float) -> None:
+        """
+        暗黙的な待機時間を設定する
+        
+        Args:
+            seconds: 暗黙的な待機時間（秒）
+        """
+        self.driver.implicitly_wait(seconds)
+        self._implicit_wait = float(seconds)
+    
+    @contextmanager
+    def implicit_wait_disabled(self) -> Iterator[None]:
+        """
+        ブロック内で暗黙的な待機を一時的に0にするコンテキストマネージャー
+        
+        ブロックを抜けると元の待機時間に戻す。既に0の場合はドライバへのコマンドを送らない。
+        """
+        previous = self.get_implicit_wait()
+        if previous <= 0:
+            yield
+            return
+        
+        self.set_implicit_wait(0)
+        try:
+            yield
+        finally:
+            self.set_implicit_wait(previous)
+    
+    def _check_mixed_waits(self, method_name: str) -> None:
+        """
+        デバッグモードで、暗黙的な待機と明示的な待機の併用を検出して警告する
+        
+        Args:
+            method_name: 明示的な待機を行うメソッド名
+        """
+        if not settings.DEBUG_MIXED_WAITS:
+            return
+        implicit_wait = self.get_implicit_wait()
+        if implicit_wait > 0:
+            warnings.warn(
+                f"{method_name}: 暗黙的な待機（{implicit_wait}秒）が有効なまま明示的な待機を行っています。"
+                f"要素が存在しない場合、各ポーリングが最大{implicit_wait}秒ブロックされます",
+                MixedWaitsWarning,
+                stacklevel=3,
+            )
     
     def wait_for_element(self, locator: Tuple[By, str], timeout: Optional[int] = None, 
-                       condition: str = "presence") -> WebElement:
+                       condition: Union[str, Condition] = "presence", mode: Optional[str] = None) -> WebElement:
         """
         要素が特定の状態になるまで待機する
         
         Args:
             locator: (検索方法, 検索値)のタプル
             timeout: 待機時間（秒）
-            condition: 待機条件（presence, visibility, clickable）
-            
+            condition: 待機条件（presence, visibility, clickable）または src.conditions の Condition。
+                Conditionはブラウザ内で評価されるため、1回のポーリングが1往復で済む
+            mode: 待機方法。Noneの場合は settings.WAIT_MODE を使用
+                poll: WebDriverWaitによる一定間隔のポーリング
+                adaptive: 短い間隔から始めて徐々に間隔を広げるポーリング
+                observer: ブラウザ内のMutationObserverで条件の成立を検知する
+        
         Returns:
             WebElement: 条件を満たした要素
         """
         if timeout is None:
             timeout = settings.EXPLICIT_WAIT
+        if mode is None:
+            mode = settings.WAIT_MODE
+        if not isinstance(condition, str):
+            with _timeout_locator(locator):
+                return self._wait_for_condition(locator, condition, timeout, mode)
+        if condition not in _EXPECTED_CONDITIONS:
+            raise ValueError(f"サポートされていない待機条件: {condition}")
         
-        wait = WebDriverWait(self.driver, timeout)
+        self._check_mixed_waits("wait_for_element")
+        from selenium.webdriver.support import expected_conditions as EC
         
-        if condition == "presence":
-            return wait.until(EC.presence_of_element_located(locator))
-        elif condition == "visibility":
-            return wait.until(EC.visibility_of_element_located(locator))
-        elif condition == "clickable":
-            return wait.until(EC.element_to_be_clickable(locator))
-        else:
-            raise ValueError(f"サポートされていない待機条件: {condition}")
+        expected_condition = getattr(EC, _EXPECTED_CONDITIONS[condition])(locator)
+        message = f"{locator} が {condition} の状態になりませんでした（{timeout}秒）"
+        
+        with _timeout_locator(locator):
+            if mode == "poll":
+                return WebDriverWait(self.driver, timeout).until(expected_condition)
+            elif mode == "adaptive":
+                return self._poll_adaptively(expected_condition, timeout, message)
+            elif mode == "observer":
+                return self._wait_with_observer(
+                    locator, browser_scripts.CONDITION_PREDICATES[condition], None,
+                    expected_condition, timeout, message
+                )
+            else:
+                raise ValueError(f"サポートされていない待機モード: {mode}")
+    
+    def _wait_for_condition(self, locator: Tuple[By, str], condition: Condition,
+                            timeout: float, mode: str) -> WebElement:
+        """
+        Conditionを満たす要素が現れるまで待機する
+        
+        条件は1つの判定式に変換してブラウザ内で評価し、一致した要素を同じ呼び出しで受け取る。
+        
+        Args:
+            locator: (検索方法, 検索値)のタプル
+            condition: 待機条件
+            timeout: 待機時間（秒）
+            mode: 待機方法（poll, adaptive, observer）
+        
+        Returns:
+            WebElement: 条件を満たした要素
+        """
+        self._check_mixed_waits("wait_for_element")
+        by, value = locator
+        predicate, params = condition.compile()
+        message = f"{locator} が {condition.description} の状態になりませんでした（{timeout}秒）"
+        
+        if mode == "observer":
+            return self._wait_with_observer(locator, predicate, params, None, timeout, message)
+        if mode not in ("poll", "adaptive"):
+            raise ValueError(f"サポートされていない待機モード: {mode}")
+        script = browser_scripts.find_matching_script(predicate)
+        return self.wait_until(lambda d: d.execute_script(script, by, value, params), timeout, message, mode)
+    
+    def wait_until(self, condition: Callable[[WebDriver], Any], timeout: Optional[int] = None,
+                   message: str = "", mode: Optional[str] = None) -> Any:
+        """
+        条件が真になるまで待機する
+        
+        Args:
+            condition: ドライバを受け取り、成立時に真となる値を返す関数
+            timeout: 待機時間（秒）
+            message: タイムアウト時のメッセージ
+            mode: 待機方法。observerはこのメソッドでは使えないためadaptiveとして扱う
+        
+        Returns:
+            Any: conditionが返した値
+        
+        Raises:
+            TimeoutException: 時間内に条件が成立しなかった場合
+        """
+        if timeout is None:
+            timeout = settings.EXPLICIT_WAIT
+        if mode is None:
+            mode = settings.WAIT_MODE
+        
+        if mode == "poll":
+            return WebDriverWait(self.driver, timeout).until(condition, message)
+        return self._poll_adaptively(condition, timeout, message)
+    
+    def _poll_adaptively(self, condition: Callable[[WebDriver], Any], timeout: float,
+                         message: str = "") -> Any:
+        """
+        間隔を広げながら条件をポーリングする
+        
+        最初は ADAPTIVE_POLL_MIN 秒間隔で確認し、確認のたびに間隔を2倍にして
+        ADAPTIVE_POLL_MAX 秒まで広げる。すぐに成立する条件の待ち時間を短くしつつ、
+        長い待機でのコマンド数を抑える。
+        
+        Args:
+            condition: ドライバを受け取り、成立時に真となる値を返す関数
+            timeout: 待機時間（秒）
+            message: タイムアウト時のメッセージ
+        
+        Returns:
+            Any: conditionが返した値
+        """
+        deadline = time.monotonic() + timeout
+        interval = settings.ADAPTIVE_POLL_MIN
+        while True:
+            try:
+                value = condition(self.driver)
+                if value:
+                    return value
+            except NoSuchElementException:
+                pass
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise TimeoutException(message)
+            time.sleep(min(interval, remaining))
+            interval = min(interval * 2, settings.ADAPTIVE_POLL_MAX)
+    
+    def _wait_with_observer(self, locator: Tuple[By, str], predicate: str, params: Any,
+                            fallback_condition: Optional[Callable[[WebDriver], Any]], timeout: float,
+                            message: str = "") -> WebElement:
+        """
+        MutationObserverで条件を満たす要素が現れるまで待機する
+        
+        非同期スクリプトは OBSERVER_WAIT_CHUNK 秒ごとに区切って実行し、ドライバの
+        スクリプトタイムアウトを超えないようにする。非同期スクリプトが使えない場合は
+        同じ判定式を同期スクリプトで、それも使えない場合は fallback_condition を
+        adaptiveポーリングで確認する。
+        
+        Args:
+            locator: (検索方法, 検索値)のタプル
+            predicate: 判定式（el と params を参照できるJavaScriptの式）
+            params: 判定式の引数
+            fallback_condition: スクリプトが使えない場合の条件。Noneの場合はJavascriptExceptionを送出する
+            timeout: 待機時間（秒）
+            message: タイムアウト時のメッセージ
+        
+        Returns:
+            WebElement: 条件を満たした要素
+        """
+        by, value = locator
+        deadline = time.monotonic() + timeout
+        script = browser_scripts.observe_matching_script(predicate)
+        
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise TimeoutException(message)
+            budget_ms = int(min(remaining, settings.OBSERVER_WAIT_CHUNK) * 1000)
+            try:
+                element = self.driver.execute_async_script(script, by, value, params, budget_ms)
+            except TimeoutException:
+                # ドライバのスクリプトタイムアウトが待機時間より短い場合
+                continue
+            except JavascriptException:
+                break
+            if element is not None:
+                return element
+        
+        # 非同期スクリプトが使えない場合は同期スクリプトで1ポーリング1往復の確認を行う
+        find_script = browser_scripts.find_matching_script(predicate)
+        remaining = max(deadline - time.monotonic(), 0)
+        try:
+            return self._poll_adaptively(
+                lambda d: d.execute_script(find_script, by, value, params), remaining, message
+            )
+        except JavascriptException:
+            if fallback_condition is None:
+                raise
+            return self._poll_adaptively(fallback_condition, max(deadline - time.monotonic(), 0), message)
     
     def get_text(self, locator: Tuple[By, str], timeout: Optional[int] = None) -> str:
         """
@@ -151,7 +448,7 @@ class PageActions:
         Args:
             locator: (検索方法, 検索値)のタプル
             timeout: 待機時間（秒）
-            
+        
         Returns:
             str: 要素のテキスト
         """
@@ -166,13 +463,133 @@ class PageActions:
             locator: (検索方法, 検索値)のタプル
             attribute: 取得する属性の名前
             timeout: 待機時間（秒）
-            
+        
         Returns:
             str: 属性の値
         """
         element = self.find(locator, timeout)
         return element.get_attribute(attribute)
     
+    def get_texts(self, locator: Tuple[By, str], timeout: Optional[int] = None) -> List[str]:
+        """
+        一致する全要素のテキストを1回のスクリプト実行で取得する
+        
+        WebElement.text と同じく、表示されていない要素（display: none など）は空文字列を返す。
+        テキストは innerText の前後の空白を除いたもので、空白の正規化は WebElement.text と
+        異なる場合がある。
+        
+        Args:
+            locator: (検索方法, 検索値)のタプル
+            timeout: 待機時間（秒）
+        
+        Returns:
+            List[str]: 要素ごとのテキストのリスト
+        """
+        return self._extract_all(
+            locator, browser_scripts.GET_TEXTS, None,
+            lambda element: element.text, timeout
+        )
+    
+    def get_attributes(self, locator: Tuple[By, str], names: Union[str, List[str]],
+                       timeout: Optional[int] = None) -> list:
+        """
+        一致する全要素の属性値を1回のスクリプト実行で取得する
+        
+        Args:
+            locator: (検索方法, 検索値)のタプル
+            names: 取得する属性名、または属性名のリスト
+            timeout: 待機時間（秒）
+        
+        Returns:
+            list: namesが文字列の場合は値のリスト、リストの場合は{属性名: 値}の辞書のリスト
+        """
+        return self._extract_named_values(
+            locator, browser_scripts.GET_ATTRIBUTES, names,
+            lambda element, name: element.get_dom_attribute(name), timeout
+        )
+    
+    def get_properties(self, locator: Tuple[By, str], names: Union[str, List[str]],
+                       timeout: Optional[int] = None) -> list:
+        """
+        一致する全要素のDOMプロパティ値を1回のスクリプト実行で取得する
+        
+        Args:
+            locator: (検索方法, 検索値)のタプル
+            names: 取得するプロパティ名、またはプロパティ名のリスト
+            timeout: 待機時間（秒）
+        
+        Returns:
+            list: namesが文字列の場合は値のリスト、リストの場合は{プロパティ名: 値}の辞書のリスト
+        """
+        return self._extract_named_values(
+            locator, browser_scripts.GET_PROPERTIES, names,
+            lambda element, name: element.get_property(name), timeout
+        )
+    
+    def _extract_named_values(self, locator: Tuple[By, str], script: str, names: Union[str, List[str]],
+                              read_value: Callable[[WebElement, str], Any],
+                              timeout: Optional[int] = None) -> list:
+        """
+        属性・プロパティの一括取得の共通処理
+        
+        Args:
+            locator: (検索方法, 検索値)のタプル
+            script: 一括取得に使用するスクリプト
+            names: 取得する名前、または名前のリスト
+            read_value: スクリプトが使えない場合に要素ごとに値を読む関数
+            timeout: 待機時間（秒）
+        
+        Returns:
+            list: 値のリスト、または辞書のリスト
+        """
+        single = isinstance(names, str)
+        name_list = [names] if single else list(names)
+        rows = self._extract_all(
+            locator, script, name_list,
+            lambda element: {name: read_value(element, name) for name in name_list},
+            timeout
+        )
+        if single:
+            return [row[names] for row in rows]
+        return rows
+    
+    def _extract_all(self, locator: Tuple[By, str], script: str, names: Optional[List[str]],
+                     read_element: Callable[[WebElement], Any],
+                     timeout: Optional[int] = None) -> list:
+        """
+        一致する全要素から値を取得する
+        
+        スクリプトは要素が見つかるまで1ポーリングにつき1回だけ実行される。
+        JavaScriptが使えない場合は、find_allと要素ごとの読み取りにフォールバックする。
+        
+        Args:
+            locator: (検索方法, 検索値)のタプル
+            script: 一括取得に使用するスクリプト
+            names: スクリプトに渡す名前のリスト
+            read_element: フォールバック時に要素ごとに値を読む関数
+            timeout: 待機時間（秒）
+        
+        Returns:
+            list: 要素ごとの値のリスト
+        
+        Raises:
+            TimeoutException: 要素が見つからない場合
+        """
+        if timeout is None:
+            timeout = settings.EXPLICIT_WAIT
+        
+        if self.use_javascript:
+            args = list(locator) if names is None else [*locator, names]
+            try:
+                return WebDriverWait(self.driver, timeout).until(
+                    lambda d: d.execute_script(script, *args)
+                )
+            except JavascriptException:
+                # JavaScriptが無効、またはロケーターを解決できない場合は要素ごとの取得に切り替える
+                pass
+        
+        return [read_element(element) for element in self.find_all(locator, timeout)]
+    
     def scroll_to_element(self, locator: Tuple[By, str], timeout: Optional[int] = None) -> None:
         """
         要素までスクロールする
@@ -193,6 +610,8 @@ class PageActions:
             timeout: 待機時間（秒）
         """
         element = self.find(locator, timeout)
+        from selenium.webdriver.common.action_chains import ActionChains
+        
         ActionChains(self.driver).move_to_element(element).perform()
     
     def select_dropdown_option_by_text(self, locator: Tuple[By, str], option_text: str, 
@@ -221,26 +640,196 @@ class PageActions:
             option_value: 選択するオプションの値
             timeout: 待機時間（秒）
         """
+        self._select_by_value(self.find(locator, timeout), option_value)
+    
+    def fill_form(self, fields: Dict[Tuple[By, str], Any], mode: Optional[str] = None,
+                  timeout: Optional[int] = None) -> None:
+        """
+        フォームの複数のフィールドに値を入力する
+        
+        Args:
+            fields: {ロケーター: 値} の辞書。辞書の順に入力する
+                チェックボックス・ラジオボタン: 真偽値
+                セレクトボックス: オプションの値（複数選択の場合は値のリスト）
+                その他の入力要素: 入力するテキスト
+            mode: 入力方法。Noneの場合は settings.FORM_FILL_MODE を使用
+                fast: 1回のスクリプト実行で値を設定し、input/changeイベントを発生させる
+                fidelity: 要素の検索を1回にまとめ、実際のキー入力とクリックで入力する
+            timeout: 全てのフィールドが見つかるまでの待機時間（秒）
+        
+        Raises:
+            TimeoutException: 見つからないフィールドがある場合
+            NoSuchElementException: セレクトボックスに値が一致するオプションがない場合
+                （fastモードでは、どのフィールドも変更せずに送出する）
+        """
+        if timeout is None:
+            timeout = settings.EXPLICIT_WAIT
+        if mode is None:
+            mode = settings.FORM_FILL_MODE
+        if mode not in ("fast", "fidelity"):
+            raise ValueError(f"サポートされていない入力方法: {mode}")
+        items = list(fields.items())
+        if not items:
+            return
+        
+        if mode == "fast" and self.use_javascript:
+            payload = [[*locator, value] for locator, value in items]
+            try:
+                self.wait_until(
+                    lambda d: d.execute_script(browser_scripts.FILL_FORM, payload), timeout,
+                    f"フォームのフィールドが見つかりませんでした（{timeout}秒）"
+                )
+                return
+            except JavascriptException as e:
+                # 入力値の誤りは実際の操作でも失敗するため、そのまま呼び出し元に伝える
+                if browser_scripts.FILL_FORM_OPTION_ERROR in (e.msg or ""):
+                    raise NoSuchElementException(e.msg) from e
+                # JavaScriptが使えない場合は実際の操作で入力する
+        
+        found = self._find_form_fields([locator for locator, _ in items], timeout)
+        for (_, value), (element, tag, input_type, checked) in zip(items, found):
+            if tag == "select":
+                self._select_by_value(element, value)
+            elif input_type in ("checkbox", "radio"):
+                if bool(value) != checked:
+                    element.click()
+            else:
+                element.clear()
+                element.send_keys(str(value))
+    
+    def _find_form_fields(self, locators: List[Tuple[By, str]],
+                          timeout: float) -> List[Tuple[WebElement, str, str, bool]]:
+        """
+        フォームの全フィールドを探し、要素と種類を返す
+        
+        JavaScriptが使える場合は1ポーリングにつき1回のスクリプト実行で全フィールドを探す。
+        
+        Args:
+            locators: ロケーターのリスト
+            timeout: 待機時間（秒）
+        
+        Returns:
+            List[Tuple[WebElement, str, str, bool]]: (要素, タグ名, type属性, チェック状態) のリスト
+        """
+        if self.use_javascript:
+            payload = [list(locator) for locator in locators]
+            try:
+                rows = self.wait_until(
+                    lambda d: d.execute_script(browser_scripts.FIND_FORM_FIELDS, payload), timeout,
+                    f"フォームのフィールドが見つかりませんでした（{timeout}秒）"
+                )
+                return [tuple(row) for row in rows]
+            except JavascriptException:
+                pass
+        
+        fields = []
+        for locator in locators:
+            element = self.find(locator, timeout)
+            input_type = (element.get_attribute("type") or "").lower()
+            checked = element.is_selected() if input_type in ("checkbox", "radio") else False
+            fields.append((element, element.tag_name.lower(), input_type, checked))
+        return fields
+    
+    @staticmethod
+    def _select_by_value(element: WebElement, value: Union[str, List[str]]) -> None:
+        """
+        セレクトボックスのオプションを値で選択する
+        
+        Args:
+            element: select要素
+            value: オプションの値。複数選択の場合は値のリストを指定でき、他の選択は解除される
+        """
         from selenium.webdriver.support.ui import Select
         
-        element = self.find(locator, timeout)
         select = Select(element)
-        select.select_by_value(option_value)
+        if isinstance(value, (list, tuple)):
+            if select.is_multiple:
+                select.deselect_all()
+            for option_value in value:
+                select.select_by_value(option_value)
+        else:
+            select.select_by_value(value)
     
-    def wait_for_page_load(self, timeout: Optional[int] = None) -> None:
+    def wait_for_page_load(self, timeout: Optional[int] = None, state: str = "complete") -> None:
         """
-        ページの読み込みが完了するまで待機する
+        ページの読み込みが指定した状態になるまで待機する
         
         Args:
             timeout: 待機時間（秒）
+            state: 待機する document.readyState（interactive, complete）
+                interactive: DOMの構築が完了した（completeも含む）
+                complete: サブリソースを含めて読み込みが完了した
         """
         if timeout is None:
             timeout = settings.EXPLICIT_WAIT
+        if state not in ("interactive", "complete"):
+            raise ValueError(f"サポートされていない読み込み状態: {state}")
+        accepted = ("interactive", "complete") if state == "interactive" else ("complete",)
         
         WebDriverWait(self.driver, timeout).until(
-            lambda d: d.execute_script('return document.readyState') == 'complete'
+            lambda d: d.execute_script(browser_scripts.READY_STATE) in accepted
         )
     
+    def wait_for_all_present(self, locators: List[Tuple[By, str]], timeout: Optional[int] = None) -> None:
+        """
+        全てのロケーターに一致する要素が存在するまで待機する
+        
+        JavaScriptが使える場合は1ポーリングにつき1回のスクリプト実行で全てのロケーターを確認する。
+        
+        Args:
+            locators: ロケーターのリスト
+            timeout: 待機時間（秒）
+        
+        Raises:
+            TimeoutException: 時間内に全ての要素が揃わなかった場合
+        """
+        if timeout is None:
+            timeout = settings.EXPLICIT_WAIT
+        if not locators:
+            return
+        
+        message = f"{list(locators)} の要素が揃いませんでした（{timeout}秒）"
+        if self.use_javascript:
+            payload = [list(locator) for locator in locators]
+            try:
+                self.wait_until(lambda d: d.execute_script(browser_scripts.ALL_PRESENT, payload), timeout, message)
+                return
+            except JavascriptException:
+                pass
+        
+        deadline = time.monotonic() + timeout
+        for locator in locators:
+            self.wait_for_element(locator, max(deadline - time.monotonic(), 0))
+    
+    def wait_for_network_idle(self, idle_time: Optional[float] = None, timeout: Optional[int] = None) -> None:
+        """
+        ネットワークがアイドル状態になるまで待機する
+        
+        DOMの構築が完了し、読み込みが完了したリソース（Resource Timing）の数が idle_time 秒間
+        増えなくなった時点をアイドルとみなす。実行中のリクエストそのものは検出できないため、
+        idle_time より長く応答のないリクエストがある場合は早く終わることがある。
+        
+        Args:
+            idle_time: アイドルとみなすまでの時間（秒）。Noneの場合は settings.NETWORK_IDLE_TIME を使用
+            timeout: 待機時間（秒）
+        """
+        if timeout is None:
+            timeout = settings.EXPLICIT_WAIT
+        if idle_time is None:
+            idle_time = settings.NETWORK_IDLE_TIME
+        observed = {"count": None, "since": 0.0}
+        
+        def is_idle(driver):
+            ready_state, count = driver.execute_script(browser_scripts.NETWORK_STATE)
+            now = time.monotonic()
+            if ready_state == "loading" or count != observed["count"]:
+                observed["count"] = count
+                observed["since"] = now
+                return False
+            return now - observed["since"] >= idle_time
+        
+        self.wait_until(is_idle, timeout, f"ネットワークがアイドル状態になりませんでした（{timeout}秒）", mode="adaptive")
+    
     def switch_to_iframe(self, locator: Tuple[By, str], timeout: Optional[int] = None) -> None:
         """
         iframeに切り替える
@@ -267,6 +856,7 @@ class PageActions:
         """
         if timeout is None:
             timeout = settings.EXPLICIT_WAIT
+        from selenium.webdriver.support import expected_conditions as EC
         
         WebDriverWait(self.driver, timeout).until(EC.alert_is_present())
         self.driver.switch_to.alert.accept()
@@ -280,6 +870,7 @@ class PageActions:
         """
         if timeout is None:
             timeout = settings.EXPLICIT_WAIT
+        from selenium.webdriver.support import expected_conditions as EC
         
         WebDriverWait(self.driver, timeout).until(EC.alert_is_present())
         self.driver.switch_to.alert.dismiss()
@@ -288,17 +879,22 @@ class PageActions:
         """
         スクリーンショットを撮る
         
+        ASYNC_ARTIFACTSが有効な場合、ファイルはバックグラウンドで書き込まれるため、
+        戻った時点では返したパスのファイルがまだ存在しない場合がある。
+        SCREENSHOT_STOREが有効な場合は内容のハッシュで重複を除いて保存し、
+        ファイル名はマニフェストに記録する。
+        
         Args:
             filename: 保存するファイル名
-            
+        
         Returns:
             str: スクリーンショットのパス
         """
-        import os
-        from datetime import datetime
+        from src.artifact_writer import save_screenshot
+        from src.artifacts import unique_artifact_path
+        from src.screenshot_store import store_screenshot
         
-        os.makedirs(settings.SCREENSHOT_DIR, exist_ok=True)
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filepath = os.path.join(settings.SCREENSHOT_DIR, f"{filename}_{timestamp}.png")
-        self.driver.save_screenshot(filepath)
-        return filepath
\ No newline at end of file
+        if settings.SCREENSHOT_STORE:
+            return store_screenshot(self.driver, filename)
+        filepath = unique_artifact_path(settings.SCREENSHOT_DIR, filename, "png")
+        return save_screenshot(self.driver, filepath)
\ No newline at end of file
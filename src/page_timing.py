@@ -0,0 +1,281 @@
+"""
+ページ性能の計測。
+BasePage のページ遷移ごとに Navigation Timing・Paint Timing・Resource Timing を1回のスクリプト実行で取得し、
+ページオブジェクトのクラスとテストをキーにしてJSONLで保存します。
+ページオブジェクトが宣言した予算（PERFORMANCE_BUDGETS）を超えた場合は、テストを失敗させるか警告します。
+"""
+
+import json
+import os
+import threading
+import warnings
+from typing import Any, Dict, List, Optional
+
+from config import settings
+from src import browser_scripts
+from src.artifacts import get_current_test, unique_artifact_path
+
+# 予算に指定できる指標。時刻はナビゲーションの開始からのミリ秒、
+# resource_count は件数、transfer_size（HTML）・resource_bytes（サブリソースの合計）はバイト数
+BUDGET_METRICS = (
+    "ttfb", "dom_interactive", "dom_content_loaded", "load", "first_paint", "first_contentful_paint",
+    "transfer_size", "resource_count", "resource_bytes",
+)
+# サマリーに平均を表示する指標
+SUMMARY_METRICS = ("ttfb", "dom_content_loaded", "load", "first_contentful_paint")
+
+
+class PerformanceBudgetExceeded(AssertionError):
+    """ページ性能が予算を超えたことを示す例外"""
+    
+    def __init__(self, timing: "PageTiming", message: str):
+        """
+        PerformanceBudgetExceededクラスの初期化
+        
+        Args:
+            timing: 予算を超えた計測結果
+            message: エラーメッセージ
+        """
+        super().__init__(message)
+        self.timing = timing
+
+
+class PerformanceBudgetWarning(UserWarning):
+    """ページ性能が予算を超えたことを示す警告（予算を超えた場合の動作が warn の場合）"""
+
+
+class PageTiming:
+    """1回のページ遷移の計測結果"""
+    
+    def __init__(self, page: str, action: str, test: Optional[str], data: Dict[str, Any]):
+        """
+        PageTimingクラスの初期化
+        
+        Args:
+            page: ページオブジェクトのクラス名
+            action: ページ遷移の種類（open, refresh, back, forward）
+            test: 実行中のテストのnodeid。テストの外ではNone
+            data: browser_scripts.PAGE_TIMING の戻り値
+        """
+        navigation = data.get("navigation") or {}
+        self.page = page
+        self.action = action
+        self.test = test
+        self.url = navigation.get("url")
+        # 戻る・進むでバックフォワードキャッシュから復元されたページは、最初の読み込みのエントリを
+        # 読み直すことになるため、指標を記録しない（予算の確認と平均からも除く）
+        self.restored = bool(data.get("restored")) and action in ("back", "forward")
+        self.navigation = navigation
+        self.paint = data.get("paint") or {}
+        self.resources = data.get("resources") or []
+        self.metrics: Dict[str, Optional[float]] = {
+            "ttfb": navigation.get("ttfb"),
+            "dom_interactive": navigation.get("dom_interactive"),
+            "dom_content_loaded": navigation.get("dom_content_loaded"),
+            "load": navigation.get("load"),
+            "first_paint": self.paint.get("first-paint"),
+            "first_contentful_paint": self.paint.get("first-contentful-paint"),
+            "transfer_size": navigation.get("transfer_size"),
+            "resource_count": data.get("resource_count"),
+            "resource_bytes": data.get("resource_bytes"),
+        }
+        if self.restored:
+            self.metrics = dict.fromkeys(self.metrics)
+        self.violations: List[str] = []
+    
+    def check_budgets(self, budgets: Dict[str, float]) -> List[str]:
+        """
+        指標を予算と比較し、超えた指標を violations に記録する
+        
+        まだ発生していないイベント（ページ読み込み戦略が eager の場合の load など）の指標は確認しない。
+        
+        Args:
+            budgets: 指標 → 上限
+        
+        Returns:
+            List[str]: 予算を超えた指標の説明（"ttfb: 420 > 300" など）
+        """
+        violations = []
+        for metric, limit in budgets.items():
+            if metric not in BUDGET_METRICS:
+                raise ValueError(f"サポートされていない指標: {metric}（{', '.join(BUDGET_METRICS)}）")
+            value = self.metrics.get(metric)
+            if value is not None and value > limit:
+                violations.append(f"{metric}: {value:g} > {limit:g}")
+        self.violations = violations
+        return violations
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        計測結果を辞書で返す（JSONLの1行）
+        
+        Returns:
+            Dict[str, Any]: ページ・テスト・指標・リソースなど
+        """
+        return {
+            "page": self.page,
+            "test": self.test,
+            "action": self.action,
+            "url": self.url,
+            "restored": self.restored,
+            "metrics": self.metrics,
+            "violations": self.violations,
+            "navigation": self.navigation,
+            "paint": self.paint,
+            "resources": self.resources,
+        }
+
+
+class PageTimingRecorder:
+    """計測結果をJSONLに追記し、ページオブジェクトのクラスごとに集計する"""
+    
+    def __init__(self, path: Optional[str] = None):
+        """
+        PageTimingRecorderクラスの初期化
+        
+        Args:
+            path: JSONLのパス。Noneの場合は最初の記録時に {REPORT_DIR}/{実行ID}/{ワーカーID}/ に作成する
+        """
+        self.path = path
+        # ページ → {"count", "violations", "sums": {指標: 合計}, "counts": {指標: 計測できた回数}}
+        self.pages: Dict[str, Dict[str, Any]] = {}
+        self._file = None
+        self._lock = threading.Lock()
+    
+    def record(self, timing: PageTiming) -> None:
+        """
+        計測結果をJSONLに追記し、集計に加える
+        
+        Args:
+            timing: 計測結果
+        """
+        line = json.dumps(timing.to_dict(), ensure_ascii=False) + "\n"
+        with self._lock:
+            if self._file is None:
+                if self.path is None:
+                    self.path = unique_artifact_path(settings.REPORT_DIR, "page_timing", "jsonl")
+                os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+                self._file = open(self.path, "a", encoding="utf-8")
+            self._file.write(line)
+            # プロセスが異常終了しても、それまでの計測結果が残るようにする
+            self._file.flush()
+            entry = self._entry(timing.page)
+            entry["count"] += 1
+            entry["violations"] += 1 if timing.violations else 0
+            for metric in SUMMARY_METRICS:
+                value = timing.metrics.get(metric)
+                if value is not None:
+                    entry["sums"][metric] = entry["sums"].get(metric, 0.0) + value
+                    entry["counts"][metric] = entry["counts"].get(metric, 0) + 1
+    
+    def _entry(self, page: str) -> Dict[str, Any]:
+        """ページの集計を返す（呼び出し元でロックを取得する）"""
+        return self.pages.setdefault(page, {"count": 0, "violations": 0, "sums": {}, "counts": {}})
+    
+    def close(self) -> None:
+        """JSONLのファイルを閉じる（集計は残る）"""
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+    
+    def to_dict(self) -> Dict:
+        """
+        集計結果を辞書で返す（並列実行時にコントローラーへ渡すために使用）
+        
+        Returns:
+            Dict: ページごとの集計結果
+        """
+        with self._lock:
+            return {
+                page: {"count": entry["count"], "violations": entry["violations"],
+                       "sums": dict(entry["sums"]), "counts": dict(entry["counts"])}
+                for page, entry in self.pages.items()
+            }
+    
+    def merge(self, data: Dict) -> None:
+        """
+        他のワーカーの集計結果を加える
+        
+        Args:
+            data: to_dict の結果
+        """
+        with self._lock:
+            for page, other in data.items():
+                entry = self._entry(page)
+                entry["count"] += other["count"]
+                entry["violations"] += other["violations"]
+                for key in ("sums", "counts"):
+                    for metric, value in other[key].items():
+                        entry[key][metric] = entry[key].get(metric, 0) + value
+    
+    def summary_lines(self) -> List[str]:
+        """
+        ページごとの計測回数・主な指標の平均・予算を超えた回数を表す行を返す
+        
+        Returns:
+            List[str]: 表示する行。一度も計測していない場合は空のリスト
+        """
+        with self._lock:
+            pages = self.pages
+            if not pages:
+                return []
+            width = max(24, max(len(page) for page in pages) + 2)
+            lines = [f"{'page':<{width}}{'count':>7}" + "".join(f"{metric:>24}" for metric in SUMMARY_METRICS)
+                     + f"{'over budget':>13}"]
+            for page, entry in sorted(pages.items()):
+                cells = []
+                for metric in SUMMARY_METRICS:
+                    count = entry["counts"].get(metric, 0)
+                    cells.append(f"{entry['sums'][metric] / count:>22.0f}ms" if count else f"{'-':>24}")
+                lines.append(f"{page:<{width}}{entry['count']:>7}" + "".join(cells) + f"{entry['violations']:>13}")
+        return lines
+
+
+_page_timing_recorder = PageTimingRecorder()
+
+
+def get_page_timing_recorder() -> PageTimingRecorder:
+    """
+    プロセス共通のPageTimingRecorderを返す
+    
+    Returns:
+        PageTimingRecorder: 共通の記録
+    """
+    return _page_timing_recorder
+
+
+def measure_page(driver, page: str, action: str, budgets: Optional[Dict[str, float]] = None,
+                 budget_action: Optional[str] = None) -> PageTiming:
+    """
+    現在のページの性能を1回のスクリプト実行で取得して記録し、予算を確認する
+    
+    Args:
+        driver: WebDriverのインスタンス
+        page: ページオブジェクトのクラス名
+        action: ページ遷移の種類（open, refresh, back, forward）
+        budgets: 指標 → 上限。Noneまたは空の場合は確認しない
+        budget_action: 予算を超えた場合の動作（fail, warn）。Noneの場合は settings.PERFORMANCE_BUDGET_ACTION
+    
+    Returns:
+        PageTiming: 計測結果
+    
+    Raises:
+        PerformanceBudgetExceeded: 予算を超え、動作が fail の場合（計測結果は記録した後に送出する）
+    """
+    budget_action = budget_action or settings.PERFORMANCE_BUDGET_ACTION
+    if budget_action not in ("fail", "warn"):
+        raise ValueError(f"サポートされていない予算超過時の動作: {budget_action}")
+    data = driver.execute_script(browser_scripts.PAGE_TIMING, settings.PAGE_TIMING_MAX_RESOURCES)
+    timing = PageTiming(page, action, get_current_test(), data or {})
+    if budgets:
+        timing.check_budgets(budgets)
+    get_page_timing_recorder().record(timing)
+    
+    if timing.violations:
+        message = f"{page}.{action}（{timing.url}）がページ性能の予算を超えました: {', '.join(timing.violations)}"
+        if budget_action == "warn":
+            warnings.warn(message, PerformanceBudgetWarning, stacklevel=3)
+        else:
+            raise PerformanceBudgetExceeded(timing, message)
+    return timing
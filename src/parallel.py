@@ -0,0 +1,134 @@
+"""
+並列実行（pytest-xdist）のためのユーティリティ。
+ワーカー数の決定とワーカーごとの稼働率の集計を行います。
+"""
+
+import os
+import time
+from typing import Dict, List, Optional
+
+from config import settings
+
+
+def available_cpu_count() -> int:
+    """
+    このプロセスが使用できるCPU数を返す
+    
+    Returns:
+        int: CPU数
+    """
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def available_memory_mb() -> Optional[int]:
+    """
+    利用可能なメモリ量を返す
+    
+    Returns:
+        Optional[int]: 利用可能なメモリ量（MB）。取得できない場合はNone
+    """
+    try:
+        with open("/proc/meminfo", encoding="utf-8") as meminfo:
+            for line in meminfo:
+                if line.startswith("MemAvailable:"):
+                    return int(line.split()[1]) // 1024
+    except OSError:
+        pass
+    
+    try:
+        pages = os.sysconf("SC_AVPHYS_PAGES")
+        page_size = os.sysconf("SC_PAGE_SIZE")
+        return pages * page_size // (1024 * 1024)
+    except (AttributeError, ValueError, OSError):
+        return None
+
+
+def recommended_worker_count(memory_per_worker_mb: int = settings.WORKER_MEMORY_MB,
+                             max_workers: Optional[int] = settings.MAX_WORKERS) -> int:
+    """
+    CPU数と利用可能なメモリ量から並列実行のワーカー数を決める
+    
+    Args:
+        memory_per_worker_mb: 1ワーカー（ブラウザを含む）が使用するメモリ量の見積もり（MB）
+        max_workers: ワーカー数の上限。Noneの場合は上限なし
+    
+    Returns:
+        int: ワーカー数（1以上）
+    """
+    workers = available_cpu_count()
+    memory_mb = available_memory_mb()
+    if memory_mb is not None and memory_per_worker_mb > 0:
+        workers = min(workers, memory_mb // memory_per_worker_mb)
+    if max_workers:
+        workers = min(workers, max_workers)
+    return max(1, workers)
+
+
+class WorkerStats:
+    """ワーカーごとのテスト実行時間の集計"""
+    
+    def __init__(self, worker_id: str):
+        """
+        WorkerStatsクラスの初期化
+        
+        Args:
+            worker_id: ワーカーID
+        """
+        self.worker_id = worker_id
+        self.started = time.perf_counter()
+        self.finished: Optional[float] = None
+        self.busy_seconds = 0.0
+        self.tests = 0
+    
+    def add_report(self, report) -> None:
+        """
+        テストレポートの実行時間を加算する
+        
+        Args:
+            report: pytestのTestReport
+        """
+        self.busy_seconds += report.duration
+        if report.when == "call":
+            self.tests += 1
+    
+    def finish(self) -> None:
+        """集計を終了する"""
+        self.finished = time.perf_counter()
+    
+    def to_dict(self) -> Dict[str, float]:
+        """
+        集計結果を辞書にする（ワーカーからコントローラーへの受け渡し用）
+        
+        Returns:
+            Dict[str, float]: 集計結果
+        """
+        end = self.finished if self.finished is not None else time.perf_counter()
+        return {
+            "worker_id": self.worker_id,
+            "wall_seconds": end - self.started,
+            "busy_seconds": self.busy_seconds,
+            "tests": self.tests,
+        }
+
+
+def format_utilization(stats: List[Dict[str, float]]) -> List[str]:
+    """
+    ワーカーごとの稼働率を表形式の文字列にする
+    
+    Args:
+        stats: WorkerStats.to_dict() の結果のリスト
+    
+    Returns:
+        List[str]: 表の各行
+    """
+    lines = [f"{'worker':<8} {'tests':>6} {'busy(s)':>9} {'wall(s)':>9} {'util':>6}"]
+    for row in sorted(stats, key=lambda r: r["worker_id"]):
+        wall = row["wall_seconds"]
+        utilization = row["busy_seconds"] / wall * 100 if wall > 0 else 0.0
+        lines.append(
+            f"{row['worker_id']:<8} {row['tests']:>6} {row['busy_seconds']:>9.1f} "
+            f"{wall:>9.1f} {utilization:>5.0f}%"
+        )
+    return lines
@@ -0,0 +1,456 @@
+"""
+リソースのフィルタリング。
+機能テストに不要な画像・フォント・動画や解析用スクリプトの読み込みをブロックし、ページの読み込みを速くします。
+Chromium系ブラウザではCDPの Network.setBlockedURLs を、その他のブラウザではローカルのフィルタリングプロキシを使用します。
+どちらの方法でも、リソースの種類は実際の応答の種類ではなくURLの拡張子で判定します。
+"""
+
+from __future__ import annotations
+
+import fnmatch
+import http.client
+import json
+import os
+import select
+import socket
+import threading
+import urllib.request
+from collections import Counter
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+from config import settings
+
+if TYPE_CHECKING:
+    from selenium.webdriver.remote.webdriver import WebDriver
+
+# CDPでリソースをブロックできるブラウザ
+CHROMIUM_BROWSERS = ("chrome", "edge")
+# Chromium系ブラウザのケイパビリティの browserName
+CHROMIUM_BROWSER_NAMES = ("chrome", "msedge", "microsoftedge")
+
+# リソースの種類と拡張子の対応。URLの拡張子で種類を判定する
+RESOURCE_TYPE_EXTENSIONS = {
+    "image": ("png", "jpg", "jpeg", "gif", "webp", "avif", "svg", "ico", "bmp"),
+    "media": ("mp4", "webm", "ogg", "ogv", "mp3", "wav", "m4a", "mov", "m3u8"),
+    "font": ("woff", "woff2", "ttf", "otf", "eot"),
+    "stylesheet": ("css",),
+    "script": ("js", "mjs"),
+}
+
+# プロキシが転送しないホップ間ヘッダー
+_HOP_BY_HOP_HEADERS = {
+    "connection", "keep-alive", "proxy-authenticate", "proxy-authorization", "proxy-connection",
+    "te", "trailer", "transfer-encoding", "upgrade",
+}
+
+
+class ResourceFilter:
+    """ブロックするリソースの条件"""
+    
+    def __init__(self, resource_types: Iterable[str] = (), url_patterns: Iterable[str] = ()):
+        """
+        ResourceFilterクラスの初期化
+        
+        Args:
+            resource_types: ブロックするリソースの種類（image, media, font, stylesheet, script）
+            url_patterns: ブロックするURLのパターン（* をワイルドカードとして使用できる）
+        """
+        self.resource_types = tuple(resource_types)
+        self.url_patterns = tuple(url_patterns)
+        unknown = [t for t in self.resource_types if t not in RESOURCE_TYPE_EXTENSIONS]
+        if unknown:
+            raise ValueError(f"サポートされていないリソースの種類: {', '.join(unknown)}")
+        self._extensions = {
+            ext: resource_type
+            for resource_type in self.resource_types
+            for ext in RESOURCE_TYPE_EXTENSIONS[resource_type]
+        }
+    
+    @classmethod
+    def from_settings(cls, profile: Optional[str] = None) -> Optional["ResourceFilter"]:
+        """
+        設定のプロファイルからフィルタを作成する
+        
+        Args:
+            profile: プロファイル名。Noneの場合は settings.RESOURCE_FILTER_PROFILE を使用
+        
+        Returns:
+            Optional[ResourceFilter]: フィルタ。プロファイルが指定されていない場合はNone
+        """
+        name = profile or settings.RESOURCE_FILTER_PROFILE
+        if not name:
+            return None
+        if name not in settings.RESOURCE_FILTER_PROFILES:
+            raise ValueError(f"存在しないリソースフィルタのプロファイル: {name}")
+        config = settings.RESOURCE_FILTER_PROFILES[name]
+        return cls(
+            config.get("resource_types", ()),
+            [*config.get("url_patterns", ()), *settings.BLOCKED_URL_PATTERNS],
+        )
+    
+    def matches(self, url: str) -> bool:
+        """
+        URLがブロックの対象かどうかを判定する
+        
+        Args:
+            url: リクエストのURL
+        
+        Returns:
+            bool: ブロックする場合はTrue
+        """
+        if any(fnmatch.fnmatchcase(url, pattern) for pattern in self.url_patterns):
+            return True
+        path = urlsplit(url).path
+        ext = os.path.splitext(path)[1][1:].lower()
+        return bool(ext) and ext in self._extensions
+    
+    def blocked_url_patterns(self) -> List[str]:
+        """
+        CDPの Network.setBlockedURLs に渡すURLパターンを返す
+        
+        CDPのURLパターンはリソースの種類を指定できないため、種類は拡張子のパターン（*.png など）に変換する。
+        拡張子のないURL（/images/hero など）で配信される画像はブロックされない。
+        
+        Returns:
+            List[str]: URLパターンのリスト
+        """
+        patterns = list(self.url_patterns)
+        for ext in self._extensions:
+            patterns.append(f"*.{ext}")
+            patterns.append(f"*.{ext}?*")
+        return patterns
+
+
+def install_cdp_filter(driver: WebDriver, resource_filter: ResourceFilter) -> None:
+    """
+    CDPでリソースのブロックを設定する（Chromium系ブラウザのみ）
+    
+    設定はセッション内の以降の全てのページ遷移に適用される。
+    
+    Args:
+        driver: Seleniumのwebdriverインスタンス
+        resource_filter: ブロックするリソースの条件
+    """
+    driver.execute_cdp_cmd("Network.enable", {})
+    driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": resource_filter.blocked_url_patterns()})
+
+
+def uses_cdp_filter(driver: WebDriver) -> bool:
+    """
+    ドライバがCDPでリソースをブロックするブラウザかどうかを判定する
+    
+    コマンドラインオプションではなく、実際に起動したブラウザのケイパビリティで判定する
+    （requires マーカーで別のブラウザが起動される場合があるため）。
+    
+    Args:
+        driver: Seleniumのwebdriverインスタンス
+    
+    Returns:
+        bool: Chromium系ブラウザの場合はTrue
+    """
+    browser_name = (getattr(driver, "capabilities", None) or {}).get("browserName") or ""
+    return browser_name.lower() in CHROMIUM_BROWSER_NAMES
+
+
+def collect_blocked_requests(driver: WebDriver) -> List[str]:
+    """
+    パフォーマンスログからブロックされたリクエストのURLを取り出す
+    
+    ドライバは goog:loggingPrefs で performance ログを有効にして起動している必要がある。
+    ログは読み出すと消えるため、前回の呼び出し以降にブロックされたリクエストが返る。
+    
+    Args:
+        driver: Seleniumのwebdriverインスタンス
+    
+    Returns:
+        List[str]: ブロックされたリクエストのURL
+    """
+    urls: Dict[str, str] = {}
+    blocked = []
+    for entry in driver.get_log("performance"):
+        message = json.loads(entry["message"])["message"]
+        params = message.get("params", {})
+        if message.get("method") == "Network.requestWillBeSent":
+            urls[params.get("requestId")] = params.get("request", {}).get("url", "")
+        elif message.get("method") == "Network.loadingFailed" and params.get("blockedReason"):
+            blocked.append(urls.get(params.get("requestId"), ""))
+    return blocked
+
+
+class BlockedResourceStats:
+    """ブロックしたリクエストの集計"""
+    
+    def __init__(self, measure_bytes: bool = settings.RESOURCE_FILTER_MEASURE_BYTES):
+        """
+        BlockedResourceStatsクラスの初期化
+        
+        Args:
+            measure_bytes: Trueの場合、ブロックしたURLにHEADリクエストを送り、
+                Content-Lengthから削減できたバイト数を見積もる（テストとは別のスレッドで行い、
+                take で完了を待つ。調べたURLのサイズは再利用する）
+        """
+        self.measure_bytes = measure_bytes
+        self.requests = 0
+        self.bytes = 0
+        self.hosts: Counter = Counter()
+        self._pending_requests = 0
+        self._pending_bytes = 0
+        self._sizes: Dict[str, Optional[int]] = {}
+        # take の呼び出しまでに完了を待つ見積もり
+        self._futures: List[Future] = []
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+    
+    def record(self, url: str) -> None:
+        """
+        ブロックしたリクエストを記録する
+        
+        Args:
+            url: ブロックしたリクエストのURL
+        """
+        with self._lock:
+            self.requests += 1
+            self._pending_requests += 1
+            self.hosts[urlsplit(url).hostname or "?"] += 1
+            known = url in self._sizes
+            if known:
+                self._add_bytes(self._sizes[url])
+        if self.measure_bytes and not known and url.startswith(("http://", "https://")):
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="swt-resource-size")
+            future = self._executor.submit(self._measure, url)
+            with self._lock:
+                self._futures.append(future)
+    
+    def take(self, timeout: float = 10) -> Tuple[int, int]:
+        """
+        前回の呼び出し以降にブロックしたリクエスト数とバイト数を返す
+        
+        バイト数を見積もる場合は、その間に記録したリクエストの見積もりが完了するまで待つ。
+        
+        Args:
+            timeout: 見積もりの完了を待つ最大秒数。超えた分のバイト数は次の呼び出しに含まれる
+        
+        Returns:
+            Tuple[int, int]: (リクエスト数, 見積もったバイト数)
+        """
+        with self._lock:
+            futures, self._futures = self._futures, []
+        if futures:
+            wait(futures, timeout=timeout)
+        with self._lock:
+            result = (self._pending_requests, self._pending_bytes)
+            self._pending_requests = 0
+            self._pending_bytes = 0
+        return result
+    
+    def merge(self, data: Dict) -> None:
+        """
+        他のワーカーの集計結果を加える
+        
+        Args:
+            data: to_dict() の戻り値
+        """
+        with self._lock:
+            self.requests += data["requests"]
+            self.bytes += data["bytes"]
+            self.hosts.update(data["hosts"])
+    
+    def to_dict(self) -> Dict:
+        """
+        集計結果を辞書に変換する（ワーカー間の受け渡し用）
+        
+        Returns:
+            Dict: 集計結果
+        """
+        with self._lock:
+            return {"requests": self.requests, "bytes": self.bytes, "hosts": dict(self.hosts)}
+    
+    def close(self) -> None:
+        """バイト数の見積もりを完了させる"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+    
+    def summary(self, top: int = 5) -> Optional[str]:
+        """
+        集計結果を表す文字列を返す
+        
+        Args:
+            top: 表示するホストの数
+        
+        Returns:
+            Optional[str]: 一度もブロックしていない場合はNone
+        """
+        if self.requests == 0:
+            return None
+        size = f"{self.bytes / 1024 / 1024:.1f}MB" if self.measure_bytes else "未計測"
+        hosts = ", ".join(f"{host} ({count})" for host, count in self.hosts.most_common(top))
+        return f"ブロックしたリクエスト: {self.requests}件, 削減したバイト数: {size}, 主なホスト: {hosts}"
+    
+    def _add_bytes(self, size: Optional[int]) -> None:
+        """見積もったバイト数を加える（ロックを取得して呼び出す）"""
+        if size:
+            self.bytes += size
+            self._pending_bytes += size
+    
+    def _measure(self, url: str) -> None:
+        """HEADリクエストでリソースのサイズを調べる"""
+        size = None
+        try:
+            request = urllib.request.Request(url, method="HEAD")
+            with urllib.request.urlopen(request, timeout=5) as response:
+                length = response.headers.get("Content-Length")
+                size = int(length) if length else None
+        except Exception:
+            pass
+        with self._lock:
+            self._sizes.setdefault(url, size)
+            # 見積もり中に同じURLが再びブロックされた場合も、リクエストごとに加える
+            self._add_bytes(size)
+
+
+class FilteringProxy:
+    """ブロック対象のリクエストに空の応答を返すローカルHTTPプロキシ"""
+    
+    def __init__(self, resource_filter: ResourceFilter, stats: BlockedResourceStats,
+                 host: str = "127.0.0.1", port: int = 0):
+        """
+        FilteringProxyクラスの初期化
+        
+        HTTPSの通信はCONNECTでトンネルするため、URLパターンのうちホスト名に一致するものだけが
+        適用される（拡張子による種類の判定はHTTPの通信にのみ適用される）。
+        
+        Args:
+            resource_filter: ブロックするリソースの条件
+            stats: ブロックしたリクエストの集計
+            host: 待ち受けるホスト
+            port: 待ち受けるポート。0の場合は空いているポートを使用する
+        """
+        self.resource_filter = resource_filter
+        self.stats = stats
+        self._httpd = ThreadingHTTPServer((host, port), _make_proxy_handler(self))
+        self._httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+    
+    @property
+    def address(self) -> str:
+        """プロキシのアドレス（host:port）"""
+        host, port = self._httpd.server_address[:2]
+        return f"{host}:{port}"
+    
+    def start(self) -> "FilteringProxy":
+        """プロキシをバックグラウンドで起動する"""
+        self._thread = threading.Thread(
+            target=self._httpd.serve_forever, kwargs={"poll_interval": 0.05},
+            name="swt-filtering-proxy", daemon=True
+        )
+        self._thread.start()
+        return self
+    
+    def stop(self) -> None:
+        """プロキシを停止する"""
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+    
+    def __enter__(self) -> "FilteringProxy":
+        return self.start()
+    
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.stop()
+
+
+def _make_proxy_handler(proxy: FilteringProxy):
+    """プロキシのリクエストハンドラークラスを作成する"""
+    
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        
+        def log_message(self, format, *args):
+            pass
+        
+        def do_CONNECT(self):
+            host, _, port = self.path.partition(":")
+            if proxy.resource_filter.matches(f"https://{host}/"):
+                proxy.stats.record(f"https://{host}/")
+                self.send_response(403)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            try:
+                upstream = socket.create_connection((host, int(port or 443)), timeout=30)
+            except OSError:
+                self.send_error(502)
+                return
+            self.send_response(200, "Connection Established")
+            self.end_headers()
+            self._tunnel(upstream)
+        
+        def _tunnel(self, upstream):
+            sockets = [self.connection, upstream]
+            try:
+                while True:
+                    readable, _, errored = select.select(sockets, [], sockets, 30)
+                    if errored or not readable:
+                        break
+                    for sock in readable:
+                        data = sock.recv(65536)
+                        if not data:
+                            return
+                        (upstream if sock is self.connection else self.connection).sendall(data)
+            except OSError:
+                pass
+            finally:
+                upstream.close()
+                self.close_connection = True
+        
+        def _forward(self):
+            url = self.path
+            if proxy.resource_filter.matches(url):
+                proxy.stats.record(url)
+                self.send_response(204)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            
+            parts = urlsplit(url)
+            length = int(self.headers.get("Content-Length") or 0)
+            body = self.rfile.read(length) if length else None
+            headers = {
+                name: value for name, value in self.headers.items()
+                if name.lower() not in _HOP_BY_HOP_HEADERS
+            }
+            path = parts.path or "/"
+            if parts.query:
+                path += "?" + parts.query
+            connection_class = (
+                http.client.HTTPSConnection if parts.scheme == "https" else http.client.HTTPConnection
+            )
+            try:
+                connection = connection_class(parts.hostname, parts.port, timeout=30)
+                connection.request(self.command, path, body, headers)
+                response = connection.getresponse()
+                data = response.read()
+            except OSError:
+                self.send_error(502)
+                return
+            
+            self.send_response(response.status, response.reason)
+            for name, value in response.getheaders():
+                if name.lower() not in _HOP_BY_HOP_HEADERS and name.lower() != "content-length":
+                    self.send_header(name, value)
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            if self.command != "HEAD":
+                self.wfile.write(data)
+            connection.close()
+        
+        do_GET = do_POST = do_PUT = do_PATCH = do_DELETE = do_HEAD = do_OPTIONS = _forward
+    
+    return Handler
@@ -0,0 +1,187 @@
+"""
+一時的な失敗の再実行と不安定なテストの集計。
+待機のタイムアウトなどで失敗したテストを、ブラウザを起動し直さずに同じドライバで再実行し、
+テストごと・ロケーターごとの失敗回数を記録します。
+"""
+
+import threading
+from collections import Counter
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+import pytest
+
+from config import settings
+
+
+def is_retryable(error: BaseException, exception_names: Iterable[str] = settings.RETRY_EXCEPTIONS) -> bool:
+    """
+    再実行の対象となる例外かどうかを返す
+    
+    例外はクラス名で判定する（サブクラスも対象）。
+    
+    Args:
+        error: テストで発生した例外
+        exception_names: 再実行の対象とする例外のクラス名
+    
+    Returns:
+        bool: 対象の場合はTrue
+    """
+    names = set(exception_names)
+    return any(cls.__name__ in names for cls in type(error).__mro__)
+
+
+def get_retry_count(marker, default: int) -> int:
+    """
+    retry マーカーから再実行の最大回数を読み取る
+    
+    @pytest.mark.retry(2) と @pytest.mark.retry(n=2) の形式に対応し、引数のない
+    @pytest.mark.retry は1回とする。
+    
+    Args:
+        marker: テストの retry マーカー。Noneの場合は default を使用する
+        default: マーカーがない場合の回数（--retries）
+    
+    Returns:
+        int: 再実行の最大回数
+    
+    Raises:
+        ValueError: 回数が0以上の整数でない場合
+    """
+    if marker is None:
+        return default
+    retries = marker.args[0] if marker.args else marker.kwargs.get("n", 1)
+    if isinstance(retries, bool) or not isinstance(retries, int) or retries < 0:
+        raise ValueError(f"retry マーカーの回数は0以上の整数で指定してください: {retries!r}")
+    return retries
+
+
+def get_error_locator(error: BaseException) -> Optional[str]:
+    """
+    例外に記録された待機中のロケーターを返す
+    
+    Args:
+        error: テストで発生した例外（PageActionsの待機はタイムアウト時に locator 属性を設定する）
+    
+    Returns:
+        Optional[str]: "検索方法=検索値" の形式。記録されていない場合はNone
+    """
+    locator = getattr(error, "locator", None)
+    if locator is None:
+        return None
+    return f"{locator[0]}={locator[1]}"
+
+
+def rerun(run: Callable[[], None], retries: int, reset: Optional[Callable[[], None]] = None,
+          exception_names: Iterable[str] = settings.RETRY_EXCEPTIONS) -> Tuple[bool, List[BaseException]]:
+    """
+    失敗したテストを成功するか再実行の回数を使い切るまで再実行する
+    
+    再実行の対象ではない例外で失敗した場合は、それ以上再実行しない。pytest.fail による失敗も
+    失敗として記録する。再実行でスキップ（pytest.skip）や xfail になった場合は、それを結果とするため
+    そのまま送出する。
+    
+    Args:
+        run: テストを実行する関数
+        retries: 再実行の最大回数
+        reset: 再実行の前にブラウザの状態を戻す関数
+        exception_names: 再実行の対象とする例外のクラス名
+    
+    Returns:
+        Tuple[bool, List[BaseException]]: 再実行で成功したかどうかと、再実行で発生した例外のリスト
+    
+    Raises:
+        pytest.skip.Exception: 再実行でスキップされた場合
+        pytest.xfail.Exception: 再実行で xfail になった場合
+    """
+    errors: List[BaseException] = []
+    for _ in range(retries):
+        try:
+            if reset is not None:
+                reset()
+            run()
+        except pytest.xfail.Exception:
+            # pytest.fail.Exception のサブクラスのため、失敗として扱う前に送出する
+            raise
+        except (Exception, pytest.fail.Exception) as e:
+            errors.append(e)
+            if not is_retryable(e, exception_names):
+                break
+        else:
+            return True, errors
+    return False, errors
+
+
+class FlakinessStats:
+    """再実行したテストとタイムアウトしたロケーターの集計"""
+    
+    def __init__(self):
+        """FlakinessStatsクラスの初期化"""
+        self.tests: Dict[str, Dict[str, int]] = {}
+        self.locators: Counter = Counter()
+        self._lock = threading.Lock()
+    
+    def record(self, nodeid: str, errors: List[BaseException], passed: bool) -> None:
+        """
+        再実行の結果を記録する
+        
+        Args:
+            nodeid: テストのnodeid
+            errors: 最初の実行と再実行で発生した例外
+            passed: 最終的に成功したかどうか
+        """
+        with self._lock:
+            entry = self.tests.setdefault(nodeid, {"runs": 0, "failures": 0, "recovered": 0})
+            entry["runs"] += len(errors) + (1 if passed else 0)
+            entry["failures"] += len(errors)
+            entry["recovered"] += 1 if passed else 0
+            for error in errors:
+                locator = get_error_locator(error)
+                if locator is not None:
+                    self.locators[locator] += 1
+    
+    def to_dict(self) -> Dict:
+        """
+        集計結果を辞書で返す（並列実行時にコントローラーへ渡すために使用）
+        
+        Returns:
+            Dict: 集計結果
+        """
+        return {"tests": self.tests, "locators": dict(self.locators)}
+    
+    def merge(self, data: Dict) -> None:
+        """
+        他のワーカーの集計結果を加える
+        
+        Args:
+            data: to_dict の結果
+        """
+        with self._lock:
+            for nodeid, counts in data["tests"].items():
+                entry = self.tests.setdefault(nodeid, {"runs": 0, "failures": 0, "recovered": 0})
+                for key, value in counts.items():
+                    entry[key] += value
+            self.locators.update(data["locators"])
+    
+    def summary_lines(self, limit: int = 10) -> List[str]:
+        """
+        不安定なテストとタイムアウトの多いロケーターを表す行を返す
+        
+        Args:
+            limit: 表示するテストとロケーターの最大数
+        
+        Returns:
+            List[str]: 表示する行。再実行していない場合は空のリスト
+        """
+        if not self.tests:
+            return []
+        recovered = sum(entry["recovered"] for entry in self.tests.values())
+        lines = [f"再実行したテスト: {len(self.tests)}件（再実行で成功: {recovered}件）"]
+        ranked = sorted(self.tests.items(), key=lambda item: item[1]["failures"], reverse=True)
+        for nodeid, entry in ranked[:limit]:
+            result = "成功" if entry["recovered"] else "失敗"
+            lines.append(f"  {entry['failures']}/{entry['runs']}回失敗 ({result})  {nodeid}")
+        if self.locators:
+            lines.append("タイムアウトしたロケーター:")
+            for locator, count in self.locators.most_common(limit):
+                lines.append(f"  {count:>4}回  {locator}")
+        return lines
@@ -0,0 +1,174 @@
+"""
+テストの実行順序の調整。
+requires マーカーで宣言された要件（ブラウザ、ウィンドウサイズ、オリジン、ログイン状態）ごとに
+テストをまとめ、ブラウザの再起動や状態のリセットが少なくなる順序に並べ替えます。
+
+使用例:
+    @pytest.mark.requires(browser="firefox", role="admin")
+    @pytest.mark.usefixtures("driver")
+    class TestAdminSettings:
+        ...
+"""
+
+from typing import Dict, List, Optional, Tuple
+
+# 要件の項目。並べ替えではこの順に優先してまとめる（前の項目ほど切り替えのコストが大きい）
+REQUIREMENT_KEYS = ("browser", "window_size", "origin", "role")
+# クラススコープの driver フィクスチャが使用する項目。テストクラスのメソッドには指定できない
+DRIVER_REQUIREMENT_KEYS = ("browser", "window_size")
+
+
+def parse_window_size(value) -> Optional[Tuple[int, int]]:
+    """
+    ウィンドウサイズの指定を (幅, 高さ) に変換する
+    
+    Args:
+        value: (幅, 高さ) または "1280x720" 形式の文字列。Noneの場合は既定のサイズ
+    
+    Returns:
+        Optional[Tuple[int, int]]: ウィンドウサイズ。指定がない場合はNone
+    """
+    if value is None:
+        return None
+    if isinstance(value, str):
+        width, _, height = value.lower().partition("x")
+        return int(width), int(height)
+    width, height = value
+    return int(width), int(height)
+
+
+def get_requirements(node, defaults: Dict[str, Optional[str]]) -> Dict[str, Optional[str]]:
+    """
+    テスト（またはテストクラス）の要件を返す
+    
+    requires マーカーはモジュール・クラス・メソッドに付けることができ、テストに近いものを優先する。
+    
+    Args:
+        node: pytestのテストアイテムまたはテストクラスのノード
+        defaults: マーカーで指定されていない項目の値
+    
+    Returns:
+        Dict[str, Optional[str]]: 項目ごとの要件。window_size は "幅x高さ" の文字列に正規化する
+    
+    Raises:
+        ValueError: 未知の項目が指定された場合
+    """
+    requirements = dict(defaults)
+    # iter_markers はテストに近いものから返すため、遠いものから順に上書きする
+    for marker in reversed(list(node.iter_markers("requires"))):
+        unknown = set(marker.kwargs) - set(REQUIREMENT_KEYS)
+        if unknown:
+            raise ValueError(f"requires マーカーの未知の項目: {', '.join(sorted(unknown))}")
+        requirements.update(marker.kwargs)
+    window_size = parse_window_size(requirements.get("window_size"))
+    requirements["window_size"] = f"{window_size[0]}x{window_size[1]}" if window_size else None
+    return requirements
+
+
+def check_requirements(item) -> None:
+    """
+    テストクラスのメソッドの requires マーカーに driver フィクスチャの項目が指定されていないことを確認する
+    
+    driver フィクスチャはクラス単位で起動するため、メソッドに指定した browser・window_size は使用されない。
+    クラスに属さないテストでは driver フィクスチャがテストごとに起動するため、指定できる。
+    
+    Args:
+        item: pytestのテストアイテム
+    
+    Raises:
+        ValueError: テストクラスのメソッドに browser・window_size が指定されている場合
+    """
+    if getattr(item, "cls", None) is None:
+        return
+    for marker in getattr(item, "own_markers", ()):
+        keys = [key for key in DRIVER_REQUIREMENT_KEYS if marker.name == "requires" and key in marker.kwargs]
+        if keys:
+            raise ValueError(
+                f"{item.nodeid}: requires マーカーの {', '.join(keys)} はテストクラスに指定してください"
+                "（driver フィクスチャはクラス単位で起動するため、メソッドの指定は使用されません）"
+            )
+
+
+def count_transitions(requirements: List[Dict[str, Optional[str]]]) -> Dict[str, int]:
+    """
+    実行順に並んだ要件から、ブラウザの再起動と状態のリセットの回数を見積もる
+    
+    Args:
+        requirements: テストの実行順に並んだ要件
+    
+    Returns:
+        Dict[str, int]: restarts（ブラウザの切り替え）、resizes（ウィンドウサイズの変更）、
+            resets（オリジンまたはログイン状態の切り替え）の回数
+    """
+    counts = {"restarts": 0, "resizes": 0, "resets": 0}
+    for previous, current in zip(requirements, requirements[1:]):
+        if current["browser"] != previous["browser"]:
+            counts["restarts"] += 1
+        elif current["window_size"] != previous["window_size"]:
+            counts["resizes"] += 1
+        if current["origin"] != previous["origin"] or current["role"] != previous["role"]:
+            counts["resets"] += 1
+    return counts
+
+
+def _sort_key(requirements: Dict[str, Optional[str]]) -> Tuple[str, ...]:
+    """要件を並べ替えのキーに変換する（指定のない項目を先にする）"""
+    return tuple("" if requirements[key] is None else str(requirements[key]) for key in REQUIREMENT_KEYS)
+
+
+def schedule_items(items: List, defaults: Dict[str, Optional[str]]) -> Dict[str, Dict[str, int]]:
+    """
+    テストを要件ごとにまとめて並べ替える（itemsをその場で並べ替える）
+    
+    クラススコープのフィクスチャ（driver）を使い回せるよう、同じクラスのテストは連続したまま
+    クラス単位（クラスに属さないテストはモジュール単位）で並べ替える。モジュールスコープの
+    フィクスチャを作り直さないよう、並べ替えはモジュールの中だけで行い、モジュールの順序は変えない。
+    同じ要件のテストは収集された順序を保つ。
+    
+    Args:
+        items: pytestのテストアイテムのリスト
+        defaults: マーカーで指定されていない項目の値
+    
+    Returns:
+        Dict[str, Dict[str, int]]: 並べ替え前（before）と後（after）の count_transitions の結果
+    """
+    requirements = {id(item): get_requirements(item, defaults) for item in items}
+    before = count_transitions([requirements[id(item)] for item in items])
+    
+    # モジュール → クラス（またはモジュール）単位 → テスト
+    modules: Dict[str, Dict[str, List]] = {}
+    for item in items:
+        units = modules.setdefault(item.nodeid.split("::", 1)[0], {})
+        units.setdefault(item.nodeid.rsplit("::", 1)[0], []).append(item)
+    ordered = []
+    for units in modules.values():
+        module_units = []
+        for unit in units.values():
+            unit.sort(key=lambda item: _sort_key(requirements[id(item)]))
+            module_units.append(unit)
+        module_units.sort(key=lambda unit: _sort_key(requirements[id(unit[0])]))
+        ordered.extend(module_units)
+    
+    items[:] = [item for unit in ordered for item in unit]
+    after = count_transitions([requirements[id(item)] for item in items])
+    return {"before": before, "after": after}
+
+
+def format_schedule_summary(result: Dict[str, Dict[str, int]]) -> str:
+    """
+    並べ替えの効果を表す文字列を返す
+    
+    Args:
+        result: schedule_items の結果
+    
+    Returns:
+        str: 並べ替え前後の切り替え回数と節約した回数
+    """
+    before, after = result["before"], result["after"]
+    return (
+        f"ブラウザの切り替え: {before['restarts']} → {after['restarts']}回, "
+        f"ウィンドウサイズの変更: {before['resizes']} → {after['resizes']}回, "
+        f"オリジン・ログイン状態の切り替え: {before['resets']} → {after['resets']}回 "
+        f"(節約した再起動: {before['restarts'] - after['restarts']}回, "
+        f"状態のリセット: {before['resets'] - after['resets']}回)"
+    )
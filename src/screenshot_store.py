@@ -0,0 +1,344 @@
+"""
+内容のハッシュで重複を除くスクリーンショットの保存先。
+同じ内容の画像は1つだけ保存し、テストごとの参照をマニフェストに記録します。
+合計サイズが上限を超えた場合は、使われていない期間が長い画像から削除します（並列実行の全ワーカーの合計）。
+
+保存先:
+    {SCREENSHOT_DIR}/objects/{ハッシュの先頭2文字}/{ハッシュ}.png
+    {SCREENSHOT_DIR}/{実行ID}/{ワーカーID}/manifest.jsonl
+"""
+
+import base64
+import hashlib
+import io
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional, Tuple
+
+from config import settings
+from src.artifact_writer import ArtifactWriter, get_artifact_writer, make_png_resizer
+from src.artifacts import artifact_dir, get_capture_stats, get_current_test
+
+
+def dhash(data: bytes, size: int = 8) -> int:
+    """
+    画像の差分ハッシュ（dHash）を計算する
+    
+    画像をグレースケールの (size+1)×size に縮小し、横に隣り合う画素の明暗をビットにする。
+    見た目が近い画像ほど異なるビットが少なくなる。Pillowが必要。
+    
+    Args:
+        data: 画像のデータ
+        size: ハッシュの一辺のビット数
+    
+    Returns:
+        int: size×size ビットのハッシュ
+    """
+    from PIL import Image
+    
+    image = Image.open(io.BytesIO(data)).convert("L").resize((size + 1, size))
+    pixels = image.tobytes()
+    value = 0
+    for row in range(size):
+        for col in range(size):
+            left = pixels[row * (size + 1) + col]
+            right = pixels[row * (size + 1) + col + 1]
+            value = (value << 1) | (1 if left > right else 0)
+    return value
+
+
+def hamming_distance(a: int, b: int) -> int:
+    """
+    2つのハッシュの異なるビット数を返す
+    
+    Args:
+        a: ハッシュ
+        b: ハッシュ
+    
+    Returns:
+        int: 異なるビット数
+    """
+    return bin(a ^ b).count("1")
+
+
+class ScreenshotStore:
+    """内容のハッシュをキーとするスクリーンショットの保存先"""
+    
+    def __init__(self, root: str = settings.SCREENSHOT_DIR,
+                 max_mb: Optional[float] = settings.SCREENSHOT_STORE_MAX_MB,
+                 perceptual: bool = settings.SCREENSHOT_PERCEPTUAL_DEDUPE,
+                 threshold: int = settings.SCREENSHOT_DHASH_THRESHOLD):
+        """
+        ScreenshotStoreクラスの初期化
+        
+        Args:
+            root: スクリーンショットのルートディレクトリ
+            max_mb: 保存する画像の合計サイズの上限（MB）。Noneの場合は無制限
+            perceptual: 見た目がほぼ同じ画像を保存せず、最初の画像を参照するかどうか
+            threshold: ほぼ同じとみなす差分ハッシュの異なるビット数の上限
+        """
+        self.root = root
+        self.objects_dir = os.path.join(root, "objects")
+        self.max_bytes = None if max_mb is None else int(max_mb * 1024 * 1024)
+        self.perceptual = perceptual
+        self.threshold = threshold
+        # ハッシュ → {"size", "group"}。使われた順（最後が最新）
+        self._entries: Optional["OrderedDict[str, Dict]"] = None
+        # _entries の合計サイズ。上限を超えた時だけ保存先を読み直す
+        self._total = 0
+        # (差分ハッシュ, グループの最初の画像のハッシュ)
+        self._fingerprints: List[Tuple[int, str]] = []
+        self._lock = threading.Lock()
+        # 最後に設定した更新日時（ナノ秒）
+        self._last_touch = 0
+        
+        # 統計情報
+        self.stored = 0
+        self.duplicates = 0
+        self.near_duplicates = 0
+        self.evicted = 0
+        self.bytes_saved = 0
+    
+    def object_path(self, digest: str) -> str:
+        """
+        ハッシュに対応する画像のパスを返す
+        
+        Args:
+            digest: 画像のハッシュ
+        
+        Returns:
+            str: 画像のパス
+        """
+        return os.path.join(self.objects_dir, digest[:2], f"{digest}.png")
+    
+    def put(self, data: str, name: str, transform: Optional[Callable[[bytes], bytes]] = None,
+            writer: Optional[ArtifactWriter] = None) -> str:
+        """
+        スクリーンショットを保存する
+        
+        ハッシュは変換後の書き込む内容で計算する。返すパスがハッシュで決まるため、
+        デコードと変換は呼び出し元のスレッドで行い、writer を指定した場合は書き込みだけを
+        ライターのスレッドで行う。ただし perceptual が有効な場合は、ほぼ同じ画像のパスを
+        返すためにその場で保存する。
+        
+        Args:
+            data: PNGのBase64文字列（get_screenshot_as_base64 の結果）
+            name: マニフェストに記録する名前
+            transform: 保存前にデータを変換する関数（縮小など）
+            writer: 書き込みを行うライター。Noneの場合はその場で書き込む
+        
+        Returns:
+            str: 画像のパス（ほぼ同じ画像の場合は、その画像のパス）
+        """
+        content = base64.b64decode(data)
+        if transform is not None:
+            try:
+                content = transform(content)
+            except Exception:
+                # 変換に失敗した場合は元のデータを保存する
+                pass
+        digest = hashlib.sha256(content).hexdigest()[:32]
+        path = self.object_path(digest)
+        test = get_current_test()
+        
+        if writer is None or self.perceptual:
+            return self._store(digest, content, name, test)[0]
+        writer.submit_task(path, lambda: self._store(digest, content, name, test)[1])
+        return path
+    
+    def summary(self) -> Optional[str]:
+        """
+        保存状況を表す文字列を返す
+        
+        Returns:
+            Optional[str]: 一度も保存していない場合はNone
+        """
+        if self.stored + self.duplicates + self.near_duplicates == 0:
+            return None
+        return (
+            f"保存: {self.stored}件, 重複: {self.duplicates}件, ほぼ同じ画像: {self.near_duplicates}件, "
+            f"削除: {self.evicted}件, 節約した容量: {self.bytes_saved / 1024:.0f} KB"
+        )
+    
+    def _store(self, digest: str, content: bytes, name: str, test: Optional[str]) -> Tuple[str, Optional[int]]:
+        """
+        画像を保存してマニフェストに記録する
+        
+        objects/ のファイルは常にファイル名のハッシュの内容を保持する。見た目がほぼ同じ画像は
+        保存せず、マニフェストに参照先（group）を記録して参照先のパスを返す。
+        
+        Returns:
+            Tuple[str, Optional[int]]: 画像のパスと書き込んだバイト数（既存の画像を参照した場合はNone）
+        """
+        path = self.object_path(digest)
+        written = None
+        with self._lock:
+            entries = self._load_entries()
+            entry = entries.get(digest)
+            if entry is None and os.path.exists(path):
+                # 並列実行の他のワーカーが保存した画像
+                entry = entries[digest] = {"size": os.path.getsize(path), "group": digest}
+                self._total += entry["size"]
+            if entry is not None and os.path.exists(path):
+                entries.move_to_end(digest)
+                self._touch(path)
+                self.duplicates += 1
+                self.bytes_saved += len(content)
+            else:
+                entry = {"size": len(content), "group": digest}
+                similar = self._find_similar(content, digest)
+                if similar is not None and os.path.exists(self.object_path(similar)):
+                    # 別のハッシュの内容を保存すると内容のハッシュによる参照が壊れるため、参照先を返す
+                    path = self.object_path(similar)
+                    entry = {"size": 0, "group": similar}
+                    entries.move_to_end(similar)
+                    self._touch(path)
+                    self.near_duplicates += 1
+                    self.bytes_saved += len(content)
+                else:
+                    os.makedirs(os.path.dirname(path), exist_ok=True)
+                    self._write_atomic(path, content)
+                    self._touch(path)
+                    self.stored += 1
+                    written = len(content)
+                    self._total += len(content) - entries.get(digest, {"size": 0})["size"]
+                    entries[digest] = entry
+                    self._evict(digest)
+            self._append_manifest(path, digest, entry["group"], name, test)
+        return path, written
+    
+    def _find_similar(self, content: bytes, digest: str) -> Optional[str]:
+        """見た目がほぼ同じ画像のハッシュを返す（ロックを取得して呼び出す）"""
+        if not self.perceptual:
+            return None
+        try:
+            fingerprint = dhash(content)
+        except ImportError:
+            # Pillowがない場合は完全一致のみで重複を除く
+            self.perceptual = False
+            return None
+        for other, group in self._fingerprints:
+            if hamming_distance(fingerprint, other) <= self.threshold and group in self._entries:
+                return group
+        self._fingerprints.append((fingerprint, digest))
+        return None
+    
+    @staticmethod
+    def _write_atomic(path: str, content: bytes) -> None:
+        """途中まで書かれたファイルが読まれないよう、一時ファイルを置き換えて書き込む"""
+        fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.write(content)
+        os.replace(temp_path, path)
+    
+    def _touch(self, path: str) -> None:
+        """
+        画像の更新日時を現在時刻にする（ロックを取得して呼び出す）
+        
+        ファイルシステムの時刻の粒度では連続した保存が同じ時刻になるため、前回より必ず後の時刻を設定する。
+        """
+        now = max(time.time_ns(), self._last_touch + 1)
+        self._last_touch = now
+        os.utime(path, ns=(now, now))
+    
+    def _load_entries(self) -> "OrderedDict[str, Dict]":
+        """保存済みの画像を読み込む（ロックを取得して呼び出す）"""
+        if self._entries is not None:
+            return self._entries
+        found = []
+        if os.path.isdir(self.objects_dir):
+            for directory, _, filenames in os.walk(self.objects_dir):
+                for filename in filenames:
+                    if not filename.endswith(".png"):
+                        continue
+                    try:
+                        stat = os.stat(os.path.join(directory, filename))
+                    except FileNotFoundError:
+                        # 他のワーカーが削除した画像
+                        continue
+                    found.append((stat.st_mtime_ns, filename[:-4], stat.st_size))
+        self._entries = OrderedDict(
+            (digest, {"size": size, "group": digest}) for _, digest, size in sorted(found)
+        )
+        self._total = sum(size for _, _, size in found)
+        return self._entries
+    
+    def _evict(self, keep: str) -> None:
+        """
+        合計サイズが上限を超えている間、使われていない期間が長い画像から削除する（ロックを取得して呼び出す）
+        
+        保存のたびに保存先を走査しないよう、合計サイズは保存・削除ごとに更新し、上限を超えた時だけ
+        保存先を読み直す。並列実行では全ワーカーが同じ objects/ に保存するため、読み直した後は
+        全ワーカーの合計で判定する（他のワーカーが保存した分は次に読み直すまで数えないため、
+        全体では一時的に上限を超えることがある）。画像は使用時に更新日時を更新するため、
+        更新日時の順が全ワーカーで共通の使用順になる。
+        
+        Args:
+            keep: 削除しない画像（保存したばかりの画像）のハッシュ
+        """
+        if self.max_bytes is None or self._total <= self.max_bytes:
+            return
+        self._entries = None
+        entries = self._load_entries()
+        if keep in entries:
+            entries.move_to_end(keep)
+        while self._total > self.max_bytes and len(entries) > 1:
+            digest, entry = entries.popitem(last=False)
+            try:
+                os.remove(self.object_path(digest))
+            except FileNotFoundError:
+                pass
+            self.evicted += 1
+            self._fingerprints = [(fp, group) for fp, group in self._fingerprints if group != digest]
+            self._total -= entry["size"]
+    
+    def _append_manifest(self, path: str, digest: str, group: str, name: str, test: Optional[str]) -> None:
+        """テストごとの参照をマニフェストに追記する（ロックを取得して呼び出す）"""
+        record = {"path": path, "hash": digest, "group": group, "name": name, "test": test, "time": time.time()}
+        with open(os.path.join(artifact_dir(self.root), "manifest.jsonl"), "a", encoding="utf-8") as f:
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+
+_default_store: Optional[ScreenshotStore] = None
+_default_store_lock = threading.Lock()
+
+
+def get_screenshot_store() -> ScreenshotStore:
+    """
+    プロセス共通のScreenshotStoreを返す
+    
+    Returns:
+        ScreenshotStore: 共通の保存先
+    """
+    global _default_store
+    with _default_store_lock:
+        if _default_store is None:
+            _default_store = ScreenshotStore()
+        return _default_store
+
+
+def store_screenshot(driver, name: str) -> str:
+    """
+    スクリーンショットを撮影して共通の保存先に保存する
+    
+    ASYNC_ARTIFACTSが有効な場合は、書き込みを共通のライターで行う（ハッシュを求めるため、デコードと縮小はその場で行う）。
+    
+    Args:
+        driver: Seleniumのwebdriverインスタンス
+        name: マニフェストに記録する名前
+    
+    Returns:
+        str: 画像のパス
+    """
+    transform = None
+    if settings.SCREENSHOT_MAX_WIDTH:
+        transform = make_png_resizer(settings.SCREENSHOT_MAX_WIDTH)
+    writer = get_artifact_writer() if settings.ASYNC_ARTIFACTS else None
+    start = time.perf_counter()
+    data = driver.get_screenshot_as_base64()
+    get_capture_stats().record("screenshot", time.perf_counter() - start, len(data) * 3 // 4)
+    return get_screenshot_store().put(data, name, transform, writer)
@@ -0,0 +1,377 @@
+"""
+ログイン済みのセッション状態のキャッシュ。
+ログイン後のクッキーとWeb Storageをユーザーや役割ごとに保存し、
+以降のテストではUIでのログインを行わずにブラウザへ復元します。
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional
+from urllib.parse import urlsplit
+
+from config import settings
+from src import browser_scripts
+
+if TYPE_CHECKING:
+    from selenium.webdriver.remote.webdriver import WebDriver
+
+
+def get_origin(url: str) -> Optional[str]:
+    """
+    URLのオリジンを返す
+    
+    Args:
+        url: URL
+    
+    Returns:
+        Optional[str]: 例: "https://app.example.com"。http(s)以外のURLの場合はNone
+    """
+    parts = urlsplit(url)
+    if parts.scheme not in ("http", "https") or not parts.netloc:
+        return None
+    return f"{parts.scheme}://{parts.netloc}"
+
+
+class SessionState:
+    """保存したセッション状態（1つのオリジンのクッキーとWeb Storage）"""
+    
+    def __init__(self, origin: str, cookies: List[dict], local_storage: Dict[str, str],
+                 session_storage: Dict[str, str], created_at: Optional[float] = None):
+        """
+        SessionStateクラスの初期化
+        
+        Args:
+            origin: 状態を取得したページのオリジン
+            cookies: driver.get_cookies() の結果
+            local_storage: localStorageの内容
+            session_storage: sessionStorageの内容
+            created_at: 取得した時刻（UNIX時間）
+        """
+        self.origin = origin
+        self.cookies = cookies
+        self.local_storage = local_storage
+        self.session_storage = session_storage
+        self.created_at = created_at if created_at is not None else time.time()
+    
+    def is_expired(self, ttl: float, now: Optional[float] = None) -> bool:
+        """
+        有効期間を過ぎているかどうかを返す
+        
+        Args:
+            ttl: 有効期間（秒）
+            now: 現在時刻（UNIX時間）
+        
+        Returns:
+            bool: 過ぎている場合はTrue
+        """
+        now = time.time() if now is None else now
+        return now - self.created_at >= ttl
+    
+    def to_dict(self) -> Dict:
+        """
+        ファイルに保存するための辞書を返す
+        
+        Returns:
+            Dict: 状態の内容
+        """
+        return {
+            "origin": self.origin,
+            "cookies": self.cookies,
+            "local_storage": self.local_storage,
+            "session_storage": self.session_storage,
+            "created_at": self.created_at,
+        }
+    
+    @classmethod
+    def from_dict(cls, data: Dict) -> "SessionState":
+        """
+        to_dict の結果から状態を作成する
+        
+        Args:
+            data: 状態の内容
+        
+        Returns:
+            SessionState: 状態
+        """
+        return cls(data["origin"], data["cookies"], data["local_storage"], data["session_storage"],
+                   data["created_at"])
+
+
+class SessionCache:
+    """ユーザーや役割ごとのセッション状態のキャッシュ"""
+    
+    def __init__(self, ttl: float = settings.SESSION_CACHE_TTL,
+                 directory: Optional[str] = settings.SESSION_CACHE_DIR, enabled: bool = True):
+        """
+        SessionCacheクラスの初期化
+        
+        Args:
+            ttl: 保存した状態の有効期間（秒）
+            directory: 状態をファイルにも保存するディレクトリ。Noneの場合はメモリにのみ保存する
+            enabled: Falseの場合は状態を保存せず、常にUIでログインする
+        """
+        self.ttl = ttl
+        self.directory = directory
+        self.enabled = enabled
+        self._states: Dict[str, SessionState] = {}
+        self._lock = threading.Lock()
+        
+        # 統計情報
+        self.restores = 0
+        self.logins = 0
+        self.expired = 0
+        self.rejected = 0
+        self.login_seconds = 0.0
+        self.restore_seconds = 0.0
+    
+    def get(self, key: str) -> Optional[SessionState]:
+        """
+        保存した状態を返す。有効期間を過ぎた状態は削除する
+        
+        Args:
+            key: ユーザーや役割を表すキー
+        
+        Returns:
+            Optional[SessionState]: 状態。保存されていない場合はNone
+        """
+        if not self.enabled:
+            return None
+        with self._lock:
+            state = self._states.get(key)
+        if state is None:
+            state = self._load(key)
+        if state is None:
+            return None
+        if state.is_expired(self.ttl):
+            self.expired += 1
+            self.invalidate(key)
+            return None
+        with self._lock:
+            self._states[key] = state
+        return state
+    
+    def put(self, key: str, state: SessionState) -> None:
+        """
+        状態を保存する
+        
+        Args:
+            key: ユーザーや役割を表すキー
+            state: 状態
+        """
+        if not self.enabled:
+            return
+        with self._lock:
+            self._states[key] = state
+        if self.directory is not None:
+            self._save(key, state)
+    
+    def invalidate(self, key: str) -> None:
+        """
+        保存した状態を削除する
+        
+        Args:
+            key: ユーザーや役割を表すキー
+        """
+        with self._lock:
+            self._states.pop(key, None)
+        if self.directory is not None:
+            try:
+                os.remove(self._path(key))
+            except FileNotFoundError:
+                pass
+    
+    def capture(self, driver: WebDriver, key: str) -> SessionState:
+        """
+        現在のページのオリジンのクッキーとWeb Storageを保存する
+        
+        Args:
+            driver: Seleniumのwebdriverインスタンス
+            key: ユーザーや役割を表すキー
+        
+        Returns:
+            SessionState: 保存した状態
+        """
+        origin, local_storage, session_storage = driver.execute_script(browser_scripts.CAPTURE_STORAGE)
+        state = SessionState(origin, driver.get_cookies(), local_storage, session_storage)
+        self.put(key, state)
+        return state
+    
+    def restore(self, driver: WebDriver, key: str) -> bool:
+        """
+        保存した状態をブラウザに復元する
+        
+        クッキーはオリジンのページを開いていないと設定できないため、別のオリジンにいる場合は
+        SESSION_CACHE_RESTORE_PATH のページを開いてから設定する。
+        
+        Args:
+            driver: Seleniumのwebdriverインスタンス
+            key: ユーザーや役割を表すキー
+        
+        Returns:
+            bool: 復元した場合はTrue、保存されていない場合はFalse
+        """
+        state = self.get(key)
+        if state is None:
+            return False
+        
+        start = time.perf_counter()
+        if get_origin(driver.current_url) != state.origin:
+            driver.get(f"{state.origin}/{settings.SESSION_CACHE_RESTORE_PATH.lstrip('/')}")
+        now = time.time()
+        for cookie in state.cookies:
+            # ブラウザに拒否されるため、期限切れのクッキーは設定しない
+            if cookie.get("expiry") is not None and cookie["expiry"] <= now:
+                continue
+            driver.add_cookie(cookie)
+        if state.local_storage or state.session_storage:
+            driver.execute_script(browser_scripts.RESTORE_STORAGE, state.local_storage, state.session_storage)
+        self.restore_seconds += time.perf_counter() - start
+        self.restores += 1
+        return True
+    
+    def ensure_session(self, driver: WebDriver, key: str, login: Callable[[], object],
+                       verify: Callable[[], bool], timeout: Optional[float] = None) -> bool:
+        """
+        保存した状態を復元してログイン済みにする。復元できない場合はログインして状態を保存する
+        
+        復元した状態がアプリケーションに受け付けられなかった場合（サーバー側でセッションが
+        失効したなど）は、保存した状態を削除してログインし直す。
+        login はログインボタンのクリックで戻ることがあるため、ログイン後は verify が True を返すまで
+        待ってから状態を保存する（ログイン前のクッキーを保存しないため）。確認できない場合は保存しない。
+        
+        Args:
+            driver: Seleniumのwebdriverインスタンス
+            key: ユーザーや役割を表すキー
+            login: UIでログインする関数
+            verify: ログイン済みかどうかを返す関数（復元後とログイン後に呼ぶ）
+            timeout: ログイン後に verify が True を返すまで待つ最大秒数。Noneの場合は settings.EXPLICIT_WAIT
+        
+        Returns:
+            bool: 復元した場合はTrue、ログインした場合はFalse
+        """
+        if self.restore(driver, key):
+            if verify():
+                return True
+            self.rejected += 1
+            self.invalidate(key)
+            driver.delete_all_cookies()
+        
+        start = time.perf_counter()
+        login()
+        self.login_seconds += time.perf_counter() - start
+        self.logins += 1
+        if self.enabled and self._wait_for_login(verify, settings.EXPLICIT_WAIT if timeout is None else timeout):
+            self.capture(driver, key)
+        return False
+    
+    @staticmethod
+    def _wait_for_login(verify: Callable[[], bool], timeout: float) -> bool:
+        """
+        ログインが完了して verify が True を返すまで待つ
+        
+        Args:
+            verify: ログイン済みかどうかを返す関数
+            timeout: 待つ最大秒数
+        
+        Returns:
+            bool: ログインを確認できた場合はTrue
+        """
+        deadline = time.monotonic() + timeout
+        interval = settings.ADAPTIVE_POLL_MIN
+        while not verify():
+            if time.monotonic() >= deadline:
+                return False
+            time.sleep(interval)
+            interval = min(interval * 2, settings.ADAPTIVE_POLL_MAX)
+        return True
+    
+    def estimated_seconds_saved(self) -> float:
+        """
+        復元によって節約できたログイン時間の推定値を返す
+        
+        Returns:
+            float: 節約できた時間（秒）
+        """
+        if self.logins == 0:
+            return 0.0
+        restored = self.restores - self.rejected
+        return max(restored * self.login_seconds / self.logins - self.restore_seconds, 0.0)
+    
+    def to_dict(self) -> Dict:
+        """
+        集計結果を辞書で返す（並列実行時にコントローラーへ渡すために使用）
+        
+        Returns:
+            Dict: 集計結果
+        """
+        return {
+            "restores": self.restores,
+            "logins": self.logins,
+            "expired": self.expired,
+            "rejected": self.rejected,
+            "login_seconds": self.login_seconds,
+            "restore_seconds": self.restore_seconds,
+        }
+    
+    def merge(self, data: Dict) -> None:
+        """
+        他のワーカーの集計結果を加える
+        
+        Args:
+            data: to_dict の結果
+        """
+        self.restores += data["restores"]
+        self.logins += data["logins"]
+        self.expired += data["expired"]
+        self.rejected += data["rejected"]
+        self.login_seconds += data["login_seconds"]
+        self.restore_seconds += data["restore_seconds"]
+    
+    def summary(self) -> Optional[str]:
+        """
+        キャッシュの利用状況を表す文字列を返す
+        
+        Returns:
+            Optional[str]: 一度も使用していない場合はNone
+        """
+        if self.restores == 0 and self.logins == 0:
+            return None
+        average = self.login_seconds / self.logins if self.logins else 0.0
+        return (
+            f"復元: {self.restores - self.rejected}回, UIでのログイン: {self.logins}回 (平均 {average:.2f}秒), "
+            f"期限切れ: {self.expired}回, 拒否: {self.rejected}回, "
+            f"節約したログイン時間: 約{self.estimated_seconds_saved():.1f}秒"
+        )
+    
+    def _path(self, key: str) -> str:
+        """キーに対応するファイルのパスを返す"""
+        name = hashlib.sha256(key.encode("utf-8")).hexdigest()[:32]
+        return os.path.join(self.directory, f"{name}.json")
+    
+    def _load(self, key: str) -> Optional[SessionState]:
+        """ファイルから状態を読み込む"""
+        if self.directory is None:
+            return None
+        try:
+            with open(self._path(key), encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("key") != key:
+                return None
+            return SessionState.from_dict(data["state"])
+        except (OSError, ValueError, KeyError):
+            return None
+    
+    def _save(self, key: str, state: SessionState) -> None:
+        """状態をファイルに書き込む"""
+        os.makedirs(self.directory, exist_ok=True)
+        # 並列実行の他のワーカーが途中まで書かれたファイルを読まないよう、置き換えで保存する
+        fd, temp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump({"key": key, "state": state.to_dict()}, f)
+        os.replace(temp_path, self._path(key))
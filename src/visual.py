@@ -0,0 +1,415 @@
+"""
+スクリーンショットのビジュアル比較。
+ベースライン画像との画素単位の差をNumPyでまとめて計算し、無視する領域（マスク）と
+許容する差（しきい値）を考慮して一致を判定します。NumPyとPillowが必要です。
+
+使用例:
+    result = home_page.compare_screenshot("navigation", locator=HomePage.NAVIGATION_MENU,
+                                          mask_locators=[HomePage.WELCOME_MESSAGE])
+    assert result.passed, result.message
+"""
+
+import io
+import math
+import os
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from config import settings
+from src import browser_scripts
+from src.artifact_writer import get_artifact_writer
+from src.artifacts import unique_artifact_path
+
+# 無視する領域 (x, y, 幅, 高さ)。画像の画素単位
+Region = Tuple[int, int, int, int]
+
+# 差分画像で不一致の画素に付ける色
+DIFF_COLOR = (255, 0, 0)
+
+
+def decode_image(data: bytes):
+    """
+    PNGを (高さ, 幅, 3) のRGB配列に変換する
+    
+    Args:
+        data: PNGのデータ
+    
+    Returns:
+        numpy.ndarray: uint8のRGB配列
+    """
+    import numpy as np
+    from PIL import Image
+    
+    return np.asarray(Image.open(io.BytesIO(data)).convert("RGB"))
+
+
+def encode_image(array) -> bytes:
+    """
+    RGB配列をPNGに変換する
+    
+    Args:
+        array: uint8のRGB配列
+    
+    Returns:
+        bytes: PNGのデータ
+    """
+    from PIL import Image
+    
+    output = io.BytesIO()
+    Image.fromarray(array).save(output, format="PNG")
+    return output.getvalue()
+
+
+def mismatch_mask(actual, expected, pixel_threshold: int = settings.VISUAL_PIXEL_THRESHOLD,
+                  regions: Iterable[Region] = ()):
+    """
+    色の差がしきい値を超える画素を表す配列を返す
+    
+    Args:
+        actual: 比較する画像のRGB配列
+        expected: ベースライン画像のRGB配列（actualと同じ大きさ）
+        pixel_threshold: 一致とみなす色の差の上限（0〜255）
+        regions: 無視する領域
+    
+    Returns:
+        numpy.ndarray: (高さ, 幅) のbool配列。不一致の画素がTrue
+    """
+    import numpy as np
+    
+    # uint8のまま差の絶対値を求める（符号付きの型への変換を避ける）
+    difference = np.maximum(actual, expected) - np.minimum(actual, expected)
+    mask = difference.max(axis=2) > pixel_threshold
+    for x, y, width, height in regions:
+        mask[max(y, 0):max(y + height, 0), max(x, 0):max(x + width, 0)] = False
+    return mask
+
+
+def render_diff(actual, mask, scale: int = 1) -> bytes:
+    """
+    不一致の画素に色を付けた差分画像を作成する
+    
+    Args:
+        actual: 比較した画像のRGB配列
+        mask: mismatch_mask の結果。事前チェックの結果の場合は間引いた配列
+        scale: mask の1画素が表す元の画像の画素数（縦横）
+    
+    Returns:
+        bytes: 差分画像のPNGデータ
+    """
+    import numpy as np
+    
+    if scale > 1:
+        # 間引いた画素の結果をブロック単位で元の大きさに広げる
+        mask = np.repeat(np.repeat(mask, scale, axis=0), scale, axis=1)[:actual.shape[0], :actual.shape[1]]
+    image = actual // 3
+    image[mask] = DIFF_COLOR
+    return encode_image(image)
+
+
+def _scale_region(region: Region, step: int) -> Region:
+    """領域を間引いた画像の座標に変換する（一部でも含まれる画素を領域に含める）"""
+    x, y, width, height = region
+    left, top = x // step, y // step
+    return left, top, math.ceil((x + width) / step) - left, math.ceil((y + height) / step) - top
+
+
+class VisualDiff:
+    """ビジュアル比較の結果"""
+    
+    # 結果の種類
+    IDENTICAL = "identical"  # 内容が完全に一致した
+    PASSED = "passed"  # 差が許容範囲内だった
+    FAILED = "failed"  # 差が許容範囲を超えた
+    CREATED = "created"  # ベースラインがなかったため作成した
+    UPDATED = "updated"  # 差があったためベースラインを更新した
+    
+    def __init__(self, name: str, status: str, mismatched: int = 0, total: int = 0,
+                 baseline_path: Optional[str] = None, diff_path: Optional[str] = None,
+                 prechecked: bool = False):
+        """
+        VisualDiffクラスの初期化
+        
+        Args:
+            name: ベースラインの名前
+            status: 結果の種類
+            mismatched: 不一致の画素数（事前チェックで判定した場合は下限）
+            total: 比較した画素数
+            baseline_path: ベースライン画像のパス
+            diff_path: 差分画像のパス
+            prechecked: 事前チェックで不一致と判定したかどうか
+        """
+        self.name = name
+        self.status = status
+        self.mismatched = mismatched
+        self.total = total
+        self.baseline_path = baseline_path
+        self.diff_path = diff_path
+        self.prechecked = prechecked
+    
+    @property
+    def passed(self) -> bool:
+        """一致とみなす結果かどうか"""
+        return self.status != self.FAILED
+    
+    @property
+    def ratio(self) -> float:
+        """不一致の画素の割合"""
+        return self.mismatched / self.total if self.total else 0.0
+    
+    @property
+    def message(self) -> str:
+        """結果を表す文字列"""
+        if self.status == self.FAILED:
+            if self.total == 0:
+                return f"{self.name}: 画像の大きさがベースラインと異なります（ベースライン: {self.baseline_path}）"
+            prefix = "少なくとも" if self.prechecked else ""
+            return (
+                f"{self.name}: {prefix}{self.mismatched}画素（{self.ratio:.2%}）がベースラインと異なります"
+                f"（ベースライン: {self.baseline_path}, 差分: {self.diff_path}）"
+            )
+        return f"{self.name}: {self.status}"
+
+
+class VisualComparer:
+    """ベースライン画像の管理と比較"""
+    
+    def __init__(self, baseline_dir: str = settings.VISUAL_BASELINE_DIR,
+                 tolerance: float = settings.VISUAL_TOLERANCE,
+                 pixel_threshold: int = settings.VISUAL_PIXEL_THRESHOLD,
+                 precheck_step: int = settings.VISUAL_PRECHECK_STEP,
+                 update: bool = settings.VISUAL_UPDATE_BASELINES,
+                 save_diff: bool = settings.VISUAL_SAVE_DIFF):
+        """
+        VisualComparerクラスの初期化
+        
+        Args:
+            baseline_dir: ベースライン画像のルートディレクトリ
+            tolerance: 一致とみなす不一致の画素の割合の上限
+            pixel_threshold: 一致とみなす色の差の上限（0〜255）
+            precheck_step: 事前チェックで比較する画素の間隔。0の場合は事前チェックを行わない
+            update: 差分のある画像でベースラインを更新するかどうか
+            save_diff: 不一致の画像の差分を保存するかどうか
+        """
+        self.baseline_dir = baseline_dir
+        self.tolerance = tolerance
+        self.pixel_threshold = pixel_threshold
+        self.precheck_step = precheck_step
+        self.update = update
+        self.save_diff = save_diff
+        self._lock = threading.Lock()
+        
+        # 統計情報
+        self.counts: Dict[str, int] = {}
+        self.prechecked = 0
+        self.seconds = 0.0
+    
+    def baseline_path(self, name: str) -> str:
+        """
+        ベースライン画像のパスを返す
+        
+        Args:
+            name: ベースラインの名前（"/" でディレクトリを区切ることができる）
+        
+        Returns:
+            str: ベースライン画像のパス
+        """
+        return os.path.join(self.baseline_dir, *name.split("/")) + ".png"
+    
+    def compare(self, name: str, data: bytes, regions: Iterable[Region] = ()) -> VisualDiff:
+        """
+        画像をベースラインと比較する
+        
+        ベースラインとバイト列が同じ場合はデコードせずに一致とする。事前チェックでは
+        precheck_step ごとに間引いた画素を比較し、その時点で許容範囲を超えた場合は
+        全ての画素を比較せずに不一致とする。
+        
+        Args:
+            name: ベースラインの名前
+            data: 比較する画像のPNGデータ
+            regions: 無視する領域
+        
+        Returns:
+            VisualDiff: 比較の結果
+        """
+        start = time.perf_counter()
+        result = self._compare(name, data, list(regions))
+        with self._lock:
+            self.counts[result.status] = self.counts.get(result.status, 0) + 1
+            self.prechecked += 1 if result.prechecked else 0
+            self.seconds += time.perf_counter() - start
+        return result
+    
+    def check(self, driver, name: str, locator: Optional[Tuple[str, str]] = None,
+              mask_locators: Sequence[Tuple[str, str]] = (), regions: Iterable[Region] = ()) -> VisualDiff:
+        """
+        スクリーンショットを撮影してベースラインと比較する
+        
+        locator を指定した場合は、要素のスクリーンショット（要素の範囲に切り抜いた画像）を
+        ブラウザから取得するため、ページ全体を転送・比較しない。ベースラインはブラウザごとに分ける。
+        
+        Args:
+            driver: Seleniumのwebdriverインスタンス
+            name: ベースラインの名前
+            locator: 撮影する要素のロケーター。Noneの場合は表示領域全体
+            mask_locators: 無視する要素のロケーター（一致する全ての要素の範囲を無視する）
+            regions: 無視する領域（撮影した画像の画素単位）
+        
+        Returns:
+            VisualDiff: 比較の結果
+        """
+        if locator is None:
+            data = driver.get_screenshot_as_png()
+        else:
+            data = driver.find_element(*locator).screenshot_as_png
+        regions = list(regions)
+        if mask_locators:
+            regions.extend(self.get_mask_regions(driver, mask_locators, locator))
+        browser = driver.capabilities.get("browserName") or "unknown"
+        return self.compare(f"{browser}/{name}", data, regions)
+    
+    @staticmethod
+    def get_mask_regions(driver, mask_locators: Sequence[Tuple[str, str]],
+                         origin: Optional[Tuple[str, str]] = None) -> List[Region]:
+        """
+        要素の範囲を画像の画素単位の領域に変換する（1回のスクリプト実行で取得する）
+        
+        Args:
+            driver: Seleniumのwebdriverインスタンス
+            mask_locators: 要素のロケーター
+            origin: 撮影した要素のロケーター。指定した場合は要素の左上を原点とする
+        
+        Returns:
+            List[Region]: 無視する領域
+        """
+        ratio, rects = driver.execute_script(
+            browser_scripts.ELEMENT_RECTS,
+            [list(mask) for mask in mask_locators],
+            list(origin) if origin is not None else None,
+        )
+        return [
+            (int(x * ratio), int(y * ratio), math.ceil(width * ratio), math.ceil(height * ratio))
+            for x, y, width, height in rects
+        ]
+    
+    def to_dict(self) -> Dict:
+        """
+        統計情報を辞書で返す（並列実行時にコントローラーへ渡すために使用）
+        
+        Returns:
+            Dict: 統計情報
+        """
+        return {"counts": dict(self.counts), "prechecked": self.prechecked, "seconds": self.seconds}
+    
+    def merge(self, data: Dict) -> None:
+        """
+        他のワーカーの統計情報を加える
+        
+        Args:
+            data: to_dict の結果
+        """
+        with self._lock:
+            for status, count in data["counts"].items():
+                self.counts[status] = self.counts.get(status, 0) + count
+            self.prechecked += data["prechecked"]
+            self.seconds += data["seconds"]
+    
+    def summary(self) -> Optional[str]:
+        """
+        比較の状況を表す文字列を返す
+        
+        Returns:
+            Optional[str]: 一度も比較していない場合はNone
+        """
+        compared = sum(self.counts.values())
+        if compared == 0:
+            return None
+        statuses = ", ".join(f"{status}: {count}件" for status, count in sorted(self.counts.items()))
+        return (
+            f"比較: {compared}件 ({statuses}), 事前チェックで判定: {self.prechecked}件, "
+            f"平均: {self.seconds / compared * 1000:.1f} ms"
+        )
+    
+    def _compare(self, name: str, data: bytes, regions: List[Region]) -> VisualDiff:
+        """ベースラインと比較し、必要に応じてベースラインを作成・更新する"""
+        path = self.baseline_path(name)
+        if not os.path.exists(path):
+            self._write_baseline(path, data)
+            return VisualDiff(name, VisualDiff.CREATED, baseline_path=path)
+        with open(path, "rb") as f:
+            expected_data = f.read()
+        if expected_data == data:
+            return VisualDiff(name, VisualDiff.IDENTICAL, baseline_path=path)
+        
+        actual = decode_image(data)
+        expected = decode_image(expected_data)
+        if actual.shape != expected.shape:
+            return self._failed(VisualDiff(name, VisualDiff.FAILED, baseline_path=path), data)
+        total = actual.shape[0] * actual.shape[1]
+        allowed = int(total * self.tolerance)
+        
+        step = self.precheck_step
+        if step > 1:
+            # 間引いた画素の不一致は全体の不一致の下限になる
+            sample = mismatch_mask(actual[::step, ::step], expected[::step, ::step], self.pixel_threshold,
+                                   [_scale_region(region, step) for region in regions])
+            sampled = int(sample.sum())
+            if sampled > allowed:
+                result = VisualDiff(name, VisualDiff.FAILED, sampled, total, path, prechecked=True)
+                return self._failed(result, data, actual, sample, step)
+        
+        mask = mismatch_mask(actual, expected, self.pixel_threshold, regions)
+        mismatched = int(mask.sum())
+        if mismatched > allowed:
+            return self._failed(VisualDiff(name, VisualDiff.FAILED, mismatched, total, path), data, actual, mask)
+        return VisualDiff(name, VisualDiff.PASSED, mismatched, total, path)
+    
+    def _failed(self, result: VisualDiff, data: bytes, actual=None, mask=None, scale: int = 1) -> VisualDiff:
+        """不一致の結果に応じてベースラインを更新するか差分画像を保存する"""
+        if self.update:
+            self._write_baseline(result.baseline_path, data)
+            result.status = VisualDiff.UPDATED
+        elif self.save_diff and mask is not None:
+            # PNGへの変換と書き込みはライターのスレッドで行う
+            filename = result.name.replace("/", "_") + "_diff"
+            path = unique_artifact_path(settings.SCREENSHOT_DIR, filename, "png")
+            
+            def task():
+                content = render_diff(actual, mask, scale)
+                with open(path, "wb") as f:
+                    f.write(content)
+                return len(content)
+            
+            if settings.ASYNC_ARTIFACTS:
+                get_artifact_writer().submit_task(path, task)
+            else:
+                task()
+            result.diff_path = path
+        return result
+    
+    @staticmethod
+    def _write_baseline(path: str, data: bytes) -> None:
+        """ベースライン画像を保存する"""
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "wb") as f:
+            f.write(data)
+
+
+_default_comparer: Optional[VisualComparer] = None
+_default_comparer_lock = threading.Lock()
+
+
+def get_visual_comparer() -> VisualComparer:
+    """
+    プロセス共通のVisualComparerを返す
+    
+    ベースラインを更新するかどうかは最初の呼び出し時の設定（--update-baselines）に従う。
+    
+    Returns:
+        VisualComparer: 共通の比較
+    """
+    global _default_comparer
+    with _default_comparer_lock:
+        if _default_comparer is None:
+            _default_comparer = VisualComparer(update=settings.VISUAL_UPDATE_BASELINES)
+        return _default_comparer
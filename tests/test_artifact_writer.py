@@ -0,0 +1,69 @@
+"""
+ArtifactWriterクラスのユニットテスト
+"""
+
+import base64
+import os
+
+from selenium_web_testing.src.artifact_writer import ArtifactWriter
+
+
+class TestArtifactWriter:
+    """ArtifactWriterクラスのテスト"""
+    
+    def test_writes_in_background(self, tmp_path):
+        """予約したデータがflush後に書き込まれていることのテスト"""
+        writer = ArtifactWriter()
+        path = str(tmp_path / "shots" / "a.png")
+        
+        # テスト対象の関数を呼び出す
+        assert writer.submit(path, b"png-bytes") == path
+        writer.flush()
+        
+        # アサーション
+        with open(path, "rb") as f:
+            assert f.read() == b"png-bytes"
+        assert writer.written == 1
+        writer.close()
+    
+    def test_decodes_base64(self, tmp_path):
+        """文字列のデータがBase64としてデコードされることのテスト"""
+        writer = ArtifactWriter()
+        path = str(tmp_path / "b.png")
+        
+        writer.submit(path, base64.b64encode(b"decoded").decode("ascii"))
+        writer.close()
+        
+        # アサーション
+        with open(path, "rb") as f:
+            assert f.read() == b"decoded"
+    
+    def test_transform_failure_keeps_original(self, tmp_path):
+        """変換に失敗しても元のデータが保存され、エラーが記録されることのテスト"""
+        writer = ArtifactWriter()
+        path = str(tmp_path / "c.png")
+        
+        def broken(data):
+            raise ValueError("broken image")
+        
+        writer.submit(path, b"original", broken)
+        writer.close()
+        
+        # アサーション
+        with open(path, "rb") as f:
+            assert f.read() == b"original"
+        assert len(writer.errors) == 1
+    
+    def test_write_error_is_recorded(self, tmp_path):
+        """書き込みエラーが例外にならず記録されることのテスト"""
+        writer = ArtifactWriter()
+        blocker = tmp_path / "file"
+        blocker.write_bytes(b"")
+        
+        # ファイルの下にディレクトリは作れない
+        writer.submit(os.path.join(str(blocker), "d.png"), b"data")
+        writer.close()
+        
+        # アサーション
+        assert writer.written == 0
+        assert len(writer.errors) == 1
@@ -0,0 +1,125 @@
+"""
+asyncioで動作するページ操作のユニットテスト。
+代替WebDriverサーバーに対して AsyncWebDriver で接続して実行します。
+"""
+
+import asyncio
+
+import pytest
+from selenium.common.exceptions import NoSuchElementException, StaleElementReferenceException, TimeoutException
+from selenium.webdriver.common.by import By
+
+from selenium_web_testing.src.async_page import AsyncBasePage
+from selenium_web_testing.src.async_webdriver import AsyncWebDriver
+from selenium_web_testing.src.conditions import visible
+from selenium_web_testing.benchmarks.fake_webdriver import FakeElement, FakeWebDriverServer
+
+BASE_URL = "http://app.test"
+SEARCH_BOX = (By.ID, "search")
+SEARCH_BUTTON = (By.CSS_SELECTOR, "button.search-button")
+RESULT = (By.CSS_SELECTOR, ".result")
+
+
+class AsyncSearchPage(AsyncBasePage):
+    """準備完了の条件を宣言したページ"""
+    
+    READY_LOCATORS = (SEARCH_BOX, SEARCH_BUTTON)
+
+
+@pytest.fixture
+def server():
+    """検索ページを登録したサーバー"""
+    server = FakeWebDriverServer()
+    page = server.add_page(f"{BASE_URL}/search", "Search")
+    page.add_element(SEARCH_BOX, FakeElement("input"))
+    page.add_element(SEARCH_BUTTON, FakeElement("button", "Search", navigates_to=f"{BASE_URL}/results"))
+    results = server.add_page(f"{BASE_URL}/results", "Results")
+    results.add_elements(RESULT, [FakeElement("li", f"Result {i}") for i in range(3)])
+    with server:
+        yield server
+
+
+class TestAsyncPage:
+    """AsyncPageActions・AsyncBasePageクラスのテスト"""
+    
+    def test_page_flow(self, server):
+        """ページを開いて入力・クリック・取得を行うことのテスト"""
+        async def scenario():
+            async with await AsyncWebDriver.start(server.url, {"browserName": "chrome"}) as driver:
+                page = await AsyncSearchPage(driver, BASE_URL).open("search")
+                await page.actions.type_text(SEARCH_BOX, "query")
+                value = await (await page.actions.find(SEARCH_BOX)).get_property("value")
+                await page.actions.click(SEARCH_BUTTON, condition=visible)
+                results = await page.actions.find_all(RESULT)
+                return value, await page.get_title(), [await result.get_text() for result in results]
+        
+        # 実行
+        value, title, texts = asyncio.run(scenario())
+        
+        # アサーション
+        assert value == "query"
+        assert title == "Results"
+        assert texts == ["Result 0", "Result 1", "Result 2"]
+        # 準備完了の確認と要素の待機は1回のスクリプト実行で行う
+        assert server.command_counts()["executeScript"] == 4
+    
+    def test_many_sessions_in_one_loop(self, server):
+        """1つのイベントループで複数のセッションを同時に操作することのテスト"""
+        async def scenario(index):
+            async with await AsyncWebDriver.start(server.url) as driver:
+                page = await AsyncSearchPage(driver, BASE_URL).open("search")
+                await page.actions.type_text(SEARCH_BOX, f"query {index}")
+                return driver.session_id
+        
+        async def main():
+            return await asyncio.gather(*(scenario(index) for index in range(10)))
+        
+        # 実行
+        session_ids = asyncio.run(main())
+        
+        # アサーション
+        assert len(set(session_ids)) == 10
+        assert server.sessions == {}
+    
+    def test_errors_and_timeouts(self, server):
+        """ドライバのエラーをSeleniumと同じ例外で送出し、待機がタイムアウトすることのテスト"""
+        async def scenario():
+            async with await AsyncWebDriver.start(server.url) as driver:
+                page = await AsyncSearchPage(driver, BASE_URL).open("search")
+                search_box = await driver.find_element(*SEARCH_BOX)
+                with pytest.raises(NoSuchElementException):
+                    await driver.find_element(*RESULT)
+                with pytest.raises(TimeoutException) as excinfo:
+                    await page.actions.wait_for_element(RESULT, timeout=0.1, mode="adaptive")
+                await page.actions.click(SEARCH_BUTTON)
+                with pytest.raises(StaleElementReferenceException):
+                    await search_box.clear()
+                return excinfo.value
+        
+        # 実行
+        error = asyncio.run(scenario())
+        
+        # アサーション
+        assert error.locator == RESULT
+    
+    def test_timed_out_command_does_not_leak_response(self):
+        """タイムアウトしたコマンドのレスポンスを次のコマンドが読まないことのテスト"""
+        server = FakeWebDriverServer(latency=0.3)
+        server.add_page(f"{BASE_URL}/search", "Search")
+        
+        async def scenario():
+            async with await AsyncWebDriver.start(server.url) as driver:
+                await driver.get(f"{BASE_URL}/search")
+                driver.timeout = 0.1
+                with pytest.raises(TimeoutException):
+                    await driver.get_current_url()
+                driver.timeout = 5
+                return await driver.get_title(), await driver.get_current_url()
+        
+        # 実行
+        with server:
+            title, url = asyncio.run(scenario())
+        
+        # アサーション
+        assert title == "Search"
+        assert url == f"{BASE_URL}/search"
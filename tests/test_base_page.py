@@ -0,0 +1,69 @@
+"""
+BasePageクラスのユニットテスト
+"""
+
+import pytest
+from unittest.mock import MagicMock, patch
+from selenium.webdriver.common.by import By
+
+from selenium_web_testing.src.base_page import BasePage
+
+
+class ReadyPage(BasePage):
+    """準備完了の条件を宣言したページ"""
+    
+    READY_LOCATORS = ((By.ID, "search"), (By.CSS_SELECTOR, "nav"))
+
+
+class TestBasePage:
+    """BasePageクラスのテスト"""
+    
+    @pytest.fixture
+    def mock_driver(self):
+        """モックドライバを作成するフィクスチャ"""
+        driver = MagicMock()
+        driver.caps = {"pageLoadStrategy": "normal"}
+        return driver
+    
+    def test_open_skips_redundant_wait(self, mock_driver):
+        """normal戦略ではページを開いた後に読み込み状態を確認しないことのテスト"""
+        BasePage(mock_driver, "http://app.test").open("login")
+        
+        # アサーション
+        mock_driver.get.assert_called_once_with("http://app.test/login")
+        mock_driver.execute_script.assert_not_called()
+    
+    def test_open_waits_for_load_with_none_strategy(self, mock_driver):
+        """none戦略で条件が宣言されていない場合に読み込みの完了を待つことのテスト"""
+        mock_driver.caps = {"pageLoadStrategy": "none"}
+        mock_driver.execute_script.return_value = "complete"
+        
+        BasePage(mock_driver, "http://app.test").refresh()
+        
+        # アサーション
+        mock_driver.execute_script.assert_called_once_with("return document.readyState")
+    
+    def test_open_waits_for_ready_locators(self, mock_driver):
+        """READY_LOCATORSの要素が1回のスクリプト実行で確認されることのテスト"""
+        mock_driver.caps = {"pageLoadStrategy": "none"}
+        mock_driver.execute_script.return_value = True
+        
+        ReadyPage(mock_driver, "http://app.test").open()
+        
+        # アサーション
+        assert mock_driver.execute_script.call_count == 1
+        payload = mock_driver.execute_script.call_args[0][1]
+        assert payload == [[By.ID, "search"], [By.CSS_SELECTOR, "nav"]]
+    
+    def test_wait_for_network_idle(self, mock_driver):
+        """リソース数が変わらなくなるまで待機することのテスト"""
+        mock_driver.execute_script.side_effect = [
+            ["loading", 0], ["interactive", 3], ["complete", 5], ["complete", 5], ["complete", 5],
+        ]
+        page = BasePage(mock_driver, "http://app.test")
+        
+        with patch("time.sleep"):
+            page.actions.wait_for_network_idle(idle_time=0, timeout=5)
+        
+        # アサーション
+        assert mock_driver.execute_script.call_count == 4
@@ -0,0 +1,104 @@
+"""
+ページ操作のラウンドトリップ数の回帰テスト。
+代替WebDriverサーバー上でベンチマークを実行し、基準より往復回数が増えていないことを確認します。
+"""
+
+from selenium import webdriver
+from selenium.webdriver.common.by import By
+from selenium.common.exceptions import NoSuchElementException, StaleElementReferenceException
+import pytest
+
+from selenium_web_testing.benchmarks.fake_webdriver import FakeElement, FakeWebDriverServer
+from selenium_web_testing.benchmarks.import_time import IMPORT_TARGETS, find_forbidden, measure_imports
+from selenium_web_testing.benchmarks.suite import find_regressions, load_baseline, run_suite
+from selenium_web_testing.src import browser_scripts
+from selenium_web_testing.src.page_actions import PageActions
+
+# 他のスクリプトの一部、または代替サーバーが対応していないスクリプト（ビジュアル比較・DOMスナップショット）
+UNHANDLED_SCRIPTS = {"LOCATE_FUNCTION", "IS_VISIBLE", "FILL_FORM_OPTION_ERROR", "ELEMENT_RECTS", "DOM_SNAPSHOT"}
+
+
+def test_round_trips_do_not_regress():
+    """全ての操作のラウンドトリップ数が基準以下であることのテスト"""
+    results = run_suite(latency=0.0, iterations=1)
+    
+    # アサーション
+    assert find_regressions(results, load_baseline()) == []
+
+
+@pytest.mark.parametrize("module", sorted(IMPORT_TARGETS))
+def test_imports_are_deferred(module):
+    """ブラウザのドライバやwebdriver_managerが読み込み時に読み込まれないことのテスト"""
+    modules = measure_imports(module)
+    
+    # アサーション
+    assert module in modules
+    assert find_forbidden(modules, IMPORT_TARGETS[module]) == []
+
+
+class TestFakeWebDriverServer:
+    """代替WebDriverサーバーのテスト"""
+    
+    @pytest.fixture
+    def server(self):
+        """ページを1つ登録したサーバー"""
+        server = FakeWebDriverServer()
+        page = server.add_page("http://app.test/", "Home")
+        page.add_element((By.ID, "go"), FakeElement("a", "Go", navigates_to="http://app.test/next"))
+        server.add_page("http://app.test/next", "Next")
+        with server:
+            yield server
+    
+    @pytest.fixture
+    def driver(self, server):
+        """代替サーバーに接続したドライバ"""
+        driver = webdriver.Remote(command_executor=server.url, options=webdriver.ChromeOptions())
+        yield driver
+        driver.quit()
+    
+    def test_navigation_and_counts(self, server, driver):
+        """ページ遷移とコマンドの記録のテスト"""
+        server.reset_counts()
+        driver.get("http://app.test/")
+        driver.find_element(By.ID, "go").click()
+        driver.back()
+        
+        # アサーション
+        assert driver.title == "Home"
+        assert server.command_counts()["findElement"] == 1
+        assert server.round_trips == 5
+    
+    def test_script_constants_are_handled(self, server):
+        """browser_scripts のスクリプトの定数に代替処理が登録されていることのテスト"""
+        names = [
+            name for name, value in vars(browser_scripts).items()
+            if name.isupper() and not name.startswith("_") and isinstance(value, str) and name not in UNHANDLED_SCRIPTS
+        ]
+        
+        # アサーション
+        assert [name for name in names if getattr(browser_scripts, name) not in server.script_handlers] == []
+    
+    def test_texts_of_hidden_elements_match_webelement_text(self, server, driver):
+        """get_texts が表示されていない要素に WebElement.text と同じ空文字列を返すことのテスト"""
+        page = server.add_page("http://app.test/list", "List")
+        page.add_elements((By.CSS_SELECTOR, "li"), [FakeElement("li", "Shown"), FakeElement("li", "Hidden", displayed=False)])
+        driver.get("http://app.test/list")
+        
+        # テスト対象の関数を呼び出す
+        texts = PageActions(driver).get_texts((By.CSS_SELECTOR, "li"))
+        
+        # アサーション
+        assert texts == [element.text for element in driver.find_elements(By.CSS_SELECTOR, "li")] == ["Shown", ""]
+        assert browser_scripts.IS_VISIBLE in browser_scripts.GET_TEXTS
+    
+    def test_errors_map_to_selenium_exceptions(self, driver):
+        """W3Cのエラーが対応するSeleniumの例外になることのテスト"""
+        driver.get("http://app.test/")
+        link = driver.find_element(By.ID, "go")
+        link.click()
+        
+        # アサーション
+        with pytest.raises(NoSuchElementException):
+            driver.find_element(By.ID, "missing")
+        with pytest.raises(StaleElementReferenceException):
+            link.click()
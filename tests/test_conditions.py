@@ -0,0 +1,50 @@
+"""
+複合待機条件のユニットテスト
+"""
+
+from selenium_web_testing.src.conditions import (
+    Condition, visible, enabled, not_covered, text_contains, attribute_equals, clickable
+)
+
+
+class TestCondition:
+    """Conditionクラスのテスト"""
+    
+    def test_compile_combines_predicates(self):
+        """& で組み合わせた条件が1つの判定式になることのテスト"""
+        predicate, params = (visible & enabled & not_covered).compile()
+        
+        # アサーション
+        assert "el.disabled" in predicate
+        assert "elementFromPoint" in predicate
+        assert " && " in predicate
+        assert params == []
+    
+    def test_compile_numbers_params(self):
+        """各条件の引数が params の通し番号に置き換えられることのテスト"""
+        condition = text_contains("OK") & attribute_equals("data-state", "ready")
+        predicate, params = condition.compile()
+        
+        # アサーション
+        assert params == ["OK", "data-state", "ready"]
+        assert "indexOf(params[0])" in predicate
+        assert "el.getAttribute(params[1]) === params[2]" in predicate
+        assert "$" not in predicate
+    
+    def test_or_and_invert(self):
+        """| と ~ の変換と説明文のテスト"""
+        condition = ~text_contains("Loading") | clickable
+        predicate, params = condition.compile()
+        
+        # アサーション
+        assert predicate.startswith("(!(")
+        assert " || " in predicate
+        assert params == ["Loading"]
+        assert condition.description == "not text_contains('Loading') | visible & enabled"
+    
+    def test_custom_condition(self):
+        """独自の判定式を持つ条件のテスト"""
+        condition = Condition("el.children.length >= $0", (3,), "has_children")
+        
+        # アサーション
+        assert condition.compile() == ("(el.children.length >= params[0])", [3])
@@ -0,0 +1,114 @@
+"""
+DOMスナップショットのユニットテスト
+"""
+
+import zipfile
+from unittest.mock import MagicMock
+
+import pytest
+
+from selenium_web_testing.src import artifacts, browser_scripts, dom_snapshot
+from selenium_web_testing.src.artifacts import CaptureStats
+from selenium_web_testing.src.dom_snapshot import (
+    CAPTURE_KIND, capture_dom_snapshot, close_dom_archive, should_sample, settings
+)
+
+
+@pytest.fixture
+def driver():
+    """ロケーターの祖先のDOMを返すモックドライバ"""
+    driver = MagicMock()
+    driver.execute_script.return_value = {
+        "url": "https://app.test/",
+        "title": "Home",
+        "root": "nav.main-nav",
+        "used": "nav.main-nav",
+        "matched": 0,
+        "truncated": False,
+        "html": '<nav class="main-nav"><a href="/">Home</a></nav>',
+    }
+    return driver
+
+
+@pytest.fixture
+def stats(tmp_path, monkeypatch):
+    """アーカイブの保存先を一時ディレクトリにし、取得の集計を返すフィクスチャ"""
+    stats = CaptureStats()
+    monkeypatch.setenv(artifacts.RUN_ID_ENV, "run1")
+    monkeypatch.delenv(artifacts.WORKER_ID_ENV, raising=False)
+    monkeypatch.setattr(settings, "SCREENSHOT_DIR", str(tmp_path))
+    monkeypatch.setattr(settings, "ASYNC_ARTIFACTS", False)
+    monkeypatch.setattr(dom_snapshot, "get_capture_stats", lambda: stats)
+    yield stats
+    close_dom_archive()
+
+
+class TestDomSnapshot:
+    """DOMスナップショットのテスト"""
+    
+    def test_should_sample(self):
+        """成功したテストの取得をnodeidで決めることのテスト"""
+        nodeids = [f"tests/test_a.py::test_{i}" for i in range(1000)]
+        
+        # アサーション
+        assert not any(should_sample(nodeid, 0) for nodeid in nodeids)
+        assert all(should_sample(nodeid, 1) for nodeid in nodeids)
+        sampled = [nodeid for nodeid in nodeids if should_sample(nodeid, 0.1)]
+        assert 50 < len(sampled) < 150
+        assert sampled == [nodeid for nodeid in nodeids if should_sample(nodeid, 0.1)]
+    
+    def test_subtree_around_locator_is_archived(self, driver, stats, tmp_path):
+        """失敗したロケーターの周辺を1回のスクリプト実行で取得して圧縮保存することのテスト"""
+        # 実行
+        path = capture_dom_snapshot(driver, "test_nav", ("css selector", "nav.main-nav a.missing"))
+        close_dom_archive()
+        
+        # アサーション
+        driver.execute_script.assert_called_once_with(
+            browser_scripts.DOM_SNAPSHOT, "css selector", "nav.main-nav a.missing",
+            settings.DOM_SNAPSHOT_ANCESTOR_LEVELS, settings.DOM_SNAPSHOT_MAX_CHARS,
+        )
+        assert path == str(tmp_path / "run1" / "main" / "dom_snapshots.zip")
+        with zipfile.ZipFile(path) as archive:
+            assert archive.namelist() == ["test_nav_0001.html"]
+            info = archive.getinfo("test_nav_0001.html")
+            assert info.compress_type == zipfile.ZIP_DEFLATED
+            content = archive.read("test_nav_0001.html").decode("utf-8")
+        assert "locator: css selector=nav.main-nav a.missing (一致: 0件)" in content
+        assert "存在する最も近い祖先: nav.main-nav" in content
+        assert content.endswith('<nav class="main-nav"><a href="/">Home</a></nav>\n')
+        entry = stats.to_dict()[CAPTURE_KIND]
+        assert entry["count"] == 1
+        assert entry["bytes"] == len(content.encode("utf-8"))
+        assert entry["stored"] == info.compress_size
+    
+    def test_archive_is_appended(self, driver, stats):
+        """同じ実行のスナップショットを1つのアーカイブに追記することのテスト"""
+        capture_dom_snapshot(driver, "test_a")
+        close_dom_archive()
+        path = capture_dom_snapshot(driver, "test_b")
+        close_dom_archive()
+        
+        # アサーション
+        driver.execute_script.assert_called_with(
+            browser_scripts.DOM_SNAPSHOT, None, None,
+            settings.DOM_SNAPSHOT_ANCESTOR_LEVELS, settings.DOM_SNAPSHOT_MAX_CHARS,
+        )
+        with zipfile.ZipFile(path) as archive:
+            assert archive.namelist() == ["test_a_0001.html", "test_b_0001.html"]
+    
+    def test_capture_stats_summary(self):
+        """成果物の種類ごとの取得時間とサイズを集計することのテスト"""
+        stats = CaptureStats()
+        stats.record("screenshot", 0.2, 300 * 1024)
+        other = CaptureStats()
+        other.record("dom snapshot", 0.01, 40 * 1024)
+        other.record_stored("dom snapshot", 4 * 1024)
+        
+        # 実行
+        stats.merge(other.to_dict())
+        lines = stats.summary_lines()
+        
+        # アサーション
+        assert lines[1].split() == ["dom", "snapshot", "1", "10.0", "40.0", "4.0"]
+        assert lines[2].split() == ["screenshot", "1", "200.0", "300.0", "-"]
@@ -0,0 +1,115 @@
+"""
+DriverPoolクラスのユニットテスト
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from unittest.mock import MagicMock
+
+from selenium_web_testing.src.driver_pool import DriverPool, reset_driver_state
+
+
+class TestDriverPool:
+    """DriverPoolクラスのテスト"""
+    
+    @pytest.fixture
+    def factory(self):
+        """呼び出すたびに新しいモックドライバを返すファクトリ"""
+        def _factory(key):
+            driver = MagicMock(spec=["window_handles", "switch_to", "close", "execute_script",
+                                     "delete_all_cookies", "get", "quit", "current_window_handle"])
+            driver.window_handles = ["main"]
+            return driver
+        return MagicMock(side_effect=_factory)
+    
+    def test_reuses_released_driver(self, factory):
+        """返却したドライバが再利用されることのテスト"""
+        pool = DriverPool(factory, max_reuse=10, max_idle=1)
+        
+        first = pool.acquire("chrome")
+        pool.release(first)
+        second = pool.acquire("chrome")
+        
+        # アサーション
+        assert second is first
+        assert factory.call_count == 1
+        assert pool.reuses == 1
+        first.get.assert_called_with("about:blank")
+    
+    def test_keys_are_separated(self, factory):
+        """キーが異なるドライバは再利用されないことのテスト"""
+        pool = DriverPool(factory)
+        
+        chrome = pool.acquire("chrome")
+        pool.release(chrome)
+        firefox = pool.acquire("firefox")
+        
+        # アサーション
+        assert firefox is not chrome
+        assert factory.call_count == 2
+    
+    def test_recycles_after_max_reuse(self, factory):
+        """再利用回数の上限に達したドライバが終了されることのテスト"""
+        pool = DriverPool(factory, max_reuse=2)
+        
+        driver = pool.acquire()
+        pool.release(driver)
+        assert pool.acquire() is driver
+        pool.release(driver)
+        
+        # アサーション
+        driver.quit.assert_called_once()
+        assert pool.recycled == 1
+        assert pool.acquire() is not driver
+    
+    def test_discards_unhealthy_driver(self, factory):
+        """応答しないドライバが破棄されることのテスト"""
+        pool = DriverPool(factory)
+        
+        driver = pool.acquire()
+        pool.release(driver)
+        type(driver).current_window_handle = property(MagicMock(side_effect=Exception("session deleted")))
+        
+        # アサーション
+        assert pool.acquire() is not driver
+        driver.quit.assert_called_once()
+        assert pool.discarded == 1
+    
+    def test_counts_discards_from_threads(self, factory):
+        """複数のスレッドから破棄したドライバが全て数えられることのテスト"""
+        pool = DriverPool(factory)
+        drivers = [pool.acquire() for _ in range(20)]
+        
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            list(executor.map(lambda driver: pool.release(driver, discard=True), drivers))
+        
+        # アサーション
+        assert pool.discarded == 20
+    
+    def test_close_quits_all_drivers(self, factory):
+        """closeで全てのドライバが終了されることのテスト"""
+        pool = DriverPool(factory)
+        
+        idle = pool.acquire()
+        busy = pool.acquire()
+        pool.release(idle)
+        pool.close()
+        
+        # アサーション
+        idle.quit.assert_called_once()
+        busy.quit.assert_called_once()
+
+
+def test_reset_driver_state_closes_extra_windows():
+    """reset_driver_stateが余分なウィンドウを閉じることのテスト"""
+    driver = MagicMock()
+    driver.window_handles = ["main", "popup"]
+    
+    reset_driver_state(driver)
+    
+    # アサーション
+    driver.close.assert_called_once()
+    driver.switch_to.window.assert_called_with("main")
+    driver.execute_cdp_cmd.assert_called_once_with("Network.clearBrowserCookies", {})
+    driver.get.assert_called_once_with("about:blank")
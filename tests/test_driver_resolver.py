@@ -0,0 +1,142 @@
+"""
+ドライバの解決と起動時間の計測のユニットテスト
+"""
+
+import os
+from unittest.mock import MagicMock, patch
+
+import pytest
+from selenium.common.exceptions import SessionNotCreatedException
+
+from selenium_web_testing.src import driver_resolver
+from selenium_web_testing.src.driver_resolver import (
+    DriverResolver, StartupProfile, StartupStats, parse_major_version, start_driver
+)
+
+
+@pytest.fixture
+def browser_binary(tmp_path, monkeypatch):
+    """ブラウザのバイナリの代わりとなるファイルを作成するフィクスチャ"""
+    binary = tmp_path / "chrome"
+    binary.write_text("")
+    monkeypatch.setattr(driver_resolver, "find_browser_binary", lambda name: str(binary))
+    return binary
+
+
+@pytest.fixture
+def driver_binary(tmp_path):
+    """ドライバのバイナリの代わりとなる実行可能ファイルを作成するフィクスチャ"""
+    path = tmp_path / "chromedriver"
+    path.write_text("")
+    path.chmod(0o755)
+    return str(path)
+
+
+def version_output(version):
+    """subprocess.runの戻り値を作成する"""
+    return MagicMock(stdout=f"Google Chrome {version}\n")
+
+
+class TestDriverResolver:
+    """DriverResolverクラスのテスト"""
+    
+    def test_parse_major_version(self):
+        """--versionの出力からメジャーバージョンを取り出すことのテスト"""
+        assert parse_major_version("Google Chrome 120.0.6099.109") == "120"
+        assert parse_major_version("Mozilla Firefox 121.0") == "121"
+        assert parse_major_version("unknown") is None
+    
+    def test_version_probe_is_cached_until_binary_changes(self, tmp_path, browser_binary):
+        """バイナリが更新されるまで--versionを再実行しないことのテスト"""
+        resolver = DriverResolver(str(tmp_path / "manifest.json"))
+        
+        with patch("subprocess.run", return_value=version_output("120.0.1")) as mock_run:
+            assert resolver.browser_version("chrome") == "120"
+            # 別のプロセスでもマニフェストから読み込まれる
+            assert DriverResolver(resolver.manifest_path).browser_version("chrome") == "120"
+            assert mock_run.call_count == 1
+            
+            os.utime(browser_binary, (1, 1))
+            mock_run.return_value = version_output("121.0.1")
+            assert resolver.browser_version("chrome") == "121"
+            assert mock_run.call_count == 2
+    
+    def test_record_and_resolve(self, tmp_path, browser_binary, driver_binary):
+        """保存したパスがブラウザのバージョンごとに再利用されることのテスト"""
+        manifest = str(tmp_path / "manifest.json")
+        with patch("subprocess.run", return_value=version_output("120.0.1")):
+            DriverResolver(manifest).record("chrome", driver_binary)
+            resolver = DriverResolver(manifest)
+            
+            # アサーション
+            assert resolver.driver_key("chrome") == "chrome-120"
+            assert resolver.resolve("chrome") == driver_binary
+            resolver.invalidate("chrome")
+            assert DriverResolver(manifest).resolve("chrome") is None
+    
+    def test_launch_uses_cached_driver_without_install(self, tmp_path, browser_binary, driver_binary):
+        """保存済みのドライバがある場合にインストール処理を呼ばないことのテスト"""
+        resolver = DriverResolver(str(tmp_path / "manifest.json"))
+        install = MagicMock()
+        service_class = MagicMock()
+        driver_class = MagicMock()
+        
+        with patch("subprocess.run", return_value=version_output("120.0.1")):
+            resolver.record("chrome", driver_binary)
+            resolver.launch("chrome", driver_class, service_class, MagicMock(), install=install)
+        
+        # アサーション
+        install.assert_not_called()
+        service_class.assert_called_once_with(driver_binary)
+    
+    def test_launch_reinstalls_when_cached_driver_fails(self, tmp_path, browser_binary, driver_binary):
+        """保存済みのドライバで起動できない場合に解決し直すことのテスト"""
+        resolver = DriverResolver(str(tmp_path / "manifest.json"))
+        new_driver = MagicMock()
+        new_driver.service.path = driver_binary
+        driver_class = MagicMock(side_effect=[SessionNotCreatedException("version mismatch"), new_driver])
+        install = MagicMock(return_value=driver_binary)
+        
+        with patch("subprocess.run", return_value=version_output("120.0.1")):
+            resolver.record("chrome", driver_binary)
+            driver = resolver.launch("chrome", driver_class, MagicMock(), MagicMock(), install=install)
+        
+        # アサーション
+        assert driver is new_driver
+        install.assert_called_once()
+        assert resolver.resolve("chrome") == driver_binary
+
+
+class TestStartupProfile:
+    """起動時間の計測のテスト"""
+    
+    def test_start_driver_breakdown(self):
+        """service.startの前後で内訳が分けられることのテスト"""
+        service = MagicMock()
+        original_start = service.start
+        
+        def driver_class(service, options):
+            service.start()
+            return MagicMock()
+        
+        profile = StartupProfile()
+        start_driver(driver_class, service, MagicMock(), profile)
+        
+        # アサーション
+        assert set(profile.phases) == {"resolve", "spawn", "session"}
+        assert service.start is original_start
+        original_start.assert_called_once()
+    
+    def test_summary_lines(self):
+        """ブラウザごとの平均が表示されることのテスト"""
+        stats = StartupStats()
+        for seconds in (1.0, 3.0):
+            profile = StartupProfile()
+            profile.add("spawn", seconds)
+            stats.add("chrome", profile)
+        
+        lines = stats.summary_lines()
+        
+        # アサーション
+        assert lines[0].split() == ["browser", "launches", "resolve", "spawn", "session", "window_size", "total"]
+        assert lines[1].split() == ["chrome", "2", "0.00s", "2.00s", "0.00s", "0.00s", "2.00s"]
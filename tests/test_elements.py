@@ -0,0 +1,153 @@
+"""
+宣言的な要素の定義のユニットテスト
+"""
+
+from unittest.mock import MagicMock
+
+import pytest
+from selenium.common.exceptions import StaleElementReferenceException
+from selenium.webdriver.common.by import By
+from selenium.webdriver.remote.command import Command
+
+from selenium_web_testing.src import elements
+from selenium_web_testing.src.base_page import BasePage
+from selenium_web_testing.src.elements import CachedElement, Element, ElementCacheStats, Elements
+
+
+class SearchPage(BasePage):
+    """要素を宣言したページ"""
+    
+    SEARCH_BOX = (By.ID, "search")
+    RESULTS = (By.CSS_SELECTOR, ".result")
+    
+    search_box = Element(SEARCH_BOX)
+    submit = Element((By.CSS_SELECTOR, "button"), invalidates=True)
+    results = Elements(RESULTS)
+
+
+def make_element(driver, element_id):
+    """ドライバと要素IDを持つモック要素を作成する"""
+    element = MagicMock()
+    element.parent = driver
+    element.id = element_id
+    return element
+
+
+@pytest.fixture
+def stats(monkeypatch):
+    """テストごとの集計を返すフィクスチャ"""
+    stats = ElementCacheStats()
+    monkeypatch.setattr(elements, "get_element_cache_stats", lambda: stats)
+    return stats
+
+
+@pytest.fixture
+def page():
+    """要素の検索をモックにしたページ"""
+    driver = MagicMock()
+    driver.caps = {"pageLoadStrategy": "normal"}
+    page = SearchPage(driver, "http://app.test")
+    page.actions = MagicMock()
+    page.actions.find.side_effect = lambda locator, timeout: make_element(driver, f"id-{page.actions.find.call_count}")
+    return page
+
+
+class TestElements:
+    """Element・Elementsクラスのテスト"""
+    
+    def test_resolved_once_until_navigation(self, page, stats):
+        """最初のアクセスで検索し、ページ遷移まで同じ要素を返すことのテスト"""
+        first = page.search_box
+        second = page.search_box
+        
+        # アサーション
+        assert isinstance(first, CachedElement)
+        assert first is second
+        page.actions.find.assert_called_once_with(SearchPage.SEARCH_BOX, None)
+        assert SearchPage.search_box.locator == SearchPage.SEARCH_BOX
+        
+        page.refresh()
+        assert page.search_box is not first
+        assert stats.to_dict() == {"hits": 1, "misses": 2, "stale": 0}
+    
+    def test_stale_element_is_relocated(self, page, stats):
+        """DOMから外れた要素を探し直してコマンドを実行し直すことのテスト"""
+        element = page.search_box
+        page.driver.execute.side_effect = [StaleElementReferenceException("stale"), {"value": None}]
+        
+        # 実行
+        element.clear()
+        
+        # アサーション
+        assert page.actions.find.call_count == 2
+        assert page.driver.execute.call_args_list[1].args == (Command.CLEAR_ELEMENT, {"id": "id-2"})
+        assert page.search_box is element
+        assert stats.stale == 1
+    
+    def test_stale_element_is_relocated_for_get_attribute(self, page, stats):
+        """スクリプトで実行される get_attribute でも探し直して実行し直すことのテスト"""
+        element = page.search_box
+        page.driver.execute_script.side_effect = [StaleElementReferenceException("stale"), "query"]
+        
+        # 実行
+        value = element.get_attribute("value")
+        
+        # アサーション
+        assert value == "query"
+        assert page.driver.execute_script.call_args_list[1].args[1:] == (element, "value")
+        assert element.id == "id-2"
+        assert stats.stale == 1
+    
+    def test_stale_element_is_relocated_for_is_displayed(self, page, stats):
+        """スクリプトで実行される is_displayed でも探し直して実行し直すことのテスト"""
+        element = page.search_box
+        page.driver.execute_script.side_effect = [StaleElementReferenceException("stale"), True]
+        
+        # 実行
+        displayed = element.is_displayed()
+        
+        # アサーション
+        assert displayed is True
+        assert page.actions.find.call_count == 2
+        assert element.id == "id-2"
+        assert stats.stale == 1
+    
+    def test_stale_element_is_not_relocated_after_navigation(self, page, stats):
+        """検索した時から別のURLに遷移した場合は、別のページの要素に置き換えないことのテスト"""
+        page.driver.current_url = "http://app.test/search"
+        element = page.search_box
+        page.driver.current_url = "http://app.test/results"
+        page.driver.execute.side_effect = StaleElementReferenceException("stale")
+        
+        # アサーション
+        with pytest.raises(StaleElementReferenceException, match="results"):
+            element.clear()
+        assert page.actions.find.call_count == 1
+        assert element.id == "id-1"
+    
+    def test_click_on_invalidating_element_clears_cache(self, page, stats):
+        """invalidates=True の要素のクリック後にキャッシュを破棄することのテスト"""
+        search_box = page.search_box
+        page.submit.click()
+        
+        # アサーション
+        assert page.search_box is not search_box
+        assert stats.misses == 3
+    
+    def test_elements_relocate_by_index(self, page, stats):
+        """複数の要素のうちDOMから外れた要素を同じ位置の要素で置き換えることのテスト"""
+        driver = page.driver
+        page.actions.find_all.side_effect = [
+            [make_element(driver, "a"), make_element(driver, "b")],
+            [make_element(driver, "c"), make_element(driver, "d")],
+        ]
+        results = page.results
+        driver.execute.side_effect = [StaleElementReferenceException("stale"), {"value": "text"}]
+        
+        # 実行
+        results[1].click()
+        
+        # アサーション
+        assert driver.execute.call_args_list[1].args == (Command.CLICK_ELEMENT, {"id": "d"})
+        assert page.results is results
+        assert "ヒット率: 50%" in stats.summary()
@@ -0,0 +1,91 @@
+"""
+CommandRecorderクラスのユニットテスト
+"""
+
+import json
+from unittest.mock import MagicMock
+
+from selenium.webdriver.common.by import By
+
+from selenium_web_testing.src.instrumentation import CommandRecorder
+from selenium_web_testing.src.page_actions import PageActions
+
+
+class TestCommandRecorder:
+    """CommandRecorderクラスのテスト"""
+    
+    def make_driver(self):
+        """コマンド実行がMagicMockのドライバを作成する"""
+        driver = MagicMock()
+        driver.command_executor.execute.return_value = {"value": None}
+        driver.find_element.side_effect = lambda by, value: driver.command_executor.execute(
+            "findElement", {"using": by, "value": value})
+        return driver
+    
+    def test_records_command_and_caller(self, request):
+        """コマンド名・呼び出し元・テストのnodeidが記録されることのテスト"""
+        recorder = CommandRecorder()
+        driver = recorder.install(self.make_driver())
+        
+        # テスト対象の関数を呼び出す
+        PageActions(driver).is_element_present((By.ID, "test-id"))
+        
+        # アサーション
+        assert [r.command for r in recorder.records] == ["findElement"]
+        record = recorder.records[0]
+        assert record.caller == "PageActions.is_element_present"
+        assert record.nodeid == request.node.nodeid
+    
+    def test_records_failed_command(self):
+        """例外になったコマンドも記録されることのテスト"""
+        recorder = CommandRecorder()
+        driver = self.make_driver()
+        driver.command_executor.execute.side_effect = RuntimeError("boom")
+        recorder.install(driver)
+        
+        try:
+            driver.command_executor.execute("getTitle", {})
+        except RuntimeError:
+            pass
+        
+        # アサーション
+        assert recorder.records[0].error == "RuntimeError"
+        assert recorder.records[0].caller is None
+    
+    def test_report_and_export(self, tmp_path):
+        """ホットスポットの表とJSONLの書き出しのテスト"""
+        recorder = CommandRecorder()
+        driver = recorder.install(self.make_driver())
+        for _ in range(3):
+            driver.command_executor.execute("findElement", {})
+        driver.command_executor.execute("getTitle", {})
+        
+        lines = recorder.hot_spot_report()
+        path = tmp_path / "commands.jsonl"
+        recorder.export_jsonl(str(path))
+        
+        # アサーション
+        assert lines[0].startswith("WebDriverコマンド: 4回")
+        assert any(line.split()[:1] == ["3"] and line.endswith("findElement") for line in lines)
+        rows = [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+        assert len(rows) == 4
+        assert rows[0]["command"] == "findElement"
+    
+    def test_merge_worker_aggregates(self):
+        """他のワーカーの集計を加えてホットスポットの表を作ることのテスト"""
+        worker = CommandRecorder()
+        driver = worker.install(self.make_driver())
+        for _ in range(2):
+            driver.command_executor.execute("findElement", {})
+        controller = CommandRecorder()
+        
+        # 実行
+        controller.merge(worker.to_dict())
+        controller.merge(worker.to_dict())
+        lines = controller.hot_spot_report()
+        
+        # アサーション
+        assert controller.records == []
+        assert lines[0].startswith("WebDriverコマンド: 4回")
+        assert any(line.split()[:1] == ["4"] and line.endswith("findElement") for line in lines)
+        assert CommandRecorder().hot_spot_report() == []
@@ -0,0 +1,115 @@
+"""
+ロケーターの一括確認のユニットテスト
+"""
+
+from unittest.mock import MagicMock
+
+import pytest
+from selenium.webdriver.common.by import By
+
+from selenium_web_testing.src import browser_scripts, locator_health
+from selenium_web_testing.src.base_page import BasePage
+from selenium_web_testing.src.locator_health import (
+    LocatorHealth, check_locators, format_health_report, prepare_smoke_session, settings,
+)
+
+
+class SearchPage(BasePage):
+    """ロケーターを宣言したページ"""
+    
+    URL_PATH = "search"
+    READY_LOCATORS = ((By.ID, "search"),)
+    SEARCH_BOX = (By.ID, "search")
+    RESULTS = (By.CSS_SELECTOR, ".result")
+    EMPTY_MESSAGE = (By.CSS_SELECTOR, ".empty")
+    SUBMIT = (By.CSS_SELECTOR, "button")
+    BROKEN = (By.XPATH, "//div[")
+    
+    OPTIONAL_LOCATORS = ("EMPTY_MESSAGE",)
+    MULTIPLE_LOCATORS = ("RESULTS",)
+
+
+class AdvancedSearchPage(SearchPage):
+    """基底クラスのロケーターを引き継ぐページ"""
+    
+    FILTER = (By.NAME, "filter")
+    SUBMIT = (By.CSS_SELECTOR, "button.advanced")
+
+
+class AccountPage(BasePage):
+    """ログインが必要なページ"""
+    
+    URL_PATH = "account"
+    LOCATOR_SMOKE_ROLE = "user"
+
+
+@pytest.fixture
+def driver():
+    """ロケーターごとの一致数と表示数を返すモックドライバ"""
+    driver = MagicMock()
+    driver.execute_script.return_value = [
+        [1, 1, None], [12, 10, None], [0, 0, None], [3, 3, None], [0, 0, "The string '//div[' is not valid"],
+    ]
+    return driver
+
+
+class TestLocatorHealth:
+    """ロケーターの一括確認のテスト"""
+    
+    def test_declared_locators(self):
+        """ロケーターの形をした大文字のクラス属性だけを集めることのテスト"""
+        locators = AdvancedSearchPage.declared_locators()
+        
+        # アサーション（READY_LOCATORS や URL_PATH は含まない）
+        assert list(locators) == ["SEARCH_BOX", "RESULTS", "EMPTY_MESSAGE", "SUBMIT", "BROKEN", "FILTER"]
+        assert locators["SUBMIT"] == (By.CSS_SELECTOR, "button.advanced")
+    
+    def test_check_locators_in_one_script(self, driver):
+        """全てのロケーターを1回のスクリプト実行で確認して分類することのテスト"""
+        results = SearchPage(driver, "http://app.test").check_locators()
+        
+        # アサーション
+        driver.execute_script.assert_called_once_with(browser_scripts.CHECK_LOCATORS, [
+            [By.ID, "search"], [By.CSS_SELECTOR, ".result"], [By.CSS_SELECTOR, ".empty"],
+            [By.CSS_SELECTOR, "button"], [By.XPATH, "//div["],
+        ])
+        assert [(result.name, result.status, result.ok) for result in results] == [
+            ("SEARCH_BOX", LocatorHealth.OK, True),
+            ("RESULTS", LocatorHealth.OK, True),
+            ("EMPTY_MESSAGE", LocatorHealth.MISSING, True),
+            ("SUBMIT", LocatorHealth.AMBIGUOUS, False),
+            ("BROKEN", LocatorHealth.INVALID, False),
+        ]
+        report = format_health_report(results, only_problems=True)
+        assert len(report) == 2
+        assert "SUBMIT = css selector=button" in report[0]
+    
+    def test_check_repeats_until_healthy(self, driver):
+        """timeout を指定した場合に問題がなくなるまで確認を繰り返すことのテスト"""
+        driver.execute_script.side_effect = [[[0, 0, None]], [[1, 0, None]], [[1, 1, None]]]
+        
+        # 実行
+        results = check_locators(driver, {"SEARCH_BOX": (By.ID, "search")}, timeout=5, poll_interval=0)
+        
+        # アサーション
+        assert driver.execute_script.call_count == 3
+        assert results[0].status == LocatorHealth.OK
+    
+    def test_smoke_session_logs_in_for_role(self, driver, monkeypatch):
+        """役割を宣言したページではセッション状態のキャッシュを使ってログインすることのテスト"""
+        login_page_class = MagicMock()
+        monkeypatch.setattr(locator_health, "import_object", lambda path: login_page_class)
+        monkeypatch.setattr(settings, "LOCATOR_SMOKE_ACCOUNTS", {"user": ("smoke", "secret")})
+        cache = MagicMock()
+        driver.current_url = "https://app.test/search"
+        
+        # アサーション
+        assert prepare_smoke_session(driver, AccountPage, "https://app.test", cache) is True
+        login_page_class.assert_called_once_with(driver, "https://app.test")
+        login_page_class.return_value.login_with_session_cache.assert_called_once_with(cache, "smoke", "secret")
+        # 役割のないページはログインしていない状態で開く
+        assert prepare_smoke_session(driver, SearchPage, "https://app.test", cache) is True
+        driver.delete_all_cookies.assert_called_once()
+        # アカウントのない役割はスキップする
+        monkeypatch.setattr(settings, "LOCATOR_SMOKE_ACCOUNTS", {})
+        assert prepare_smoke_session(driver, AccountPage, "https://app.test", cache) is False
@@ -0,0 +1,90 @@
+"""
+BrowserMatrixクラスのユニットテスト
+"""
+
+import threading
+from unittest.mock import MagicMock
+
+import pytest
+
+from selenium_web_testing.src.matrix import BrowserMatrix, MatrixFailure, MatrixStats, parse_browsers
+
+
+def make_acquire(failing=()):
+    """ブラウザ名を持つモックドライバを返す acquire（failing のブラウザは起動に失敗する）"""
+    def _acquire(browser):
+        if browser in failing:
+            raise RuntimeError(f"{browser} を起動できません")
+        driver = MagicMock()
+        driver.name = browser
+        return driver
+    return MagicMock(side_effect=_acquire)
+
+
+class TestBrowserMatrix:
+    """BrowserMatrix・MatrixStatsクラスのテスト"""
+    
+    def test_parse_browsers(self):
+        """カンマ区切りのブラウザ名を重複なく指定順に変換することのテスト"""
+        assert parse_browsers(" Chrome, firefox,,chrome ") == ["chrome", "firefox"]
+        assert parse_browsers(None) == []
+    
+    def test_runs_scenario_concurrently(self):
+        """全てのブラウザでシナリオを同時に実行し、ドライバを返却することのテスト"""
+        acquire, release = make_acquire(), MagicMock()
+        stats = MatrixStats()
+        # 全てのブラウザのシナリオが同時に実行されていなければ待機が成立しない
+        barrier = threading.Barrier(3, timeout=5)
+        
+        def scenario(driver):
+            barrier.wait()
+            return driver.name.upper()
+        
+        with BrowserMatrix(["chrome", "firefox", "edge"], acquire, release, stats) as matrix:
+            result = matrix.run(scenario)
+        
+        # アサーション
+        assert result.values == {"chrome": "CHROME", "firefox": "FIREFOX", "edge": "EDGE"}
+        assert [run.browser for run in result.runs] == ["chrome", "firefox", "edge"]
+        assert release.call_count == 3
+        assert stats.to_dict()["scenario"]["edge"]["runs"] == 1
+    
+    def test_failures_are_aggregated(self):
+        """失敗したブラウザと起動できなかったブラウザをまとめて報告することのテスト"""
+        stats = MatrixStats()
+        
+        def scenario(driver):
+            if driver.name == "firefox":
+                raise ValueError("要素が見つかりません")
+            return True
+        
+        with BrowserMatrix(["chrome", "firefox", "safari"], make_acquire({"safari"}), stats=stats) as matrix:
+            with pytest.raises(MatrixFailure) as excinfo:
+                matrix.run(scenario, name="login")
+            result = matrix.run(scenario, name="login", check=False)
+        
+        # アサーション
+        message = str(excinfo.value)
+        assert "2/3個のブラウザで失敗しました" in message
+        assert "firefox: ValueError" in message
+        assert "safari: RuntimeError" in message
+        assert result["chrome"].passed
+        assert not result["safari"].launched
+        # 起動できなかったブラウザは所要時間がないため集計しない
+        assert stats.to_dict()["login"]["firefox"] == {"runs": 2, "failed": 2, "seconds": pytest.approx(0, abs=1)}
+        assert "safari" not in stats.to_dict()["login"]
+    
+    def test_summary_marks_slow_browser(self):
+        """最も速いブラウザより大幅に遅いブラウザを強調して並べることのテスト"""
+        stats = MatrixStats()
+        stats.merge({"search": {"chrome": {"runs": 2, "failed": 0, "seconds": 0.4},
+                                "firefox": {"runs": 2, "failed": 1, "seconds": 1.2}}})
+        
+        # 実行
+        lines = stats.summary_lines(slowdown_ratio=1.5)
+        
+        # アサーション
+        assert lines[0].split() == ["scenario", "chrome", "firefox", "slowest"]
+        assert lines[1].split() == ["search", "200ms", "600ms", "(1失敗)!", "3.0x"]
+        assert lines[2].split()[-4:] == ["2/2", "0.4s", "1/2", "1.2s"]
+        assert MatrixStats().summary_lines() == []
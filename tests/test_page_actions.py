@@ -3,11 +3,13 @@ PageActionsクラスのユニットテスト
 """
 
 import pytest
-from unittest.mock import MagicMock, patch
+from unittest.mock import MagicMock, patch, call
 from selenium.webdriver.common.by import By
-from selenium.common.exceptions import NoSuchElementException
+from selenium.common.exceptions import NoSuchElementException, JavascriptException, TimeoutException
 
-from selenium_web_testing.src.page_actions import PageActions
+from selenium_web_testing.src.page_actions import PageActions, MixedWaitsWarning
+from selenium_web_testing.src.page_actions import settings
+from selenium_web_testing.src.conditions import visible, enabled, text_contains
 
 
 class TestPageActions:
@@ -129,4 +131,286 @@ class TestPageActions:
             
             # アサーション
             assert value == "test value"
-            mock_element.get_attribute.assert_called_once_with("test-attr")
\ No newline at end of file
+            mock_element.get_attribute.assert_called_once_with("test-attr")
+    
+    def test_get_texts(self, page_actions, mock_driver):
+        """get_texts関数（1回のスクリプト実行で取得）のテスト"""
+        mock_driver.execute_script.return_value = ["Home", "About"]
+        
+        # テスト対象の関数を呼び出す
+        texts = page_actions.get_texts((By.CSS_SELECTOR, "nav a"))
+        
+        # アサーション
+        assert texts == ["Home", "About"]
+        mock_driver.execute_script.assert_called_once()
+        mock_driver.find_elements.assert_not_called()
+    
+    def test_get_texts_fallback(self, page_actions, mock_driver):
+        """get_texts関数（JavaScriptが使えない場合）のテスト"""
+        mock_driver.execute_script.side_effect = JavascriptException("javascript disabled")
+        first, second = MagicMock(text="Home"), MagicMock(text="About")
+        
+        # find_allメソッドをパッチ
+        with patch.object(page_actions, 'find_all', return_value=[first, second]):
+            # テスト対象の関数を呼び出す
+            texts = page_actions.get_texts((By.CSS_SELECTOR, "nav a"))
+            
+            # アサーション
+            assert texts == ["Home", "About"]
+    
+    def test_get_attributes(self, page_actions, mock_driver):
+        """get_attributes関数のテスト"""
+        mock_driver.execute_script.return_value = [
+            {"href": "/home", "title": "Home"},
+            {"href": "/about", "title": None},
+        ]
+        
+        # 属性名のリストを指定した場合は辞書のリスト
+        rows = page_actions.get_attributes((By.CSS_SELECTOR, "nav a"), ["href", "title"])
+        assert rows[1] == {"href": "/about", "title": None}
+        
+        # 属性名を1つ指定した場合は値のリスト
+        mock_driver.execute_script.return_value = [{"href": "/home"}, {"href": "/about"}]
+        hrefs = page_actions.get_attributes((By.CSS_SELECTOR, "nav a"), "href")
+        assert hrefs == ["/home", "/about"]
+    
+    def test_get_properties_fallback(self, page_actions, mock_driver):
+        """get_properties関数（JavaScriptを使わない設定）のテスト"""
+        page_actions.use_javascript = False
+        element = MagicMock()
+        element.get_property.return_value = True
+        
+        # find_allメソッドをパッチ
+        with patch.object(page_actions, 'find_all', return_value=[element]):
+            # テスト対象の関数を呼び出す
+            values = page_actions.get_properties((By.ID, "agree"), "checked")
+            
+            # アサーション
+            assert values == [True]
+            mock_driver.execute_script.assert_not_called()
+            element.get_property.assert_called_once_with("checked")
+    
+    def test_is_element_present_disables_implicit_wait(self, page_actions, mock_driver):
+        """is_element_present関数が暗黙的な待機を一時的に0にすることのテスト"""
+        mock_driver.timeouts.implicit_wait = 10
+        mock_driver.find_element.side_effect = NoSuchElementException("Element not found")
+        
+        # テスト対象の関数を呼び出す
+        result = page_actions.is_element_present((By.ID, "test-id"))
+        
+        # アサーション
+        assert result is False
+        assert mock_driver.implicitly_wait.call_args_list == [call(0), call(10.0)]
+    
+    def test_is_element_present_skips_zero_implicit_wait(self, page_actions, mock_driver):
+        """暗黙的な待機が0の場合は待機時間を変更しないことのテスト"""
+        mock_driver.timeouts.implicit_wait = 0
+        
+        # テスト対象の関数を呼び出す
+        page_actions.is_element_present((By.ID, "test-id"))
+        
+        # アサーション
+        mock_driver.implicitly_wait.assert_not_called()
+    
+    def test_is_element_absent(self, page_actions, mock_driver):
+        """is_element_absent関数のテスト"""
+        mock_driver.timeouts.implicit_wait = 10
+        mock_driver.find_elements.return_value = []
+        assert page_actions.is_element_absent((By.ID, "test-id")) is True
+        
+        mock_driver.find_elements.return_value = [MagicMock()]
+        assert page_actions.is_element_absent((By.ID, "test-id")) is False
+        
+        # 暗黙的な待機は元に戻っている
+        assert mock_driver.implicitly_wait.call_args_list[-1] == call(10.0)
+    
+    def test_mixed_waits_warning(self, page_actions, mock_driver, monkeypatch):
+        """デバッグモードで暗黙的な待機と明示的な待機の併用を警告することのテスト"""
+        monkeypatch.setattr(settings, "DEBUG_MIXED_WAITS", True)
+        mock_driver.timeouts.implicit_wait = 10
+        
+        with patch('selenium.webdriver.support.ui.WebDriverWait.until', return_value=MagicMock()):
+            with pytest.warns(MixedWaitsWarning):
+                page_actions.find((By.ID, "test-id"))
+    
+    def test_wait_for_element_observer(self, page_actions, mock_driver):
+        """observerモードで非同期スクリプトが返した要素を返すことのテスト"""
+        mock_element = MagicMock()
+        mock_driver.execute_async_script.return_value = mock_element
+        
+        # テスト対象の関数を呼び出す
+        element = page_actions.wait_for_element((By.ID, "test-id"), condition="visibility", mode="observer")
+        
+        # アサーション
+        assert element == mock_element
+        script, by, value = mock_driver.execute_async_script.call_args[0][:3]
+        assert "MutationObserver" in script
+        assert (by, value) == (By.ID, "test-id")
+    
+    def test_wait_for_element_observer_fallback(self, page_actions, mock_driver, monkeypatch):
+        """非同期スクリプトが使えない場合に同期スクリプトのポーリングに切り替わることのテスト"""
+        monkeypatch.setattr(settings, "ADAPTIVE_POLL_MIN", 0.001)
+        mock_element = MagicMock()
+        mock_driver.execute_async_script.side_effect = JavascriptException("async not supported")
+        mock_driver.execute_script.side_effect = [None, None, mock_element]
+        
+        # テスト対象の関数を呼び出す
+        element = page_actions.wait_for_element((By.ID, "test-id"), timeout=5, mode="observer")
+        
+        # アサーション
+        assert element == mock_element
+        assert mock_driver.execute_script.call_count == 3
+    
+    def test_wait_until_adaptive_backoff(self, page_actions, monkeypatch):
+        """adaptiveモードでポーリング間隔が広がることのテスト"""
+        monkeypatch.setattr(settings, "ADAPTIVE_POLL_MIN", 0.05)
+        monkeypatch.setattr(settings, "ADAPTIVE_POLL_MAX", 0.2)
+        condition = MagicMock(side_effect=[False, False, False, False, "done"])
+        
+        with patch("time.sleep") as mock_sleep:
+            result = page_actions.wait_until(condition, timeout=10, mode="adaptive")
+        
+        # アサーション
+        assert result == "done"
+        assert [c.args[0] for c in mock_sleep.call_args_list] == [0.05, 0.1, 0.2, 0.2]
+    
+    def test_wait_until_adaptive_timeout(self, page_actions):
+        """adaptiveモードで条件が成立しない場合にTimeoutExceptionとなることのテスト"""
+        with pytest.raises(TimeoutException):
+            page_actions.wait_until(lambda d: False, timeout=0, mode="adaptive")
+    
+    def test_timeout_records_locator(self, page_actions):
+        """タイムアウトの例外に待機していたロケーターが記録されることのテスト"""
+        with patch('selenium.webdriver.support.ui.WebDriverWait.until', side_effect=TimeoutException("timeout")):
+            with pytest.raises(TimeoutException) as excinfo:
+                page_actions.find((By.ID, "slow"), timeout=1)
+        
+        # アサーション
+        assert excinfo.value.locator == (By.ID, "slow")
+    
+    def test_wait_for_element_unsupported_mode(self, page_actions):
+        """サポートされていない待機モードのテスト"""
+        with pytest.raises(ValueError):
+            page_actions.wait_for_element((By.ID, "test-id"), mode="unknown")
+    
+    def test_wait_for_element_with_condition(self, page_actions, mock_driver):
+        """Conditionが1回のポーリングにつき1回のスクリプト実行で評価されることのテスト"""
+        mock_element = MagicMock()
+        mock_driver.execute_script.side_effect = [None, mock_element]
+        
+        # テスト対象の関数を呼び出す
+        with patch("time.sleep"):
+            element = page_actions.wait_for_element(
+                (By.ID, "submit"), timeout=5, condition=visible & text_contains("OK"), mode="poll"
+            )
+        
+        # アサーション
+        assert element == mock_element
+        assert mock_driver.execute_script.call_count == 2
+        script, by, value, params = mock_driver.execute_script.call_args[0]
+        assert "getComputedStyle" in script
+        assert (by, value, params) == (By.ID, "submit", ["OK"])
+        mock_driver.find_element.assert_not_called()
+    
+    def test_click_with_condition(self, page_actions, mock_driver):
+        """待機で見つかった要素が探し直されずにクリックされることのテスト"""
+        mock_element = MagicMock()
+        mock_driver.execute_script.return_value = mock_element
+        
+        # テスト対象の関数を呼び出す
+        page_actions.click((By.ID, "submit"), condition=visible & enabled)
+        
+        # アサーション
+        mock_element.click.assert_called_once()
+        assert mock_driver.execute_script.call_count == 1
+        mock_driver.find_element.assert_not_called()
+    
+    def test_wait_for_condition_observer_without_javascript(self, page_actions, mock_driver):
+        """JavaScriptが使えない場合にConditionの待機がエラーとなることのテスト"""
+        mock_driver.execute_async_script.side_effect = JavascriptException("async not supported")
+        mock_driver.execute_script.side_effect = JavascriptException("not supported")
+        
+        with pytest.raises(JavascriptException):
+            page_actions.wait_for_element((By.ID, "submit"), timeout=5, condition=visible, mode="observer")
+    
+    def test_fill_form_fast(self, page_actions, mock_driver):
+        """fastモードで1回のスクリプト実行で全フィールドに入力することのテスト"""
+        mock_driver.execute_script.return_value = True
+        
+        # テスト対象の関数を呼び出す
+        page_actions.fill_form({(By.ID, "name"): "Taro", (By.ID, "terms"): True}, mode="fast")
+        
+        # アサーション
+        assert mock_driver.execute_script.call_count == 1
+        script, payload = mock_driver.execute_script.call_args[0]
+        assert "dispatchEvent" in script
+        assert payload == [[By.ID, "name", "Taro"], [By.ID, "terms", True]]
+    
+    def test_fill_form_fidelity(self, page_actions, mock_driver):
+        """fidelityモードで検索をまとめ、実際の操作で入力することのテスト"""
+        text_field, checkbox, unchanged, select = MagicMock(), MagicMock(), MagicMock(), MagicMock()
+        mock_driver.execute_script.return_value = [
+            [text_field, "input", "text", False],
+            [checkbox, "input", "checkbox", False],
+            [unchanged, "input", "checkbox", True],
+            [select, "select", "select-one", False],
+        ]
+        
+        # テスト対象の関数を呼び出す
+        with patch.object(PageActions, "_select_by_value") as mock_select:
+            page_actions.fill_form({
+                (By.ID, "name"): "Taro",
+                (By.ID, "terms"): True,
+                (By.ID, "newsletter"): True,
+                (By.ID, "country"): "jp",
+            }, mode="fidelity")
+        
+        # アサーション
+        assert mock_driver.execute_script.call_count == 1
+        text_field.clear.assert_called_once()
+        text_field.send_keys.assert_called_once_with("Taro")
+        checkbox.click.assert_called_once()
+        unchanged.click.assert_not_called()
+        mock_select.assert_called_once_with(select, "jp")
+        mock_driver.find_element.assert_not_called()
+    
+    def test_fill_form_fast_fallback(self, page_actions, mock_driver):
+        """スクリプトが使えない場合に要素ごとの入力に切り替わることのテスト"""
+        mock_element = MagicMock()
+        mock_element.tag_name = "input"
+        mock_element.get_attribute.return_value = "text"
+        mock_driver.execute_script.side_effect = JavascriptException("not supported")
+        
+        # テスト対象の関数を呼び出す
+        with patch.object(page_actions, "find", return_value=mock_element):
+            page_actions.fill_form({(By.ID, "name"): "Taro"}, mode="fast")
+        
+        # アサーション
+        mock_element.send_keys.assert_called_once_with("Taro")
+    
+    def test_fill_form_fast_invalid_option(self, page_actions, mock_driver):
+        """fastモードでオプションが見つからない場合に、実際の操作に切り替えずに例外を送出することのテスト"""
+        mock_driver.execute_script.side_effect = JavascriptException(
+            "javascript error: Cannot locate option with value: xx"
+        )
+        
+        # テスト対象の関数を呼び出す
+        with patch.object(page_actions, "find") as mock_find:
+            with pytest.raises(NoSuchElementException, match="Cannot locate option with value: xx"):
+                page_actions.fill_form({(By.ID, "name"): "Taro", (By.ID, "country"): "xx"}, mode="fast")
+        
+        # アサーション
+        assert mock_driver.execute_script.call_count == 1
+        mock_find.assert_not_called()
+    
+    def test_wait_for_page_load_interactive(self, page_actions, mock_driver):
+        """interactiveを指定した場合にDOMの構築完了で待機を終えることのテスト"""
+        mock_driver.execute_script.return_value = "interactive"
+        
+        # テスト対象の関数を呼び出す
+        page_actions.wait_for_page_load(timeout=1, state="interactive")
+        
+        # アサーション
+        mock_driver.execute_script.assert_called_once_with("return document.readyState")
+        with pytest.raises(ValueError):
+            page_actions.wait_for_page_load(state="loaded")
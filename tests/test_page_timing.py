@@ -0,0 +1,149 @@
+"""
+ページ性能の計測のユニットテスト
+"""
+
+import json
+from unittest.mock import MagicMock
+
+import pytest
+
+from selenium_web_testing.src import base_page, browser_scripts, page_timing
+from selenium_web_testing.src.base_page import BasePage
+from selenium_web_testing.src.page_timing import (
+    PageTimingRecorder, PerformanceBudgetExceeded, PerformanceBudgetWarning, settings,
+)
+
+TEST_ID = "tests/test_search.py::TestSearch::test_search"
+
+
+class BudgetedPage(BasePage):
+    """ページ性能の予算を宣言したページ"""
+    
+    PERFORMANCE_BUDGETS = {"ttfb": 300, "dom_content_loaded": 1500, "load": 3000}
+
+
+def timing_data(ttfb, dom_content_loaded, load=None):
+    """browser_scripts.PAGE_TIMING の戻り値を作成する"""
+    return {
+        "navigation": {"url": "http://app.test/search", "type": "navigate", "ttfb": ttfb,
+                       "dom_content_loaded": dom_content_loaded, "load": load, "transfer_size": 2048},
+        "paint": {"first-contentful-paint": 180.5},
+        "resource_count": 12,
+        "resource_bytes": 40960,
+        "resources": [{"name": "http://app.test/app.js", "type": "script", "start": 20.0,
+                       "duration": 150.0, "transfer_size": 30000}],
+    }
+
+
+@pytest.fixture
+def recorder(monkeypatch, tmp_path):
+    """テストごとのJSONLに記録するレコーダー"""
+    recorder = PageTimingRecorder(str(tmp_path / "page_timing.jsonl"))
+    monkeypatch.setattr(page_timing, "get_page_timing_recorder", lambda: recorder)
+    monkeypatch.setattr(page_timing, "get_current_test", lambda: TEST_ID)
+    monkeypatch.setattr(base_page, "measure_page", page_timing.measure_page)
+    yield recorder
+    recorder.close()
+
+
+@pytest.fixture
+def mock_driver():
+    """モックドライバを作成するフィクスチャ"""
+    driver = MagicMock()
+    driver.caps = {"pageLoadStrategy": "normal"}
+    return driver
+
+
+class TestPageTiming:
+    """ページ性能の計測と予算のテスト"""
+    
+    def test_navigation_is_measured_in_one_script(self, recorder, mock_driver, monkeypatch):
+        """計測が有効な場合にページ遷移ごとに1回のスクリプト実行で計測し、JSONLに記録することのテスト"""
+        monkeypatch.setattr(settings, "PAGE_TIMING_ENABLED", True)
+        mock_driver.execute_script.return_value = timing_data(120.4, 800.0, 950.0)
+        
+        # 実行
+        page = BasePage(mock_driver, "http://app.test").open("search").refresh()
+        recorder.close()
+        
+        # アサーション
+        mock_driver.execute_script.assert_called_with(browser_scripts.PAGE_TIMING, settings.PAGE_TIMING_MAX_RESOURCES)
+        assert mock_driver.execute_script.call_count == 2
+        assert page.last_timing.metrics["first_contentful_paint"] == 180.5
+        with open(recorder.path, encoding="utf-8") as f:
+            records = [json.loads(line) for line in f]
+        assert [(r["page"], r["test"], r["action"]) for r in records] == [
+            ("BasePage", TEST_ID, "open"), ("BasePage", TEST_ID, "refresh"),
+        ]
+        assert records[0]["metrics"]["ttfb"] == 120.4
+        assert records[0]["resources"][0]["type"] == "script"
+    
+    def test_not_measured_by_default(self, recorder, mock_driver):
+        """計測が無効で予算もない場合はスクリプトを実行しないことのテスト"""
+        BasePage(mock_driver, "http://app.test").open("search")
+        
+        # アサーション
+        mock_driver.execute_script.assert_not_called()
+        assert recorder.pages == {}
+    
+    def test_budget_exceeded_fails(self, recorder, mock_driver):
+        """予算を超えた場合に指標を示して失敗し、計測結果は記録されることのテスト"""
+        mock_driver.execute_script.return_value = timing_data(420.0, 1200.0)
+        
+        with pytest.raises(PerformanceBudgetExceeded) as excinfo:
+            BudgetedPage(mock_driver, "http://app.test").open("search")
+        
+        # アサーション
+        assert "ttfb: 420 > 300" in str(excinfo.value)
+        # まだ発生していない load は確認しない
+        assert excinfo.value.timing.violations == ["ttfb: 420 > 300"]
+        assert recorder.to_dict()["BudgetedPage"]["violations"] == 1
+    
+    def test_budget_exceeded_warns(self, recorder, mock_driver, monkeypatch):
+        """予算超過時の動作が warn の場合に警告だけを出すことのテスト"""
+        monkeypatch.setattr(BudgetedPage, "PERFORMANCE_BUDGET_ACTION", "warn")
+        mock_driver.execute_script.return_value = timing_data(100.0, 2000.0)
+        
+        with pytest.warns(PerformanceBudgetWarning, match="dom_content_loaded: 2000 > 1500"):
+            page = BudgetedPage(mock_driver, "http://app.test").open("search")
+        
+        # アサーション
+        assert page.last_timing.violations == ["dom_content_loaded: 2000 > 1500"]
+        with pytest.raises(ValueError):
+            page.last_timing.check_budgets({"tti": 100})
+    
+    def test_back_restored_from_bfcache_is_flagged(self, recorder, mock_driver):
+        """戻るでバックフォワードキャッシュから復元されたページは、最初の読み込みの指標で予算を確認しないことのテスト"""
+        restored = dict(timing_data(420.0, 1200.0), restored=True)
+        mock_driver.execute_script.side_effect = [timing_data(100.0, 500.0), restored]
+        
+        # 実行
+        page = BudgetedPage(mock_driver, "http://app.test").open("search").navigate_back()
+        recorder.close()
+        
+        # アサーション
+        assert page.last_timing.restored is True
+        assert page.last_timing.violations == []
+        assert set(page.last_timing.metrics.values()) == {None}
+        with open(recorder.path, encoding="utf-8") as f:
+            assert [json.loads(line)["restored"] for line in f] == [False, True]
+        assert recorder.to_dict()["BudgetedPage"]["counts"]["ttfb"] == 1
+    
+    def test_summary_merges_workers(self, tmp_path):
+        """ワーカーの集計を加えてページごとの平均を表示することのテスト"""
+        recorder = PageTimingRecorder(str(tmp_path / "page_timing.jsonl"))
+        other = PageTimingRecorder(str(tmp_path / "other.jsonl"))
+        recorder.record(page_timing.PageTiming("HomePage", "open", TEST_ID, timing_data(100.0, 500.0, 900.0)))
+        other.record(page_timing.PageTiming("HomePage", "open", TEST_ID, timing_data(300.0, 700.0)))
+        recorder.close()
+        other.close()
+        
+        # 実行
+        recorder.merge(other.to_dict())
+        lines = recorder.summary_lines()
+        
+        # アサーション
+        assert lines[0].split() == ["page", "count", "ttfb", "dom_content_loaded", "load",
+                                    "first_contentful_paint", "over", "budget"]
+        assert lines[1].split() == ["HomePage", "2", "200ms", "600ms", "900ms", "180ms", "0"]
+        assert PageTimingRecorder().summary_lines() == []
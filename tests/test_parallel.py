@@ -0,0 +1,71 @@
+"""
+並列実行ユーティリティのユニットテスト
+"""
+
+import os
+from unittest.mock import MagicMock, patch
+
+from selenium_web_testing.src import artifacts, parallel
+
+
+class TestArtifacts:
+    """成果物パス生成のテスト"""
+    
+    def test_paths_are_isolated_per_worker(self, tmp_path, monkeypatch):
+        """ワーカーごとに別のディレクトリが使われることのテスト"""
+        monkeypatch.setenv(artifacts.RUN_ID_ENV, "run1")
+        monkeypatch.setenv(artifacts.WORKER_ID_ENV, "gw3")
+        
+        path = artifacts.unique_artifact_path(str(tmp_path), "test_login", "png")
+        
+        # アサーション
+        assert os.path.dirname(path) == os.path.join(str(tmp_path), "run1", "gw3")
+        assert os.path.isdir(os.path.dirname(path))
+    
+    def test_paths_do_not_collide(self, tmp_path, monkeypatch):
+        """同じ名前で連続して生成してもパスが衝突しないことのテスト"""
+        monkeypatch.setenv(artifacts.RUN_ID_ENV, "run1")
+        
+        paths = {artifacts.unique_artifact_path(str(tmp_path), "test_login", "png") for _ in range(100)}
+        
+        # アサーション
+        assert len(paths) == 100
+
+
+class TestRecommendedWorkerCount:
+    """ワーカー数の決定のテスト"""
+    
+    def test_limited_by_memory(self):
+        """メモリ量でワーカー数が制限されることのテスト"""
+        with patch.object(parallel, "available_cpu_count", return_value=32), \
+                patch.object(parallel, "available_memory_mb", return_value=4000):
+            assert parallel.recommended_worker_count(memory_per_worker_mb=500, max_workers=None) == 8
+    
+    def test_limited_by_cpu_and_max_workers(self):
+        """CPU数と上限でワーカー数が制限されることのテスト"""
+        with patch.object(parallel, "available_cpu_count", return_value=4), \
+                patch.object(parallel, "available_memory_mb", return_value=None):
+            assert parallel.recommended_worker_count(memory_per_worker_mb=500, max_workers=None) == 4
+            assert parallel.recommended_worker_count(memory_per_worker_mb=500, max_workers=2) == 2
+    
+    def test_at_least_one_worker(self):
+        """メモリが少なくても1ワーカーは確保されることのテスト"""
+        with patch.object(parallel, "available_cpu_count", return_value=4), \
+                patch.object(parallel, "available_memory_mb", return_value=100):
+            assert parallel.recommended_worker_count(memory_per_worker_mb=500, max_workers=None) == 1
+
+
+def test_worker_stats_utilization():
+    """ワーカーの稼働率の集計のテスト"""
+    stats = parallel.WorkerStats("gw0")
+    stats.add_report(MagicMock(when="setup", duration=1.0))
+    stats.add_report(MagicMock(when="call", duration=2.0))
+    row = stats.to_dict()
+    row["wall_seconds"] = 4.0
+    
+    lines = parallel.format_utilization([row])
+    
+    # アサーション
+    assert row["tests"] == 1
+    assert row["busy_seconds"] == 3.0
+    assert lines[1].split()[-1] == "75%"
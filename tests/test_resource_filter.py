@@ -0,0 +1,178 @@
+"""
+リソースのフィルタリングのユニットテスト
+"""
+
+import json
+import threading
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import MagicMock
+
+import pytest
+
+from selenium_web_testing.src.resource_filter import (
+    BlockedResourceStats, FilteringProxy, ResourceFilter, collect_blocked_requests, install_cdp_filter,
+    uses_cdp_filter,
+)
+
+
+@pytest.fixture
+def upstream():
+    """プロキシの転送先となるHTTPサーバーを起動するフィクスチャ"""
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, format, *args):
+            pass
+        
+        def do_HEAD(self):
+            self.send_response(200)
+            self.send_header("Content-Length", str(len(f"page {self.path}")))
+            self.end_headers()
+        
+        def do_GET(self):
+            self.do_HEAD()
+            self.wfile.write(f"page {self.path}".encode())
+    
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+class TestResourceFilter:
+    """ResourceFilterクラスのテスト"""
+    
+    def test_matches_by_type_and_pattern(self):
+        """リソースの種類とURLパターンで判定されることのテスト"""
+        resource_filter = ResourceFilter(["image", "font"], ["*google-analytics.com*"])
+        
+        # アサーション
+        assert resource_filter.matches("https://cdn.example.com/hero.JPG?w=2000")
+        assert resource_filter.matches("https://example.com/fonts/main.woff2")
+        assert resource_filter.matches("https://www.google-analytics.com/analytics.js")
+        assert not resource_filter.matches("https://example.com/app.js")
+        assert not resource_filter.matches("https://example.com/login")
+    
+    def test_blocked_url_patterns(self):
+        """CDPに渡すパターンに拡張子のパターンが含まれることのテスト"""
+        patterns = ResourceFilter(["font"], ["*ads*"]).blocked_url_patterns()
+        
+        # アサーション
+        assert patterns[0] == "*ads*"
+        assert "*.woff2" in patterns
+        assert "*.woff2?*" in patterns
+    
+    def test_unknown_resource_type(self):
+        """サポートされていないリソースの種類のテスト"""
+        with pytest.raises(ValueError):
+            ResourceFilter(["xhr"])
+    
+    def test_from_settings(self, monkeypatch):
+        """プロファイルと追加のURLパターンからフィルタが作られることのテスト"""
+        from selenium_web_testing.src.resource_filter import settings
+        monkeypatch.setattr(settings, "BLOCKED_URL_PATTERNS", ["*tracker*"])
+        
+        resource_filter = ResourceFilter.from_settings("no-media")
+        
+        # アサーション
+        assert resource_filter.resource_types == ("image", "media")
+        assert resource_filter.url_patterns == ("*tracker*",)
+        assert ResourceFilter.from_settings(None) is None
+        with pytest.raises(ValueError):
+            ResourceFilter.from_settings("unknown")
+
+
+class TestCdpFilter:
+    """CDPによるブロックのテスト"""
+    
+    def test_install_cdp_filter(self):
+        """Network.setBlockedURLsが呼ばれることのテスト"""
+        driver = MagicMock()
+        
+        install_cdp_filter(driver, ResourceFilter(["image"]))
+        
+        # アサーション
+        method, params = driver.execute_cdp_cmd.call_args[0]
+        assert method == "Network.setBlockedURLs"
+        assert "*.png" in params["urls"]
+    
+    def test_collect_blocked_requests(self):
+        """パフォーマンスログからブロックされたURLだけが取り出されることのテスト"""
+        def entry(method, **params):
+            return {"message": json.dumps({"message": {"method": method, "params": params}})}
+        
+        driver = MagicMock()
+        driver.get_log.return_value = [
+            entry("Network.requestWillBeSent", requestId="1", request={"url": "https://example.com/a.png"}),
+            entry("Network.requestWillBeSent", requestId="2", request={"url": "https://example.com/api"}),
+            entry("Network.loadingFailed", requestId="1", blockedReason="inspector"),
+            entry("Network.loadingFailed", requestId="2", errorText="net::ERR_ABORTED"),
+        ]
+        
+        # アサーション
+        assert collect_blocked_requests(driver) == ["https://example.com/a.png"]
+        driver.get_log.assert_called_once_with("performance")
+    
+    def test_uses_cdp_filter_by_started_browser(self):
+        """起動したブラウザのケイパビリティでCDPを使用するか判定することのテスト"""
+        def driver(browser_name):
+            return MagicMock(capabilities={"browserName": browser_name})
+        
+        # アサーション
+        assert uses_cdp_filter(driver("chrome"))
+        assert uses_cdp_filter(driver("msedge"))
+        assert not uses_cdp_filter(driver("firefox"))
+
+
+class TestFilteringProxy:
+    """FilteringProxyクラスのテスト"""
+    
+    def test_blocks_and_forwards(self, upstream):
+        """ブロック対象には空の応答を返し、それ以外は転送することのテスト"""
+        stats = BlockedResourceStats(measure_bytes=False)
+        with FilteringProxy(ResourceFilter(["image"]), stats) as proxy:
+            opener = urllib.request.build_opener(
+                urllib.request.ProxyHandler({"http": f"http://{proxy.address}"})
+            )
+            with opener.open(f"{upstream}/login") as response:
+                page = response.read()
+            with opener.open(f"{upstream}/hero.png") as response:
+                image = response.read()
+                status = response.status
+        
+        # アサーション
+        assert page == b"page /login"
+        assert status == 204
+        assert image == b""
+        assert stats.take() == (1, 0)
+        assert stats.take() == (0, 0)
+        assert stats.hosts["127.0.0.1"] == 1
+
+
+class TestBlockedResourceStats:
+    """BlockedResourceStatsクラスのテスト"""
+    
+    def test_measure_bytes(self, upstream):
+        """HEADリクエストでブロックしたリソースのサイズが見積もられることのテスト"""
+        stats = BlockedResourceStats(measure_bytes=True)
+        
+        stats.record(f"{upstream}/hero.png")
+        stats.record(f"{upstream}/hero.png")
+        
+        # アサーション（見積もりの完了を待ってからテストごとの値を返す）
+        size = len(b"page /hero.png")
+        assert stats.take() == (2, size * 2)
+        stats.record(f"{upstream}/hero.png")
+        assert stats.take() == (1, size)
+        assert "ブロックしたリクエスト: 3件" in stats.summary()
+    
+    def test_merge(self):
+        """ワーカーの集計結果が合算されることのテスト"""
+        stats = BlockedResourceStats(measure_bytes=False)
+        stats.record("https://cdn.example.com/a.png")
+        
+        stats.merge({"requests": 3, "bytes": 100, "hosts": {"cdn.example.com": 3}})
+        
+        # アサーション
+        assert stats.to_dict() == {"requests": 4, "bytes": 100, "hosts": {"cdn.example.com": 4}}
@@ -0,0 +1,93 @@
+"""
+再実行と不安定なテストの集計のユニットテスト
+"""
+
+from unittest.mock import MagicMock
+
+import pytest
+from selenium.common.exceptions import StaleElementReferenceException, TimeoutException
+
+from selenium_web_testing.src.retry import FlakinessStats, get_retry_count, is_retryable, rerun
+
+
+def timeout(locator=None):
+    """ロケーターを記録したTimeoutExceptionを作成する"""
+    error = TimeoutException("timeout")
+    error.locator = locator
+    return error
+
+
+class TestRetry:
+    """再実行のテスト"""
+    
+    def test_is_retryable(self):
+        """例外のクラス名で再実行の対象を判定することのテスト"""
+        assert is_retryable(TimeoutException())
+        assert is_retryable(StaleElementReferenceException())
+        assert not is_retryable(AssertionError())
+        assert is_retryable(AssertionError(), ["AssertionError"])
+    
+    def test_get_retry_count(self):
+        """retry マーカーの位置引数・キーワード引数・引数なしの形式から回数を読み取ることのテスト"""
+        assert get_retry_count(pytest.mark.retry(3).mark, 0) == 3
+        assert get_retry_count(pytest.mark.retry(n=2).mark, 0) == 2
+        assert get_retry_count(pytest.mark.retry.mark, 0) == 1
+        assert get_retry_count(None, 4) == 4
+        for invalid in (pytest.mark.retry(-1).mark, pytest.mark.retry("2").mark, pytest.mark.retry(n=True).mark):
+            with pytest.raises(ValueError):
+                get_retry_count(invalid, 0)
+    
+    def test_rerun_until_passed(self):
+        """成功するまで状態をリセットして再実行することのテスト"""
+        run = MagicMock(side_effect=[timeout(), None])
+        reset = MagicMock()
+        
+        # 実行
+        passed, errors = rerun(run, retries=3, reset=reset)
+        
+        # アサーション
+        assert passed is True
+        assert len(errors) == 1
+        assert run.call_count == 2
+        assert reset.call_count == 2
+    
+    def test_rerun_stops_on_other_errors(self):
+        """再実行の対象ではない例外で失敗した場合に再実行をやめることのテスト"""
+        run = MagicMock(side_effect=[AssertionError(), None])
+        
+        # 実行
+        passed, errors = rerun(run, retries=3)
+        
+        # アサーション
+        assert passed is False
+        assert run.call_count == 1
+    
+    def test_rerun_outcome_exceptions(self):
+        """pytest.fail は失敗として記録し、スキップと xfail はそのまま送出することのテスト"""
+        passed, errors = rerun(MagicMock(side_effect=pytest.fail.Exception("failed")), retries=3)
+        
+        # アサーション
+        assert passed is False
+        assert isinstance(errors[0], pytest.fail.Exception)
+        for outcome in (pytest.skip.Exception("skipped"), pytest.xfail.Exception("xfailed")):
+            run = MagicMock(side_effect=[timeout(), outcome])
+            with pytest.raises(type(outcome)):
+                rerun(run, retries=3)
+            assert run.call_count == 2
+    
+    def test_stats_by_test_and_locator(self):
+        """テストごと・ロケーターごとに集計することのテスト"""
+        stats = FlakinessStats()
+        stats.record("t.py::test_a", [timeout(("id", "slow")), timeout(("id", "slow"))], passed=True)
+        other = FlakinessStats()
+        other.record("t.py::test_b", [timeout(), timeout(("css selector", ".x"))], passed=False)
+        
+        # 実行
+        stats.merge(other.to_dict())
+        
+        # アサーション
+        assert stats.tests["t.py::test_a"] == {"runs": 3, "failures": 2, "recovered": 1}
+        assert stats.locators == {"id=slow": 2, "css selector=.x": 1}
+        lines = stats.summary_lines()
+        assert lines[0] == "再実行したテスト: 2件（再実行で成功: 1件）"
+        assert "     2回  id=slow" in lines
@@ -0,0 +1,108 @@
+"""
+テストの実行順序の調整のユニットテスト
+"""
+
+from unittest.mock import MagicMock
+
+import pytest
+
+from selenium_web_testing.src.scheduling import (
+    check_requirements, count_transitions, format_schedule_summary, get_requirements, parse_window_size,
+    schedule_items,
+)
+
+DEFAULTS = {"browser": "chrome", "window_size": None, "origin": "https://app.test", "role": None}
+
+
+class FakeItem:
+    """requires マーカーを持つテストアイテムの代わり"""
+    
+    def __init__(self, nodeid, *markers):
+        """
+        Args:
+            nodeid: テストのnodeid
+            markers: requires マーカーの引数（テストから遠い順）
+        """
+        self.nodeid = nodeid
+        self.markers = [MagicMock(kwargs=kwargs) for kwargs in markers]
+    
+    def iter_markers(self, name):
+        """テストに近いマーカーから返す"""
+        return reversed(self.markers)
+
+
+class TestScheduling:
+    """実行順序の調整のテスト"""
+    
+    def test_nearest_marker_wins(self):
+        """テストに近いマーカーの指定を優先することのテスト"""
+        item = FakeItem("t.py::TestA::test_a", {"browser": "firefox", "role": "admin"}, {"role": "guest"})
+        
+        # アサーション
+        assert get_requirements(item, DEFAULTS) == {
+            "browser": "firefox", "window_size": None, "origin": "https://app.test", "role": "guest",
+        }
+        with pytest.raises(ValueError):
+            get_requirements(FakeItem("t.py::test_b", {"device": "phone"}), DEFAULTS)
+    
+    def test_parse_window_size(self):
+        """ウィンドウサイズの指定を変換することのテスト"""
+        assert parse_window_size("1280x720") == (1280, 720)
+        assert parse_window_size((375, 812)) == (375, 812)
+        assert parse_window_size(None) is None
+    
+    def test_classes_are_grouped_by_requirements(self):
+        """クラスを連続させたままモジュールの中で要件ごとにまとめることのテスト"""
+        items = [
+            FakeItem("a.py::TestChrome::test_1"),
+            FakeItem("a.py::TestFirefox::test_1", {"browser": "firefox"}),
+            FakeItem("a.py::TestFirefox::test_2", {"browser": "firefox"}),
+            FakeItem("a.py::TestSearch::test_1"),
+            FakeItem("b.py::TestAdmin::test_1", {"role": "admin"}, {"role": "guest"}),
+            FakeItem("b.py::TestAdmin::test_2", {"role": "admin"}),
+            FakeItem("b.py::test_mobile", {"browser": "firefox", "window_size": (375, 812)}),
+            FakeItem("b.py::TestChrome::test_1"),
+        ]
+        
+        # 実行
+        result = schedule_items(items, DEFAULTS)
+        
+        # アサーション（モジュールをまたいで並べ替えない）
+        assert [item.nodeid for item in items] == [
+            "a.py::TestChrome::test_1",
+            "a.py::TestSearch::test_1",
+            "a.py::TestFirefox::test_1",
+            "a.py::TestFirefox::test_2",
+            "b.py::TestChrome::test_1",
+            "b.py::TestAdmin::test_2",
+            "b.py::TestAdmin::test_1",
+            "b.py::test_mobile",
+        ]
+        assert result["before"] == {"restarts": 4, "resizes": 0, "resets": 3}
+        assert result["after"] == {"restarts": 3, "resizes": 0, "resets": 3}
+        assert "節約した再起動: 1回" in format_schedule_summary(result)
+    
+    def test_driver_requirements_on_methods_are_rejected(self):
+        """テストクラスのメソッドに driver フィクスチャの項目を指定するとエラーになることのテスト"""
+        def item(nodeid, cls, **kwargs):
+            marker = MagicMock(kwargs=kwargs)
+            marker.name = "requires"
+            return MagicMock(nodeid=nodeid, cls=cls, own_markers=[marker])
+        
+        with pytest.raises(ValueError, match="browser"):
+            check_requirements(item("a.py::TestA::test_a", object, browser="firefox"))
+        
+        # アサーション（クラスに属さないテストとログイン状態の指定は使用される）
+        check_requirements(item("a.py::test_b", None, browser="firefox"))
+        check_requirements(item("a.py::TestA::test_c", object, role="admin"))
+    
+    def test_count_transitions(self):
+        """オリジンやログイン状態の切り替えを数えることのテスト"""
+        requirements = [
+            dict(DEFAULTS),
+            dict(DEFAULTS, role="admin"),
+            dict(DEFAULTS, role="admin", origin="https://admin.app.test"),
+        ]
+        
+        # アサーション
+        assert count_transitions(requirements) == {"restarts": 0, "resizes": 0, "resets": 2}
@@ -0,0 +1,165 @@
+"""
+ScreenshotStoreクラスのユニットテスト
+"""
+
+import base64
+import hashlib
+import io
+import json
+import os
+
+import pytest
+from PIL import Image
+
+from selenium_web_testing.src import artifacts, screenshot_store
+from selenium_web_testing.src.artifact_writer import ArtifactWriter
+from selenium_web_testing.src.screenshot_store import ScreenshotStore, hamming_distance
+
+
+def encode(data: bytes) -> str:
+    """get_screenshot_as_base64 と同じ形式に変換する"""
+    return base64.b64encode(data).decode("ascii")
+
+
+def read_manifest(root):
+    """マニフェストの記録を読み込む"""
+    with open(os.path.join(str(root), "run1", "main", "manifest.jsonl"), encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+
+@pytest.fixture(autouse=True)
+def run_id(monkeypatch):
+    """実行IDとワーカーIDを固定するフィクスチャ"""
+    monkeypatch.setenv(artifacts.RUN_ID_ENV, "run1")
+    monkeypatch.delenv(artifacts.WORKER_ID_ENV, raising=False)
+
+
+class TestScreenshotStore:
+    """ScreenshotStoreクラスのテスト"""
+    
+    def test_identical_images_are_stored_once(self, tmp_path):
+        """同じ内容の画像が1つだけ保存され、参照がマニフェストに記録されることのテスト"""
+        store = ScreenshotStore(str(tmp_path), max_mb=None)
+        
+        # テスト対象の関数を呼び出す
+        first = store.put(encode(b"same-png"), "test_a")
+        second = store.put(encode(b"same-png"), "test_b")
+        
+        # アサーション
+        assert first == second
+        with open(first, "rb") as f:
+            assert f.read() == b"same-png"
+        assert (store.stored, store.duplicates) == (1, 1)
+        assert [record["name"] for record in read_manifest(tmp_path)] == ["test_a", "test_b"]
+        assert len({record["hash"] for record in read_manifest(tmp_path)}) == 1
+    
+    def test_writes_through_artifact_writer(self, tmp_path):
+        """ライターを指定した場合にバックグラウンドで書き込まれることのテスト"""
+        store = ScreenshotStore(str(tmp_path), max_mb=None)
+        writer = ArtifactWriter()
+        
+        path = store.put(encode(b"png"), "test_a", transform=lambda data: data.upper(), writer=writer)
+        writer.close()
+        
+        # アサーション
+        with open(path, "rb") as f:
+            assert f.read() == b"PNG"
+        assert writer.written == 1
+        # ハッシュは変換後の書き込んだ内容で計算する
+        assert path == store.object_path(hashlib.sha256(b"PNG").hexdigest()[:32])
+    
+    def test_least_recently_used_images_are_evicted(self, tmp_path):
+        """合計サイズが上限を超えた場合に、使われていない期間が長い画像から削除されることのテスト"""
+        store = ScreenshotStore(str(tmp_path), max_mb=25 / (1024 * 1024))
+        a = store.put(encode(b"a" * 10), "a")
+        b = store.put(encode(b"b" * 10), "b")
+        store.put(encode(b"a" * 10), "a again")
+        
+        # テスト対象の関数を呼び出す
+        c = store.put(encode(b"c" * 10), "c")
+        
+        # アサーション
+        assert os.path.exists(a) and os.path.exists(c)
+        assert not os.path.exists(b)
+        assert store.evicted == 1
+        # 別のプロセスの保存先も保存済みの画像を引き継ぐ
+        assert ScreenshotStore(str(tmp_path)).put(encode(b"a" * 10), "a") == a
+    
+    def test_evicts_images_of_other_workers(self, tmp_path):
+        """並列実行の他のワーカーが保存した画像も含めた合計サイズで削除されることのテスト"""
+        max_mb = 25 / (1024 * 1024)
+        worker1 = ScreenshotStore(str(tmp_path), max_mb=max_mb)
+        worker2 = ScreenshotStore(str(tmp_path), max_mb=max_mb)
+        a = worker1.put(encode(b"a" * 10), "a")
+        b = worker2.put(encode(b"b" * 10), "b")
+        
+        # テスト対象の関数を呼び出す
+        c = worker1.put(encode(b"c" * 16), "c")
+        
+        # アサーション
+        # 自身の合計（26）が上限を超えた時に読み直し、他のワーカーの画像を含めた合計（36）で削除する
+        assert not os.path.exists(a) and not os.path.exists(b)
+        assert os.path.exists(c)
+        assert worker1.evicted == 2
+    
+    def test_walks_objects_only_over_the_limit(self, tmp_path, monkeypatch):
+        """合計サイズが上限を超えるまで保存先を読み直さないことのテスト"""
+        walks = []
+        walk = os.walk
+        monkeypatch.setattr(screenshot_store.os, "walk", lambda top: walks.append(top) or walk(top))
+        store = ScreenshotStore(str(tmp_path), max_mb=25 / (1024 * 1024))
+        
+        # テスト対象の関数を呼び出す
+        store.put(encode(b"a" * 10), "a")
+        store.put(encode(b"b" * 10), "b")
+        walked = len(walks)
+        store.put(encode(b"c" * 10), "c")
+        
+        # アサーション
+        assert walked == 0
+        assert len(walks) == 1
+        assert store.evicted == 1
+    
+    def test_near_duplicates_refer_to_first_image(self, tmp_path, monkeypatch):
+        """見た目がほぼ同じ画像は保存せず、最初の画像のパスを返すことのテスト"""
+        monkeypatch.setattr(screenshot_store, "dhash", lambda data: 0b1111 if data == b"first" else 0b1110)
+        store = ScreenshotStore(str(tmp_path), max_mb=None, perceptual=True, threshold=1)
+        
+        # テスト対象の関数を呼び出す
+        first = store.put(encode(b"first"), "a")
+        second = store.put(encode(b"second"), "b")
+        
+        # アサーション
+        assert second == first
+        with open(first, "rb") as f:
+            assert f.read() == b"first"
+        manifest = read_manifest(tmp_path)
+        # ハッシュに対応するパスには別の画像の内容を保存しない
+        assert not os.path.exists(store.object_path(manifest[1]["hash"]))
+        assert manifest[1]["group"] == manifest[0]["hash"]
+        assert manifest[1]["path"] == first
+        assert (store.stored, store.near_duplicates) == (1, 1)
+    
+    def test_near_duplicates_with_pillow(self, tmp_path):
+        """Pillowの差分ハッシュで見た目がほぼ同じ画像を判定することのテスト"""
+        def png(pixel):
+            image = Image.new("RGB", (64, 64), "white")
+            image.paste((0, 0, 0), (0, 0, 32, 64))
+            image.putpixel((60, 60), pixel)
+            output = io.BytesIO()
+            image.save(output, format="PNG")
+            return output.getvalue()
+        
+        store = ScreenshotStore(str(tmp_path), max_mb=None, perceptual=True)
+        first = store.put(encode(png((255, 255, 255))), "a")
+        second = store.put(encode(png((250, 250, 250))), "b")
+        
+        # アサーション
+        assert second == first
+        assert store.near_duplicates == 1
+        assert read_manifest(tmp_path)[1]["group"] == read_manifest(tmp_path)[0]["hash"]
+    
+    def test_hamming_distance(self):
+        """異なるビット数のテスト"""
+        assert hamming_distance(0b1011, 0b0001) == 2
+        assert hamming_distance(5, 5) == 0
@@ -0,0 +1,133 @@
+"""
+セッション状態のキャッシュのユニットテスト
+"""
+
+import time
+from unittest.mock import MagicMock
+
+import pytest
+
+from selenium_web_testing.src import browser_scripts
+from selenium_web_testing.src.session_cache import SessionCache, SessionState, get_origin
+
+
+@pytest.fixture
+def driver():
+    """ログイン済みのページを開いているモックドライバ"""
+    driver = MagicMock()
+    driver.current_url = "https://app.test/dashboard"
+    driver.execute_script.return_value = ["https://app.test", {"token": "abc"}, {}]
+    driver.get_cookies.return_value = [
+        {"name": "sessionid", "value": "s1"},
+        {"name": "old", "value": "x", "expiry": 1},
+    ]
+    return driver
+
+
+class TestSessionCache:
+    """SessionCacheクラスのテスト"""
+    
+    def test_get_origin(self):
+        """URLからオリジンを取り出すことのテスト"""
+        assert get_origin("https://app.test:8443/login?next=/") == "https://app.test:8443"
+        assert get_origin("about:blank") is None
+    
+    def test_capture_and_restore(self, driver):
+        """保存した状態をオリジンのページを開いてから復元することのテスト"""
+        cache = SessionCache()
+        cache.capture(driver, "admin")
+        driver.reset_mock()
+        driver.current_url = "about:blank"
+        
+        # 実行
+        assert cache.restore(driver, "admin") is True
+        
+        # アサーション
+        driver.get.assert_called_once_with("https://app.test/favicon.ico")
+        # 期限切れのクッキーは設定しない
+        driver.add_cookie.assert_called_once_with({"name": "sessionid", "value": "s1"})
+        driver.execute_script.assert_called_once_with(browser_scripts.RESTORE_STORAGE, {"token": "abc"}, {})
+    
+    def test_expired_state_is_removed(self, driver):
+        """有効期間を過ぎた状態は復元しないことのテスト"""
+        cache = SessionCache(ttl=60)
+        cache.put("admin", SessionState("https://app.test", [], {}, {}, created_at=time.time() - 61))
+        
+        # アサーション
+        assert cache.restore(driver, "admin") is False
+        assert cache.expired == 1
+        assert cache.get("admin") is None
+    
+    def test_rejected_session_is_invalidated(self, driver):
+        """アプリケーションが復元した状態を受け付けない場合にログインし直すことのテスト"""
+        cache = SessionCache()
+        cache.capture(driver, "admin")
+        login = MagicMock()
+        
+        # 実行
+        restored = cache.ensure_session(driver, "admin", login=login, verify=MagicMock(side_effect=[False, True]))
+        
+        # アサーション
+        assert restored is False
+        assert cache.rejected == 1
+        driver.delete_all_cookies.assert_called_once()
+        login.assert_called_once()
+        # ログイン後の状態が保存し直される
+        assert cache.get("admin") is not None
+    
+    def test_ensure_session_logs_in_once(self, driver):
+        """2回目以降はUIでログインせずに復元することのテスト"""
+        cache = SessionCache()
+        login = MagicMock()
+        
+        # 実行
+        first = cache.ensure_session(driver, "user", login=login, verify=lambda: True)
+        second = cache.ensure_session(driver, "user", login=login, verify=lambda: True)
+        
+        # アサーション
+        assert (first, second) == (False, True)
+        login.assert_called_once()
+        assert cache.to_dict()["restores"] == 1
+        assert "UIでのログイン: 1回" in cache.summary()
+    
+    def test_state_is_captured_after_login_completes(self, driver):
+        """ログインの完了を確認してから状態を保存し、確認できない場合は保存しないことのテスト"""
+        cache = SessionCache()
+        # ログインボタンのクリック直後は、まだログイン後のページに遷移していない
+        verify = MagicMock(side_effect=[False, False, True])
+        
+        # 実行
+        cache.ensure_session(driver, "user", login=MagicMock(), verify=verify, timeout=5)
+        cache.ensure_session(driver, "guest", login=MagicMock(), verify=lambda: False, timeout=0.1)
+        
+        # アサーション
+        assert verify.call_count == 3
+        assert cache.get("user") is not None
+        assert cache.get("guest") is None
+        driver.get_cookies.assert_called_once()
+    
+    def test_disabled_cache_always_logs_in(self, driver):
+        """無効の場合は状態を保存しないことのテスト"""
+        cache = SessionCache(enabled=False)
+        login = MagicMock()
+        
+        cache.ensure_session(driver, "user", login=login, verify=lambda: True)
+        cache.ensure_session(driver, "user", login=login, verify=lambda: True)
+        
+        # アサーション
+        assert login.call_count == 2
+        driver.get_cookies.assert_not_called()
+    
+    def test_state_is_shared_through_directory(self, driver, tmp_path):
+        """ディレクトリに保存した状態を別のキャッシュから読み込めることのテスト"""
+        SessionCache(directory=str(tmp_path)).capture(driver, "admin")
+        other = SessionCache(directory=str(tmp_path))
+        
+        # アサーション
+        state = other.get("admin")
+        assert state.origin == "https://app.test"
+        assert state.local_storage == {"token": "abc"}
+        assert other.get("guest") is None
+        
+        other.invalidate("admin")
+        assert SessionCache(directory=str(tmp_path)).get("admin") is None
@@ -0,0 +1,109 @@
+"""
+ビジュアル比較のユニットテスト
+"""
+
+import io
+from unittest.mock import MagicMock
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from selenium_web_testing.src import artifacts, browser_scripts
+from selenium_web_testing.src.visual import VisualComparer, VisualDiff, settings
+
+
+@pytest.fixture
+def driver():
+    """要素のスクリーンショットを返すモックドライバ"""
+    driver = MagicMock()
+    driver.capabilities = {"browserName": "chrome"}
+    driver.find_element.return_value.screenshot_as_png = b"element-png"
+    driver.execute_script.return_value = [2, [[10.5, 4, 20, 10.2]]]
+    return driver
+
+
+def make_png(pixels):
+    """(高さ, 幅, 3) の配列からPNGを作成する"""
+    output = io.BytesIO()
+    Image.fromarray(np.asarray(pixels, dtype=np.uint8)).save(output, format="PNG")
+    return output.getvalue()
+
+
+class TestVisualComparer:
+    """VisualComparerクラスのテスト"""
+    
+    def test_missing_baseline_is_created(self, tmp_path):
+        """ベースラインがない場合は作成して一致とすることのテスト"""
+        comparer = VisualComparer(str(tmp_path))
+        
+        # 実行
+        result = comparer.compare("chrome/home", b"png")
+        
+        # アサーション
+        assert result.status == VisualDiff.CREATED
+        assert result.passed
+        assert (tmp_path / "chrome" / "home.png").read_bytes() == b"png"
+    
+    def test_identical_bytes_are_not_decoded(self, tmp_path):
+        """ベースラインとバイト列が同じ場合はデコードせずに一致とすることのテスト"""
+        comparer = VisualComparer(str(tmp_path))
+        comparer.compare("home", b"not a png")
+        
+        # 実行（PNGとしてデコードすると失敗するデータ）
+        result = comparer.compare("home", b"not a png")
+        
+        # アサーション
+        assert result.status == VisualDiff.IDENTICAL
+        assert "identical: 1件" in comparer.summary()
+    
+    def test_element_capture_with_masks(self, driver, tmp_path):
+        """要素のスクリーンショットを撮影し、無視する要素の範囲を画素単位で求めることのテスト"""
+        comparer = VisualComparer(str(tmp_path))
+        
+        # 実行
+        result = comparer.check(driver, "form", locator=("id", "login-form"), mask_locators=[("css selector", ".clock")])
+        
+        # アサーション
+        driver.find_element.assert_called_once_with("id", "login-form")
+        driver.get_screenshot_as_png.assert_not_called()
+        driver.execute_script.assert_called_once_with(
+            browser_scripts.ELEMENT_RECTS, [["css selector", ".clock"]], ["id", "login-form"]
+        )
+        assert result.baseline_path == str(tmp_path / "chrome" / "form.png")
+        # devicePixelRatio を掛けて画素単位にする
+        assert VisualComparer.get_mask_regions(driver, [("css selector", ".clock")]) == [(21, 8, 40, 21)]
+    
+    def test_tolerance_and_masks(self, tmp_path):
+        """許容範囲内の差と無視する領域の差を一致とすることのテスト"""
+        baseline = [[[255, 255, 255]] * 20 for _ in range(10)]
+        changed = [row[:] for row in baseline]
+        changed[0][0] = [0, 0, 0]
+        changed[5][5] = [250, 250, 250]
+        comparer = VisualComparer(str(tmp_path), tolerance=0, precheck_step=0, save_diff=False)
+        comparer.compare("page", make_png(baseline))
+        
+        # アサーション
+        failed = comparer.compare("page", make_png(changed))
+        assert failed.status == VisualDiff.FAILED
+        assert failed.mismatched == 1
+        passed = comparer.compare("page", make_png(changed), regions=[(0, 0, 2, 2)])
+        assert passed.status == VisualDiff.PASSED
+    
+    def test_precheck_rejects_without_full_comparison(self, tmp_path, monkeypatch):
+        """間引いた画素だけで不一致が確定した場合に差分画像を保存することのテスト"""
+        monkeypatch.setenv(artifacts.RUN_ID_ENV, "run1")
+        monkeypatch.setattr(settings, "SCREENSHOT_DIR", str(tmp_path / "shots"))
+        monkeypatch.setattr(settings, "ASYNC_ARTIFACTS", False)
+        comparer = VisualComparer(str(tmp_path), tolerance=0.01, precheck_step=4)
+        comparer.compare("page", make_png([[[255, 255, 255]] * 16 for _ in range(16)]))
+        
+        # 実行
+        result = comparer.compare("page", make_png([[[0, 0, 0]] * 16 for _ in range(16)]))
+        
+        # アサーション
+        assert result.prechecked
+        assert result.mismatched == 16
+        assert "少なくとも16画素" in result.message
+        with open(result.diff_path, "rb") as f:
+            assert f.read(8) == b"\x89PNG\r\n\x1a\n"